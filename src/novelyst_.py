@@ -19,6 +19,7 @@ GNU General Public License for more details.
 """
 import os
 import sys
+import tracemalloc
 from pathlib import Path
 from pywriter.pywriter_globals import *
 from pywriter.config.configuration import Configuration
@@ -77,9 +78,17 @@ SETTINGS = dict(
     date_width=70,
     time_width=40,
     duration_width=55,
+    timeline_width=40,
     arcs_width=55,
     plot_width=300,
-    column_order='wc;vp;sy;st;nt;dt;tm;dr;tg;po;ac;pt;ar'
+    snapshot_cache_mb=100,
+    slow_hook_ms=200,
+    warm_views='scene;chapter',
+    backup_keep_last=10,
+    backup_keep_hourly=24,
+    backup_keep_daily=14,
+    backup_keep_weekly=8,
+    column_order='wc;vp;sy;st;nt;dt;tm;dr;tl;tg;po;ac;pt;ar'
 )
 OPTIONS = dict(
     show_contents=True,
@@ -98,11 +107,18 @@ OPTIONS = dict(
     show_links=True,
     detach_prop_win=False,
     clean_up_yw=False,
+    backup_history=False,
 )
 
 
 def main():
-    #--- Set up the directories for configuration and temporary files.
+    #--- Get the command line options.
+    args = sys.argv[1:]
+    if '--trace-memory' in args:
+        args.remove('--trace-memory')
+        tracemalloc.start()
+
+    #--- Set up the directories for configuration, cached, and temporary files.
     try:
         homeDir = str(Path.home()).replace('\\', '/')
         installDir = f'{homeDir}/.pywriter/{APPNAME}'
@@ -113,6 +129,8 @@ def main():
     os.makedirs(configDir, exist_ok=True)
     tempDir = f'{installDir}/temp'
     os.makedirs(tempDir, exist_ok=True)
+    cacheDir = f'{installDir}/cache'
+    os.makedirs(cacheDir, exist_ok=True)
 
     #--- Load configuration.
     iniFile = f'{configDir}/{APPNAME}.ini'
@@ -123,7 +141,12 @@ def main():
     kwargs.update(configuration.options)
 
     #--- Instantiate the app object.
-    app = NovelystTk('novelyst @release', tempDir, **kwargs)
+    app = NovelystTk('novelyst @release', tempDir, cacheDir=cacheDir, **kwargs)
+
+    #--- Start the profiling mode, if specified.
+    if '--profile' in args:
+        args.remove('--profile')
+        app.toggle_profiling()
 
     #--- Launchers for opening linked non-standard filetypes.
     launcherConfig = NvConfiguration()
@@ -132,7 +155,7 @@ def main():
 
     #--- Load a project, if specified.
     try:
-        sourcePath = sys.argv[1]
+        sourcePath = args[0]
     except:
         sourcePath = ''
     if not sourcePath or not os.path.isfile(sourcePath):
@@ -6,11 +6,19 @@ html_items -- Provide a class for HTML items report file representation.
 html_locations -- Provide a class for HTML locations report file representation.
 html_project_notes -- Provide a class for HTML project notes report file representation.
 html_report -- Provide a base class for HTML report file representation.
+html_timeline -- Provide a class for HTML timeline report file representation.
+lazy_export_target_factory -- Provide a factory class for export targets imported on demand.
 nv_doc_exporter -- Provide a converter class for document export.
 nv_exporter -- Provide an abstract base class for exporters.
 nv_reporter -- Provide a converter class for report generation.
+ods_char_list_nv -- Provide a class for ODS character list export, written as a stream.
+ods_item_list_nv -- Provide a class for ODS item list export, written as a stream.
+ods_loc_list_nv -- Provide a class for ODS location list export, written as a stream.
+ods_scene_list_nv -- Provide a class for ODS scene list export, written as a stream.
+ods_stream_writer -- Provide a base class for ODS files written as a stream.
 odt_arcs -- Provide a class for ODT invisibly tagged arc defining chapters export, and the filter classes needed.
 odt_characters_custom -- Provide a class for ODT invisibly tagged character descriptions export.
+odt_manuscript_nv -- Provide a class for ODT manuscript export, re-rendering only changed scenes.
 wrimo_file -- Provide a class for an obfuscated text file representation.
 
 Copyright (c) 2023 Peter Triesberger
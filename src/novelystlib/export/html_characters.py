@@ -13,6 +13,12 @@ class HtmlCharacters(HtmlReport):
     DESCRIPTION = 'HTML charcters report'
     EXTENSION = '.html'
     SUFFIX = '_character_report'
+    FINGERPRINT_SOURCES = dict(
+        title=None,
+        authorName=None,
+        srtCharacters=None,
+        characters=None,
+        )
 
     _fileHeader = f'''{HtmlReport._fileHeader}
 <title>{_('Characters')} ($Title)</title>
@@ -13,6 +13,12 @@ class HtmlItems(HtmlReport):
     DESCRIPTION = 'HTML items report'
     EXTENSION = '.html'
     SUFFIX = '_item_report'
+    FINGERPRINT_SOURCES = dict(
+        title=None,
+        authorName=None,
+        srtItems=None,
+        items=None,
+        )
 
     _fileHeader = f'''{HtmlReport._fileHeader}
 <title>{_('Items')} ($Title)</title>
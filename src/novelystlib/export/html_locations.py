@@ -13,6 +13,12 @@ class HtmlLocations(HtmlReport):
     DESCRIPTION = 'HTML locations report'
     EXTENSION = '.html'
     SUFFIX = '_location_report'
+    FINGERPRINT_SOURCES = dict(
+        title=None,
+        authorName=None,
+        srtLocations=None,
+        locations=None,
+        )
 
     _fileHeader = f'''{HtmlReport._fileHeader}
 <title>{_('Locations')} ($Title)</title>
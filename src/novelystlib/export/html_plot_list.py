@@ -17,9 +17,18 @@ class HtmlPlotList(HtmlReport):
     Public instance variables:
         filePath: str -- path to the file (property with getter and setter). 
 
+    Public class constants:
+        FINGERPRINT_SOURCES: dict -- Novel data read by the export, for the export cache.
+
     """
     DESCRIPTION = _('HTML Plot list')
     SUFFIX = '_plotlist'
+    FINGERPRINT_SOURCES = dict(
+        title=None,
+        srtChapters=None,
+        chapters=('title', 'chType', 'chLevel', 'srtScenes', 'kwVar'),
+        scenes=('title', 'scType', 'scnArcs', 'kwVar'),
+        )
 
     def write(self):
         """Create a HTML table.
@@ -56,12 +65,14 @@ class HtmlPlotList(HtmlReport):
             if arcDefinition is not None:
                 arcs[arcDefinition] = self.novel.chapters[chId].title
 
+        arcAttributes = [f'style="background: {arcColors[i % len(arcColors)]}"' for i in range(len(arcs))]
+        emptyCell = create_cell('')
+
         # Title row.
         htmlText.append('<tr class="heading">')
-        htmlText.append(create_cell(''))
+        htmlText.append(emptyCell)
         for i, arc in enumerate(arcs):
-            j = i % len(arcColors)
-            htmlText.append(create_cell(arcs[arc], attr=f'style="background: {arcColors[j]}"'))
+            htmlText.append(create_cell(arcs[arc], attr=arcAttributes[i]))
         htmlText.append('</tr>')
 
         # Chapter/scene rows.
@@ -74,28 +85,27 @@ class HtmlPlotList(HtmlReport):
                 htmlText.append(f'<tr>')
                 htmlText.append(create_cell(self.novel.chapters[chId].title, attr=f'style="{STYLE_CH_TITLE}"'))
                 for arc in arcs:
-                    htmlText.append(create_cell(''))
+                    htmlText.append(emptyCell)
                 htmlText.append(f'</tr>')
             for scId in self.novel.chapters[chId].srtScenes:
                 if self.novel.scenes[scId].scType == 0:
                     htmlText.append(f'<tr>')
                     scnArcs[scId] = string_to_list(self.novel.scenes[scId].scnArcs)
                     htmlText.append(create_cell(self.novel.scenes[scId].title))
+                    pointIds = string_to_list(self.novel.scenes[scId].kwVar.get('Field_SceneAssoc', None))
                     for i, arc in enumerate(arcs):
-                        j = i % len(arcColors)
                         if arc in scnArcs[scId]:
                             entry = ''
                             # Use arc point titles instead of binary marker.
-                            pointIds = string_to_list(self.novel.scenes[scId].kwVar.get('Field_SceneAssoc', None))
                             points = []
                             for ptId in pointIds:
                                 if arc in self.novel.scenes[ptId].scnArcs:
                                     points.append(self.novel.scenes[ptId].title)
                             if points:
                                 entry = list_to_string(points)
-                            htmlText.append(create_cell(entry, attr=f'style="background: {arcColors[j]}"'))
+                            htmlText.append(create_cell(entry, attr=arcAttributes[i]))
                         else:
-                            htmlText.append(create_cell(''))
+                            htmlText.append(emptyCell)
                     htmlText.append(f'</tr>')
 
         htmlText.append(self._fileFooter)
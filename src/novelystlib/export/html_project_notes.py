@@ -13,6 +13,12 @@ class HtmlProjectNotes(HtmlReport):
     DESCRIPTION = 'HTML project notes report'
     EXTENSION = '.html'
     SUFFIX = '_projectnote_report'
+    FINGERPRINT_SOURCES = dict(
+        title=None,
+        authorName=None,
+        srtPrjNotes=None,
+        projectNotes=None,
+        )
 
     _fileHeader = f'''{HtmlReport._fileHeader}
 <title>{_('Project notes')} ($Title)</title>
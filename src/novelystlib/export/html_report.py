@@ -4,11 +4,51 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/novelyst
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
+from functools import lru_cache
 from pywriter.file.file_export import FileExport
 
+HTML_ESCAPES = str.maketrans({
+    '&': '&amp;',
+    '"': '&quot;',
+    "'": '&apos;',
+    '>': '&gt;',
+    '<': '&lt;',
+    '\n': '<p />',
+    })
+CACHED_TEXT_LENGTH = 100
+# Texts up to this length, such as titles and tags, are cached.
+
+
+def escape_html(text):
+    """Return text with HTML special characters escaped, and line breaks as paragraphs.
+
+    Positional arguments:
+        text: str -- Text to escape. If not a string, return an empty string.
+
+    All characters are replaced in one pass.
+    Repeated short strings, such as titles, are converted only once.
+    Longer texts, such as descriptions, are rarely repeated, so they are not cached.
+    """
+    if not isinstance(text, str):
+        return ''
+
+    if len(text) <= CACHED_TEXT_LENGTH:
+        return _escape_short_html(text)
+
+    return text.rstrip().translate(HTML_ESCAPES)
+
+
+@lru_cache(maxsize=1024)
+def _escape_short_html(text):
+    return text.rstrip().translate(HTML_ESCAPES)
+
 
 class HtmlReport(FileExport):
-    """Class for HTML report file representation."""
+    """Class for HTML report file representation.
+
+    Subclasses may specify the novel data they read in the
+    FINGERPRINT_SOURCES class constant; see ExportCache.
+    """
     DESCRIPTION = 'HTML report'
     EXTENSION = '.html'
     SUFFIX = '_report'
@@ -45,18 +85,4 @@ td.chtitle {font-weight: bold}
         
         Overrides the superclass method.
         """
-        HTML_REPLACEMENTS = [
-            ('&', '&amp;'),  # must be first!
-            ('"', '&quot;'),
-            ("'", '&apos;'),
-            ('>', '&gt;'),
-            ('<', '&lt;'),
-            ('\n', '<p />'),
-        ]
-        try:
-            text = text.rstrip()
-            for yw, htm in HTML_REPLACEMENTS:
-                text = text.replace(yw, htm)
-        except AttributeError:
-            text = ''
-        return text
+        return escape_html(text)
@@ -0,0 +1,116 @@
+"""Provide a class for HTML timeline report file representation.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from datetime import date
+from pywriter.pywriter_globals import *
+from novelystlib.export.html_report import HtmlReport
+from novelystlib.model.timeline_index import TimelineIndex
+
+
+class HtmlTimeline(HtmlReport):
+    """Class for HTML timeline report file representation.
+
+    Lists the dated scenes in chronological order, with the gaps between them,
+    the scenes overlapping each scene, and the scenes out of reading order.
+
+    Public methods:
+        write() -- Write instance variables to the file.
+
+    Public class constants:
+        FINGERPRINT_SOURCES: dict -- Novel data read by the export, for the export cache.
+        MIN_GAP: int -- Gaps longer than this number of seconds are listed.
+    """
+    DESCRIPTION = _('HTML Timeline')
+    SUFFIX = '_timeline'
+    FINGERPRINT_SOURCES = dict(
+        title=None,
+        srtChapters=None,
+        chapters=('title', 'isTrash', 'srtScenes'),
+        scenes=('title', 'scType', 'date', 'time', 'day', 'lastsDays', 'lastsHours', 'lastsMinutes'),
+        )
+    MIN_GAP = 86400
+
+    def write(self):
+        """Create a HTML table.
+
+        Raise the "Error" exception in case of error.
+        Extends the superclass method.
+        """
+
+        def create_cell(text, attr=''):
+            """Return the markup for a table cell with text and attributes."""
+            return f'<td {attr}>{self._convert_from_yw(text)}</td>'
+
+        timeline = TimelineIndex(self.novel)
+        chapterTitles = {}
+        # key: scene ID, value: title of the chapter
+        for chId in self.novel.srtChapters:
+            for scId in self.novel.chapters[chId].srtScenes:
+                chapterTitles[scId] = self.novel.chapters[chId].title
+        gapsBefore = {}
+        # key: ID of the scene after the gap, value: gap length
+        for length, __, scId in timeline.get_gaps(self.MIN_GAP):
+            gapsBefore[scId] = length
+
+        htmlText = [self._fileHeader]
+        htmlText.append(f'''<title>{self.novel.title}</title>
+</head>
+<body>
+<p class=title>{self.novel.title} - {_("Timeline")}</p>
+<table>''')
+        htmlText.append('<tr class="heading">')
+        for heading in (_('Start'), _('End'), _('Scene'), _('Chapter'), _('Notes')):
+            htmlText.append(create_cell(heading))
+        htmlText.append('</tr>')
+        for scId in timeline.get_chronology():
+            if scId in gapsBefore:
+                htmlText.append('<tr>')
+                htmlText.append(create_cell(f'{_("Gap")}: {self._format_duration(gapsBefore[scId])}', attr='colspan="5" style="font-style: italic"'))
+                htmlText.append('</tr>')
+            start, end, isDate = timeline.get_span(scId)
+            notes = []
+            if timeline.is_out_of_order(scId):
+                notes.append(_('Out of reading order'))
+            overlapping = [self.novel.scenes[otherId].title for otherId in timeline.get_overlapping(scId)]
+            if overlapping:
+                notes.append(f'{_("Overlaps")}: {list_to_string(overlapping)}')
+            htmlText.append('<tr>')
+            htmlText.append(create_cell(self._format_time(start, isDate)))
+            htmlText.append(create_cell(self._format_time(end, isDate)))
+            htmlText.append(create_cell(self.novel.scenes[scId].title, attr='class="chtitle"'))
+            htmlText.append(create_cell(chapterTitles[scId]))
+            htmlText.append(create_cell('\n'.join(notes)))
+            htmlText.append('</tr>')
+
+        htmlText.append(self._fileFooter)
+        with open(self.filePath, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(htmlText))
+
+    def _format_duration(self, seconds):
+        """Return a duration in days, hours, and minutes, as displayed in the tree."""
+        days, seconds = divmod(seconds, 86400)
+        hours, seconds = divmod(seconds, 3600)
+        minutes = seconds // 60
+        parts = []
+        if days:
+            parts.append(f'{days}d')
+        if hours:
+            parts.append(f'{hours}h')
+        if minutes:
+            parts.append(f'{minutes}min')
+        return ' '.join(parts)
+
+    def _format_time(self, seconds, isDate):
+        """Return a timeline position as date or day, and time."""
+        days, seconds = divmod(seconds, 86400)
+        dispTime = f'{seconds // 3600:02}:{seconds % 3600 // 60:02}'
+        if isDate:
+            try:
+                return f'{date.fromordinal(days + 1).isoformat()} {dispTime}'
+
+            except (ValueError, OverflowError):
+                pass
+        return f'{_("Day")} {days} {dispTime}'
@@ -0,0 +1,82 @@
+"""Provide a factory class for export targets imported on demand.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+from importlib import import_module
+from pywriter.pywriter_globals import *
+from pywriter.converter.export_target_factory import ExportTargetFactory
+
+
+class LazyExportTargetFactory(ExportTargetFactory):
+    """A factory class that instantiates an export target file object.
+
+    The export target classes are registered by their dotted paths,
+    so the writer modules are imported only when a document of this type is created.
+
+    Public methods:
+        get_target_class(suffix) -- Import the export target class registered for a suffix and return it.
+        make_file_objects(self, sourcePath, **kwargs) -- Instantiate a target object for conversion to any format.
+    """
+
+    def __init__(self, exportTargets):
+        """Set the registry of the export target classes.
+
+        Positional arguments:
+            exportTargets: dict -- key: target file name suffix, value: dotted path of the target class.
+
+        Overrides the superclass constructor.
+        """
+        self._exportTargets = exportTargets
+        self._targetClasses = {}
+        # key: suffix, value: imported target class
+
+    def get_target_class(self, suffix):
+        """Import the export target class registered for a suffix and return it.
+
+        Positional arguments:
+            suffix: str -- Target file name suffix.
+
+        Raise the "Error" exception if no class is registered for the suffix.
+        """
+        try:
+            return self._targetClasses[suffix]
+
+        except KeyError:
+            pass
+
+        try:
+            classPath = self._exportTargets[suffix]
+        except KeyError:
+            raise Error(f'{_("Export type is not supported")}: "{suffix}".')
+
+        moduleName, className = classPath.rsplit('.', 1)
+        targetClass = getattr(import_module(moduleName), className)
+        self._targetClasses[suffix] = targetClass
+        return targetClass
+
+    def make_file_objects(self, sourcePath, **kwargs):
+        """Instantiate a target object for conversion to any format.
+
+        Positional arguments:
+            sourcePath: str -- path to the source file to convert.
+
+        Required keyword arguments:
+            suffix: str -- target file name suffix.
+
+        Return a tuple with two elements:
+        - None
+        - targetFile: a FileExport subclass instance
+
+        Raise the "Error" exception in case of error.
+        Overrides the superclass method.
+        """
+        fileName, __ = os.path.splitext(sourcePath)
+        suffix = kwargs['suffix']
+        targetClass = self.get_target_class(suffix)
+        if suffix is None:
+            suffix = ''
+        targetFile = targetClass(f'{fileName}{suffix}{targetClass.EXTENSION}', **kwargs)
+        return None, targetFile
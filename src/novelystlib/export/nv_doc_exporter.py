@@ -10,29 +10,8 @@ from tkinter import ttk
 from datetime import datetime
 from pywriter.pywriter_globals import *
 from pywriter.file.doc_open import open_document
-from pywriter.converter.export_target_factory import ExportTargetFactory
-from pywriter.odt_w.odt_w_proof import OdtWProof
-from pywriter.odt_w.odt_w_manuscript import OdtWManuscript
-from pywriter.odt_w.odt_w_scenedesc import OdtWSceneDesc
-from pywriter.odt_w.odt_w_chapterdesc import OdtWChapterDesc
-from pywriter.odt_w.odt_w_partdesc import OdtWPartDesc
-from pywriter.odt_w.odt_w_brief_synopsis import OdtWBriefSynopsis
-from pywriter.odt_w.odt_w_export import OdtWExport
-from pywriter.odt_w.odt_w_items import OdtWItems
-from pywriter.odt_w.odt_w_locations import OdtWLocations
-from pywriter.odt_w.odt_w_xref import OdtWXref
-from pywriter.odt_w.odt_w_notes import OdtWNotes
-from pywriter.odt_w.odt_w_todo import OdtWTodo
-from pywriter.ods_w.ods_w_charlist import OdsWCharList
-from pywriter.ods_w.ods_w_loclist import OdsWLocList
-from pywriter.ods_w.ods_w_itemlist import OdsWItemList
-from pywriter.ods_w.ods_w_scenelist import OdsWSceneList
-from pywriter.yw.data_files import DataFiles
 from novelystlib.export.nv_exporter import NvExporter
-from novelystlib.export.odt_characters_nv import OdtCharactersNv
-from novelystlib.export.wrimo_file import WrimoFile
-from novelystlib.export.odt_plot import OdtPlot
-from novelystlib.export.ods_plot_list import OdsPlotList
+from novelystlib.export.lazy_export_target_factory import LazyExportTargetFactory
 
 
 class NvDocExporter(NvExporter):
@@ -41,28 +20,31 @@ class NvDocExporter(NvExporter):
     Public methods:
         run(source, suffix, lock=True, show=True) -- Create a target object and run conversion.    
     """
-    EXPORT_TARGET_CLASSES = [OdtWProof,
-                             OdtWManuscript,
-                             OdtWBriefSynopsis,
-                             OdtWSceneDesc,
-                             OdtWChapterDesc,
-                             OdtWPartDesc,
-                             OdtWExport,
-                             OdtPlot,
-                             OdtCharactersNv,
-                             OdtWItems,
-                             OdtWLocations,
-                             OdtWXref,
-                             OdtWNotes,
-                             OdtWTodo,
-                             OdsWCharList,
-                             OdsWLocList,
-                             OdsWItemList,
-                             OdsWSceneList,
-                             OdsPlotList,
-                             DataFiles,
-                             WrimoFile,
-                             ]
+    EXPORT_TARGETS = {
+        '_proof':'pywriter.odt_w.odt_w_proof.OdtWProof',
+        '_manuscript':'novelystlib.export.odt_manuscript_nv.OdtManuscriptNv',
+        '_brf_synopsis':'pywriter.odt_w.odt_w_brief_synopsis.OdtWBriefSynopsis',
+        '_scenes':'pywriter.odt_w.odt_w_scenedesc.OdtWSceneDesc',
+        '_chapters':'pywriter.odt_w.odt_w_chapterdesc.OdtWChapterDesc',
+        '_parts':'pywriter.odt_w.odt_w_partdesc.OdtWPartDesc',
+        '':'pywriter.odt_w.odt_w_export.OdtWExport',
+        '_plot':'novelystlib.export.odt_plot.OdtPlot',
+        '_characters':'novelystlib.export.odt_characters_nv.OdtCharactersNv',
+        '_items':'pywriter.odt_w.odt_w_items.OdtWItems',
+        '_locations':'pywriter.odt_w.odt_w_locations.OdtWLocations',
+        '_xref':'pywriter.odt_w.odt_w_xref.OdtWXref',
+        '_notes':'pywriter.odt_w.odt_w_notes.OdtWNotes',
+        '_todo':'pywriter.odt_w.odt_w_todo.OdtWTodo',
+        '_charlist':'novelystlib.export.ods_char_list_nv.OdsCharListNv',
+        '_loclist':'novelystlib.export.ods_loc_list_nv.OdsLocListNv',
+        '_itemlist':'novelystlib.export.ods_item_list_nv.OdsItemListNv',
+        '_scenelist':'novelystlib.export.ods_scene_list_nv.OdsSceneListNv',
+        '_plotlist':'novelystlib.export.ods_plot_list.OdsPlotList',
+        '_data':'pywriter.yw.data_files.DataFiles',
+        '_wrimo':'novelystlib.export.wrimo_file.WrimoFile',
+        }
+    # key: target file name suffix, value: dotted path of the target class
+    # The writer modules are imported on the first export of their document type.
 
     def __init__(self, ui):
         """Create strategy class instances.
@@ -72,9 +54,7 @@ class NvDocExporter(NvExporter):
         
         Extends the superclass constructor.
         """
-        DataFiles.SUFFIX = '_data'
-
-        self.exportTargetFactory = ExportTargetFactory(self.EXPORT_TARGET_CLASSES)
+        self.exportTargetFactory = LazyExportTargetFactory(self.EXPORT_TARGETS)
         self.ui = ui
         self._source = None
         self._target = None
@@ -103,6 +83,13 @@ class NvDocExporter(NvExporter):
             self.ui.set_info_how(f'!{str(ex)}')
             return
 
+        self._fingerprint = None
+        if self.exportCache is not None:
+            self._fingerprint = self.exportCache.get_fingerprint(self._target, self._source.novel, **kwargs)
+            if self.exportCache.is_up_to_date(self._target.filePath, self._fingerprint):
+                self._report_up_to_date()
+                return
+
         if os.path.isfile(self._target.filePath):
             self._ask()
         else:
@@ -156,6 +143,8 @@ class NvDocExporter(NvExporter):
             self.ui.set_info_how(f'!{str(ex)}')
         else:
             # Successfully created a new document.
+            if self._fingerprint is not None:
+                self.exportCache.update(self._target.filePath, self._fingerprint)
             if self._lock and not self.ui.isLocked:
                 self.ui.lock()
             self._targetFileDate = datetime.now().replace(microsecond=0).isoformat(sep=' ')
@@ -178,3 +167,12 @@ class NvDocExporter(NvExporter):
         if self._lock and not self.ui.isLocked:
             self.ui.lock()
 
+    def _report_up_to_date(self):
+        """Skip the export, because the existing document was created from the same data."""
+        if self._lock and not self.ui.isLocked:
+            self.ui.lock()
+        self.ui.set_info_how(_('{0} is up to date.').format(self._target.DESCRIPTION))
+        if self._show:
+            if self.ui.ask_yes_no(_('Document "{}" is up to date. Open now?').format(norm_path(self._target.filePath))):
+                open_document(self._target.filePath)
+
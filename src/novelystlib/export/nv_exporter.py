@@ -13,7 +13,11 @@ class NvExporter(ABC):
     
     Public methods:
         run(source, suffix, lock=False, show=False) -- Create a target object and run conversion.    
+
+    Public class variables:
+        exportCache: ExportCache -- Record of the exported documents' fingerprints; None if disabled.
     """
+    exportCache = None
 
     @abstractmethod
     def run(self, source, suffix, lock=False, show=False):
@@ -7,13 +7,8 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 import os
 from pywriter.pywriter_globals import *
 from pywriter.file.doc_open import open_document
-from pywriter.converter.export_target_factory import ExportTargetFactory
 from novelystlib.export.nv_exporter import NvExporter
-from novelystlib.export.html_project_notes import HtmlProjectNotes
-from novelystlib.export.html_characters import HtmlCharacters
-from novelystlib.export.html_locations import HtmlLocations
-from novelystlib.export.html_items import HtmlItems
-from novelystlib.export.html_plot_list import HtmlPlotList
+from novelystlib.export.lazy_export_target_factory import LazyExportTargetFactory
 
 
 class NvReporter(NvExporter):
@@ -26,12 +21,16 @@ class NvReporter(NvExporter):
     specified by the user interface's tempDir attribute, if any. 
     Otherwise, the project directory is used. 
     """
-    EXPORT_TARGET_CLASSES = [HtmlProjectNotes,
-                             HtmlCharacters,
-                             HtmlLocations,
-                             HtmlItems,
-                             HtmlPlotList,
-                             ]
+    EXPORT_TARGETS = {
+        '_projectnote_report':'novelystlib.export.html_project_notes.HtmlProjectNotes',
+        '_character_report':'novelystlib.export.html_characters.HtmlCharacters',
+        '_location_report':'novelystlib.export.html_locations.HtmlLocations',
+        '_item_report':'novelystlib.export.html_items.HtmlItems',
+        '_plotlist':'novelystlib.export.html_plot_list.HtmlPlotList',
+        '_timeline':'novelystlib.export.html_timeline.HtmlTimeline',
+        }
+    # key: target file name suffix, value: dotted path of the target class
+    # The report modules are imported on the first report of their type.
 
     def __init__(self, ui):
         """Create strategy class instances.
@@ -41,7 +40,7 @@ class NvReporter(NvExporter):
         
         Extends the superclass constructor.
         """
-        self._exportTargetFactory = ExportTargetFactory(self.EXPORT_TARGET_CLASSES)
+        self._exportTargetFactory = LazyExportTargetFactory(self.EXPORT_TARGETS)
         self._ui = ui
 
     def run(self, source, suffix):
@@ -67,11 +66,21 @@ class NvReporter(NvExporter):
                 if not dirname:
                     dirname = '.'
             target.filePath = f'{dirname}/{filename}'
+            fingerprint = None
+            if self.exportCache is not None:
+                fingerprint = self.exportCache.get_fingerprint(target, source.novel, **kwargs)
+                if self.exportCache.is_up_to_date(target.filePath, fingerprint):
+                    self._ui.set_info_how(_('{0} is up to date.').format(target.DESCRIPTION))
+                    open_document(target.filePath)
+                    return
+
             try:
                 target.novel = source.novel
                 target.write()
             except Error as ex:
                 self._ui.set_info_how(f'!{str(ex)}')
             else:
+                if fingerprint is not None:
+                    self.exportCache.update(target.filePath, fingerprint)
                 open_document(target.filePath)
 
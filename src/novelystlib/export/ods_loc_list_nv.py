@@ -0,0 +1,15 @@
+"""Provide a class for ODS location list export, written as a stream.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from pywriter.ods_w.ods_w_loclist import OdsWLocList
+from novelystlib.export.ods_stream_writer import OdsStreamWriter
+
+
+class OdsLocListNv(OdsStreamWriter, OdsWLocList):
+    """ODS location list representation.
+
+    Use the templates of the superclass, and write the content directly into the ODS archive.
+    """
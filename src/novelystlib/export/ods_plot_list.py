@@ -4,12 +4,12 @@ Copyright (c) 2022 Peter Triesberger
 For further information see https://github.com/peter88213/yw-table
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
-import tempfile
 from pywriter.pywriter_globals import *
 from pywriter.ods_w.ods_writer import OdsWriter
+from novelystlib.export.ods_stream_writer import OdsStreamWriter
 
 
-class OdsPlotList(OdsWriter):
+class OdsPlotList(OdsStreamWriter):
     """html plot list representation.
 
     Public methods:
@@ -18,9 +18,18 @@ class OdsPlotList(OdsWriter):
     Public instance variables:
         filePath: str -- path to the file (property with getter and setter). 
 
+    Public class constants:
+        FINGERPRINT_SOURCES: dict -- Novel data read by the export, for the export cache.
+
     """
     DESCRIPTION = _('ODS Plot list')
     SUFFIX = '_plotlist'
+    FINGERPRINT_SOURCES = dict(
+        title=None,
+        srtChapters=None,
+        chapters=('title', 'chType', 'chLevel', 'srtScenes', 'kwVar'),
+        scenes=('title', 'scType', 'scnArcs', 'kwVar'),
+        )
 
     _ADDITIONAL_STYLES = '''
   <style:style style:name="ce0" style:family="table-cell" style:parent-style-name="Default">
@@ -51,11 +60,10 @@ class OdsPlotList(OdsWriter):
     _fileHeader = OdsWriter._CONTENT_XML_HEADER.replace(' </office:automatic-styles>', _ADDITIONAL_STYLES)
     _fileHeader = f'{_fileHeader}{DESCRIPTION}" table:style-name="ta1" table:print="false">'
 
-    def write_content_xml(self):
-        """Create the ODS table.
-        
-        Raise the "Error" exception in case of error. 
-        Extends the superclass method.
+    def _get_content_parts(self):
+        """Generate the ODS table row by row.
+
+        Overrides the superclass method.
         """
 
         def create_cell(text, attr='', link=''):
@@ -65,12 +73,10 @@ class OdsPlotList(OdsWriter):
                 text = ''
             else:
                 text = f'\n      <text:p>{self._convert_from_yw(text)}</text:p>'
-            return f'     <table:table-cell {attr} office:value-type="string">{text}\n     </table:table-cell>'
+            return f'     <table:table-cell {attr} office:value-type="string">{text}\n     </table:table-cell>\n'
 
-        odsText = [
-            self._fileHeader,
-            '<table:table-column table:style-name="co4" table:default-cell-style-name="Default"/>',
-            ]
+        yield f'{self._fileHeader}\n'
+        yield '<table:table-column table:style-name="co4" table:default-cell-style-name="Default"/>\n'
 
         arcColorsTotal = 6
         # total number of the background colors used in the "ce" table cell styles
@@ -78,21 +84,22 @@ class OdsPlotList(OdsWriter):
         # Get arcs.
         arcs = {}
         arcIds = {}
-        scnArcs = {}
         for chId in self.novel.srtChapters:
             arcDefinition = self.novel.chapters[chId].kwVar.get('Field_ArcDefinition', None)
             if arcDefinition is not None:
                 arcs[arcDefinition] = self.novel.chapters[chId].title
-                odsText.append('<table:table-column table:style-name="co3" table:default-cell-style-name="Default"/>')
+                yield '<table:table-column table:style-name="co3" table:default-cell-style-name="Default"/>\n'
                 arcIds[arcDefinition] = chId
+        arcAttributes = [f'table:style-name="ce{(i % arcColorsTotal) + 1}" ' for i in range(len(arcs))]
+        emptyCell = create_cell('')
 
         # Title row.
-        odsText.append('   <table:table-row table:style-name="ro2">')
-        odsText.append(create_cell(''))
+        row = ['   <table:table-row table:style-name="ro2">\n', emptyCell]
         for i, arc in enumerate(arcs):
             j = (i % arcColorsTotal) + 1
-            odsText.append(create_cell(arcs[arc], attr=f'table:style-name="ce{j}"', link=f'_plot.odt#ChID{arcIds[arc]}'))
-        odsText.append('    </table:table-row>')
+            row.append(create_cell(arcs[arc], attr=f'table:style-name="ce{j}"', link=f'_plot.odt#ChID{arcIds[arc]}'))
+        row.append('    </table:table-row>\n')
+        yield ''.join(row)
 
         # Chapter/scene rows.
         for chId in self.novel.srtChapters:
@@ -101,33 +108,32 @@ class OdsPlotList(OdsWriter):
                     # do not include the "Planning" section
                     break
 
-                odsText.append('   <table:table-row table:style-name="ro2">')
-                odsText.append(create_cell(self.novel.chapters[chId].title, attr='table:style-name="ce0"', link=f'_plot.odt#ChID{chId}'))
-                for arc in arcs:
-                    odsText.append(create_cell(''))
-                odsText.append(f'    </table:table-row>')
+                row = ['   <table:table-row table:style-name="ro2">\n']
+                row.append(create_cell(self.novel.chapters[chId].title, attr='table:style-name="ce0"', link=f'_plot.odt#ChID{chId}'))
+                row.extend(emptyCell for arc in arcs)
+                row.append('    </table:table-row>\n')
+                yield ''.join(row)
+
             for scId in self.novel.chapters[chId].srtScenes:
                 if self.novel.scenes[scId].scType == 0:
-                    odsText.append('   <table:table-row table:style-name="ro2">')
-                    scnArcs[scId] = string_to_list(self.novel.scenes[scId].scnArcs)
-                    odsText.append(create_cell(self.novel.scenes[scId].title, link=f'_manuscript.odt#ScID:{scId}%7Cregion'))
+                    row = ['   <table:table-row table:style-name="ro2">\n']
+                    scnArcs = string_to_list(self.novel.scenes[scId].scnArcs)
+                    row.append(create_cell(self.novel.scenes[scId].title, link=f'_manuscript.odt#ScID:{scId}%7Cregion'))
+                    pointIds = string_to_list(self.novel.scenes[scId].kwVar.get('Field_SceneAssoc', None))
                     for i, arc in enumerate(arcs):
-                        j = (i % arcColorsTotal) + 1
-                        if arc in scnArcs[scId]:
+                        if arc in scnArcs:
                             entry = ''
                             # Use arc point titles instead of binary marker.
-                            pointIds = string_to_list(self.novel.scenes[scId].kwVar.get('Field_SceneAssoc', None))
                             points = []
                             for ptId in pointIds:
                                 if arc in self.novel.scenes[ptId].scnArcs:
                                     points.append(self.novel.scenes[ptId].title)
                             if points:
                                 entry = list_to_string(points)
-                            odsText.append(create_cell(entry, attr=f'table:style-name="ce{j}" '))
+                            row.append(create_cell(entry, attr=arcAttributes[i]))
                         else:
-                            odsText.append(create_cell(''))
-                    odsText.append(f'    </table:table-row>')
+                            row.append(emptyCell)
+                    row.append('    </table:table-row>\n')
+                    yield ''.join(row)
 
-        odsText.append(self._CONTENT_XML_FOOTER)
-        with open(self.filePath, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(odsText))
+        yield self._CONTENT_XML_FOOTER
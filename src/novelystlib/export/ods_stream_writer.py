@@ -0,0 +1,97 @@
+"""Provide a base class for ODS files written as a stream.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import io
+import os
+import zipfile
+from datetime import datetime
+from string import Template
+from pywriter.pywriter_globals import *
+from pywriter.ods_w.ods_writer import OdsWriter
+
+
+class OdsStreamWriter(OdsWriter):
+    """ODS file representation, streaming the content into the zip archive.
+
+    Public methods:
+        write() -- Write the ODS file.
+
+    The content.xml document is compressed on the fly while it is being written,
+    so there is no temporary directory, and the document is never joined into one string.
+    By default, the content is generated by the file export templates.
+    The pywriter base class builds a list for each section, e.g. all scene rows,
+    so that its chapter and scene filters can be reused.
+    Subclasses that are to generate the content row by row,
+    like the plot list, override the _get_content_parts() method.
+    """
+
+    def write(self):
+        """Write the ODS file.
+
+        Return a message.
+        Raise the "Error" exception in case of error.
+        Overrides the superclass method.
+        """
+        backedUp = False
+        if os.path.isfile(self.filePath):
+            try:
+                os.replace(self.filePath, f'{self.filePath}.bak')
+            except:
+                raise Error(f'{_("Cannot overwrite file")}: "{norm_path(self.filePath)}".')
+            else:
+                backedUp = True
+        try:
+            with zipfile.ZipFile(self.filePath, 'w', compression=zipfile.ZIP_DEFLATED) as odfTarget:
+                odfTarget.writestr('mimetype', self._MIMETYPE, compress_type=zipfile.ZIP_STORED)
+                # The ODF specification requires the mimetype to be first and uncompressed.
+                odfTarget.writestr('META-INF/manifest.xml', self._MANIFEST_XML)
+                odfTarget.writestr('settings.xml', self._SETTINGS_XML)
+                odfTarget.writestr('styles.xml', self._get_styles_xml())
+                odfTarget.writestr('meta.xml', self._get_meta_xml())
+                with odfTarget.open('content.xml', 'w') as member:
+                    with io.TextIOWrapper(member, encoding='utf-8') as f:
+                        for part in self._get_content_parts():
+                            f.write(part)
+        except:
+            if os.path.isfile(self.filePath):
+                os.remove(self.filePath)
+            if backedUp:
+                os.replace(f'{self.filePath}.bak', self.filePath)
+            raise Error(f'{_("Cannot create file")}: "{norm_path(self.filePath)}".')
+
+        return f'{_("File written")}: "{norm_path(self.filePath)}".'
+
+    def _get_content_parts(self):
+        """Generate the content.xml document piece by piece.
+
+        By default, use the file export templates.
+        Each section is built as a whole by the pywriter base class,
+        and then written line by line.
+        """
+        yield from self._get_fileHeader()
+        yield from self._get_chapters()
+        yield from self._get_characters()
+        yield from self._get_locations()
+        yield from self._get_items()
+        yield from self._get_projectNotes()
+        yield self._fileFooter
+
+    def _get_meta_xml(self):
+        metaMapping = dict(
+            Author=self.novel.authorName,
+            Title=self.novel.title,
+            Summary=f'<![CDATA[{self.novel.desc}]]>',
+            Datetime=datetime.today().replace(microsecond=0).isoformat(),
+        )
+        return Template(self._META_XML).safe_substitute(metaMapping)
+
+    def _get_styles_xml(self):
+        self.novel.check_locale()
+        localeMapping = dict(
+            Language=self.novel.languageCode,
+            Country=self.novel.countryCode,
+            )
+        return Template(self._STYLES_XML).safe_substitute(localeMapping)
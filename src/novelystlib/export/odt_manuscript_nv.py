@@ -0,0 +1,126 @@
+"""Provide a class for ODT manuscript export, re-rendering only changed scenes.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from collections.abc import Mapping
+from pywriter.pywriter_globals import *
+from pywriter.odt_w.odt_w_manuscript import OdtWManuscript
+from novelystlib.model.element_state import get_element_state
+
+
+class OdtManuscriptNv(OdtWManuscript):
+    """ODT manuscript file representation.
+
+    Converting the scene contents to ODT markup is the main effort of the export.
+    The converted scene data is cached across exports, so repeated exports
+    during revision only convert the scenes changed in the meantime.
+    A cache entry is keyed by the export class, the scene data,
+    and the project data used for the conversion.
+    The key holds the scene's strings themselves, whose hashes Python caches,
+    so looking up an unchanged scene is cheap and exact.
+    The scene numbering and the running totals are set on a copy of the cached mapping
+    on each export, so changing a scene does not invalidate the following ones.
+    The cache holds the entries of the latest export only, and only as many scenes
+    as fit into CACHE_LIMIT characters of scene content;
+    the other scenes are converted on each export.
+
+    Public class constants:
+        CACHE_LIMIT: int -- Maximum total length of the cached scenes' contents.
+    """
+    CACHE_LIMIT = 2000000
+    _sceneCache = {}
+    # key: tuple of the conversion's input data, value: scene mapping
+
+    def __init__(self, filePath, **kwargs):
+        """Initialize the cache bookkeeping.
+
+        Positional arguments:
+            filePath: str -- path to the file represented by the File instance.
+            
+        Optional arguments:
+            kwargs -- keyword arguments to be used by subclasses.  
+
+        Extends the superclass constructor.
+        """
+        super().__init__(filePath, **kwargs)
+        self._context = None
+        # tuple of the project data used for the conversion
+        self._usedEntries = {}
+        # cache entries of the current export
+        self._cachedLength = 0
+        # total length of the scene contents in self._usedEntries
+
+    def write(self):
+        """Write the manuscript; keep the converted scenes for the next export.
+
+        Extends the superclass method.
+        """
+        self._context = None
+        self._usedEntries = {}
+        self._cachedLength = 0
+        try:
+            return super().write()
+
+        finally:
+            type(self)._sceneCache = self._usedEntries
+
+    def _get_sceneMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        """Return the cached mapping of an unchanged scene, or convert the scene.
+
+        Extends the superclass method.
+        """
+        scene = self.novel.scenes[scId]
+        if self._context is None:
+            self._context = (
+                f'{type(self).__module__}.{type(self).__qualname__}',
+                tuple(self.novel.languages or ()),
+                self.novel.authorName,
+                self.novel.languageCode,
+                self.novel.countryCode,
+                self.novel.fieldTitle1,
+                self.novel.fieldTitle2,
+                self.novel.fieldTitle3,
+                self.novel.fieldTitle4,
+                self.projectName,
+                self.projectPath,
+                )
+        titles = []
+        for collection, elemIds in (
+                (self.novel.characters, scene.characters),
+                (self.novel.locations, scene.locations),
+                (self.novel.items, scene.items),
+                ):
+            for elemId in elemIds or ():
+                try:
+                    titles.append(collection[elemId].title)
+                except KeyError:
+                    titles.append(None)
+        key = (self._context, scId, tuple(titles), self._freeze(get_element_state(scene)))
+        sceneMapping = self._sceneCache.get(key, None)
+        if sceneMapping is None:
+            sceneMapping = super()._get_sceneMapping(scId, sceneNumber, wordsTotal, lettersTotal)
+        else:
+            # The numbering differs between exports, so it goes into a copy.
+            sceneMapping = dict(sceneMapping)
+            if sceneNumber == 0:
+                sceneNumber = ''
+            sceneMapping['SceneNumber'] = sceneNumber
+            sceneMapping['WordsTotal'] = wordsTotal
+            sceneMapping['LettersTotal'] = lettersTotal
+        contentLength = len(scene.sceneContent or '')
+        if self._cachedLength + contentLength <= self.CACHE_LIMIT:
+            self._usedEntries[key] = sceneMapping
+            self._cachedLength += contentLength
+        return sceneMapping
+
+    def _freeze(self, value):
+        """Return a hashable equivalent of a scene attribute value."""
+        if isinstance(value, Mapping):
+            return tuple((key, self._freeze(value[key])) for key in sorted(value))
+
+        if isinstance(value, list):
+            return tuple(self._freeze(element) for element in value)
+
+        return value
@@ -4,25 +4,86 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/novelyst
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
+import os
 import re
 
 from pywriter.pywriter_globals import *
 from pywriter.file.file_export import FileExport
 from pywriter.model.scene import ADDITIONAL_WORD_LIMITS, NO_WORD_LIMITS
 
+WORD_LIMITS = re.compile(f'({ADDITIONAL_WORD_LIMITS.pattern})|{NO_WORD_LIMITS.pattern}', re.MULTILINE)
+# Additional word limits are captured, so they can be told from the removable parts.
+
+
+def obfuscate(text):
+    """Return obfuscated text for an exact word count.
+
+    Positional arguments:
+        text: str -- Text to obfuscate.
+
+    Additional word limits become spaces, markup, comments, and hyphens are removed,
+    and all other non-whitespace characters become "x".
+    """
+    text = WORD_LIMITS.sub(_replace_word_limit, text)
+    table = {ord(c): 'x' for c in set(text) if not c.isspace()}
+    return text.translate(table)
+
+
+def _replace_word_limit(match):
+    if match.lastindex:
+        return ' '
+
+    return ''
+
 
 class WrimoFile(FileExport):
     """Obfuscated text file representation.
 
     Public methods:
-        read() -- parse the file and get the instance variables.
+        write() -- Write the obfuscated scene contents to the file.
+
+    Public class constants:
+        FINGERPRINT_SOURCES: dict -- Novel data read by the export, for the export cache.
     """
     DESCRIPTION = _('Obfuscated text for word count')
     EXTENSION = '.txt'
     SUFFIX = '_wrimo'
+    FINGERPRINT_SOURCES = dict(
+        srtChapters=None,
+        chapters=('chType', 'srtScenes'),
+        scenes=('sceneContent', 'scType', 'doNotExport'),
+        )
+    _BUFFER_SIZE = 1048576
 
     _sceneTemplate = '$SceneContent\n\n'
 
+    def write(self):
+        """Write the obfuscated scene contents to the file.
+
+        The scenes are selected and obfuscated by the superclass's _get_chapters() method,
+        and written one by one, so the whole text is not joined into one string.
+        The other sections are skipped, because their templates are empty.
+        Raise the "Error" exception in case of error.
+        Overrides the superclass method.
+        """
+        lines = self._get_chapters()
+        backedUp = False
+        if os.path.isfile(self.filePath):
+            try:
+                os.replace(self.filePath, f'{self.filePath}.bak')
+            except:
+                raise Error(f'{_("Cannot overwrite file")}: "{norm_path(self.filePath)}".')
+            else:
+                backedUp = True
+        try:
+            with open(self.filePath, 'w', encoding='utf-8', buffering=self._BUFFER_SIZE) as f:
+                for line in lines:
+                    f.write(line)
+        except:
+            if backedUp:
+                os.replace(f'{self.filePath}.bak', self.filePath)
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+
     def _convert_from_yw(self, text, quick=False):
         """Return obfuscated text for an exact word count.
         
@@ -35,11 +96,6 @@ class WrimoFile(FileExport):
         Overrides the superclass method.
         """
         if text:
-            text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
-            text = NO_WORD_LIMITS.sub('', text)
-            # at this point, all words are delimited by spaces
-            text = re.sub('\S', 'x', text)
-        else:
-            text = ''
-        return text
+            return obfuscate(text)
 
+        return ''
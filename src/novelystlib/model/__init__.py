@@ -1,6 +1,21 @@
 """Modules for the novelyst model.
 
 Modules:
+backup_store -- Provide a class for a deduplicating project backup store.
+compact_chapter -- Provide a memory-saving chapter class for novelyst.
+compact_scene -- Provide a memory-saving scene class for novelyst.
+element_state -- Provide a function for reading the instance variables of novel elements.
+export_cache -- Provide a class for a persistent record of exported documents' model fingerprints.
+file_hash -- Provide a function for fast file content hashing.
+kw_var_record -- Provide a mapping class for compact storage of custom keyword variables.
+model_event_bus -- Provide a publish/subscribe class for model change events.
+novel_merger -- Provide a class for merging external changes into the novelyst model.
+scene_columns -- Provide a class for a columnar mirror of the scene metadata.
+search_index -- Provide a class for a full-text search index of the novel.
+snapshot_cache -- Provide a class for a persistent cache of processed project data.
+text_replacer -- Provide a class for project-wide find and replace.
+timeline_index -- Provide a class for a chronological index of the scenes.
+wc_log -- Provide classes for the word count log time series.
 work_file -- Provide a class for the novelyst model file.
 
 Copyright (c) 2023 Peter Triesberger
@@ -0,0 +1,236 @@
+"""Provide a class for a deduplicating project backup store.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import re
+import json
+import zlib
+import hashlib
+from datetime import date
+from datetime import datetime
+from pywriter.pywriter_globals import *
+
+
+class BackupStore:
+    """Content-addressed store for the backup history of a project file.
+
+    The project file is split into chunks at the beginning of each XML element
+    representing a novel element (scene, chapter, character etc.).
+    Each chunk is stored only once, identified by its hash.
+    Each backup is a manifest that lists the chunks of the saved file.
+    Thus, saving a project with one changed scene adds just one chunk and a manifest.
+
+    Directory layout:
+        <storeDir>/chunks/<first two hash characters>/<hash> -- zlib-compressed chunk.
+        <storeDir>/manifests/<backup ID>.json -- file hash, size, and chunk hashes.
+
+    The backup ID is the date and time of the backup (YYYYMMDD-hhmmss-microseconds).
+
+    Public methods:
+        add(filePath) -- Add a backup of the file, and apply the retention policy.
+        get_backups() -- Return a list of (backup ID, date/time, size) tuples, latest first.
+        prune() -- Delete backups not kept by the retention policy, and unreferenced chunks.
+        restore(backupId, targetPath) -- Reassemble a backup and write it to targetPath.
+
+    Public instance variables:
+        storeDir: str -- Path to the store directory.
+        keepLast: int -- Number of latest backups that are always kept.
+        keepHourly: int -- Number of hours for which the latest backup is kept.
+        keepDaily: int -- Number of days for which the latest backup is kept.
+        keepWeekly: int -- Number of weeks for which the latest backup is kept.
+    """
+    _CHUNK_START = re.compile(
+        rb'<(?:PROJECT|LOCATIONS|LOCATION|ITEMS|ITEM|CHARACTERS|CHARACTER|PROJECTVARS|PROJECTVAR|'
+        rb'PROJECTNOTES|PROJECTNOTE|SCENES|SCENE|CHAPTERS|CHAPTER|WCLog)>'
+        )
+    _ID_FORMAT = '%Y%m%d-%H%M%S-%f'
+
+    def __init__(self, storeDir, keepLast=10, keepHourly=24, keepDaily=14, keepWeekly=8):
+        """Set the store location and the retention policy.
+
+        Positional arguments:
+            storeDir: str -- Path to the store directory.
+
+        Optional arguments:
+            keepLast: int -- Number of latest backups that are always kept.
+            keepHourly: int -- Number of hours for which the latest backup is kept.
+            keepDaily: int -- Number of days for which the latest backup is kept.
+            keepWeekly: int -- Number of weeks for which the latest backup is kept.
+        """
+        self.storeDir = storeDir
+        self.keepLast = keepLast
+        self.keepHourly = keepHourly
+        self.keepDaily = keepDaily
+        self.keepWeekly = keepWeekly
+        self._chunkDir = f'{storeDir}/chunks'
+        self._manifestDir = f'{storeDir}/manifests'
+
+    def add(self, filePath):
+        """Add a backup of the file, and apply the retention policy.
+
+        Positional arguments:
+            filePath: str -- Path to the file to back up.
+
+        Return the backup ID, or None if the file is identical to the latest backup.
+        Raise the "Error" exception in case of error.
+        """
+        try:
+            with open(filePath, 'rb') as f:
+                content = f.read()
+            fileHash = self._get_hash(content)
+            backups = self._get_backup_ids()
+            if backups and self._read_manifest(backups[-1])['hash'] == fileHash:
+                return None
+
+            chunkHashes = []
+            # Searching chunk starts is much faster than splitting with a lookahead pattern.
+            boundaries = [0]
+            boundaries.extend(match.start() for match in self._CHUNK_START.finditer(content))
+            boundaries.append(len(content))
+            for start, end in zip(boundaries, boundaries[1:]):
+                if end > start:
+                    chunkHashes.append(self._write_chunk(content[start:end]))
+            backupId = datetime.now().strftime(self._ID_FORMAT)
+            manifest = dict(hash=fileHash, size=len(content), chunks=chunkHashes)
+            os.makedirs(self._manifestDir, exist_ok=True)
+            manifestPath = f'{self._manifestDir}/{backupId}.json'
+            with open(f'{manifestPath}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(f'{manifestPath}.tmp', manifestPath)
+        except Exception as ex:
+            raise Error(f'{_("Cannot back up file")}: "{norm_path(filePath)}" - {str(ex)}.')
+
+        self.prune()
+        return backupId
+
+    def get_backups(self):
+        """Return a list of (backup ID, date/time, size) tuples, latest first.
+
+        The date/time is an ISO-formatted string (YYYY-MM-DD hh:mm:ss).
+        """
+        backups = []
+        for backupId in reversed(self._get_backup_ids()):
+            try:
+                size = self._read_manifest(backupId)['size']
+            except:
+                continue
+
+            timestamp = datetime.strptime(backupId, self._ID_FORMAT).replace(microsecond=0).isoformat(sep=' ')
+            backups.append((backupId, timestamp, size))
+        return backups
+
+    def prune(self):
+        """Delete backups not kept by the retention policy, and unreferenced chunks.
+
+        Return the number of deleted backups.
+        """
+        backupIds = list(reversed(self._get_backup_ids()))
+        keep = set(backupIds[:self.keepLast])
+        for getPeriod, periods in ((self._get_hour, self.keepHourly), (self._get_day, self.keepDaily), (self._get_week, self.keepWeekly)):
+            # Keep the latest backup of each of the latest periods.
+            seenPeriods = set()
+            for backupId in backupIds:
+                period = getPeriod(backupId)
+                if not period in seenPeriods:
+                    if len(seenPeriods) == periods:
+                        break
+
+                    seenPeriods.add(period)
+                    keep.add(backupId)
+        deleted = 0
+        for backupId in backupIds:
+            if not backupId in keep:
+                try:
+                    os.remove(f'{self._manifestDir}/{backupId}.json')
+                    deleted += 1
+                except:
+                    pass
+        if deleted:
+            self._collect_garbage()
+        return deleted
+
+    def restore(self, backupId, targetPath):
+        """Reassemble a backup and write it to targetPath.
+
+        Positional arguments:
+            backupId: str -- ID of the backup to restore.
+            targetPath: str -- Path of the file to write.
+
+        The file content is verified before the target file is replaced.
+        Raise the "Error" exception in case of error.
+        """
+        try:
+            manifest = self._read_manifest(backupId)
+            content = b''.join(self._read_chunk(chunkHash) for chunkHash in manifest['chunks'])
+        except Exception as ex:
+            raise Error(f'{_("Cannot restore backup")}: "{backupId}" - {str(ex)}.')
+
+        if self._get_hash(content) != manifest['hash']:
+            raise Error(f'{_("Cannot restore backup")}: "{backupId}" - {_("Backup is damaged")}.')
+
+        try:
+            with open(f'{targetPath}.tmp', 'wb') as f:
+                f.write(content)
+            os.replace(f'{targetPath}.tmp', targetPath)
+        except Exception as ex:
+            raise Error(f'{_("Cannot write file")}: "{norm_path(targetPath)}" - {str(ex)}.')
+
+    def _collect_garbage(self):
+        """Delete all chunks that are not referenced by a manifest."""
+        referenced = set()
+        for backupId in self._get_backup_ids():
+            try:
+                referenced.update(self._read_manifest(backupId)['chunks'])
+            except:
+                # Keep everything, if a manifest cannot be read.
+                return
+
+        for subDir in os.scandir(self._chunkDir):
+            for chunkFile in os.scandir(subDir.path):
+                if not chunkFile.name in referenced:
+                    try:
+                        os.remove(chunkFile.path)
+                    except:
+                        pass
+
+    def _get_backup_ids(self):
+        """Return a list of the backup IDs, oldest first."""
+        try:
+            return sorted(entry.name[:-5] for entry in os.scandir(self._manifestDir) if entry.name.endswith('.json'))
+
+        except FileNotFoundError:
+            return []
+
+    def _get_day(self, backupId):
+        return backupId[:8]
+
+    def _get_hash(self, content):
+        return hashlib.blake2b(content, digest_size=20).hexdigest()
+
+    def _get_hour(self, backupId):
+        return backupId[:11]
+
+    def _get_week(self, backupId):
+        return date(int(backupId[:4]), int(backupId[4:6]), int(backupId[6:8])).isocalendar()[:2]
+
+    def _read_chunk(self, chunkHash):
+        with open(f'{self._chunkDir}/{chunkHash[:2]}/{chunkHash}', 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def _read_manifest(self, backupId):
+        with open(f'{self._manifestDir}/{backupId}.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_chunk(self, chunk):
+        """Store the chunk, if not already stored, and return its hash."""
+        chunkHash = self._get_hash(chunk)
+        chunkPath = f'{self._chunkDir}/{chunkHash[:2]}/{chunkHash}'
+        if not os.path.isfile(chunkPath):
+            os.makedirs(os.path.dirname(chunkPath), exist_ok=True)
+            with open(f'{chunkPath}.tmp', 'wb') as f:
+                f.write(zlib.compress(chunk))
+            os.replace(f'{chunkPath}.tmp', chunkPath)
+        return chunkHash
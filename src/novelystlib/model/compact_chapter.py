@@ -0,0 +1,72 @@
+"""Provide a memory-saving chapter class for novelyst.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import sys
+from pywriter.model.chapter import Chapter
+from novelystlib.model.kw_var_record import KwVarRecord
+
+
+class CompactChapter(Chapter):
+    """Chapter with its instance variables stored in slots.
+
+    The pywriter superclasses have no slots, so the instances still have an
+    instance dictionary. It is only created when accessed, and stays empty.
+    With 2,000 chapters, the chapter objects take 80% of the memory of
+    pywriter chapters (1.7 MB instead of 2.2 MB, as measured by bench_memory.py
+    with Python 3.11).
+    The custom keyword variables are held by a KwVarRecord with slots
+    for the novelyst chapter fields.
+
+    Public methods:
+        from_chapter(chapter) -- Class method: Return a compact copy of a chapter.
+
+    Public class constants:
+        KwVar: class -- KwVarRecord subclass for the chapter's custom keyword variables.
+        STATE_IN_SLOTS: bool -- True: All instance variables are stored in slots.
+    """
+    __slots__ = (
+        'title',
+        'desc',
+        'kwVar',
+        'chLevel',
+        'chType',
+        'suppressChapterTitle',
+        'isTrash',
+        'suppressChapterBreak',
+        'srtScenes',
+        )
+    STATE_IN_SLOTS = True
+
+    class KwVar(KwVarRecord):
+        FIELDS = __slots__ = (
+            'Field_NoNumber',
+            'Field_ArcDefinition',
+            )
+
+    def __init__(self):
+        """Initialize instance variables.
+
+        Extends the superclass constructor.
+        """
+        super().__init__()
+        self.kwVar = self.KwVar()
+
+    @classmethod
+    def from_chapter(cls, chapter):
+        """Return a compact copy of a chapter.
+
+        Positional arguments:
+            chapter: Chapter -- The chapter to copy.
+
+        The copy shares the attribute values, except for the custom keyword variables.
+        The scene IDs are interned.
+        """
+        compactChapter = cls()
+        for name, value in vars(chapter).items():
+            setattr(compactChapter, name, value)
+        compactChapter.kwVar = cls.KwVar(chapter.kwVar)
+        compactChapter.srtScenes = [sys.intern(scId) for scId in compactChapter.srtScenes]
+        return compactChapter
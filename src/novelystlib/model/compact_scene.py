@@ -0,0 +1,101 @@
+"""Provide a memory-saving scene class for novelyst.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import sys
+from pywriter.model.scene import Scene
+from novelystlib.model.kw_var_record import KwVarRecord
+
+
+class CompactScene(Scene):
+    """Scene with its instance variables stored in slots.
+
+    The pywriter superclasses have no slots, so the instances still have an
+    instance dictionary. It is only created when accessed, and stays empty.
+    With 10,000 scenes, the scene objects take 43% of the memory of
+    pywriter scenes (13.4 MB instead of 31.1 MB, as measured by bench_memory.py
+    with Python 3.11). The custom keyword variables are held by a
+    KwVarRecord with slots for the novelyst scene fields.
+
+    Public methods:
+        from_scene(scene) -- Class method: Return a compact copy of a scene.
+
+    Public class constants:
+        KwVar: class -- KwVarRecord subclass for the scene's custom keyword variables.
+        STATE_IN_SLOTS: bool -- True: All instance variables are stored in slots.
+    """
+    __slots__ = (
+        'title',
+        'desc',
+        'kwVar',
+        '_sceneContent',
+        'wordCount',
+        'letterCount',
+        'scType',
+        'doNotExport',
+        'status',
+        'notes',
+        'tags',
+        'field1',
+        'field2',
+        'field3',
+        'field4',
+        'appendToPrev',
+        'isReactionScene',
+        'isSubPlot',
+        'goal',
+        'conflict',
+        'outcome',
+        'characters',
+        'locations',
+        'items',
+        'date',
+        'time',
+        'day',
+        'lastsMinutes',
+        'lastsHours',
+        'lastsDays',
+        'image',
+        'scnArcs',
+        'scnMode',
+        )
+    STATE_IN_SLOTS = True
+
+    class KwVar(KwVarRecord):
+        FIELDS = __slots__ = (
+            'Field_SceneArcs',
+            'Field_SceneAssoc',
+            'Field_CustomAR',
+            'Field_SceneStyle',  # This is for updating old projects.
+            'Field_SceneMode',
+            )
+
+    def __init__(self):
+        """Initialize instance variables.
+
+        Extends the superclass constructor.
+        """
+        super().__init__()
+        self.kwVar = self.KwVar()
+
+    @classmethod
+    def from_scene(cls, scene):
+        """Return a compact copy of a scene.
+
+        Positional arguments:
+            scene: Scene -- The scene to copy.
+
+        The copy shares the attribute values, except for the custom keyword variables.
+        The tags and the IDs of the related elements are interned.
+        """
+        compactScene = cls()
+        for name, value in vars(scene).items():
+            setattr(compactScene, name, value)
+        compactScene.kwVar = cls.KwVar(scene.kwVar)
+        for name in ('tags', 'characters', 'locations', 'items'):
+            values = getattr(compactScene, name)
+            if values:
+                setattr(compactScene, name, [sys.intern(value) for value in values])
+        return compactScene
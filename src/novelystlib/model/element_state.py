@@ -0,0 +1,43 @@
+"""Provide a function for reading the instance variables of novel elements.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+
+_slotNames = {}
+# key: class, value: list of the slot names of the class and its superclasses
+
+
+def get_element_state(element):
+    """Return a dict with the instance variables of an element, including slots.
+
+    Positional arguments:
+        element: BasicElement -- The element to read.
+
+    Unlike vars(), this works with the compact elements; key: attribute name, value: attribute value.
+    The instance dictionary of a class whose STATE_IN_SLOTS constant is True is not read,
+    because reading would create an empty one.
+    """
+    elementClass = type(element)
+    slotNames = _slotNames.get(elementClass, None)
+    if slotNames is None:
+        slotNames = []
+        for c in reversed(elementClass.__mro__):
+            slots = c.__dict__.get('__slots__', ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            slotNames.extend(name for name in slots if name not in ('__dict__', '__weakref__'))
+        _slotNames[elementClass] = slotNames
+    state = {}
+    for name in slotNames:
+        try:
+            state[name] = getattr(element, name)
+        except AttributeError:
+            pass
+    if not getattr(elementClass, 'STATE_IN_SLOTS', False):
+        try:
+            state.update(vars(element))
+        except TypeError:
+            pass
+    return state
@@ -0,0 +1,169 @@
+"""Provide a class for a persistent record of exported documents' model fingerprints.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import json
+import hashlib
+from pywriter.model.basic_element import BasicElement
+from novelystlib.model.element_state import get_element_state
+
+
+class ExportCache:
+    """Record of the model fingerprints the exported documents were created from.
+
+    A fingerprint is a hash over the part of the novel an export class reads,
+    as specified by the class's FINGERPRINT_SOURCES constant, if any.
+    Otherwise, the fingerprint covers the whole novel.
+    FINGERPRINT_SOURCES is a dict; key: name of a novel attribute,
+    value: tuple of the element attributes to consider, or None for all.
+    The fingerprint also covers the keyword arguments the target was created with,
+    and the target's options, i.e. the instance variables named by OPTIONS,
+    such as the project name used in links, and the element filters.
+
+    An export can be skipped, if the document was created with the same fingerprint
+    and has not been changed since.
+
+    Public methods:
+        get_fingerprint(target, novel, **kwargs) -- Return a hash over the novel data and the options of an export target.
+        is_up_to_date(filePath, fingerprint) -- Return True if the document was exported with this fingerprint and is unchanged.
+        update(filePath, fingerprint) -- Record the fingerprint of a document just written.
+
+    Public instance variables:
+        filePath: str -- Path to the cache file.
+
+    Public class constants:
+        FORMAT: int -- Version of the fingerprint; increment when the export classes change.
+        OPTIONS: tuple -- Names of the target instance variables that control the export.
+    """
+    FORMAT = 2
+    OPTIONS = (
+        'projectName',
+        'projectPath',
+        'scenesSplit',
+        '_sceneFilter',
+        '_chapterFilter',
+        '_characterFilter',
+        '_locationFilter',
+        '_itemFilter',
+        )
+
+    def __init__(self, filePath):
+        """Set the cache file path.
+
+        Positional arguments:
+            filePath: str -- Path to the cache file.
+        """
+        self.filePath = filePath
+
+    def get_fingerprint(self, target, novel, **kwargs):
+        """Return a hash over the novel data and the options of an export target.
+
+        Positional arguments:
+            target: FileExport -- The export target.
+            novel: Novel -- The novel to export.
+
+        Optional arguments:
+            kwargs -- Keyword arguments the target has been created with.
+        """
+        hashObject = hashlib.blake2b(digest_size=20)
+        targetClass = type(target)
+        hashObject.update(f'{self.FORMAT} {targetClass.__module__}.{targetClass.__qualname__}'.encode('utf-8'))
+        hashObject.update(repr(self._normalize(kwargs)).encode('utf-8'))
+        options = {name: getattr(target, name) for name in self.OPTIONS if hasattr(target, name)}
+        hashObject.update(repr(self._normalize(options)).encode('utf-8'))
+        sources = getattr(target, 'FINGERPRINT_SOURCES', None)
+        if sources is None:
+            sources = dict.fromkeys(vars(novel))
+        for name, fields in sources.items():
+            hashObject.update(f'\0{name}\0'.encode('utf-8'))
+            value = getattr(novel, name, None)
+            if isinstance(value, dict):
+                for elemId, element in value.items():
+                    if isinstance(element, BasicElement):
+                        if fields is None:
+                            attributes = sorted(get_element_state(element).items())
+                        else:
+                            attributes = [getattr(element, field, None) for field in fields]
+                        hashObject.update(repr((elemId, attributes)).encode('utf-8'))
+                    else:
+                        hashObject.update(repr((elemId, element)).encode('utf-8'))
+            else:
+                hashObject.update(repr(value).encode('utf-8'))
+        return hashObject.hexdigest()
+
+    def is_up_to_date(self, filePath, fingerprint):
+        """Return True if the document was exported with this fingerprint and is unchanged.
+
+        Positional arguments:
+            filePath: str -- Path to the exported document.
+            fingerprint: str -- Fingerprint as returned by get_fingerprint().
+        """
+        entry = self._read().get(os.path.abspath(filePath), None)
+        return entry is not None and entry == [fingerprint] + self._get_file_state(filePath)
+
+    def update(self, filePath, fingerprint):
+        """Record the fingerprint of a document just written.
+
+        Positional arguments:
+            filePath: str -- Path to the exported document.
+            fingerprint: str -- Fingerprint as returned by get_fingerprint().
+
+        Entries of documents that no longer exist are removed.
+        """
+        entries = {}
+        for documentPath, entry in self._read().items():
+            if os.path.isfile(documentPath):
+                entries[documentPath] = entry
+        fileState = self._get_file_state(filePath)
+        if fileState:
+            entries[os.path.abspath(filePath)] = [fingerprint] + fileState
+        try:
+            with open(f'{self.filePath}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(f'{self.filePath}.tmp', self.filePath)
+        except:
+            pass
+
+    def _get_file_state(self, filePath):
+        """Return a list with the size and modification time of a file; an empty list if missing."""
+        try:
+            fileStat = os.stat(filePath)
+        except OSError:
+            return []
+
+        return [fileStat.st_size, fileStat.st_mtime_ns]
+
+    def _normalize(self, value):
+        """Return a representation of an option value that does not depend on object identities.
+
+        Objects such as filters are represented by their class and their instance variables.
+        """
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+
+        if isinstance(value, dict):
+            return tuple(sorted((repr(key), self._normalize(value[key])) for key in value))
+
+        if isinstance(value, (list, tuple)):
+            return tuple(self._normalize(item) for item in value)
+
+        if isinstance(value, (set, frozenset)):
+            return tuple(sorted(repr(self._normalize(item)) for item in value))
+
+        valueClass = type(value)
+        try:
+            state = vars(value)
+        except TypeError:
+            state = {}
+        return (f'{valueClass.__module__}.{valueClass.__qualname__}', self._normalize(state))
+
+    def _read(self):
+        try:
+            with open(self.filePath, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        except:
+            return {}
@@ -0,0 +1,29 @@
+"""Provide a function for fast file content hashing.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import hashlib
+import mmap
+
+
+def get_file_hash(filePath):
+    """Return a hex digest of the content of the file at filePath.
+
+    Positional arguments:
+        filePath: str -- path to the file to hash.
+
+    The file is memory-mapped, so large project files are not copied into memory.
+    BLAKE2b is used because it is the fastest cryptographic hash of the standard library.
+    Raise OSError, if the file cannot be read.
+    """
+    fileHash = hashlib.blake2b(digest_size=16)
+    with open(filePath, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                fileHash.update(mm)
+        except ValueError:
+            # empty files cannot be memory-mapped
+            pass
+    return fileHash.hexdigest()
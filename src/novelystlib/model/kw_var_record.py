@@ -0,0 +1,135 @@
+"""Provide a mapping class for compact storage of custom keyword variables.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import sys
+from collections.abc import MutableMapping
+
+
+class KwVarRecord(MutableMapping):
+    """Dict-like record of an element's custom keyword variables.
+
+    Subclasses list the known field names in FIELDS and declare them as __slots__.
+    The known fields are stored in the slots; an unset slot means a missing key.
+    Unknown field names are kept in a dictionary created on demand.
+    A new record has all known fields set to None, like the elements
+    read from a project file.
+    Iteration order is the order of FIELDS, followed by the unknown fields
+    in insertion order, so the record's repr() equals the repr() of the
+    corresponding dict.
+
+    Public methods:
+        copy() -- Return a shallow copy of the record.
+
+    Public class constants:
+        FIELDS: tuple -- Names of the fields stored in slots.
+    """
+    __slots__ = ('_extra',)
+    FIELDS = ()
+
+    def __init__(self, fields=None):
+        """Set the known fields to None, then add the given fields.
+
+        Optional arguments:
+            fields -- Mapping or iterable of (key, value) pairs.
+        """
+        self._extra = None
+        for fieldName in self.FIELDS:
+            setattr(self, fieldName, None)
+        if fields is not None:
+            self.update(fields)
+
+    def copy(self):
+        """Return a shallow copy of the record."""
+        record = type(self).__new__(type(self))
+        record._extra = None
+        for fieldName in self.FIELDS:
+            try:
+                setattr(record, fieldName, getattr(self, fieldName))
+            except AttributeError:
+                pass
+        if self._extra is not None:
+            record._extra = dict(self._extra)
+        return record
+
+    def get(self, key, default=None):
+        """Return the value of a field, or the default, if missing.
+
+        Overrides the superclass method for speed.
+        """
+        if key in self.FIELDS:
+            return getattr(self, key, default)
+
+        if self._extra is None:
+            return default
+
+        return self._extra.get(key, default)
+
+    def __contains__(self, key):
+        if key in self.FIELDS:
+            return hasattr(self, key)
+
+        return self._extra is not None and key in self._extra
+
+    def __copy__(self):
+        return self.copy()
+
+    def __delitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                delattr(self, key)
+                return
+
+            except AttributeError:
+                raise KeyError(key) from None
+
+        if self._extra is None:
+            raise KeyError(key)
+
+        del self._extra[key]
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            try:
+                return getattr(self, key)
+
+            except AttributeError:
+                raise KeyError(key) from None
+
+        if self._extra is None:
+            raise KeyError(key)
+
+        return self._extra[key]
+
+    def __iter__(self):
+        for fieldName in self.FIELDS:
+            if hasattr(self, fieldName):
+                yield fieldName
+
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        count = 0
+        for fieldName in self.FIELDS:
+            if hasattr(self, fieldName):
+                count += 1
+        if self._extra is not None:
+            count += len(self._extra)
+        return count
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+            return
+
+        if self._extra is None:
+            self._extra = {}
+        if isinstance(key, str):
+            key = sys.intern(key)
+        self._extra[key] = value
@@ -0,0 +1,228 @@
+"""Provide a publish/subscribe class for model change events.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import traceback
+from collections import deque
+from collections import namedtuple
+from datetime import datetime
+
+ModelEvent = namedtuple('ModelEvent', ['kind', 'node', 'field', 'sender'])
+# kind: str -- One of the ModelEventBus event kinds.
+# node: str -- Tree node ID of the element concerned; '' for the project; None for any element.
+# field: str -- Name of the changed element attribute; None for any attribute.
+# sender: object -- The publishing instance, so subscribers can ignore their own changes.
+
+
+class ModelEventBus:
+    """Publish/subscribe hub for changes of the novel.
+
+    Publishers announce the changes they make to the model.
+    The events are collected, and delivered when the application is idle,
+    so a burst of changes produces a single notification per subscriber.
+    Identical events are delivered only once.
+    Between begin_batch() and end_batch(), the delivery is held back.
+    Exceptions raised by subscribers are logged, and do not stop the delivery to the others.
+
+    Public methods:
+        begin_batch() -- Hold back the delivery until the matching end_batch() call.
+        discard() -- Drop the pending events.
+        end_batch() -- End a batch; schedule the delivery of the collected events.
+        flush() -- Deliver the pending events to the subscribers.
+        publish(kind, node, field=None, sender=None) -- Announce a model change.
+        publish_fallback(sender=None) -- Announce a change of the whole project, unless the changes are announced otherwise.
+        subscribe(callback, kinds=None, immediate=False) -- Register a callback for model change events.
+        unsubscribe(callback) -- Remove a registered callback.
+
+    Public instance variables:
+        errorLog: deque -- Messages of the latest exceptions raised by subscribers.
+
+    Public class constants:
+        ELEMENT_ADDED: str -- Event kind: An element has been added.
+        ELEMENT_REMOVED: str -- Event kind: An element has been removed.
+        ELEMENT_MOVED: str -- Event kind: An element has been moved to another position.
+        FIELD_CHANGED: str -- Event kind: An element attribute has been changed.
+        ERROR_LOG_SIZE: int -- Number of latest exceptions logged.
+        PART_PREFIX: str -- Node ID prefix of parts.
+        CHAPTER_PREFIX: str -- Node ID prefix of chapters.
+        SCENE_PREFIX: str -- Node ID prefix of scenes.
+        CHARACTER_PREFIX: str -- Node ID prefix of characters.
+        LOCATION_PREFIX: str -- Node ID prefix of locations.
+        ITEM_PREFIX: str -- Node ID prefix of items.
+        PRJ_NOTE_PREFIX: str -- Node ID prefix of project notes.
+        NODE_COLLECTIONS: dict -- key: node ID prefix, value: name of the Novel's element dictionary.
+
+    A node ID is the element ID with the prefix of the element type, e.g. "sc1" for scene 1.
+    """
+    ELEMENT_ADDED = 'added'
+    ELEMENT_REMOVED = 'removed'
+    ELEMENT_MOVED = 'moved'
+    FIELD_CHANGED = 'changed'
+    ERROR_LOG_SIZE = 20
+    PART_PREFIX = 'pt'
+    CHAPTER_PREFIX = 'ch'
+    SCENE_PREFIX = 'sc'
+    CHARACTER_PREFIX = 'cr'
+    LOCATION_PREFIX = 'lc'
+    ITEM_PREFIX = 'it'
+    PRJ_NOTE_PREFIX = 'pn'
+    NODE_COLLECTIONS = {
+        PART_PREFIX: 'chapters',
+        CHAPTER_PREFIX: 'chapters',
+        SCENE_PREFIX: 'scenes',
+        CHARACTER_PREFIX: 'characters',
+        LOCATION_PREFIX: 'locations',
+        ITEM_PREFIX: 'items',
+        PRJ_NOTE_PREFIX: 'projectNotes',
+        }
+
+    def __init__(self, schedule=None):
+        """Set the scheduler for the delivery.
+
+        Optional arguments:
+            schedule -- Function that calls its argument when the application is idle,
+                        e.g. the after_idle() method of the tk root window.
+                        If None, the events are delivered immediately.
+        """
+        self._schedule = schedule
+        self._subscribers = []
+        # list of (callback, kinds) tuples
+        self._immediateSubscribers = []
+        # list of (callback, kinds) tuples; called on publishing
+        self._pending = {}
+        # ordered set of ModelEvent instances; the values are not used
+        self._batchDepth = 0
+        self._isScheduled = False
+        self._isDelivering = False
+        self._fallbackEvent = None
+        # ModelEvent instance to be delivered, if no other events are pending
+        self.errorLog = deque(maxlen=self.ERROR_LOG_SIZE)
+
+    def begin_batch(self):
+        """Hold back the delivery until the matching end_batch() call.
+
+        Batches can be nested.
+        """
+        self._batchDepth += 1
+
+    def discard(self):
+        """Drop the pending events, e.g. when the project is closed."""
+        self._pending = {}
+        self._fallbackEvent = None
+
+    def end_batch(self):
+        """End a batch; schedule the delivery of the collected events."""
+        self._batchDepth = max(0, self._batchDepth - 1)
+        self._request_delivery()
+
+    def flush(self):
+        """Deliver the pending events to the subscribers.
+
+        Each subscriber's callback is called once with the list of events of the kinds it subscribed to.
+        """
+        self._isScheduled = False
+        if self._batchDepth:
+            return
+
+        fallbackEvent = self._fallbackEvent
+        self._fallbackEvent = None
+        if not self._pending:
+            if fallbackEvent is None:
+                return
+
+            self._notify_immediate_subscribers(fallbackEvent)
+            self._pending[fallbackEvent] = None
+        events = list(self._pending)
+        self._pending = {}
+        self._isDelivering = True
+        try:
+            for callback, kinds in list(self._subscribers):
+                if kinds is None:
+                    selectedEvents = events
+                else:
+                    selectedEvents = [event for event in events if event.kind in kinds]
+                if selectedEvents:
+                    try:
+                        callback(selectedEvents)
+                    except Exception as ex:
+                        self.errorLog.append(
+                            f'{datetime.now().replace(microsecond=0).isoformat(" ")} {getattr(callback, "__qualname__", callback)}: {str(ex)}\n{traceback.format_exc()}'
+                            )
+        finally:
+            self._isDelivering = False
+
+    def publish(self, kind, node, field=None, sender=None):
+        """Announce a model change.
+
+        Positional arguments:
+            kind: str -- One of the event kinds defined by the class constants.
+            node: str -- Tree node ID of the element concerned; '' for the project; None for any element.
+
+        Optional arguments:
+            field: str -- Name of the changed element attribute; None for any attribute.
+            sender: object -- The publishing instance.
+        """
+        event = ModelEvent(kind, node, field, sender)
+        self._notify_immediate_subscribers(event)
+        self._pending[event] = None
+        self._request_delivery()
+
+    def publish_fallback(self, sender=None):
+        """Announce a change of the whole project, unless the changes are announced otherwise.
+
+        Optional arguments:
+            sender: object -- The publishing instance.
+
+        This is for code that changes the model without publishing the changes, e.g. older plugins
+        that just set the application's isModified flag, or update the project structure.
+        A FIELD_CHANGED event without node is delivered, if no other events are pending at the delivery.
+        Of several calls before the delivery, the first one's sender is kept.
+        Calls by subscribers during the delivery are ignored, because they follow announced changes.
+        """
+        if self._isDelivering or self._fallbackEvent is not None:
+            return
+
+        self._fallbackEvent = ModelEvent(self.FIELD_CHANGED, None, None, sender)
+        self._request_delivery()
+
+    def subscribe(self, callback, kinds=None, immediate=False):
+        """Register a callback for model change events.
+
+        Positional arguments:
+            callback -- Function to be called with a list of ModelEvent instances.
+
+        Optional arguments:
+            kinds: tuple -- Event kinds to be notified of; if None, all kinds.
+            immediate: bool -- If True, call back on publishing, with a single event, even within a batch.
+                              This is for subscribers that must not be out of date, e.g. caches.
+        """
+        if immediate:
+            self._immediateSubscribers.append((callback, kinds))
+        else:
+            self._subscribers.append((callback, kinds))
+
+    def unsubscribe(self, callback):
+        """Remove a registered callback.
+
+        Positional arguments:
+            callback -- Function registered by subscribe().
+        """
+        self._subscribers = [subscriber for subscriber in self._subscribers if subscriber[0] != callback]
+        self._immediateSubscribers = [subscriber for subscriber in self._immediateSubscribers if subscriber[0] != callback]
+
+    def _notify_immediate_subscribers(self, event):
+        for callback, kinds in self._immediateSubscribers:
+            if kinds is None or event.kind in kinds:
+                callback([event])
+
+    def _request_delivery(self):
+        if self._batchDepth or self._isScheduled or not (self._pending or self._fallbackEvent):
+            return
+
+        if self._schedule is None:
+            self.flush()
+        else:
+            self._isScheduled = True
+            self._schedule(self.flush)
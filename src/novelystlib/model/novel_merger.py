@@ -0,0 +1,219 @@
+"""Provide a class for merging external changes into the novelyst model.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import hashlib
+from collections.abc import Mapping
+from novelystlib.model.element_state import get_element_state
+
+
+class NovelMerger:
+    """Three-way merger for Novel instances, based on per-element content hashes.
+
+    The "base" is the state of the project file when it was last read or written.
+    The "local" model may have unsaved changes.
+    The "remote" model has been read from the file after it was changed externally.
+
+    Public methods:
+        get_hashes(novel) -- Return a dictionary with the content hashes of all novel elements.
+        merge(localNovel, remoteNovel, baseHashes) -- Apply remote changes to the local novel.
+
+    Public instance variables:
+        changed: dict -- key: collection name, value: set of IDs of elements taken from remote.
+        conflicts: list of (collection name, ID) tuples -- elements changed both locally and remotely.
+
+    Public class constants:
+        COLLECTIONS: tuple -- Names of the Novel's element dictionaries.
+        SORTED_LISTS: tuple -- Names of the Novel's sort order lists.
+        NOVEL_KEY: str -- Pseudo collection name for the novel's own attributes.
+
+    Elements that have been changed only externally are taken from the remote model.
+    Elements that have been changed both locally and externally are kept as they are,
+    and reported as conflicts.
+    Elements taken from the remote model that are missing in a kept sort order list
+    are appended to it, so they are not orphaned.
+    """
+    COLLECTIONS = ('chapters', 'scenes', 'characters', 'locations', 'items', 'projectNotes')
+    SORTED_LISTS = ('srtChapters', 'srtCharacters', 'srtLocations', 'srtItems', 'srtPrjNotes')
+    NOVEL_KEY = 'novel'
+    _SORTED_LIST_OF = dict(
+        chapters='srtChapters',
+        characters='srtCharacters',
+        locations='srtLocations',
+        items='srtItems',
+        projectNotes='srtPrjNotes',
+        )
+
+    def __init__(self):
+        self.changed = {}
+        self.conflicts = []
+
+    @classmethod
+    def get_hashes(cls, novel):
+        """Return a dictionary with the content hashes of all novel elements.
+
+        Positional arguments:
+            novel: Novel -- The novel to hash.
+
+        Keys are (collection name, ID) tuples.
+        The sort order lists and the novel's own attributes have a None ID.
+        Empty attributes and fields are not hashed, so an element created in memory
+        has the same hash as after writing and reading it,
+        although the reader sets e.g. False instead of None, or [] instead of None.
+        """
+        hashes = {}
+        for collection in cls.COLLECTIONS:
+            elements = getattr(novel, collection)
+            for elemId in elements:
+                hashes[(collection, elemId)] = cls._hash_state(elements[elemId])
+        for srtList in cls.SORTED_LISTS:
+            hashes[(srtList, None)] = cls._hash_value(getattr(novel, srtList))
+        hashes[(cls.NOVEL_KEY, None)] = cls._hash_value(cls._get_novel_attributes(novel))
+        return hashes
+
+    def merge(self, localNovel, remoteNovel, baseHashes):
+        """Apply remote changes to the local novel.
+
+        Positional arguments:
+            localNovel: Novel -- The in-memory novel, possibly with unsaved changes.
+            remoteNovel: Novel -- The novel as read from the changed file.
+            baseHashes: dict -- Element hashes of the file when last read or written.
+
+        Return True if any remote change has been applied.
+        """
+        self.changed = {}
+        self.conflicts = []
+        localHashes = self.get_hashes(localNovel)
+        remoteHashes = self.get_hashes(remoteNovel)
+        for key in set(baseHashes) | set(localHashes) | set(remoteHashes):
+            baseHash = baseHashes.get(key, None)
+            localHash = localHashes.get(key, None)
+            remoteHash = remoteHashes.get(key, None)
+            if remoteHash == baseHash or remoteHash == localHash:
+                # no external change, or the same change on both sides
+                continue
+
+            if localHash != baseHash:
+                self.conflicts.append(key)
+                continue
+
+            collection, elemId = key
+            if collection == self.NOVEL_KEY:
+                for attribute, value in self._get_novel_attributes(remoteNovel).items():
+                    setattr(localNovel, attribute, value)
+            elif elemId is None:
+                setattr(localNovel, collection, list(getattr(remoteNovel, collection)))
+            elif remoteHash is None:
+                del getattr(localNovel, collection)[elemId]
+            else:
+                getattr(localNovel, collection)[elemId] = getattr(remoteNovel, collection)[elemId]
+            self.changed.setdefault(collection, set()).add(elemId)
+        self._attach_remote_elements(localNovel, remoteNovel, baseHashes)
+        self._repair_references(localNovel)
+        return bool(self.changed)
+
+    def _attach_remote_elements(self, localNovel, remoteNovel, baseHashes):
+        """Add the elements taken from remote to the kept sort order lists they are missing in.
+
+        This is necessary if a sort order list with a conflicting local change refers to an element added remotely.
+        Scenes are appended to the chapter they belong to remotely.
+        If this chapter does not exist locally, a scene added remotely is removed again,
+        and reported as a conflict.
+        """
+        for collection in self._SORTED_LIST_OF:
+            if not collection in self.changed:
+                continue
+
+            srtList = getattr(localNovel, self._SORTED_LIST_OF[collection])
+            listedIds = set(srtList)
+            for elemId in getattr(remoteNovel, self._SORTED_LIST_OF[collection]):
+                if elemId in self.changed[collection] and elemId in getattr(localNovel, collection) and not elemId in listedIds:
+                    srtList.append(elemId)
+
+        if not 'scenes' in self.changed:
+            return
+
+        assignedScenes = set()
+        for chId in localNovel.chapters:
+            assignedScenes.update(localNovel.chapters[chId].srtScenes)
+        for chId in remoteNovel.chapters:
+            for scId in remoteNovel.chapters[chId].srtScenes:
+                if not scId in self.changed['scenes'] or not scId in localNovel.scenes or scId in assignedScenes:
+                    continue
+
+                if chId in localNovel.chapters:
+                    localNovel.chapters[chId].srtScenes.append(scId)
+                    assignedScenes.add(scId)
+                elif not ('scenes', scId) in baseHashes:
+                    del localNovel.scenes[scId]
+                    self.changed['scenes'].discard(scId)
+                    self.conflicts.append(('scenes', scId))
+        if not self.changed['scenes']:
+            del self.changed['scenes']
+
+    @classmethod
+    def _get_novel_attributes(cls, novel):
+        """Return a dictionary with the novel's attributes, except the element collections."""
+        attributes = dict(vars(novel))
+        for name in cls.COLLECTIONS + cls.SORTED_LISTS:
+            attributes.pop(name, None)
+        return attributes
+
+    @classmethod
+    def _hash_state(cls, element):
+        """Return a content hash of an element's instance variables, including slots."""
+        return cls._hash_value(get_element_state(element))
+
+    @classmethod
+    def _hash_value(cls, value):
+        # The binary digest takes less memory than the hex digest, and is only compared.
+        return hashlib.blake2b(repr(cls._normalize(value)).encode('utf-8'), digest_size=16).digest()
+
+    @classmethod
+    def _normalize(cls, value):
+        """Return a representation that does not depend on the insertion order of mappings.
+
+        Mapping entries with empty values are omitted.
+        """
+        if isinstance(value, Mapping):
+            items = ((key, cls._normalize(value[key])) for key in value)
+            return tuple(sorted(item for item in items if not cls._is_empty(item[1])))
+
+        if isinstance(value, (list, tuple)):
+            return tuple(cls._normalize(item) for item in value)
+
+        return value
+
+    @staticmethod
+    def _is_empty(value):
+        """Return True if a normalized value is None, False, or an empty string or tuple."""
+        if value is None or value is False:
+            return True
+
+        if isinstance(value, (str, tuple)):
+            return not value
+
+        return False
+
+    def _repair_references(self, novel):
+        """Remove references to elements that have been deleted externally.
+
+        This is necessary if conflicting local elements refer to deleted remote ones.
+        """
+        for chId in novel.chapters:
+            novel.chapters[chId].srtScenes = [scId for scId in novel.chapters[chId].srtScenes if scId in novel.scenes]
+        novel.srtChapters = [chId for chId in novel.srtChapters if chId in novel.chapters]
+        novel.srtCharacters = [crId for crId in novel.srtCharacters if crId in novel.characters]
+        novel.srtLocations = [lcId for lcId in novel.srtLocations if lcId in novel.locations]
+        novel.srtItems = [itId for itId in novel.srtItems if itId in novel.items]
+        novel.srtPrjNotes = [pnId for pnId in novel.srtPrjNotes if pnId in novel.projectNotes]
+        for scId in novel.scenes:
+            scene = novel.scenes[scId]
+            if scene.characters:
+                scene.characters = [crId for crId in scene.characters if crId in novel.characters]
+            if scene.locations:
+                scene.locations = [lcId for lcId in scene.locations if lcId in novel.locations]
+            if scene.items:
+                scene.items = [itId for itId in scene.items if itId in novel.items]
@@ -0,0 +1,304 @@
+"""Provide a class for a columnar mirror of the scene metadata.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import operator
+from array import array
+from itertools import accumulate
+from itertools import compress
+from itertools import repeat
+
+_numpy = []
+# the NumPy module, or None if not installed; empty until a large project needs it
+
+
+def _get_numpy():
+    """Return the NumPy module, or None if not installed; import it on the first call."""
+    if not _numpy:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy.append(numpy)
+    return _numpy[0]
+
+
+class SceneColumns:
+    """Scene metadata stored column by column, for fast aggregates.
+
+    The columns hold one entry per scene, in reading order.
+    Scenes not assigned to a chapter follow at the end.
+    Aggregates are computed by whole-column operations:
+    with NumPy arrays, if NumPy is installed and the project has at least
+    NUMPY_THRESHOLD scenes, otherwise with the array module and the
+    C-implemented iteration tools. NumPy is imported on first use, because
+    importing it takes longer than the aggregates of a smaller project.
+    Results are kept, because the instance reflects the model at the time it was built.
+    When the model changes, a new instance must be built.
+
+    Public methods:
+        count_words() -- Return a tuple of word count totals.
+        get_counts() -- Return a tuple with total numbers.
+        get_positions() -- Return the word count positions of the scenes and chapters.
+        get_scene_groups(attribute) -- Return the IDs of the "normal" scenes to be exported, grouped by status or mode.
+        get_status_counts() -- Return a list with word count totals depending of scene status.
+        get_viewpoint_words() -- Return the word counts of the "normal" scenes per viewpoint character.
+
+    Public instance variables:
+        sceneIds: list -- Scene IDs, in column order.
+        chapterIds: list -- Chapter IDs, in reading order.
+        usesNumpy: bool -- True, if the columns are NumPy arrays.
+
+    Public class constants:
+        NUMPY_THRESHOLD: int -- Minimum number of scenes for using NumPy.
+    """
+    NUMPY_THRESHOLD = 5000
+
+    def __init__(self, novel):
+        """Build the columns from the novel.
+
+        Positional arguments:
+            novel: Novel -- The novel to mirror.
+        """
+        self.sceneIds = []
+        self.chapterIds = list(novel.srtChapters)
+        if len(novel.scenes) >= self.NUMPY_THRESHOLD:
+            self._np = _get_numpy()
+        else:
+            self._np = None
+        self.usesNumpy = self._np is not None
+        self._results = {}
+        # key: method name, value: result
+        self._viewpoints = []
+        # viewpoint character IDs; index: viewpoint column value
+        scTypes = []
+        statuses = []
+        scnModes = []
+        wordCounts = []
+        doNotExports = []
+        viewpoints = []
+        chapterTypes = []
+        inTrash = []
+        viewpointIndex = {}
+        chTypes = []
+        chLevels = []
+        self._chapterStarts = []
+        # column index of each chapter's first scene
+
+        def add_scene(scId, chType, isTrash):
+            scene = novel.scenes[scId]
+            self.sceneIds.append(scId)
+            scTypes.append(-1 if scene.scType is None else scene.scType)
+            statuses.append(scene.status or 0)
+            try:
+                scnModes.append(int(scene.scnMode))
+            except (TypeError, ValueError):
+                scnModes.append(-1)
+            wordCounts.append(scene.wordCount or 0)
+            doNotExports.append(bool(scene.doNotExport))
+            if scene.characters:
+                crId = scene.characters[0]
+                viewpoints.append(viewpointIndex.setdefault(crId, len(viewpointIndex)))
+            else:
+                viewpoints.append(-1)
+            chapterTypes.append(chType)
+            inTrash.append(isTrash)
+
+        assignedScenes = set()
+        for chId in self.chapterIds:
+            chapter = novel.chapters[chId]
+            chType = -1 if chapter.chType is None else chapter.chType
+            chTypes.append(chType)
+            chLevels.append(chapter.chLevel or 0)
+            self._chapterStarts.append(len(self.sceneIds))
+            for scId in chapter.srtScenes:
+                add_scene(scId, chType, bool(chapter.isTrash))
+                assignedScenes.add(scId)
+        self._sceneCount = len(self.sceneIds)
+        # number of scenes in reading order, without the unassigned ones
+        for scId in novel.scenes:
+            if not scId in assignedScenes:
+                add_scene(scId, -1, True)
+        self._viewpoints = list(viewpointIndex)
+
+        self._scType = self._make_column('b', scTypes)
+        self._status = self._make_column('b', statuses)
+        self._scnMode = self._make_column('b', scnModes)
+        self._wordCount = self._make_column('q', wordCounts)
+        self._doNotExport = self._make_column('b', doNotExports)
+        self._viewpoint = self._make_column('l', viewpoints)
+        self._chapterType = self._make_column('b', chapterTypes)
+        self._inTrash = self._make_column('b', inTrash)
+        self._chType = self._make_column('b', chTypes)
+        self._chLevel = self._make_column('b', chLevels)
+
+    def count_words(self):
+        """Return a tuple of word count totals.
+
+        count: int -- Total words of "normal" type scenes.
+        totalCount: int -- Total words of "normal" and "unused" scenes.
+        """
+        result = self._results.get('count_words', None)
+        if result is None:
+            exported = self._and(self._equal(self._inTrash, 0), self._equal(self._doNotExport, 0))
+            isNormal = self._equal(self._scType, 0)
+            totalCount = self._sum(self._wordCount, self._and(exported, self._or(isNormal, self._equal(self._scType, 3))))
+            count = self._sum(self._wordCount, self._and(exported, isNormal))
+            result = self._results['count_words'] = (count, totalCount)
+        return result
+
+    def get_counts(self):
+        """Return a tuple with total numbers:
+
+        Total number of words in "normal" scenes,
+        Total number of used "normal" scenes,
+        Total number of used "normal" chapters,
+        Total number of used "normal" parts.
+        """
+        result = self._results.get('get_counts', None)
+        if result is None:
+            isUsed = self._and(self._equal(self._chapterType, 0), self._get_normal_exported())
+            normalChapters = self._equal(self._chType, 0)
+            partCount = self._count(self._and(normalChapters, self._equal(self._chLevel, 1)))
+            chapterCount = self._count(normalChapters) - partCount
+            result = self._results['get_counts'] = (self._sum(self._wordCount, isUsed), self._count(isUsed), chapterCount, partCount)
+        return result
+
+    def get_positions(self):
+        """Return the word count positions of the scenes and chapters.
+
+        Return a tuple of two dicts; key: scene/chapter ID, value: number of words before the scene/chapter.
+        The words of the "normal" scenes to be exported are counted, in reading order.
+        """
+        result = self._results.get('get_positions', None)
+        if result is None:
+            counted = self._get_normal_exported()
+            if self.usesNumpy:
+                starts = [0]
+                starts.extend(self._np.cumsum(self._wordCount * counted).tolist())
+            else:
+                starts = [0]
+                starts.extend(accumulate(map(operator.mul, self._wordCount, counted)))
+            # starts[i] is the number of words before the scene at column index i.
+            scenePositions = dict(zip(self.sceneIds[:self._sceneCount], starts))
+            chapterPositions = {chId: starts[index] for chId, index in zip(self.chapterIds, self._chapterStarts)}
+            result = self._results['get_positions'] = (scenePositions, chapterPositions)
+        return result
+
+    def get_scene_groups(self, attribute):
+        """Return the IDs of the "normal" scenes to be exported, grouped by status or mode.
+
+        Positional arguments:
+            attribute: str -- 'status' or 'scnMode'.
+
+        Return a dict; key: status or mode, value: list of scene IDs in reading order.
+        Scenes not assigned to a chapter are missing. Scenes without a valid mode are grouped under -1.
+        """
+        key = f'get_scene_groups {attribute}'
+        result = self._results.get(key, None)
+        if result is None:
+            if attribute == 'status':
+                column = self._status
+            else:
+                column = self._scnMode
+            counted = self._get_normal_exported()
+            if self.usesNumpy:
+                column = column.tolist()
+                counted = counted.tolist()
+            result = {}
+            for scId, value in compress(zip(self.sceneIds[:self._sceneCount], column), counted):
+                result.setdefault(value, []).append(scId)
+            self._results[key] = result
+        return result
+
+    def get_status_counts(self):
+        """Return a list with word count totals depending of scene status.
+
+        Position 0 -- None
+        Position 1 -- Total number of words in "outline" scenes
+        Position 2 -- Total number of words in "draft" scenes
+        Position 3 -- Total number of words in "1st Edit" scenes
+        Position 4 -- Total number of words in "2nd Edit" scenes
+        Position 5 -- Total number of words in "Done" scenes
+        """
+        result = self._results.get('get_status_counts', None)
+        if result is None:
+            normalExported = self._get_normal_exported()
+            result = [None]
+            for status in range(1, 6):
+                result.append(self._sum(self._wordCount, self._and(normalExported, self._equal(self._status, status))))
+            self._results['get_status_counts'] = result
+        return list(result)
+
+    def get_viewpoint_words(self):
+        """Return the word counts of the "normal" scenes per viewpoint character.
+
+        Return a dict; key: character ID, value: total words of the scenes to be exported.
+        Characters without such scenes are missing.
+        """
+        result = self._results.get('get_viewpoint_words', None)
+        if result is None:
+            counted = self._get_normal_exported()
+            if self.usesNumpy:
+                hasViewpoint = self._viewpoint >= 0
+                totals = self._np.bincount(
+                    self._viewpoint[hasViewpoint],
+                    weights=(self._wordCount * counted)[hasViewpoint],
+                    minlength=len(self._viewpoints),
+                    ).tolist()
+            else:
+                totals = [0] * len(self._viewpoints)
+                for viewpoint, wordCount in compress(zip(self._viewpoint, self._wordCount), counted):
+                    if viewpoint >= 0:
+                        totals[viewpoint] += wordCount
+            result = {}
+            for crId, wordCount in zip(self._viewpoints, totals):
+                if wordCount > 0:
+                    result[crId] = int(wordCount)
+            self._results['get_viewpoint_words'] = result
+        return result
+
+    def _and(self, mask1, mask2):
+        if self.usesNumpy:
+            return mask1 & mask2
+
+        return bytes(map(operator.and_, mask1, mask2))
+
+    def _count(self, mask):
+        if self.usesNumpy:
+            return int(self._np.count_nonzero(mask))
+
+        return sum(mask)
+
+    def _equal(self, column, value):
+        if self.usesNumpy:
+            return column == value
+
+        return bytes(map(operator.eq, column, repeat(value)))
+
+    def _get_normal_exported(self):
+        """Return the mask of the "normal" scenes to be exported."""
+        mask = self._results.get('_get_normal_exported', None)
+        if mask is None:
+            mask = self._results['_get_normal_exported'] = self._and(self._equal(self._scType, 0), self._equal(self._doNotExport, 0))
+        return mask
+
+    def _make_column(self, typecode, values):
+        if self.usesNumpy:
+            return self._np.array(values, dtype=typecode)
+
+        return array(typecode, values)
+
+    def _or(self, mask1, mask2):
+        if self.usesNumpy:
+            return mask1 | mask2
+
+        return bytes(map(operator.or_, mask1, mask2))
+
+    def _sum(self, column, mask):
+        if self.usesNumpy:
+            return int(column[mask].sum())
+
+        return sum(compress(column, mask))
@@ -0,0 +1,325 @@
+"""Provide a class for a full-text search index of the novel.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import re
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+
+
+class SearchIndex:
+    """Inverted index over the texts of the novel elements.
+
+    A document is a text field of a novel element, identified by a
+    (collection name, element ID, field name) tuple.
+    For each word, the index holds the documents containing it, and the word positions.
+    Words are case-insensitive; yWriter markup is not indexed.
+
+    Public methods:
+        build(novel) -- Index all texts of the novel.
+        get_text(docKey) -- Return the indexed text of a document.
+        refresh(novel) -- Reindex the texts that have changed, and remove deleted elements.
+        refresh_elements(novel, elementKeys) -- Reindex the texts of the given elements that have changed.
+        search(query) -- Return a list of the document keys matching the query.
+
+    Public instance variables:
+        wordCount: int -- Number of indexed words.
+
+    Public class constants:
+        FIELDS: dict -- key: collection name, value: tuple of the indexed field names.
+
+    Query syntax:
+        All words must occur in a document; their order does not matter.
+        A word ending with "*" matches all words beginning with it.
+        Words enclosed in double quotes must occur as a phrase.
+
+    For fast pickling, the postings are packed into a few arrays.
+    After unpickling, the postings of a word are unpacked on first access.
+    """
+    FIELDS = dict(
+        chapters=('title', 'desc'),
+        scenes=('title', 'desc', 'sceneContent', 'notes', 'goal', 'conflict', 'outcome', 'tags'),
+        characters=('title', 'fullName', 'aka', 'desc', 'bio', 'goals', 'notes', 'tags'),
+        locations=('title', 'aka', 'desc', 'tags'),
+        items=('title', 'aka', 'desc', 'tags'),
+        projectNotes=('title', 'desc'),
+        )
+    _MARKUP = re.compile(r'\[/?(?:i|b|h\d|c|r|s|u|lang=[^\]]*)\]')
+    _WORD = re.compile(r'\w+')
+    _QUERY = re.compile(r'"([^"]*)"?|(\S+)')
+
+    def __init__(self):
+        self.wordCount = 0
+        self._postings = {}
+        # key: word, value: dict (key: document number, value: list of word positions)
+        self._docKeys = []
+        # key: document number, value: document key; None if deleted
+        self._docNumbers = {}
+        # key: document key, value: document number
+        self._docTexts = {}
+        # key: document number, value: indexed text
+        self._packed = {}
+        # key: word, value: (start, end) of the packed postings
+        self._packedPostings = array('l')
+        # for each document: document number, number of positions, positions
+        self._sortedWords = None
+        # for prefix search; built on demand
+
+    def __getstate__(self):
+        """Pack the postings into one array, and return the state for pickling."""
+        packed = {}
+        packedPostings = array('l')
+        for word, (start, end) in self._packed.items():
+            packed[word] = (len(packedPostings), len(packedPostings) + end - start)
+            packedPostings.extend(self._packedPostings[start:end])
+        for word, wordPostings in self._postings.items():
+            start = len(packedPostings)
+            for docNumber, positions in wordPostings.items():
+                packedPostings.append(docNumber)
+                packedPostings.append(len(positions))
+                packedPostings.extend(positions)
+            packed[word] = (start, len(packedPostings))
+        state = dict(vars(self))
+        state['_postings'] = {}
+        state['_packed'] = packed
+        state['_packedPostings'] = packedPostings
+        state['_sortedWords'] = None
+        return state
+
+    def build(self, novel):
+        """Index all texts of the novel.
+
+        Positional arguments:
+            novel: Novel -- The novel to index.
+        """
+        self.__init__()
+        self.refresh(novel)
+
+    def get_text(self, docKey):
+        """Return the indexed text of a document.
+
+        Positional arguments:
+            docKey: tuple -- (collection name, element ID, field name).
+        """
+        return self._docTexts.get(self._docNumbers.get(docKey, None), '')
+
+    def refresh(self, novel):
+        """Reindex the texts that have changed, and remove deleted elements.
+
+        Positional arguments:
+            novel: Novel -- The novel to index.
+
+        Unchanged texts are mostly recognized by identity.
+        Still, all elements are checked; if the changed elements are known, use refresh_elements().
+        Return True if the index has changed.
+        """
+        changed = False
+        for collection in self.FIELDS:
+            elements = getattr(novel, collection)
+            for elemId in list(elements):
+                # The novel may be changed by another thread.
+                if self._refresh_element(collection, elemId, elements.get(elemId, None)):
+                    changed = True
+        for docKey in list(self._docNumbers):
+            collection, elemId, __ = docKey
+            if not elemId in getattr(novel, collection):
+                self._remove_document(self._docNumbers[docKey])
+                changed = True
+        return changed
+
+    def refresh_elements(self, novel, elementKeys):
+        """Reindex the texts of the given elements that have changed; remove deleted elements.
+
+        Positional arguments:
+            novel: Novel -- The novel to index.
+            elementKeys: iterable of (collection name, element ID) tuples.
+
+        Return True if the index has changed.
+        """
+        changed = False
+        for collection, elemId in elementKeys:
+            if self._refresh_element(collection, elemId, getattr(novel, collection).get(elemId, None)):
+                changed = True
+        return changed
+
+    def search(self, query):
+        """Return a list of the document keys matching the query.
+
+        Positional arguments:
+            query: str -- Search terms; see the class docstring for the syntax.
+
+        The documents are listed in the order they were first indexed.
+        """
+        terms = []
+        for match in self._QUERY.finditer(query.casefold()):
+            if match.group(1) is not None:
+                phrase = self._WORD.findall(match.group(1))
+                if phrase:
+                    terms.append(phrase)
+            else:
+                for word in self._WORD.findall(match.group(2)):
+                    terms.append([word])
+                if match.group(2).endswith('*') and terms and len(terms[-1]) == 1:
+                    terms[-1] = [f'{terms[-1][0]}*']
+        if not terms:
+            return []
+
+        hits = None
+        for phrase in terms:
+            if len(phrase) == 1:
+                docs = set(self._get_matching_postings(phrase[0]))
+            else:
+                docs = self._find_phrase(phrase)
+            if hits is None:
+                hits = docs
+            else:
+                hits &= docs
+            if not hits:
+                return []
+
+        return [self._docKeys[docNumber] for docNumber in sorted(hits)]
+
+    def _add_document(self, docKey, text, docNumber=None):
+        """Index a text; reuse the document number of a reindexed document."""
+        if docNumber is None:
+            docNumber = len(self._docKeys)
+            self._docKeys.append(docKey)
+        else:
+            self._docKeys[docNumber] = docKey
+        self._docNumbers[docKey] = docNumber
+        self._docTexts[docNumber] = text
+        positions = defaultdict(list)
+        words = self._split(text)
+        for position, word in enumerate(words):
+            positions[word].append(position)
+        for word in positions:
+            wordPostings = self._get_postings(word)
+            if not wordPostings:
+                self._postings[word] = wordPostings
+                self._sortedWords = None
+            wordPostings[docNumber] = positions[word]
+        self.wordCount += len(words)
+
+    def _find_phrase(self, phrase):
+        """Return a set of the numbers of the documents containing the words in this order."""
+        postings = [self._get_matching_postings(word) for word in phrase]
+        docs = set(postings[0])
+        for wordPostings in postings[1:]:
+            docs &= set(wordPostings)
+        result = set()
+        for docNumber in docs:
+            starts = set(postings[0][docNumber])
+            for offset, wordPostings in enumerate(postings[1:], 1):
+                starts &= {position - offset for position in wordPostings[docNumber]}
+                if not starts:
+                    break
+
+            else:
+                result.add(docNumber)
+        return result
+
+    def _get_matching_postings(self, word):
+        """Return a dictionary with the positions of the word per document.
+
+        A word ending with "*" is a prefix; the positions of all matching words are merged.
+        """
+        if not word.endswith('*'):
+            return self._get_postings(word)
+
+        prefix = word[:-1]
+        if self._sortedWords is None:
+            self._sortedWords = sorted(set(self._postings) | set(self._packed))
+        merged = {}
+        for i in range(bisect_left(self._sortedWords, prefix), len(self._sortedWords)):
+            matchingWord = self._sortedWords[i]
+            if not matchingWord.startswith(prefix):
+                break
+
+            for docNumber, positions in self._get_postings(matchingWord).items():
+                if docNumber in merged:
+                    merged[docNumber] = sorted(merged[docNumber] + positions)
+                else:
+                    merged[docNumber] = positions
+        return merged
+
+    def _get_postings(self, word):
+        """Return a dictionary with the positions of the word per document; unpack it, if necessary.
+
+        Return an empty dictionary if the word is not indexed.
+        """
+        try:
+            return self._postings[word]
+
+        except KeyError:
+            pass
+
+        try:
+            start, end = self._packed.pop(word)
+        except KeyError:
+            return {}
+
+        wordPostings = {}
+        packedPostings = self._packedPostings
+        i = start
+        while i < end:
+            count = packedPostings[i + 1]
+            wordPostings[packedPostings[i]] = packedPostings[i + 2:i + 2 + count].tolist()
+            i += 2 + count
+        self._postings[word] = wordPostings
+        return wordPostings
+
+    def _refresh_element(self, collection, elemId, element):
+        """Reindex the texts of an element that have changed; remove the empty ones.
+
+        Positional arguments:
+            collection: str -- Collection name.
+            elemId: str -- Element ID.
+            element -- The element; None, if deleted.
+
+        Return True if the index has changed.
+        """
+        changed = False
+        for field in self.FIELDS[collection]:
+            text = getattr(element, field, None)
+            if isinstance(text, list):
+                text = ' '.join(text)
+            docKey = (collection, elemId, field)
+            docNumber = self._docNumbers.get(docKey, None)
+            if not text:
+                if docNumber is not None:
+                    self._remove_document(docNumber)
+                    changed = True
+                continue
+
+            if docNumber is not None:
+                oldText = self._docTexts[docNumber]
+                if oldText is text:
+                    continue
+
+                if oldText == text:
+                    self._docTexts[docNumber] = text
+                    # next time, the identity check will do
+                    continue
+
+                self._remove_document(docNumber)
+            self._add_document(docKey, text, docNumber)
+            changed = True
+        return changed
+
+    def _remove_document(self, docNumber):
+        docKey = self._docKeys[docNumber]
+        self._docKeys[docNumber] = None
+        del self._docNumbers[docKey]
+        for word in set(self._split(self._docTexts.pop(docNumber))):
+            wordPostings = self._get_postings(word)
+            self.wordCount -= len(wordPostings.pop(docNumber))
+            if not wordPostings:
+                del self._postings[word]
+                self._sortedWords = None
+
+    def _split(self, text):
+        """Return a list of the words of a text, without markup."""
+        return self._WORD.findall(self._MARKUP.sub(' ', text).casefold())
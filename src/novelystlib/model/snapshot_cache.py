@@ -0,0 +1,130 @@
+"""Provide a class for a persistent cache of processed project data.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import hashlib
+import pickle
+
+
+class SnapshotCache:
+    """Size-bounded cache directory for pickled data derived from project files.
+
+    Each entry belongs to a project file path and a kind of data.
+    It is valid only for the file state (size, modification time, content hash)
+    it was created from.
+    When the total size exceeds the limit, the least recently used entries are deleted.
+
+    Public methods:
+        load(filePath, fileState, kind) -- Return the cached data, or None if not available.
+        save(filePath, fileState, data, kind) -- Store data, and evict the least recently used entries.
+
+    Public instance variables:
+        cacheDir: str -- Path to the cache directory.
+        maxSize: int -- Size limit of the cache directory in bytes.
+
+    Public class constants:
+        FORMAT: int -- Version of the entry format; increment when the cached classes change.
+    """
+    FORMAT = 4
+
+    def __init__(self, cacheDir, maxSize):
+        """Create the cache directory, if missing.
+
+        Positional arguments:
+            cacheDir: str -- Path to the cache directory.
+            maxSize: int -- Size limit of the cache directory in bytes.
+        """
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+        except:
+            pass
+
+    def load(self, filePath, fileState, kind='snapshot'):
+        """Return the cached data, or None if not available.
+
+        Positional arguments:
+            filePath: str -- Path of the project file the data is derived from.
+            fileState: tuple -- (size, modification time, content hash) of the project file.
+
+        Optional arguments:
+            kind: str -- Kind of the data; used as file extension.
+        """
+        entryPath = self._get_entry_path(filePath, kind)
+        try:
+            with open(entryPath, 'rb') as f:
+                if pickle.load(f) != self._get_header(filePath, fileState):
+                    return None
+
+                data = pickle.load(f)
+            os.utime(entryPath)
+            # Mark the entry as recently used.
+        except:
+            return None
+
+        return data
+
+    def save(self, filePath, fileState, data, kind='snapshot'):
+        """Store data, and evict the least recently used entries.
+
+        Positional arguments:
+            filePath: str -- Path of the project file the data is derived from.
+            fileState: tuple -- (size, modification time, content hash) of the project file.
+            data -- Picklable data.
+
+        Optional arguments:
+            kind: str -- Kind of the data; used as file extension.
+
+        Return True on success, otherwise return False.
+        """
+        entryPath = self._get_entry_path(filePath, kind)
+        tempPath = f'{entryPath}.tmp'
+        try:
+            with open(tempPath, 'wb') as f:
+                pickle.dump(self._get_header(filePath, fileState), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tempPath, entryPath)
+        except:
+            try:
+                os.remove(tempPath)
+            except:
+                pass
+            return False
+
+        self._evict()
+        return True
+
+    def _evict(self):
+        """Delete the least recently used entries until the size limit is met."""
+        entries = []
+        totalSize = 0
+        try:
+            for entry in os.scandir(self.cacheDir):
+                if entry.is_file():
+                    entryStat = entry.stat()
+                    entries.append((entryStat.st_mtime, entryStat.st_size, entry.path))
+                    totalSize += entryStat.st_size
+        except:
+            return
+
+        entries.sort()
+        for __, entrySize, entryPath in entries:
+            if totalSize <= self.maxSize:
+                break
+
+            try:
+                os.remove(entryPath)
+                totalSize -= entrySize
+            except:
+                pass
+
+    def _get_entry_path(self, filePath, kind):
+        pathHash = hashlib.blake2b(os.path.normcase(os.path.abspath(filePath)).encode('utf-8'), digest_size=16).hexdigest()
+        return f'{self.cacheDir}/{pathHash}.{kind}'
+
+    def _get_header(self, filePath, fileState):
+        return (self.FORMAT, os.path.normcase(os.path.abspath(filePath)), tuple(fileState))
@@ -0,0 +1,218 @@
+"""Provide a class for project-wide find and replace.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import re
+from bisect import bisect_left
+from pywriter.pywriter_globals import *
+
+MARKUP = re.compile(r'\[.+?\]|^\> ', re.MULTILINE)
+# yWriter markup, as hidden by the contents viewer
+
+
+def replace_text(pattern, replacement, text):
+    """Return a tuple with the new text and the number of replacements.
+
+    Positional arguments:
+        pattern: re.Pattern -- The compiled search pattern.
+        replacement: str -- The replacement template, as for re.sub().
+        text: str -- The text to process.
+
+    Matches that overlap yWriter markup are left unchanged, so the markup stays intact.
+    """
+    spans = [match.span() for match in MARKUP.finditer(text)]
+    starts = [start for start, __ in spans]
+    count = 0
+
+    def replace_match(match):
+        nonlocal count
+        i = bisect_left(starts, match.end()) - 1
+        # the last markup starting before the end of the match
+        if i >= 0 and spans[i][1] > match.start():
+            return match.group(0)
+
+        count += 1
+        return match.expand(replacement)
+
+    newText = pattern.sub(replace_match, text)
+    return newText, count
+
+
+class TextReplacer:
+    """Find and replace text in the whole project.
+
+    A document is a text field of a novel element, identified by a
+    (collection name, element ID, field name) tuple.
+    The field name is either the name of an element attribute,
+    or the name of a custom keyword variable, starting with "Field_".
+    First, find() computes the changes without modifying the novel, for a preview.
+    Then, apply() writes the selected changes into the novel, all or nothing.
+    undo() reverts applied changes, unless the texts have been modified since.
+
+    The documents are processed sequentially: the regular expression engine
+    handles about 40 million characters per second, so a worker pool would cost
+    more time for starting than it saves.
+
+    Public methods:
+        apply(novel, changes) -- Apply the changes to the novel; return a set of (collection name, element ID) tuples.
+        find(novel) -- Return a list of changes without modifying the novel.
+        get_context(change) -- Return the text around the first match of a change.
+        undo(novel, changes) -- Revert applied changes; return a set of (collection name, element ID) tuples.
+
+    Public instance variables:
+        pattern: re.Pattern -- The compiled search pattern.
+
+    Public class constants:
+        FIELDS: dict -- key: collection name, value: tuple of the attribute names to process.
+        KWVAR_EXCLUDED: tuple -- Names of the custom keyword variables holding references, flags, links, or dates.
+    """
+    FIELDS = dict(
+        chapters=('desc',),
+        scenes=('sceneContent', 'desc', 'notes', 'goal', 'conflict', 'outcome', 'field1', 'field2', 'field3', 'field4'),
+        characters=('desc', 'notes', 'bio', 'goals'),
+        locations=('desc',),
+        items=('desc',),
+        projectNotes=('desc',),
+        )
+    KWVAR_EXCLUDED = (
+        'Field_SceneArcs',
+        'Field_SceneAssoc',
+        'Field_CustomAR',
+        'Field_SceneStyle',
+        'Field_SceneMode',
+        'Field_ArcDefinition',
+        'Field_NoNumber',
+        'Field_Link',
+        'Field_BirthDate',
+        'Field_DeathDate',
+        )
+    _CONTEXT_CHARS = 40
+
+    def __init__(self, searchStr, replaceStr, isRegex=False, matchCase=True):
+        """Compile the search pattern.
+
+        Positional arguments:
+            searchStr: str -- The text or regular expression to find.
+            replaceStr: str -- The replacement; may contain group references, if isRegex is True.
+
+        Optional arguments:
+            isRegex: bool -- If True, searchStr is a regular expression.
+            matchCase: bool -- If False, ignore case.
+
+        Raise the "Error" exception, if the regular expression or the replacement is invalid.
+        """
+        flags = re.MULTILINE
+        if not matchCase:
+            flags |= re.IGNORECASE
+        if not searchStr:
+            raise Error(_('Nothing to find'))
+
+        try:
+            if isRegex:
+                self.pattern = re.compile(searchStr, flags)
+                self.pattern.sub(replaceStr, '')
+                # check the replacement template
+                self._replacement = replaceStr
+            else:
+                self.pattern = re.compile(re.escape(searchStr), flags)
+                self._replacement = replaceStr.replace('\\', r'\\')
+        except (re.error, IndexError) as ex:
+            raise Error(f'{_("Invalid regular expression")}: {str(ex)}')
+
+    def apply(self, novel, changes):
+        """Apply the changes to the novel; return a set of (collection name, element ID) tuples.
+
+        Positional arguments:
+            novel: Novel -- The novel to modify.
+            changes: list -- Changes as returned by find().
+
+        If any text has been modified since find(), nothing is changed.
+        Scene word counts are updated only for the scenes changed.
+        Raise the "Error" exception, if the texts have been modified since find().
+        """
+        return self._set_texts(novel, [(docKey, oldText, newText) for docKey, oldText, newText, __ in changes])
+
+    def find(self, novel):
+        """Return a list of changes without modifying the novel.
+
+        Positional arguments:
+            novel: Novel -- The novel to search.
+
+        Each change is a (document key, old text, new text, number of replacements) tuple.
+        """
+        changes = []
+        for collection, fields in self.FIELDS.items():
+            elements = getattr(novel, collection)
+            for elemId in elements:
+                element = elements[elemId]
+                documentFields = list(fields)
+                for field, value in (element.kwVar or {}).items():
+                    if isinstance(value, str) and not field in self.KWVAR_EXCLUDED:
+                        documentFields.append(field)
+                for field in documentFields:
+                    text = self._get_text(element, field)
+                    if text and isinstance(text, str):
+                        newText, count = replace_text(self.pattern, self._replacement, text)
+                        if count:
+                            changes.append(((collection, elemId, field), text, newText, count))
+        return changes
+
+    def get_context(self, change):
+        """Return the text around the first match of a change.
+
+        Positional arguments:
+            change: tuple -- A change as returned by find().
+        """
+        __, oldText, __, __ = change
+        match = self.pattern.search(oldText)
+        if match is None:
+            return ''
+
+        start = max(0, match.start() - self._CONTEXT_CHARS)
+        context = oldText[start:match.end() + self._CONTEXT_CHARS]
+        if start > 0:
+            context = f'...{context}'
+        return ' '.join(context.split())
+
+    def undo(self, novel, changes):
+        """Revert applied changes; return a set of (collection name, element ID) tuples.
+
+        Positional arguments:
+            novel: Novel -- The novel to modify.
+            changes: list -- Changes as passed to apply().
+
+        If any text has been modified since apply(), nothing is changed.
+        Raise the "Error" exception, if the texts have been modified since apply().
+        """
+        return self._set_texts(novel, [(docKey, newText, oldText) for docKey, oldText, newText, __ in changes])
+
+    def _get_text(self, element, field):
+        if field.startswith('Field_'):
+            return (element.kwVar or {}).get(field, None)
+
+        return getattr(element, field, None)
+
+    def _set_texts(self, novel, replacements):
+        """Replace the texts of the documents, all or nothing; return a set of (collection name, element ID) tuples.
+
+        Positional arguments:
+            novel: Novel -- The novel to modify.
+            replacements: list of (document key, expected text, new text) tuples.
+        """
+        for (collection, elemId, field), expectedText, __ in replacements:
+            element = getattr(novel, collection).get(elemId, None)
+            if element is None or self._get_text(element, field) != expectedText:
+                raise Error(_('The project has changed in the meantime. Please search again'))
+
+        touched = set()
+        for (collection, elemId, field), __, newText in replacements:
+            element = getattr(novel, collection)[elemId]
+            if field.startswith('Field_'):
+                element.kwVar[field] = newText
+            else:
+                # Setting the scene content updates the scene's word count.
+                setattr(element, field, newText)
+            touched.add((collection, elemId))
+        return touched
@@ -0,0 +1,326 @@
+"""Provide a class for a chronological index of the scenes.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from bisect import bisect_left
+from bisect import bisect_right
+from bisect import insort
+from datetime import date
+from datetime import time
+from pywriter.model.scene import Scene
+
+
+class TimelineIndex:
+    """Scene start and end times, sorted for fast chronology queries.
+
+    The index covers the "Normal" and "Notes" scenes of the chapters, except the trash.
+    A scene is on the timeline, if it has a date or a day.
+    Times are seconds since midnight of day 0; day 0 is 0001-01-01,
+    so date-based and day-based scenes share one axis, as with "Generate" in the scene view.
+    A missing time means midnight; a missing duration means zero.
+
+    The entries are kept sorted by start time and reading position.
+    When a scene's date, time, or duration changes, update_scene() moves
+    its entry by bisection; the reading order must not have changed.
+    Otherwise, a new index must be built.
+    The tables for the gap and overlap queries are rebuilt in one pass
+    on the first query after a change.
+
+    Two scenes overlap, if one starts before the other ends, or if they start at the same time.
+    A "Normal" scene is out of order, if it starts before the "Normal" scene
+    that precedes it in reading order.
+
+    Public methods:
+        get_chronology() -- Return the IDs of the scenes on the timeline, in chronological order.
+        get_gaps(minLength) -- Return the gaps between the scenes that are longer than minLength.
+        get_out_of_order() -- Return the IDs of the scenes out of order, in reading order.
+        get_overlapping(scId) -- Return the IDs of the scenes overlapping the scene, in chronological order.
+        get_scene_span(scene) -- Return a (start, end, isDate) tuple for a scene; None if not on the timeline.
+        get_span(scId) -- Return the scene's (start, end, isDate) tuple; None if not on the timeline.
+        is_out_of_order(scId) -- Return True if the scene starts before the previous scene in reading order.
+        is_overlapping(scId) -- Return True if the scene overlaps another scene.
+        pop_touched() -- Return and forget the IDs of the scenes whose flags may have changed by updates.
+        update_scene(scId) -- Move the scene's entry after a change of date, time, or duration.
+
+    Public class constants:
+        SCENE_FIELDS: tuple -- Scene attributes the timeline is calculated from.
+        TYPE_FIELDS: tuple -- Element attributes that decide which scenes are on the timeline.
+    """
+    SCENE_FIELDS = ('date', 'time', 'day', 'lastsDays', 'lastsHours', 'lastsMinutes')
+    TYPE_FIELDS = ('scType', 'chType', 'isTrash')
+    _DAY = 86400
+
+    def __init__(self, novel):
+        """Calculate the timeline of all scenes in one pass.
+
+        Positional arguments:
+            novel: Novel -- The novel to index.
+        """
+        self._novel = novel
+        self._readingOrder = []
+        # scene IDs of the covered scenes, in reading order
+        self._readingPos = {}
+        # key: scene ID, value: index in _readingOrder
+        self._spans = {}
+        # key: scene ID, value: (start, end, isDate) tuple
+        self._entries = []
+        # sorted list of (start, reading position) tuples of the scenes on the timeline
+        self._narrative = []
+        # sorted list of the reading positions of the "Normal" scenes on the timeline
+        self._outOfOrder = set()
+        self._touched = set()
+        self._isFresh = False
+        self._chronology = None
+        self._prefixMaxEnd = None
+        # prefixMaxEnd[i] is the latest end of the entries up to index i.
+        self._gaps = None
+        # sorted list of (length, scene ID before, scene ID after) tuples
+        self._gapLengths = None
+        self._overlapping = None
+
+        for chId in novel.srtChapters:
+            if novel.chapters[chId].isTrash:
+                continue
+
+            for scId in novel.chapters[chId].srtScenes:
+                if novel.scenes[scId].scType in (2, 3):
+                    continue
+
+                pos = len(self._readingOrder)
+                self._readingOrder.append(scId)
+                self._readingPos[scId] = pos
+                span = self.get_scene_span(novel.scenes[scId])
+                if span is not None:
+                    self._spans[scId] = span
+                    self._entries.append((span[0], pos))
+                    if self._is_narrative(scId):
+                        self._narrative.append(pos)
+        self._entries.sort()
+        previousStart = None
+        for pos in self._narrative:
+            start = self._spans[self._readingOrder[pos]][0]
+            if previousStart is not None and start < previousStart:
+                self._outOfOrder.add(self._readingOrder[pos])
+            previousStart = start
+
+    def get_chronology(self):
+        """Return the IDs of the scenes on the timeline, in chronological order.
+
+        Scenes starting at the same time are in reading order.
+        """
+        self._refresh()
+        return list(self._chronology)
+
+    def get_gaps(self, minLength):
+        """Return the gaps between the scenes that are longer than minLength.
+
+        Positional arguments:
+            minLength: int -- Minimum gap length in seconds.
+
+        Return a list of (length, scene ID before, scene ID after) tuples, the longest gap first.
+        The scene before the gap is the one that ends last.
+        """
+        self._refresh()
+        gaps = self._gaps[bisect_right(self._gapLengths, minLength):]
+        gaps.reverse()
+        return gaps
+
+    def get_out_of_order(self):
+        """Return the IDs of the scenes out of order, in reading order."""
+        return sorted(self._outOfOrder, key=self._readingPos.get)
+
+    def get_overlapping(self, scId):
+        """Return the IDs of the scenes overlapping the scene, in chronological order.
+
+        Positional arguments:
+            scId: str -- Scene ID.
+        """
+        span = self._spans.get(scId, None)
+        if span is None:
+            return []
+
+        self._refresh()
+        start, end, __ = span
+        index = bisect_left(self._entries, (start, self._readingPos[scId]))
+        overlapping = []
+
+        # Earlier entries overlap, if they end after the start.
+        # Scanning stops where the latest end so far is not after the start.
+        i = index - 1
+        while i >= 0 and (self._prefixMaxEnd[i] > start or self._entries[i][0] == start):
+            otherId = self._chronology[i]
+            if self._spans[otherId][1] > start or self._entries[i][0] == start:
+                overlapping.append(otherId)
+            i -= 1
+        overlapping.reverse()
+
+        # Later entries overlap, if they start before the end.
+        i = index + 1
+        while i < len(self._entries) and (self._entries[i][0] < end or self._entries[i][0] == start):
+            overlapping.append(self._chronology[i])
+            i += 1
+        return overlapping
+
+    @classmethod
+    def get_scene_span(cls, scene):
+        """Return a (start, end, isDate) tuple for a scene; None if not on the timeline.
+
+        Positional arguments:
+            scene: Scene -- The scene to calculate.
+
+        start, end: int -- Seconds since midnight of day 0.
+        isDate: bool -- True, if the scene has a date rather than a day.
+        """
+        if scene.date and scene.date != Scene.NULL_DATE:
+            try:
+                days = date.fromisoformat(scene.date).toordinal() - 1
+            except ValueError:
+                return None
+
+            isDate = True
+        else:
+            try:
+                days = int(scene.day)
+            except (TypeError, ValueError):
+                return None
+
+            isDate = False
+        start = days * cls._DAY
+        if scene.time:
+            try:
+                startTime = time.fromisoformat(scene.time)
+            except ValueError:
+                pass
+            else:
+                start += startTime.hour * 3600 + startTime.minute * 60 + startTime.second
+        duration = 0
+        for value, factor in ((scene.lastsDays, cls._DAY), (scene.lastsHours, 3600), (scene.lastsMinutes, 60)):
+            try:
+                duration += int(value) * factor
+            except (TypeError, ValueError):
+                pass
+        return start, start + max(0, duration), isDate
+
+    def get_span(self, scId):
+        """Return the scene's (start, end, isDate) tuple; None if not on the timeline.
+
+        Positional arguments:
+            scId: str -- Scene ID.
+        """
+        return self._spans.get(scId, None)
+
+    def is_out_of_order(self, scId):
+        """Return True if the scene starts before the previous scene in reading order.
+
+        Positional arguments:
+            scId: str -- Scene ID.
+        """
+        return scId in self._outOfOrder
+
+    def is_overlapping(self, scId):
+        """Return True if the scene overlaps another scene.
+
+        Positional arguments:
+            scId: str -- Scene ID.
+        """
+        self._refresh()
+        return scId in self._overlapping
+
+    def pop_touched(self):
+        """Return and forget the IDs of the scenes whose flags may have changed by updates."""
+        touched = self._touched
+        self._touched = set()
+        return touched
+
+    def update_scene(self, scId):
+        """Move the scene's entry after a change of date, time, or duration.
+
+        Positional arguments:
+            scId: str -- Scene ID.
+
+        Return a set with the IDs of the scenes whose flags may have changed.
+        """
+        pos = self._readingPos.get(scId, None)
+        if pos is None:
+            return set()
+
+        oldSpan = self._spans.get(scId, None)
+        newSpan = self.get_scene_span(self._novel.scenes[scId])
+        if newSpan == oldSpan:
+            return set()
+
+        isNarrative = self._is_narrative(scId)
+        touched = {scId}
+        if oldSpan is not None:
+            touched.update(self.get_overlapping(scId))
+            del self._entries[bisect_left(self._entries, (oldSpan[0], pos))]
+            del self._spans[scId]
+            if isNarrative:
+                del self._narrative[bisect_left(self._narrative, pos)]
+        if newSpan is not None:
+            self._spans[scId] = newSpan
+            insort(self._entries, (newSpan[0], pos))
+            if isNarrative:
+                insort(self._narrative, pos)
+        self._isFresh = False
+        touched.update(self.get_overlapping(scId))
+
+        # A change of the start affects the order flags of the scene and the next one.
+        if isNarrative:
+            self._outOfOrder.discard(scId)
+            if newSpan is not None:
+                self._check_order(pos)
+            i = bisect_right(self._narrative, pos)
+            if i < len(self._narrative):
+                self._check_order(self._narrative[i])
+                touched.add(self._readingOrder[self._narrative[i]])
+        self._touched.update(touched)
+        return touched
+
+    def _check_order(self, pos):
+        """Set the order flag of the "Normal" scene at the reading position."""
+        scId = self._readingOrder[pos]
+        i = bisect_left(self._narrative, pos)
+        if i > 0 and self._spans[scId][0] < self._spans[self._readingOrder[self._narrative[i - 1]]][0]:
+            self._outOfOrder.add(scId)
+        else:
+            self._outOfOrder.discard(scId)
+
+    def _is_narrative(self, scId):
+        return not self._novel.scenes[scId].scType
+
+    def _refresh(self):
+        """Rebuild the tables for the gap and overlap queries, if out of date."""
+        if self._isFresh:
+            return
+
+        self._chronology = [self._readingOrder[pos] for __, pos in self._entries]
+        self._prefixMaxEnd = []
+        self._gaps = []
+        self._overlapping = set()
+        maxEnd = None
+        maxEndId = None
+        previousStart = None
+        previousEnd = None
+        previousId = None
+        for scId in self._chronology:
+            start, end, __ = self._spans[scId]
+            if maxEnd is not None:
+                if start < previousEnd or start == previousStart:
+                    self._overlapping.add(previousId)
+                if start < maxEnd or start == previousStart:
+                    self._overlapping.add(scId)
+                elif start > maxEnd:
+                    self._gaps.append((start - maxEnd, maxEndId, scId))
+            if maxEnd is None or end > maxEnd:
+                maxEnd = end
+                maxEndId = scId
+            self._prefixMaxEnd.append(maxEnd)
+            previousStart = start
+            previousEnd = end
+            previousId = scId
+        self._gaps.sort()
+        self._gapLengths = [gap[0] for gap in self._gaps]
+        self._isFresh = True
@@ -0,0 +1,313 @@
+"""Provide classes for the word count log time series.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from collections.abc import MutableMapping
+from collections.abc import Sequence
+from datetime import date
+import xml.etree.ElementTree as ET
+
+
+class WcLog(MutableMapping):
+    """Daily word count log, stored as a compact time series.
+
+    Dates are stored as ordinals, and counts as integers, in parallel arrays sorted by date.
+    For compatibility, a WcLog behaves like the dictionary used before:
+    keys are ISO-formatted dates (YYYY-MM-DD), values are [count, total count] lists of strings.
+    The values are WcLogEntry views, so assigning an item of a value changes the log.
+
+    Public methods:
+        aggregate(period) -- Return a list of (ISO start date, count, total count, words written) tuples per week or month.
+        downsample(maxPoints) -- Return a list of at most maxPoints (ISO date, count, total count) tuples for plotting.
+        get_count(wcDate) -- Return a (count, total count) tuple as of a date, or None if not logged before.
+        get_range(startDate, endDate) -- Return a list of (ISO date, count, total count) tuples within the date range.
+        get_words_written(startDate, endDate) -- Return the words written within the date range.
+        latest() -- Return the latest (ISO date, count, total count) tuple, or None if the log is empty.
+        read_xml(xmlWcLog) -- Add the entries of a yWriter WCLog XML element.
+        write_xml(xmlRoot, discardUnchanged) -- Add a yWriter WCLog XML element.
+
+    Public instance variables:
+        dates: array of int -- Date ordinals, ascending; not to be modified directly.
+        counts: array of int -- Word counts of "normal" type scenes; not to be modified directly.
+        totalCounts: array of int -- Word counts of all scenes; not to be modified directly.
+
+    Dates can be passed as ISO-formatted strings, as datetime.date instances, or as ordinals.
+    """
+
+    def __init__(self, entries=None):
+        """Initialize the arrays.
+
+        Optional arguments:
+            entries -- Mapping or iterable of (date, [count, total count]) pairs.
+        """
+        self.dates = array('l')
+        self.counts = array('l')
+        self.totalCounts = array('l')
+        if entries:
+            self.update(entries)
+
+    def __delitem__(self, wcDate):
+        i = self._find(wcDate)
+        del self.dates[i]
+        del self.counts[i]
+        del self.totalCounts[i]
+
+    def __getitem__(self, wcDate):
+        return WcLogEntry(self, self.dates[self._find(wcDate)])
+
+    def __iter__(self):
+        for ordinal in self.dates:
+            yield date.fromordinal(ordinal).isoformat()
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({dict(self)})'
+
+    def __setitem__(self, wcDate, wc):
+        ordinal = self._to_ordinal(wcDate)
+        count = int(wc[0])
+        totalCount = int(wc[1])
+        i = bisect_left(self.dates, ordinal)
+        if i < len(self.dates) and self.dates[i] == ordinal:
+            self.counts[i] = count
+            self.totalCounts[i] = totalCount
+        else:
+            self.dates.insert(i, ordinal)
+            self.counts.insert(i, count)
+            self.totalCounts.insert(i, totalCount)
+
+    def aggregate(self, period='week'):
+        """Return a list of (ISO start date, count, total count, words written) tuples per week or month.
+
+        Optional arguments:
+            period: str -- 'week' (starting on Monday) or 'month'.
+
+        Count and total count are the latest values within the period.
+        Words written is the count difference to the previous period;
+        for the first period, it is the difference to the first entry.
+        Periods without entries are omitted.
+        """
+        result = []
+        previousCount = None
+        for i, ordinal in enumerate(self.dates):
+            day = date.fromordinal(ordinal)
+            if period == 'month':
+                periodStart = day.replace(day=1)
+            else:
+                periodStart = date.fromordinal(ordinal - day.weekday())
+            if previousCount is None:
+                previousCount = self.counts[i]
+            if result and result[-1][0] == periodStart:
+                result[-1][1] = self.counts[i]
+                result[-1][2] = self.totalCounts[i]
+            else:
+                if result:
+                    previousCount = result[-1][1]
+                result.append([periodStart, self.counts[i], self.totalCounts[i], previousCount])
+        return [(periodStart.isoformat(), count, totalCount, count - previousCount) for periodStart, count, totalCount, previousCount in result]
+
+    def downsample(self, maxPoints):
+        """Return a list of at most maxPoints (ISO date, count, total count) tuples for plotting.
+
+        Positional arguments:
+            maxPoints: int -- Maximum number of points, at least 2.
+
+        The series is divided into equal date intervals; the latest entry of each interval is kept.
+        The first and the latest entries are always included.
+        """
+        if len(self.dates) <= maxPoints:
+            return self.get_range()
+
+        first = self.dates[0]
+        last = self.dates[-1]
+        intervals = maxPoints - 1
+        indexes = [0]
+        for n in range(1, intervals + 1):
+            i = bisect_right(self.dates, first + (last - first) * n // intervals) - 1
+            if i > indexes[-1]:
+                indexes.append(i)
+        return [(date.fromordinal(self.dates[i]).isoformat(), self.counts[i], self.totalCounts[i]) for i in indexes]
+
+    def get_count(self, wcDate):
+        """Return a (count, total count) tuple as of a date, or None if not logged before.
+
+        Positional arguments:
+            wcDate -- The date; the latest entry on or before this date applies.
+        """
+        i = bisect_right(self.dates, self._to_ordinal(wcDate)) - 1
+        if i < 0:
+            return None
+
+        return self.counts[i], self.totalCounts[i]
+
+    def get_range(self, startDate=None, endDate=None):
+        """Return a list of (ISO date, count, total count) tuples within the date range.
+
+        Optional arguments:
+            startDate -- First date of the range; if None, start with the first entry.
+            endDate -- Last date of the range; if None, end with the latest entry.
+        """
+        if startDate is None:
+            start = 0
+        else:
+            start = bisect_left(self.dates, self._to_ordinal(startDate))
+        if endDate is None:
+            end = len(self.dates)
+        else:
+            end = bisect_right(self.dates, self._to_ordinal(endDate))
+        return [(date.fromordinal(self.dates[i]).isoformat(), self.counts[i], self.totalCounts[i]) for i in range(start, end)]
+
+    def get_words_written(self, startDate, endDate=None, actualCount=None):
+        """Return the words written within the date range.
+
+        Positional arguments:
+            startDate -- First date of the range.
+
+        Optional arguments:
+            endDate -- Last date of the range; if None, end with the latest entry.
+            actualCount: int -- If not None, used instead of the count at the end of the range.
+
+        The words written are the difference of the "normal" type scene word counts.
+        Return None, if the log is empty.
+        """
+        if not self.dates:
+            return None
+
+        before = self.get_count(self._to_ordinal(startDate) - 1)
+        if before is None:
+            startCount = self.counts[0]
+        else:
+            startCount = before[0]
+        if actualCount is not None:
+            endCount = actualCount
+        elif endDate is None:
+            endCount = self.counts[-1]
+        else:
+            after = self.get_count(endDate)
+            if after is None:
+                return 0
+
+            endCount = after[0]
+        return endCount - startCount
+
+    def latest(self):
+        """Return the latest (ISO date, count, total count) tuple, or None if the log is empty."""
+        if not self.dates:
+            return None
+
+        return date.fromordinal(self.dates[-1]).isoformat(), self.counts[-1], self.totalCounts[-1]
+
+    def read_xml(self, xmlWcLog):
+        """Add the entries of a yWriter WCLog XML element.
+
+        Positional arguments:
+            xmlWcLog -- The WCLog element.
+
+        Entries with invalid dates or counts are skipped.
+        """
+        for xmlWc in xmlWcLog.iterfind('WC'):
+            try:
+                self[xmlWc.find('Date').text] = [xmlWc.find('Count').text, xmlWc.find('TotalCount').text]
+            except (AttributeError, TypeError, ValueError):
+                pass
+
+    def write_xml(self, xmlRoot, discardUnchanged=False):
+        """Add a yWriter WCLog XML element.
+
+        Positional arguments:
+            xmlRoot -- The parent element.
+
+        Optional arguments:
+            discardUnchanged: bool -- If True, skip entries with unchanged word counts.
+
+        Return the WCLog element.
+        """
+        xmlWcLog = ET.SubElement(xmlRoot, 'WCLog')
+        lastCount = None
+        lastTotalCount = None
+        for ordinal, count, totalCount in zip(self.dates, self.counts, self.totalCounts):
+            if discardUnchanged:
+                if count == lastCount and totalCount == lastTotalCount:
+                    continue
+
+                lastCount = count
+                lastTotalCount = totalCount
+            xmlWc = ET.SubElement(xmlWcLog, 'WC')
+            ET.SubElement(xmlWc, 'Date').text = date.fromordinal(ordinal).isoformat()
+            ET.SubElement(xmlWc, 'Count').text = str(count)
+            ET.SubElement(xmlWc, 'TotalCount').text = str(totalCount)
+        return xmlWcLog
+
+    def _find(self, wcDate):
+        """Return the index of the entry for a date; raise KeyError if not logged."""
+        try:
+            ordinal = self._to_ordinal(wcDate)
+        except (TypeError, ValueError):
+            raise KeyError(wcDate)
+
+        i = bisect_left(self.dates, ordinal)
+        if i == len(self.dates) or self.dates[i] != ordinal:
+            raise KeyError(wcDate)
+
+        return i
+
+    def _to_ordinal(self, wcDate):
+        if isinstance(wcDate, int):
+            return wcDate
+
+        if isinstance(wcDate, date):
+            return wcDate.toordinal()
+
+        return date.fromisoformat(wcDate).toordinal()
+
+
+class WcLogEntry(Sequence):
+    """Write-through view of a word count log entry.
+
+    The entry behaves like the [count, total count] list of strings used before.
+    Assigning an item changes the log.
+    Items cannot be added or removed, because an entry always has two items.
+    Raise KeyError on access, if the entry has been deleted from the log.
+    """
+    __slots__ = ('_wcLog', '_ordinal')
+
+    def __init__(self, wcLog, ordinal):
+        """Set the log and the date of the entry.
+
+        Positional arguments:
+            wcLog: WcLog -- The log the entry belongs to.
+            ordinal: int -- The entry's date ordinal.
+        """
+        self._wcLog = wcLog
+        self._ordinal = ordinal
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, WcLogEntry)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __getitem__(self, index):
+        i = self._wcLog._find(self._ordinal)
+        return [str(self._wcLog.counts[i]), str(self._wcLog.totalCounts[i])][index]
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __setitem__(self, index, value):
+        wc = list(self)
+        wc[index] = value
+        if len(wc) != 2:
+            raise ValueError('A word count log entry has two items.')
+
+        self._wcLog[self._ordinal] = wc
@@ -5,6 +5,7 @@ For further information see https://github.com/peter88213/novelyst
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 import os
+import sys
 from datetime import datetime
 from datetime import date
 import xml.etree.ElementTree as ET
@@ -12,7 +13,14 @@ from pywriter.pywriter_globals import *
 from pywriter.yw.yw7_file import Yw7File
 from pywriter.yw.xml_indent import indent
 from pywriter.model.id_generator import create_id
-from pywriter.model.chapter import Chapter
+from pywriter.model.novel import Novel
+from novelystlib.model.compact_chapter import CompactChapter
+from novelystlib.model.compact_scene import CompactScene
+from novelystlib.model.file_hash import get_file_hash
+from novelystlib.model.novel_merger import NovelMerger
+from novelystlib.model.scene_columns import SceneColumns
+from novelystlib.model.timeline_index import TimelineIndex
+from novelystlib.model.wc_log import WcLog
 
 
 class WorkFile(Yw7File):
@@ -25,28 +33,44 @@ class WorkFile(Yw7File):
         check_arcs() -- Check and update all relationships relevant for arcs and arc points.
         count_words() -- Return a tuple of word count totals.
         get_counts() -- Return a tuple with total numbers
+        get_scene_columns() -- Return the columnar mirror of the scene metadata.
         get_status_counts() -- Return a list with word count totals depending of scene status.
+        get_timeline() -- Return the chronological index of the scenes.
         has_changed_on_disk() -- Return True if the yw project file has changed since last opened.
         has_lockfile() -- Return True if a project lockfile exists.
+        invalidate_columns() -- Discard the kept scene columns, because the model has changed.
+        invalidate_timeline() -- Discard the kept timeline index, because the scene types or the structure have changed.
         lock() -- Create a project lockfile.
+        merge() -- Read the changed file and merge the external changes into the model.
         read() -- Read file, get custom data, word count log, and timestamp.
         renumber_chapters() -- Modify chapter headings.
         unlock() -- Delete the project lockfile, if any.
-        write() -- Update the word count log, write the file, and update the timestamp.
+        update_timeline(scId) -- Update the kept timeline index after a change of the scene's date, time, or duration.
+        write() -- Update the word count log, write the file, and update the file state.
+        write_snapshot() -- Store the model in the snapshot cache, if it has been read or written since the last snapshot.
 
     Public instance variables:
         timestamp: float -- Time of last file modification (number of seconds since the epoch).
-        wcLog: dict[str, list[str, str]] -- Daily word count logs.
+        fileSize: int -- File size in bytes at last reading/writing.
+        fileHash: str -- Hex digest of the file content at last reading/writing.
+        elementHashes: dict -- Content hashes of the novel elements at last reading/writing; the base for merging external changes.
+        wcLog: WcLog -- Daily word count log; dict-like, with time series queries.
         wcLogUpdate: dict[str, list[str, str]] -- Word counts missing in the log.
+        keepColumns: bool -- If True, the scene columns and the timeline index are kept until invalidated.
     
     Public properties:
         fileDate: str -- ISO-formatted file date/time (YYYY-MM-DD hh:mm:ss).
+        tree: xml.etree.ElementTree -- The project's XML tree; parsed on demand after reading a snapshot.
+        loadedTree: xml.etree.ElementTree -- The project's XML tree, if in memory; None if not parsed yet.
 
     Public class constants:
         PRJ_KWVAR -- List of the names of the project keyword variables.
         CHP_KWVAR -- List of the names of the chapter keyword variables.
         SCN_KWVAR -- List of the names of the scene keyword variables.
 
+    Public class variables:
+        snapshotCache: SnapshotCache -- Cache for the processed data of unchanged files; None if disabled.
+
     Extends the superclass.
     """
     DESCRIPTION = _('novelyst project')
@@ -74,17 +98,10 @@ class WorkFile(Yw7File):
         'Field_LanguageCode',
         'Field_CountryCode',
         ]
-    CHP_KWVAR = [
-        'Field_NoNumber',
-        'Field_ArcDefinition',
-        ]
-    SCN_KWVAR = [
-        'Field_SceneArcs',
-        'Field_SceneAssoc',
-        'Field_CustomAR',
-        'Field_SceneStyle',  # This is for updating old projects.
-        'Field_SceneMode',
-        ]
+    CHP_KWVAR = list(CompactChapter.KwVar.FIELDS)
+    SCN_KWVAR = list(CompactScene.KwVar.FIELDS)
+
+    snapshotCache = None
 
     def __init__(self, filePath, **kwargs):
         """Initialize instance variables.
@@ -97,10 +114,26 @@ class WorkFile(Yw7File):
         
         Extends the superclass constructor.
         """
+        self._tree = None
+        self._treeSource = None
         super().__init__(filePath)
         self.timestamp = None
-        self.wcLog = {}
+        self.fileSize = None
+        self.fileHash = None
+        self.elementHashes = {}
+        self.wcLog = WcLog()
+        self._statTimestamp = None
+        # mtime of the last check with unchanged content
         self.wcLogUpdate = {}
+        self.keepColumns = False
+        self._sceneColumns = None
+        # SceneColumns instance, if kept
+        self._timeline = None
+        # TimelineIndex instance, if kept
+        self._aggregates = {}
+        # key: SceneColumns method name, value: result restored from the snapshot
+        self._snapshotPending = False
+        # True if the file has been read or written, and the snapshot is not stored yet
 
     @property
     def fileDate(self):
@@ -109,6 +142,32 @@ class WorkFile(Yw7File):
         else:
             return _('Never')
 
+    @property
+    def tree(self):
+        if self._tree is None and self._treeSource is not None:
+            # The model was read from a snapshot, so the XML tree is needed for the first time.
+            try:
+                self._tree = ET.parse(self._treeSource)
+            except:
+                raise Error(f'{_("Can not process file")}: "{norm_path(self._treeSource)}".')
+            self._treeSource = None
+        return self._tree
+
+    @tree.setter
+    def tree(self, newTree):
+        self._tree = newTree
+        self._treeSource = None
+
+    @property
+    def loadedTree(self):
+        """Return the project's XML tree without parsing it; None if not parsed yet.
+
+        Unlike the tree property, this does not parse the project file
+        when the model was read from a snapshot.
+        Used for measuring the memory, which must not load the tree itself.
+        """
+        return self._tree
+
     def adjust_scene_types(self):
         """Make sure that nodes with non-"Normal" parents inherit the type.
         
@@ -129,6 +188,9 @@ class WorkFile(Yw7File):
                     if self.novel.scenes[scId].scType != self.novel.chapters[chId].chType:
                         self.novel.scenes[scId].scType = self.novel.chapters[chId].chType
                         isModified = True
+        if isModified:
+            self.invalidate_columns()
+            self.invalidate_timeline()
         return isModified
 
     def check_arcs(self, addChapters=False):
@@ -224,7 +286,7 @@ class WorkFile(Yw7File):
                         if not partCreated:
                             # Create a "To do" part for the arc definitions.
                             chId = create_id(self.novel.chapters)
-                            self.novel.chapters[chId] = Chapter()
+                            self.novel.chapters[chId] = CompactChapter()
                             self.novel.chapters[chId].title = _('Arcs')
                             self.novel.chapters[chId].chLevel = 1
                             self.novel.chapters[chId].chType = 2
@@ -233,12 +295,10 @@ class WorkFile(Yw7File):
 
                         # Create a "To do" chapter with an arc definition.
                         chId = create_id(self.novel.chapters)
-                        self.novel.chapters[chId] = Chapter()
+                        self.novel.chapters[chId] = CompactChapter()
                         self.novel.chapters[chId].title = f'{scnArc} - {_("Narrative arc")}'
                         self.novel.chapters[chId].chLevel = 0
                         self.novel.chapters[chId].chType = 2
-                        for fieldName in self.CHP_KWVAR:
-                            self.novel.chapters[chId].kwVar[fieldName] = None
                         self.novel.chapters[chId].kwVar['Field_ArcDefinition'] = scnArc
                         self.novel.srtChapters.append(chId)
                         arcs.append(scnArc)
@@ -247,6 +307,8 @@ class WorkFile(Yw7File):
                         # Delete invalid arc assignment.
                         scnArcs.remove(scnArc)
                         self.novel.scenes[scId].scnArcs = list_to_string(scnArcs)
+        if newChapters:
+            self.invalidate_columns()
         return newChapters
 
     def count_words(self):
@@ -255,16 +317,7 @@ class WorkFile(Yw7File):
         count: int -- Total words of "normal" type scenes.
         totalCount: int -- Total words of "normal" and "unused" scenes.
         """
-        count = 0
-        totalCount = 0
-        for chId in self.novel.srtChapters:
-            if not self.novel.chapters[chId].isTrash:
-                for scId in self.novel.chapters[chId].srtScenes:
-                    if self.novel.scenes[scId].scType in (0, 3) and not self.novel.scenes[scId].doNotExport:
-                        totalCount += self.novel.scenes[scId].wordCount
-                        if self.novel.scenes[scId].scType == 0:
-                            count += self.novel.scenes[scId].wordCount
-        return count, totalCount
+        return self._get_aggregate('count_words')
 
     def get_counts(self):
         """Return a tuple with total numbers:
@@ -274,21 +327,20 @@ class WorkFile(Yw7File):
         Total number of used "normal" chapters,
         Total number of used "normal" parts.
         """
-        partCount = 0
-        chapterCount = 0
-        sceneCount = 0
-        wordCount = 0
-        for chId in self.novel.srtChapters:
-            if self.novel.chapters[chId].chType == 0:
-                for scId in self.novel.chapters[chId].srtScenes:
-                    if self.novel.scenes[scId].scType == 0 and not self.novel.scenes[scId].doNotExport:
-                        sceneCount += 1
-                        wordCount += self.novel.scenes[scId].wordCount
-                if self.novel.chapters[chId].chLevel == 1:
-                    partCount += 1
-                else:
-                    chapterCount += 1
-        return wordCount, sceneCount, chapterCount, partCount
+        return self._get_aggregate('get_counts')
+
+    def get_scene_columns(self):
+        """Return the columnar mirror of the scene metadata.
+        
+        The mirror is built from the model, if not kept from a previous call.
+        """
+        if self._sceneColumns is not None:
+            return self._sceneColumns
+
+        sceneColumns = SceneColumns(self.novel)
+        if self.keepColumns:
+            self._sceneColumns = sceneColumns
+        return sceneColumns
 
     def get_status_counts(self):
         """Return a list with word count totals depending of scene status.
@@ -300,21 +352,43 @@ class WorkFile(Yw7File):
         Position 4 -- Total number of words in "2nd Edit" scenes
         Position 5 -- Total number of words in "Done" scenes
         """
-        counts = [None, 0, 0, 0, 0, 0]
-        for scId in self.novel.scenes:
-            if self.novel.scenes[scId].scType == 0 and not self.novel.scenes[scId].doNotExport:
-                if self.novel.scenes[scId].status is not None:
-                    counts[self.novel.scenes[scId].status] += self.novel.scenes[scId].wordCount
-        return counts
+        return self._get_aggregate('get_status_counts')
+
+    def get_timeline(self):
+        """Return the chronological index of the scenes.
+        
+        The index is built from the model, if not kept from a previous call.
+        """
+        if self._timeline is not None:
+            return self._timeline
+
+        timeline = TimelineIndex(self.novel)
+        if self.keepColumns:
+            self._timeline = timeline
+        return timeline
 
     def has_changed_on_disk(self):
-        """Return True if the yw project file has changed since last opened."""
+        """Return True if the yw project file has changed since last opened.
+        
+        Compare size and modification time first, which is cheap. 
+        If the modification time differs, but the size doesn't, compare the content hash.
+        Thus a file that has been touched or copied back unchanged is not reported.
+        """
         try:
-            if self.timestamp != os.path.getmtime(self.filePath):
+            fileStat = os.stat(self.filePath)
+            if fileStat.st_size != self.fileSize:
                 return True
-            else:
+
+            if fileStat.st_mtime in (self.timestamp, self._statTimestamp):
                 return False
 
+            if self.fileHash is None or get_file_hash(self.filePath) != self.fileHash:
+                return True
+
+            # The content is unchanged; avoid hashing again until the next modification.
+            self._statTimestamp = fileStat.st_mtime
+            return False
+
         except:
             # this is for newly created projects
             return False
@@ -326,6 +400,23 @@ class WorkFile(Yw7File):
         # This cannot be done by the constructor,because filePath might change
         return os.path.isfile(lockfilePath)
 
+    def invalidate_columns(self):
+        """Discard the kept scene columns, because the model has changed.
+        
+        Code that changes the scenes or the novel structure calls this,
+        if keepColumns is set.
+        The aggregates restored from the snapshot are discarded as well.
+        """
+        self._sceneColumns = None
+        self._aggregates = {}
+
+    def invalidate_timeline(self):
+        """Discard the kept timeline index, because the scene types or the structure have changed.
+        
+        Changes of the scenes' date, time, or duration are applied with update_timeline() instead.
+        """
+        self._timeline = None
+
     def lock(self):
         """Create a project lockfile."""
         head, tail = self._split_file_path()
@@ -335,44 +426,62 @@ class WorkFile(Yw7File):
             with open(lockfilePath, 'w') as f:
                 f.write('')
 
+    def merge(self):
+        """Read the changed file and merge the external changes into the model.
+        
+        Elements changed only on disk are taken from the file.
+        Elements changed both on disk and in the model are kept, and reported as conflicts.
+        Afterwards, the file state refers to the file on disk.
+        Return a NovelMerger instance holding the changed and conflicting elements.
+        Raise the "Error" exception in case of error. 
+        """
+        remoteFile = WorkFile(self.filePath)
+        remoteFile.novel = Novel()
+        remoteFile.read()
+        merger = NovelMerger()
+        if merger.merge(self.novel, remoteFile.novel, self.elementHashes):
+            self.invalidate_columns()
+            self.invalidate_timeline()
+            self.check_arcs()
+
+        #--- Adopt the file state.
+        self.tree = remoteFile.tree
+        self.wcLog = remoteFile.wcLog
+        for wcDate in remoteFile.wcLogUpdate:
+            self.wcLogUpdate[wcDate] = remoteFile.wcLogUpdate[wcDate]
+        self.timestamp = remoteFile.timestamp
+        self.fileSize = remoteFile.fileSize
+        self.fileHash = remoteFile.fileHash
+        self._statTimestamp = None
+        self.elementHashes = remoteFile.elementHashes
+        self._snapshotPending = remoteFile._snapshotPending
+        return merger
+
     def read(self):
         """Read file, get custom data, word count log, and timestamp.
         
+        If the file is unchanged since it was last read, restore the model from the snapshot cache.
         Extends the superclass method.
         """
-        super().read()
+        #--- Read the file timestamp, size, and content hash.
+        self.invalidate_columns()
+        self.invalidate_timeline()
+        self._get_file_state()
+        if self._read_snapshot():
+            return
 
-        #--- Read the file timestamp.
-        try:
-            self.timestamp = os.path.getmtime(self.filePath)
-        except:
-            self.timestamp = None
+        super().read()
+        self._compact_elements()
 
         #--- Read the word count log.
         root = self.tree.getroot()
         xmlWclog = root.find('WCLog')
         if xmlWclog is not None:
-            for xmlWc in xmlWclog.findall('WC'):
-                wcDate = xmlWc.find('Date').text
-                wcCount = xmlWc.find('Count').text
-                wcTotalCount = xmlWc.find('TotalCount').text
-                self.wcLog[wcDate] = [wcCount, wcTotalCount]
+            self.wcLog.read_xml(xmlWclog)
 
         #--- Keep the actual wordcount, if not logged.
         # Thus the words written with another word processor can be logged on writing.
-        if self.wcLog:
-            actualCountInt, actualTotalCountInt = self.count_words()
-            actualCount = str(actualCountInt)
-            actualTotalCount = str(actualTotalCountInt)
-            latestDate = list(self.wcLog)[-1]
-            latestCount = self.wcLog[latestDate][0]
-            latestTotalCount = self.wcLog[latestDate][1]
-            if actualCount != latestCount or actualTotalCount != latestTotalCount:
-                try:
-                    fileDate = date.fromtimestamp(self.timestamp).isoformat()
-                except:
-                    fileDate = date.today().isoformat()
-                self.wcLogUpdate[fileDate] = [actualCount, actualTotalCount]
+        self.wcLogUpdate.update(self._get_unlogged_count())
 
         #--- Convert field created with novelyst v4.3
         for chId in self.novel.chapters:
@@ -416,6 +525,13 @@ class WorkFile(Yw7File):
 
         #--- If no reasonable looking locale is set, set the system locale.
         self.novel.check_locale()
+        self.invalidate_columns()
+        self.invalidate_timeline()
+
+        #--- Keep the element state for merging external changes.
+        self.elementHashes = NovelMerger.get_hashes(self.novel)
+
+        self._snapshotPending = True
 
     def renumber_chapters(self):
         """Modify chapter headings."""
@@ -512,8 +628,17 @@ class WorkFile(Yw7File):
         except:
             pass
 
+    def update_timeline(self, scId):
+        """Update the kept timeline index after a change of the scene's date, time, or duration.
+        
+        Positional arguments:
+            scId: str -- Scene ID.
+        """
+        if self._timeline is not None:
+            self._timeline.update_scene(scId)
+
     def write(self):
-        """Update the word count log, write the file, and update the timestamp.
+        """Update the word count log, write the file, and update the file state.
         
         Extends the superclass method.
         """
@@ -529,7 +654,21 @@ class WorkFile(Yw7File):
         self.wcLogUpdate = {}
 
         super().write()
-        self.timestamp = os.path.getmtime(self.filePath)
+        self._get_file_state()
+        self.elementHashes = NovelMerger.get_hashes(self.novel)
+        self._snapshotPending = True
+
+    def write_snapshot(self):
+        """Store the model in the snapshot cache, if it has been read or written since the last snapshot.
+
+        The snapshot is not written on reading and writing the file,
+        because pickling a large novel takes time, and it is needed only for reopening.
+        Call this only if the model is unchanged since the file was last read or written,
+        e.g. when closing an unmodified project.
+        """
+        if self._snapshotPending:
+            self._snapshotPending = False
+            self._write_snapshot()
 
     def _build_element_tree(self):
         """Extends the superclass method."""
@@ -541,26 +680,98 @@ class WorkFile(Yw7File):
         if xmlWcLog is not None:
             root.remove(xmlWcLog)
         if self.wcLog:
-            xmlWcLog = ET.SubElement(root, 'WCLog')
-            wcLastCount = None
-            wcLastTotalCount = None
-            for wc in self.wcLog:
-                if self.novel.kwVar.get('Field_SaveWordCount', False):
-                    # Discard entries with unchanged word count.
-                    if self.wcLog[wc][0] == wcLastCount and self.wcLog[wc][1] == wcLastTotalCount:
-                        continue
-
-                    wcLastCount = self.wcLog[wc][0]
-                    wcLastTotalCount = self.wcLog[wc][1]
-                xmlWc = ET.SubElement(xmlWcLog, 'WC')
-                ET.SubElement(xmlWc, 'Date').text = wc
-                ET.SubElement(xmlWc, 'Count').text = self.wcLog[wc][0]
-                ET.SubElement(xmlWc, 'TotalCount').text = self.wcLog[wc][1]
+            # Discard entries with unchanged word count, if logging is enabled.
+            self.wcLog.write_xml(root, discardUnchanged=self.novel.kwVar.get('Field_SaveWordCount', False))
 
         #--- Prepare the XML tree for saving.
         indent(root)
         self.tree = ET.ElementTree(root)
 
+    def _compact_elements(self):
+        """Replace the scenes and chapters read by compact instances, and intern the element IDs.
+
+        Interning makes the IDs in the dictionary keys, the sort order lists,
+        and the element references share their string objects.
+        """
+        self.novel.scenes = {sys.intern(scId): CompactScene.from_scene(scene) for scId, scene in self.novel.scenes.items()}
+        self.novel.chapters = {sys.intern(chId): CompactChapter.from_chapter(chapter) for chId, chapter in self.novel.chapters.items()}
+        for collection in ('characters', 'locations', 'items', 'projectNotes'):
+            elements = getattr(self.novel, collection)
+            setattr(self.novel, collection, {sys.intern(elemId): elements[elemId] for elemId in elements})
+        for srtList in ('srtChapters', 'srtCharacters', 'srtLocations', 'srtItems', 'srtPrjNotes'):
+            setattr(self.novel, srtList, [sys.intern(elemId) for elemId in getattr(self.novel, srtList)])
+
+    def _get_file_state(self):
+        """Store the timestamp, size, and content hash of the project file."""
+        self._statTimestamp = None
+        try:
+            fileStat = os.stat(self.filePath)
+            self.timestamp = fileStat.st_mtime
+            self.fileSize = fileStat.st_size
+            self.fileHash = get_file_hash(self.filePath)
+        except:
+            self.timestamp = None
+            self.fileSize = None
+            self.fileHash = None
+
+    def _get_unlogged_count(self):
+        """Return a dictionary with the actual word count, if it differs from the latest log entry.
+        
+        The entry is dated with the file date.
+        """
+        wcLogUpdate = {}
+        if self.wcLog:
+            actualCountInt, actualTotalCountInt = self.count_words()
+            __, latestCount, latestTotalCount = self.wcLog.latest()
+            if actualCountInt != latestCount or actualTotalCountInt != latestTotalCount:
+                try:
+                    fileDate = date.fromtimestamp(self.timestamp).isoformat()
+                except:
+                    fileDate = date.today().isoformat()
+                wcLogUpdate[fileDate] = [str(actualCountInt), str(actualTotalCountInt)]
+        return wcLogUpdate
+
+    def _read_snapshot(self):
+        """Restore the processed data from the snapshot cache, if available.
+        
+        Return True on success, otherwise return False.
+        """
+        if self.snapshotCache is None or self.fileHash is None:
+            return False
+
+        if self.is_locked():
+            raise Error(f'{_("yWriter seems to be open. Please close first")}.')
+
+        snapshot = self.snapshotCache.load(self.filePath, (self.fileSize, self.timestamp, self.fileHash))
+        if snapshot is None:
+            return False
+
+        # Keep the Novel instance, because it may be referenced by the application.
+        vars(self.novel).clear()
+        vars(self.novel).update(vars(snapshot['novel']))
+        self.wcLog = snapshot['wcLog']
+        self.wcLogUpdate = snapshot['wcLogUpdate']
+        self.elementHashes = snapshot['elementHashes']
+        self._aggregates = snapshot['aggregates']
+        self._snapshotPending = False
+        self._tree = None
+        self._treeSource = self.filePath
+        return True
+
+    def _get_aggregate(self, name):
+        """Return the result of a SceneColumns aggregate method.
+
+        Positional arguments:
+            name: str -- Name of the SceneColumns method.
+
+        The results restored from the snapshot are used only if the scene columns are kept,
+        because then all model changes invalidate them.
+        """
+        if self.keepColumns and name in self._aggregates:
+            return self._aggregates[name]
+
+        return getattr(self.get_scene_columns(), name)()
+
     def _split_file_path(self):
         head, tail = os.path.split(self.filePath)
         if head:
@@ -569,3 +780,25 @@ class WorkFile(Yw7File):
             head = './'
         return head, tail
 
+    def _write_snapshot(self):
+        """Store the processed data in the snapshot cache, if enabled.
+        
+        The data is what reading the file would produce,
+        plus the aggregates displayed when opening the project.
+        """
+        if self.snapshotCache is None or self.fileHash is None:
+            return
+
+        sceneColumns = self.get_scene_columns()
+        snapshot = dict(
+            novel=self.novel,
+            wcLog=self.wcLog,
+            wcLogUpdate=self._get_unlogged_count(),
+            elementHashes=self.elementHashes,
+            aggregates=dict(
+                count_words=sceneColumns.count_words(),
+                get_counts=sceneColumns.get_counts(),
+                get_status_counts=sceneColumns.get_status_counts(),
+                ),
+            )
+        self.snapshotCache.save(self.filePath, (self.fileSize, self.timestamp, self.fileHash), snapshot)
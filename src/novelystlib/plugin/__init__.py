@@ -1,6 +1,7 @@
 """Modules for novelyst plugin management.
 
 Modules:
+lazy_plugin -- Provide a substitute for the Plugin class of a module registered by its manifest.
 plugin_base -- Provide an abstract Plugin base class.
 plugin_collection -- Provide a plugin registry class.
 rejected_plugin -- Provide a substitute for the Plugin class of a rejected module.
@@ -0,0 +1,92 @@
+"""Provide a substitute for the Plugin class of a module registered by its manifest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+
+
+class LazyPlugin:
+    """Substitute for the Plugin class of a module not imported yet.
+
+    The plugin's properties are read from the manifest.
+    The module is imported on the first user action calling a hook listed in the manifest.
+    Hooks not listed are ignored, and so are the hooks triggered by the application
+    as long as the module is not imported: there is nothing to set up or clean up yet.
+    A plugin imported while a project is open gets its menu enabled after installation.
+
+    Public methods:
+        disable_menu() -- Do nothing, because the module is not imported yet.
+        enable_menu() -- Do nothing, because the module is not imported yet.
+        load() -- Import and install the plugin; return the Plugin instance, or None.
+        on_close() -- Do nothing, because the module is not imported yet.
+        on_quit() -- Do nothing, because the module is not imported yet.
+        open_node() -- Import the module and pass on the double-click or Return key.
+
+    Public instance variables:
+        filePath: str -- Location of the installed plugin.
+        isActive: Boolean -- Acceptance flag.
+        isRejected: Boolean --  Rejection flag.
+        VERSION: str -- Version string.
+        NOVELYST_API: str -- API compatibility indicator.
+        DESCRIPTION: str -- Description to be diplayed in the novelyst plugin list.
+        URL: str -- Plugin project homepage URL.
+        hooks: list of str -- Names of the hooks the plugin implements.
+    """
+
+    def __init__(self, plugins, filePath, manifest):
+        """Set the plugin properties from the manifest.
+
+        Positional arguments:
+            plugins -- reference to the PluginCollection instance.
+            filePath: str -- Location of the installed plugin.
+            manifest: dict -- The plugin manifest.
+        """
+        self._plugins = plugins
+        self.filePath = filePath
+        self.isActive = True
+        self.isRejected = False
+        self.VERSION = manifest.get('version', '')
+        self.NOVELYST_API = manifest['novelyst_api']
+        self.DESCRIPTION = manifest.get('description', '')
+        self.URL = manifest.get('url', '')
+        self.hooks = manifest.get('hooks', [])
+
+    def load(self):
+        """Import and install the plugin; return the Plugin instance, or None.
+
+        The loaded plugin replaces this substitute in the plugin collection.
+        If a project is open, the plugin's menu is enabled,
+        because the enable_menu hook was skipped at opening the project.
+        """
+        pluginObject = self._plugins.load_module(self.filePath)
+        if pluginObject is not None and pluginObject.isActive:
+            if 'enable_menu' in self.hooks and self._plugins.isProjectOpen:
+                pluginObject.enable_menu()
+        return pluginObject
+
+    def disable_menu(self):
+        """Do nothing, because the module is not imported yet."""
+        pass
+
+    def enable_menu(self):
+        """Do nothing, because the module is not imported yet.
+        
+        The manifest's menu entries are enabled by the plugin collection.
+        """
+        pass
+
+    def on_close(self):
+        """Do nothing, because the module is not imported yet."""
+        pass
+
+    def on_quit(self):
+        """Do nothing, because the module is not imported yet."""
+        pass
+
+    def open_node(self):
+        """Import the module and pass on the double-click or Return key."""
+        if 'open_node' in self.hooks:
+            pluginObject = self.load()
+            if pluginObject is not None and pluginObject.isActive:
+                pluginObject.open_node()
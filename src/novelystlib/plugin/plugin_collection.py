@@ -7,8 +7,14 @@ License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 import os
 import sys
 import glob
+import json
 import importlib
+import traceback
+from collections import deque
+from datetime import datetime
+from time import perf_counter
 from pywriter.pywriter_globals import *
+from novelystlib.plugin.lazy_plugin import LazyPlugin
 from novelystlib.plugin.rejected_plugin import RejectedPlugin
 
 
@@ -19,20 +25,54 @@ class PluginCollection(dict):
         key: str -- The module name.
         value: object -- The module's Plugin() instance.
     
+    A plugin module may come with a manifest, a JSON file named like the module,
+    with the MANIFEST_EXTENSION instead of ".py". Then the module is registered
+    by its manifest, and imported on first use of its menu entries or hooks.
+    The manifest is an object with the following members:
+        novelyst_api: str -- API compatibility indicator (required).
+        version: str -- Version string.
+        description: str -- Description to be diplayed in the novelyst plugin list.
+        url: str -- Plugin project homepage URL.
+        menu_entries: list -- Objects with the members 
+            menu: str -- Name of the application's menu, e.g. "toolsMenu".
+            label: str -- Menu entry label.
+            command: str -- Name of the Plugin method to call.
+            needs_project: bool -- If true, the entry is disabled when no project is open.
+        hooks: list of str -- Names of the Plugin hook methods to call, e.g. "on_close".
+    The plugin's install() method must not create the menu entries listed in the manifest.
+
     Public instance variables:
         majorVersion: int -- The application's major version number.
         minorVersion: int -- The application's minor version number.    
+        loadTimes: dict -- key: module name, value: time in seconds for loading and installing the plugin.
+        hookTimes: dict -- key: (module name, hook name), value: deque with the durations of the latest calls in seconds.
+        errorLog: dict -- key: module name, value: deque with the messages of the latest exceptions raised by hooks.
+        slowHookThreshold: float -- Duration of a hook call in seconds, above which the hook is reported as slow.
+        isProjectOpen: Boolean -- True between the enable_menu and disable_menu calls.
     
     Public methods:
+        call_hook(moduleName, hook) -- Call a plugin hook, measuring its duration and logging exceptions.
         delete_file(moduleName) -- Remove a module from the file system.
+        get_hook_statistics(moduleName) -- Return the latency statistics of a plugin's hooks.
+        is_slow(moduleName) -- Return True if a plugin hook's average duration exceeds the threshold.
         load_file(filePath) -- Load and register a single plugin.
+        load_manifest(filePath) -- Register a plugin by its manifest, without importing the module.
+        load_module(filePath) -- Load and register a single plugin; return the Plugin instance, or None.
         load_plugins(pluginPath) -- Load and register the plugins.
         disable_menu() -- Disable menu entries when no project is open.
         enable_menu() -- Enable menu entries when a project is open.
         on_quit() -- Perform actions before the application is closed.
         on_close() -- Perform actions before a project is closed.
         open_node() -- Actions on double-clicking on a node or pressing the Return key.
+
+    Public class constants:
+        MANIFEST_EXTENSION: str -- File extension of the plugin manifests.
+        HOOK_STATISTICS_SIZE: int -- Number of latest calls per plugin and hook considered for the statistics.
+        ERROR_LOG_SIZE: int -- Number of latest exceptions logged per plugin.
     """
+    MANIFEST_EXTENSION = '.manifest.json'
+    HOOK_STATISTICS_SIZE = 20
+    ERROR_LOG_SIZE = 20
 
     def __init__(self, ui):
         """Get a reference to the calling controller instance.
@@ -45,6 +85,13 @@ class PluginCollection(dict):
         """
         super().__init__()
         self._ui = ui
+        self.loadTimes = {}
+        self.hookTimes = {}
+        self.errorLog = {}
+        self.slowHookThreshold = 0.2
+        self.isProjectOpen = False
+        self._menuEntries = []
+        # list of (module name, menu, label, needs project) tuples, as registered by manifests
 
         # Get the major and minor version numbers for API compatibility check.
         # The version number is inserted on building the script.
@@ -62,6 +109,34 @@ class PluginCollection(dict):
             self.minorVersion = 45
             self.patchlevel = 0
 
+    def call_hook(self, moduleName, hook):
+        """Call a plugin hook, measuring its duration and logging exceptions.
+        
+        Positional arguments:
+            moduleName -- str: Module name as used as registry key.
+            hook -- str: Name of the Plugin method to call.
+
+        Plugins that do not inherit from PluginBase may lack hooks; these are skipped.
+        If the call takes longer than the threshold, report it on the status bar.
+        """
+        method = getattr(self[moduleName], hook, None)
+        if method is None:
+            return
+
+        startTime = perf_counter()
+        try:
+            method()
+        except Exception as ex:
+            self.errorLog.setdefault(moduleName, deque(maxlen=self.ERROR_LOG_SIZE)).append(
+                f'{datetime.now().replace(microsecond=0).isoformat(" ")} {hook}: {str(ex)}\n{traceback.format_exc()}'
+                )
+            self._ui.set_info_how(f'!{_("Plugin error")}: {moduleName}.{hook}: {str(ex)}')
+        duration = perf_counter() - startTime
+        self.hookTimes.setdefault((moduleName, hook), deque(maxlen=self.HOOK_STATISTICS_SIZE)).append(duration)
+        self._ui.profiler.record('Plugin hooks', f'{moduleName}.{hook}', duration)
+        if duration > self.slowHookThreshold:
+            self._ui.set_info_how(f'!{_("Slow plugin")}: {moduleName}.{hook} ({duration * 1000:.0f} ms)')
+
     def delete_file(self, moduleName):
         """Remove a module from the file system.
         
@@ -75,14 +150,49 @@ class PluginCollection(dict):
             try:
                 if self[moduleName].filePath:
                     if self._ui.ask_yes_no(f'{_("Delete file")} "{self[moduleName].filePath}"?'):
+                        manifestPath = f'{os.path.splitext(self[moduleName].filePath)[0]}{self.MANIFEST_EXTENSION}'
                         os.remove(self[moduleName].filePath)
+                        if os.path.isfile(manifestPath):
+                            os.remove(manifestPath)
                         self[moduleName].filePath = ''
+                        if isinstance(self[moduleName], LazyPlugin):
+                            # The module has not been imported, so it can be removed immediately.
+                            self[moduleName].isActive = False
+                            self._set_menu_state(moduleName, 'disabled')
                         return True
 
             except Exception as ex:
                 print(str(ex))
         return False
 
+    def get_hook_statistics(self, moduleName):
+        """Return the latency statistics of a plugin's hooks.
+        
+        Positional arguments:
+            moduleName -- str: Module name as used as registry key.
+
+        Return a dictionary with 
+            key: str -- The hook name.
+            value: tuple -- (number of calls considered, average duration, maximum duration); durations in seconds.
+        """
+        statistics = {}
+        for (hookModule, hook), durations in self.hookTimes.items():
+            if hookModule == moduleName and durations:
+                statistics[hook] = (len(durations), sum(durations) / len(durations), max(durations))
+        return statistics
+
+    def is_slow(self, moduleName):
+        """Return True if a plugin hook's average duration exceeds the threshold.
+        
+        Positional arguments:
+            moduleName -- str: Module name as used as registry key.
+        """
+        for __, average, __ in self.get_hook_statistics(moduleName).values():
+            if average > self.slowHookThreshold:
+                return True
+
+        return False
+
     def load_file(self, filePath):
         """Load and register a single plugin.
 
@@ -91,23 +201,56 @@ class PluginCollection(dict):
 
         Return True on success, otherwise return False. 
         """
+        return self.load_module(filePath) is not None
+
+    def load_manifest(self, filePath):
+        """Register a plugin by its manifest, without importing the module.
+
+        Positional arguments:
+            filePath -- str: The module's location in the file system. 
+
+        Create the menu entries listed in the manifest.
+        Return True on success, otherwise return False. 
+        """
+        moduleName = os.path.split(filePath)[1][:-3]
+        try:
+            with open(f'{filePath[:-3]}{self.MANIFEST_EXTENSION}', 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            pluginObject = LazyPlugin(self, filePath, manifest)
+            pluginObject.isActive = self._is_compatible(pluginObject.NOVELYST_API)
+            menuEntries = []
+            for entry in manifest.get('menu_entries', []):
+                menu = getattr(self._ui, entry['menu'])
+                menuEntries.append((menu, entry['label'], entry['command'], entry.get('needs_project', False)))
+        except Exception as ex:
+            self[moduleName] = RejectedPlugin(filePath, f'{_("Invalid manifest")}: {str(ex)}')
+            return False
+
+        self[moduleName] = pluginObject
+        if pluginObject.isActive:
+            for menu, label, command, needsProject in menuEntries:
+                menu.add_command(label=label, command=lambda m=moduleName, c=command: self._run_command(m, c))
+                self._menuEntries.append((moduleName, menu, label, needsProject))
+        return True
+
+    def load_module(self, filePath):
+        """Load and register a single plugin; return the Plugin instance, or None.
+
+        Positional arguments:
+            filePath -- str: The module's location in the file system. 
+
+        Record the time for importing and installing the plugin.
+        """
         try:
             moduleName = os.path.split(filePath)[1][:-3]
+            startTime = perf_counter()
 
             # Import the module.
             module = importlib.import_module(moduleName)
 
             # Check API compatibility.
             pluginObject = module.Plugin()
-            apiVerStr = pluginObject.NOVELYST_API
-            majorStr, minorStr = apiVerStr.split('.')
-            apiMajorVersion = int(majorStr)
-            apiMinorVersion = int(minorStr)
-            isCompatible = True
-            if apiMajorVersion != self.majorVersion:
-                isCompatible = False
-            if apiMinorVersion > self.minorVersion:
-                isCompatible = False
+            isCompatible = self._is_compatible(pluginObject.NOVELYST_API)
             if isCompatible:
                 # Install the plugin by calling its constructor substitute.
                 pluginObject.install(self._ui)
@@ -119,20 +262,23 @@ class PluginCollection(dict):
 
             # Register the module.
             self[moduleName] = pluginObject
+            self.loadTimes[moduleName] = perf_counter() - startTime
 
             # Locate the module.
             module.Plugin.filePath = filePath
-            return True
+            return pluginObject
 
         except Exception as ex:
             self[moduleName] = RejectedPlugin(filePath, str(ex))
-            return False
+            self._set_menu_state(moduleName, 'disabled')
+            return None
 
     def load_plugins(self, pluginPath):
         """Load and register the plugins.
         
         Import modules from the "plugin" subdirectory 
         and instantiate their 'Plugin' classes.
+        Modules with a manifest are registered without being imported.
         The objects are stored in the self._plugins collection.
         Return True on success, otherwise return False. 
         """
@@ -147,52 +293,80 @@ class PluginCollection(dict):
         # Load all plugins in the Plugin path.
         sys.path.append(pluginPath)
         for file in glob.iglob(f'{pluginPath}/novelyst_*.py'):
-            self.load_file(file)
+            if os.path.isfile(f'{file[:-3]}{self.MANIFEST_EXTENSION}'):
+                self.load_manifest(file)
+            else:
+                self.load_file(file)
 
         return True
 
     def disable_menu(self):
         """Disable menu entries when no project is open."""
-        for moduleName in self:
-            if self[moduleName].isActive:
-                try:
-                    self[moduleName].disable_menu()
-                except:
-                    pass
+        self.isProjectOpen = False
+        for moduleName, menu, label, needsProject in self._menuEntries:
+            if needsProject:
+                menu.entryconfig(label, state='disabled')
+        self._call_hooks('disable_menu')
 
     def enable_menu(self):
         """Enable menu entries when a project is open."""
-        for moduleName in self:
-            if self[moduleName].isActive:
-                try:
-                    self[moduleName].enable_menu()
-                except:
-                    pass
+        self.isProjectOpen = True
+        for moduleName, menu, label, needsProject in self._menuEntries:
+            if needsProject and self[moduleName].isActive:
+                menu.entryconfig(label, state='normal')
+        self._call_hooks('enable_menu')
 
     def on_quit(self):
         """Perform actions before the application is closed."""
-        for moduleName in self:
-            if self[moduleName].isActive:
-                try:
-                    self[moduleName].on_quit()
-                except:
-                    pass
+        self._call_hooks('on_quit')
 
     def on_close(self):
         """Perform actions before a project is closed."""
-        for moduleName in self:
-            if self[moduleName].isActive:
-                try:
-                    self[moduleName].on_close()
-                except:
-                    pass
+        self._call_hooks('on_close')
 
     def open_node(self, event=None):
         """Actions on double-clicking on a node or pressing the Return key."""
+        self._call_hooks('open_node')
+
+    def _call_hooks(self, hook):
+        """Call a hook of all active plugins."""
         for moduleName in self:
             if self[moduleName].isActive:
+                self.call_hook(moduleName, hook)
+
+    def _is_compatible(self, apiVerStr):
+        """Return True if a plugin with the API version string can be installed.
+        
+        Raise ValueError if the version string is malformed.
+        """
+        majorStr, minorStr = apiVerStr.split('.')
+        apiMajorVersion = int(majorStr)
+        apiMinorVersion = int(minorStr)
+        if apiMajorVersion != self.majorVersion:
+            return False
+
+        if apiMinorVersion > self.minorVersion:
+            return False
+
+        return True
+
+    def _run_command(self, moduleName, command):
+        """Call a Plugin method registered as menu command, importing the module if needed."""
+        pluginObject = self[moduleName]
+        if isinstance(pluginObject, LazyPlugin):
+            pluginObject = pluginObject.load()
+            if pluginObject is None:
+                self._ui.set_info_how(f'!{self[moduleName].DESCRIPTION}')
+                return
+
+        if pluginObject.isActive:
+            getattr(pluginObject, command)()
+
+    def _set_menu_state(self, moduleName, state):
+        """Set the state of the menu entries registered by a module's manifest."""
+        for entryModule, menu, label, __ in self._menuEntries:
+            if entryModule == moduleName:
                 try:
-                    self[moduleName].open_node()
+                    menu.entryconfig(label, state=state)
                 except:
                     pass
-
@@ -1,7 +1,11 @@
 """Modules for novelyst view-controller classes.
 
 Modules:
+event_profiler -- Provide a service class for profiling the GUI event handlers.
+file_watcher -- Provide a service class for watching the project file.
+memory_report -- Provide a service class for reporting the memory used by the loaded project.
 novelyst_tk -- Provide a tkinter GUI framework for novelyst.
+search_indexer -- Provide a service class for the project's full-text search index.
 
 Packages:
 left_frame -- Modules for novelyst left frame view-controller classes.
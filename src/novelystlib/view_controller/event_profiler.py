@@ -0,0 +1,239 @@
+"""Provide a service class for profiling the GUI event handlers.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import io
+import heapq
+import cProfile
+import pstats
+import tkinter as tk
+from datetime import datetime
+from time import perf_counter
+
+
+class EventProfiler:
+    """Measure the tkinter callbacks, and profile the slowest calls.
+
+    When started, all callbacks invoked by Tk are timed:
+    event bindings such as the tree selection, menu commands, variable traces,
+    and scheduled calls. The outermost callback is run under cProfile;
+    the profiles of the slowest calls are kept.
+    Durations measured elsewhere, e.g. of plugin hooks, can be added with record().
+    When stopped, a ranked report and the slowest calls' .prof files
+    are written to the report directory.
+
+    When the profiler is not started, the callbacks are called directly,
+    so there is no overhead.
+
+    Public methods:
+        record(category, name, duration) -- Add a duration measured by the caller.
+        start() -- Start measuring the callbacks.
+        stop() -- Stop measuring, write the report, and return its path.
+
+    Public instance variables:
+        isEnabled: bool -- True, if the callbacks are being measured.
+        reportDir: str -- Directory for the report and the .prof files.
+
+    Public class constants:
+        SLOWEST_CALLS: int -- Number of profiled calls to be kept.
+        WATCHED_FUNCTIONS: tuple -- Names of functions whose cumulative time is reported separately.
+    """
+    SLOWEST_CALLS = 10
+    WATCHED_FUNCTIONS = (
+        'apply_changes',
+        'build_tree',
+        'update_prj_structure',
+        'update_nodes',
+        'view_text',
+        'set_data',
+        )
+    _REPORT_FILE = 'profile_report.txt'
+    _PROFILE_FILE = 'profile_{:02}.prof'
+    _CALLBACK_CATEGORY = 'Event handlers'
+
+    def __init__(self, reportDir):
+        """Initialize instance variables.
+
+        Positional arguments:
+            reportDir: str -- Directory for the report and the .prof files.
+        """
+        self.reportDir = reportDir
+        self.isEnabled = False
+        self._originalCall = None
+        self._depth = 0
+        self._startDate = None
+        self._durations = {}
+        # key: (category, name), value: list of durations
+        self._slowestCalls = []
+        # heap of (duration, sequence number, name, profile)
+        self._sequence = 0
+        self._stats = None
+        # pstats.Stats instance accumulating the profiles of all calls
+
+    def record(self, category, name, duration):
+        """Add a duration measured by the caller.
+
+        Positional arguments:
+            category: str -- Heading of the report section.
+            name: str -- Name of the measured function.
+            duration: float -- Duration in seconds.
+        """
+        if self.isEnabled:
+            self._durations.setdefault((category, name), []).append(duration)
+
+    def start(self):
+        """Start measuring the callbacks.
+
+        The results of a previous run are discarded.
+        """
+        if self.isEnabled:
+            return
+
+        self._durations = {}
+        self._slowestCalls = []
+        self._stats = None
+        self._startDate = datetime.now().replace(microsecond=0)
+        self._originalCall = tk.CallWrapper.__call__
+        profiler = self
+
+        def profiled_call(callWrapper, *args):
+            return profiler._run(callWrapper, *args)
+
+        tk.CallWrapper.__call__ = profiled_call
+        self.isEnabled = True
+
+    def stop(self):
+        """Stop measuring, write the report, and return its path.
+
+        Return None, if the report cannot be written.
+        """
+        if not self.isEnabled:
+            return None
+
+        tk.CallWrapper.__call__ = self._originalCall
+        self.isEnabled = False
+        try:
+            return self._write_report()
+
+        except OSError:
+            return None
+
+    def _get_name(self, function):
+        """Return a readable name of a callback function."""
+        if getattr(function, '__name__', None) == 'callit' and function.__closure__:
+            # Function scheduled by after() or after_idle(): Get the function to call.
+            try:
+                function = function.__closure__[function.__code__.co_freevars.index('func')].cell_contents
+            except (ValueError, IndexError):
+                pass
+        name = getattr(function, '__qualname__', None)
+        if name is None:
+            return repr(function)
+
+        if '<lambda>' in name:
+            name = f'{name} (line {function.__code__.co_firstlineno})'
+        return f'{function.__module__}.{name}'
+
+    def _run(self, callWrapper, *args):
+        """Call a Tk callback, measuring its duration."""
+        if self._depth:
+            # Nested event processing: Time the callback without profiling.
+            startTime = perf_counter()
+            self._depth += 1
+            try:
+                return self._originalCall(callWrapper, *args)
+
+            finally:
+                self._depth -= 1
+                self.record(self._CALLBACK_CATEGORY, self._get_name(callWrapper.func), perf_counter() - startTime)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active.
+            profile = None
+        startTime = perf_counter()
+        self._depth += 1
+        try:
+            return self._originalCall(callWrapper, *args)
+
+        finally:
+            if profile is not None:
+                profile.disable()
+            self._depth -= 1
+            duration = perf_counter() - startTime
+            name = self._get_name(callWrapper.func)
+            self.record(self._CALLBACK_CATEGORY, name, duration)
+            if profile is not None:
+                self._keep_profile(duration, name, profile)
+
+    def _keep_profile(self, duration, name, profile):
+        """Add the profile to the totals, and keep it if the call is one of the slowest."""
+        try:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+        except TypeError:
+            # The profile is empty.
+            return
+
+        self._sequence += 1
+        entry = (duration, self._sequence, name, profile)
+        if len(self._slowestCalls) < self.SLOWEST_CALLS:
+            heapq.heappush(self._slowestCalls, entry)
+        elif duration > self._slowestCalls[0][0]:
+            heapq.heapreplace(self._slowestCalls, entry)
+
+    def _write_report(self):
+        """Write the ranked report and the .prof files; return the report path."""
+        os.makedirs(self.reportDir, exist_ok=True)
+        for entry in os.scandir(self.reportDir):
+            if entry.name.endswith('.prof'):
+                os.remove(entry.path)
+        lines = [
+            'novelyst profiling report',
+            f'{self._startDate.isoformat(sep=" ")} - {datetime.now().replace(microsecond=0).isoformat(sep=" ")}',
+            ]
+
+        #--- Durations by category, ranked by the total time.
+        categories = {}
+        for (category, name), durations in self._durations.items():
+            categories.setdefault(category, []).append((sum(durations), name, durations))
+        for category in sorted(categories):
+            lines.append(f'\n{category}, ranked by total time:')
+            lines.append(f'{"calls":>7} {"total ms":>10} {"mean ms":>9} {"max ms":>9}  name')
+            for total, name, durations in sorted(categories[category], reverse=True):
+                lines.append(f'{len(durations):7} {total * 1000:10.1f} {total * 1000 / len(durations):9.2f} {max(durations) * 1000:9.1f}  {name}')
+
+        #--- Cumulative times of the watched functions.
+        if self._stats is not None:
+            lines.append('\nSelected functions, cumulative time:')
+            lines.append(f'{"calls":>7} {"total ms":>10}  function')
+            watched = []
+            for (fileName, lineNumber, functionName), (__, callCount, __, cumulativeTime, __) in self._stats.stats.items():
+                if functionName in self.WATCHED_FUNCTIONS:
+                    watched.append((cumulativeTime, callCount, f'{os.path.basename(fileName)}:{lineNumber}({functionName})'))
+            for cumulativeTime, callCount, function in sorted(watched, reverse=True):
+                lines.append(f'{callCount:7} {cumulativeTime * 1000:10.1f}  {function}')
+
+        #--- The slowest calls with their profiles.
+        lines.append('\nSlowest calls:')
+        for rank, (duration, __, name, profile) in enumerate(sorted(self._slowestCalls, reverse=True), 1):
+            fileName = self._PROFILE_FILE.format(rank)
+            profile.dump_stats(os.path.join(self.reportDir, fileName))
+            lines.append(f'{rank:3}. {duration * 1000:9.1f} ms  {name}  ({fileName})')
+        if self._slowestCalls:
+            duration, __, name, profile = max(self._slowestCalls)
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(20)
+            lines.append(f'\nProfile of the slowest call ({name}):')
+            lines.append(stream.getvalue())
+        reportPath = os.path.join(self.reportDir, self._REPORT_FILE)
+        with open(reportPath, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+        return reportPath
@@ -0,0 +1,88 @@
+"""Provide a service class for watching the project file.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from threading import Thread
+
+
+class FileWatcher:
+    """Poll the project file and report real changes on disk.
+
+    The check runs in a worker thread, so hashing a large file does not block the GUI.
+    The result is picked up by the next poll in the tkinter main loop.
+    Each change is reported only once, until the file on disk and the
+    project are in sync again.
+
+    Public methods:
+        start(prjFile) -- Start watching a project file.
+        stop() -- Stop watching.
+
+    Public class constants:
+        INTERVAL: int -- Polling interval in milliseconds.
+    """
+    INTERVAL = 2000
+
+    def __init__(self, root, callback):
+        """Initialize instance variables.
+
+        Positional arguments:
+            root -- tk root window providing the event loop.
+            callback -- function to be called without arguments when the file has changed on disk.
+        """
+        self._root = root
+        self._callback = callback
+        self._prjFile = None
+        self._afterId = None
+        self._worker = None
+        self._result = None
+        self._reported = False
+
+    def start(self, prjFile):
+        """Start watching a project file.
+
+        Positional arguments:
+            prjFile: WorkFile -- project file to watch.
+        """
+        self.stop()
+        self._prjFile = prjFile
+        self._reported = False
+        self._afterId = self._root.after(self.INTERVAL, self._poll)
+
+    def stop(self):
+        """Stop watching."""
+        if self._afterId is not None:
+            self._root.after_cancel(self._afterId)
+            self._afterId = None
+        self._prjFile = None
+        self._result = None
+
+    def _check(self, prjFile, state):
+        """Worker thread: Store the check result together with the file state it refers to."""
+        self._result = (prjFile, state, prjFile.has_changed_on_disk())
+
+    def _poll(self):
+        """Pick up the last check result, and start a new check."""
+        self._afterId = None
+        if self._prjFile is None:
+            return
+
+        if self._worker is not None and self._worker.is_alive():
+            self._afterId = self._root.after(self.INTERVAL, self._poll)
+            return
+
+        if self._result is not None:
+            prjFile, state, hasChanged = self._result
+            self._result = None
+            if prjFile is self._prjFile and state == (prjFile.timestamp, prjFile.fileHash):
+                # Discard results overtaken by reading or writing the file.
+                if not hasChanged:
+                    self._reported = False
+                elif not self._reported:
+                    self._reported = True
+                    self._callback()
+        state = (self._prjFile.timestamp, self._prjFile.fileHash)
+        self._worker = Thread(target=self._check, args=(self._prjFile, state), daemon=True)
+        self._worker.start()
+        self._afterId = self._root.after(self.INTERVAL, self._poll)
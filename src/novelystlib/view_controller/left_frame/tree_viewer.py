@@ -8,12 +8,15 @@ import tkinter as tk
 from tkinter import ttk
 import tkinter.font as tkFont
 from pywriter.pywriter_globals import *
-from pywriter.model.chapter import Chapter
 from pywriter.model.scene import Scene
 from pywriter.model.character import Character
 from pywriter.model.world_element import WorldElement
 from pywriter.model.basic_element import BasicElement
 from pywriter.model.id_generator import create_id
+from novelystlib.model.model_event_bus import ModelEventBus
+from novelystlib.model.timeline_index import TimelineIndex
+from novelystlib.model.compact_chapter import CompactChapter
+from novelystlib.model.compact_scene import CompactScene
 from novelystlib.view_controller.left_frame.history_list import HistoryList
 
 
@@ -35,6 +38,7 @@ class TreeViewer(ttk.Frame):
         LC_ROOT -- Root of the Locations branch
         IT_ROOT -- Root of the Items branch
         PN_ROOT -- Root of the Items branch
+        STRUCTURE_FIELDS -- Element attributes whose change may affect other elements
     
     Public methods:
         add_chapter(**kwargs) -- Add a Chapter node to the tree and create an instance.
@@ -47,36 +51,40 @@ class TreeViewer(ttk.Frame):
         add_scene(**kwargs) -- Add a Scene node to the tree and create an instance.
         build_tree() -- Create and display the tree.
         close_children(parent) -- Recursively close children nodes.
-        configure_columns() -- Determine the order of the columnns
+        configure_columns() -- Set up the columns, and display them in the configured order.
         go_back(event) -- Select a node back in the tree browsing history.
         go_forward(event) --  Select a node forward in the tree browsing history.
         go_to_node(node) -- Select and view a node.
         join_scenes() -- Join the selected scene with the previous one.
         next_node(thisNode, root) -- Return the next node ID of the same element type as thisNode.
+        on_model_events(events) -- Redisplay the nodes of elements changed by others.
         on_quit() -- Write column width to the applicaton's keyword arguments.
         open_children(parent) -- Recursively show children nodes.
         prev_node(thisNode, root) -- Return the previous node ID of the same element type as thisNode.
+        rebuild_tree() -- Rebuild the tree, keeping open branches, selection, and scroll position.
+        recolor_scenes() -- Update the scene row colors for the current coloring mode, without rebuilding the tree.
         refresh_tree() -- Display the tree nodes regarding the way they are read from the file.
         reset_tree() -- Clear the displayed tree.
         show_branch(node) -- Go to node and open children.
         show_chapters(parent) -- Open Narrative/Part nodes and close chapter nodes.
+        update_nodes(nodes) -- Redisplay nodes without rebuilding the tree.
         update_prj_structure() -- Iterate the tree and rebuild the sorted lists.
                 
     Public instance variables:
         tree: ttk.Treeview -- The treeview widget to display.
-        columns -- list of tuples (ID, title, width).
+        columns -- list of tuples (ID, title, width), in display order.
         scModeMenu: tk.Menu -- Scene "Mode" submenu.
         scTypeMenu: tk.Menu -- Scene "Type" submenu.
         scStatusMenu: tk.Menu -- Scene "Status" submenu.
         crStatusMenu: tk.Menu -- Character "Status" submenu.        
     """
-    PART_PREFIX = 'pt'
-    CHAPTER_PREFIX = 'ch'
-    SCENE_PREFIX = 'sc'
-    CHARACTER_PREFIX = 'cr'
-    LOCATION_PREFIX = 'lc'
-    ITEM_PREFIX = 'it'
-    PRJ_NOTE_PREFIX = 'pn'
+    PART_PREFIX = ModelEventBus.PART_PREFIX
+    CHAPTER_PREFIX = ModelEventBus.CHAPTER_PREFIX
+    SCENE_PREFIX = ModelEventBus.SCENE_PREFIX
+    CHARACTER_PREFIX = ModelEventBus.CHARACTER_PREFIX
+    LOCATION_PREFIX = ModelEventBus.LOCATION_PREFIX
+    ITEM_PREFIX = ModelEventBus.ITEM_PREFIX
+    PRJ_NOTE_PREFIX = ModelEventBus.PRJ_NOTE_PREFIX
     NV_ROOT = 'nv'
     RS_ROOT = 'rs'
     PL_ROOT = 'pl'
@@ -84,6 +92,7 @@ class TreeViewer(ttk.Frame):
     LC_ROOT = f'wr{LOCATION_PREFIX}'
     IT_ROOT = f'wr{ITEM_PREFIX}'
     PN_ROOT = f'wr{PRJ_NOTE_PREFIX}'
+    STRUCTURE_FIELDS = ('chType', 'chLevel', 'isTrash', 'scType', 'scnArcs', 'kwVar')
 
     _COLUMNS = dict(
         wc=(_('Words'), 'wc_width'),
@@ -94,6 +103,7 @@ class TreeViewer(ttk.Frame):
         dt=(_('Date'), 'date_width'),
         tm=(_('Time'), 'time_width'),
         dr=(_('Duration'), 'duration_width'),
+        tl=(_('Timeline'), 'timeline_width'),
         tg=(_('Tags'), 'tags_width'),
         po=(_('Position'), 'ps_width'),
         ac=(_('Arcs'), 'arcs_width'),
@@ -102,6 +112,14 @@ class TreeViewer(ttk.Frame):
         )
     # Key: column ID
     # Value: (column title, column width)
+    # The node values are in this order; the display order is configurable.
+
+    _COLORING_TAGS = (
+        'Outline', 'Draft', '1st Edit', '2nd Edit', 'Done',
+        'On_schedule', 'Behind_schedule', 'Before_schedule',
+        'mod1', 'mod2', 'mod3', 'mod4', 'mod5',
+        )
+    # Scene row tags set according to the coloring mode.
 
     _KEY_CANCEL_PART = '<Shift-Delete>'
     _KEY_DEMOTE_PART = '<Shift-Right>'
@@ -153,6 +171,9 @@ class TreeViewer(ttk.Frame):
         self._ui = ui
         self._wordsTotal = None
         self._trashNode = None
+        self._colPos = {}
+        self._coloringTable = None
+        # (scene attribute, dict of row tags by attribute value) for the current coloring mode
 
         # Create a novel tree.
         self.tree = ttk.Treeview(self, selectmode='extended')
@@ -308,17 +329,13 @@ class TreeViewer(ttk.Frame):
             parent = selection
         chId = create_id(self._ui.novel.chapters)
         newNode = f'{self.CHAPTER_PREFIX}{chId}'
-        self._ui.novel.chapters[chId] = Chapter()
+        self._ui.novel.chapters[chId] = CompactChapter()
         title = kwargs.get('title', None)
         if title:
             self._ui.novel.chapters[chId].title = title
         else:
             self._ui.novel.chapters[chId].title = f'{_("New Chapter")} (ID{chId})'
         self._ui.novel.chapters[chId].chLevel = 0
-
-        # Initialize custom keyword variables.
-        for fieldName in self._ui.prjFile.CHP_KWVAR:
-            self._ui.novel.chapters[chId].kwVar[fieldName] = None
         self._ui.novel.chapters[chId].kwVar['Field_NoNumber'] = kwargs.get('NoNumber', None)
 
         # Inherit part type, if "Todo" or "Notes".
@@ -332,6 +349,7 @@ class TreeViewer(ttk.Frame):
         self._ui.novel.srtChapters.append(chId)
         title, columns, nodeTags = self._set_chapter_display(chId)
         self.tree.insert(parent, index, newNode, text=title, values=columns, tags=nodeTags)
+        self._ui.modelEvents.publish(ModelEventBus.ELEMENT_ADDED, newNode, sender=self)
         self.update_prj_structure()
         self.refresh_tree()
         self.go_to_node(newNode)
@@ -379,6 +397,7 @@ class TreeViewer(ttk.Frame):
             self._ui.novel.characters[crId].kwVar[fieldName] = None
         title, columns, nodeTags = self._set_character_display(crId)
         self.tree.insert(self.CR_ROOT, index, newNode, text=title, values=columns, tags=nodeTags)
+        self._ui.modelEvents.publish(ModelEventBus.ELEMENT_ADDED, newNode, sender=self)
         self.update_prj_structure()
         self.go_to_node(newNode)
         return crId
@@ -422,6 +441,7 @@ class TreeViewer(ttk.Frame):
             self._ui.novel.items[itId].kwVar[fieldName] = None
         title, columns, nodeTags = self._set_item_display(itId)
         self.tree.insert(self.IT_ROOT, index, newNode, text=title, values=columns, tags=nodeTags)
+        self._ui.modelEvents.publish(ModelEventBus.ELEMENT_ADDED, newNode, sender=self)
         self.update_prj_structure()
         self.go_to_node(newNode)
         return itId
@@ -465,6 +485,7 @@ class TreeViewer(ttk.Frame):
             self._ui.novel.locations[lcId].kwVar[fieldName] = None
         title, columns, nodeTags = self._set_location_display(lcId)
         self.tree.insert(self.LC_ROOT, index, newNode, text=title, values=columns, tags=nodeTags)
+        self._ui.modelEvents.publish(ModelEventBus.ELEMENT_ADDED, newNode, sender=self)
         self.update_prj_structure()
         self.go_to_node(newNode)
         return lcId
@@ -529,17 +550,13 @@ class TreeViewer(ttk.Frame):
             parent = self.RS_ROOT
         chId = create_id(self._ui.novel.chapters)
         newNode = f'{self.PART_PREFIX}{chId}'
-        self._ui.novel.chapters[chId] = Chapter()
+        self._ui.novel.chapters[chId] = CompactChapter()
         title = kwargs.get('title', None)
         if title:
             self._ui.novel.chapters[chId].title = title
         else:
             self._ui.novel.chapters[chId].title = f'{_("New Part")} (ID{chId})'
         self._ui.novel.chapters[chId].chLevel = 1
-
-        # Initialize custom keyword variables.
-        for fieldName in self._ui.prjFile.CHP_KWVAR:
-            self._ui.novel.chapters[chId].kwVar[fieldName] = None
         self._ui.novel.chapters[chId].kwVar['Field_NoNumber'] = kwargs.get('NoNumber', None)
         if parent.startswith(self.PL_ROOT):
             self._ui.novel.chapters[chId].chType = 2
@@ -550,6 +567,7 @@ class TreeViewer(ttk.Frame):
         self._ui.novel.srtChapters.append(chId)
         title, columns, nodeTags = self._set_chapter_display(chId)
         self.tree.insert(parent, index, newNode, text=title, values=columns, tags=nodeTags)
+        self._ui.modelEvents.publish(ModelEventBus.ELEMENT_ADDED, newNode, sender=self)
         self.update_prj_structure()
         self.refresh_tree()
         self.go_to_node(newNode)
@@ -591,6 +609,7 @@ class TreeViewer(ttk.Frame):
 
         title, columns, nodeTags = self._set_prjNote_display(pnId)
         self.tree.insert(self.PN_ROOT, index, newNode, text=title, values=columns, tags=nodeTags)
+        self._ui.modelEvents.publish(ModelEventBus.ELEMENT_ADDED, newNode, sender=self)
         self.update_prj_structure()
         self.go_to_node(newNode)
         return pnId
@@ -633,7 +652,7 @@ class TreeViewer(ttk.Frame):
 
         scId = create_id(self._ui.novel.scenes)
         newNode = f'{self.SCENE_PREFIX}{scId}'
-        self._ui.novel.scenes[scId] = Scene()
+        self._ui.novel.scenes[scId] = CompactScene()
         title = kwargs.get('title', None)
         if title:
             self._ui.novel.scenes[scId].title = title
@@ -645,12 +664,9 @@ class TreeViewer(ttk.Frame):
         # Default type = Normal by default
         self._ui.novel.scenes[scId].appendToPrev = kwargs.get('appendToPrev', False)
         self._ui.novel.scenes[scId].tags = kwargs.get('tags', False)
-
-        # Initialize custom keyword variables.
-        for fieldName in self._ui.prjFile.SCN_KWVAR:
-            self._ui.novel.scenes[scId].kwVar[fieldName] = None
         title, columns, nodeTags = self._set_scene_display(scId)
         self.tree.insert(parent, index, newNode, text=title, values=columns, tags=nodeTags)
+        self._ui.modelEvents.publish(ModelEventBus.ELEMENT_ADDED, newNode, sender=self)
         self.update_prj_structure()
         self.go_to_node(newNode)
         return scId
@@ -658,6 +674,7 @@ class TreeViewer(ttk.Frame):
     def build_tree(self):
         """Create and display the tree."""
         self.reset_tree()
+        self._coloringTable = None
 
         #--- Build the toplevel  structure.
         self.tree.insert('', 'end', self.NV_ROOT, text=_('Book'), tags='root', open=True)
@@ -676,7 +693,9 @@ class TreeViewer(ttk.Frame):
         self._wordsTotal = self._ui.prjFile.get_counts()[0]
         for chId in self._ui.novel.srtChapters:
             if self._ui.novel.chapters[chId].isTrash:
-                self._ui.novel.chapters[chId].chType = 3
+                if self._ui.novel.chapters[chId].chType != 3:
+                    self._ui.novel.chapters[chId].chType = 3
+                    self._ui.prjFile.invalidate_columns()
                 self._trashNode = f'{self.CHAPTER_PREFIX}{chId}'
                 inPart = False
             if self._ui.novel.chapters[chId].chLevel == 1:
@@ -729,6 +748,7 @@ class TreeViewer(ttk.Frame):
                 # add word count, if the scene is "Normal".
                 if self._ui.novel.scenes[scId].scType == 0 and not self._ui.novel.scenes[scId].doNotExport:
                     wordCount += self._ui.novel.scenes[scId].wordCount
+        self._set_timeline_display(self._ui.prjFile.get_timeline().get_chronology())
 
         #--- Build character tree.
         for crId in self._ui.novel.srtCharacters:
@@ -765,40 +785,44 @@ class TreeViewer(ttk.Frame):
             self.close_children(child)
 
     def configure_columns(self):
-        """Determine the order of the columnns.
+        """Set up the columns, and display them in the configured order.
         
         Read from the ui keyword arguments:
             column_order: str -- ordered column IDs, semicolon-separated.
         
         Write instance variables:
-            _colPos: dict -- key=ID, value=index.
-            columns -- list of tuples (ID, title, width).
+            _colPos: dict -- key=ID, value=index in the node values.
+            columns -- list of tuples (ID, title, width), in display order.
+            
+        The node values are in a fixed order, so the tree needs not be rebuilt 
+        when the column order changes.
         """
-        # Column position by column ID.
-        self._colPos = {}
-        self.columns = []
-        titles = []
         srtColumns = string_to_list(self._ui.kwargs['column_order'])
 
         # Check data integrity.
         for coId in self._COLUMNS:
             if not coId in srtColumns:
                 srtColumns.append(coId)
-        i = 0
+        self.columns = []
         for coId in srtColumns:
             try:
                 title, width = self._COLUMNS[coId]
             except:
                 continue
-            self._colPos[coId] = i
-            i += 1
-            self.columns.append((coId, title, width))
-            titles.append(title)
-        self.tree.configure(columns=tuple(titles))
-        for column in self.columns:
-            self.tree.heading(column[1], text=column[1], anchor='w')
-            self.tree.column(column[1], width=int(self._ui.kwargs[column[2]]), minwidth=3, stretch=False)
-        self.tree.column('#0', width=int(self._ui.kwargs['title_width']), stretch=False)
+            if not (coId, title, width) in self.columns:
+                self.columns.append((coId, title, width))
+        if not self._colPos:
+            # Column position by column ID.
+            titles = []
+            for coId in self._COLUMNS:
+                self._colPos[coId] = len(titles)
+                titles.append(self._COLUMNS[coId][0])
+            self.tree.configure(columns=tuple(titles))
+            for column in self.columns:
+                self.tree.heading(column[1], text=column[1], anchor='w')
+                self.tree.column(column[1], width=int(self._ui.kwargs[column[2]]), minwidth=3, stretch=False)
+            self.tree.column('#0', width=int(self._ui.kwargs['title_width']), stretch=False)
+        self.tree.configure(displaycolumns=tuple(column[1] for column in self.columns))
 
     def go_back(self, event=None):
         """Select a node back in the tree browsing history."""
@@ -953,6 +977,8 @@ class TreeViewer(ttk.Frame):
 
         # Delete selected scene instance.
         del(self._ui.novel.scenes[thisScId])
+        self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, prevNode, sender=self)
+        self._ui.modelEvents.publish(ModelEventBus.ELEMENT_REMOVED, selection, sender=self)
         self.update_prj_structure()
         self.go_to_node(prevNode)
 
@@ -983,11 +1009,44 @@ class TreeViewer(ttk.Frame):
         nextNode, __ = search_tree(root, None, False)
         return nextNode
 
+    def on_model_events(self, events):
+        """Redisplay the nodes of elements changed by others.
+        
+        Positional arguments:
+            events: list of ModelEvent instances.
+            
+        Changes of the tree's own operations are already displayed.
+        Changes that may affect other elements, e.g. via types or arcs, lead to a full update.
+        Changes of a scene's date or duration update the scenes whose timeline flags may have changed.
+        """
+        nodes = set()
+        isStructureChanged = False
+        isTimelineChanged = False
+        for event in events:
+            if event.sender is self:
+                continue
+
+            if event.kind != ModelEventBus.FIELD_CHANGED or event.node is None:
+                isStructureChanged = True
+            elif event.field is None or event.field in self.STRUCTURE_FIELDS:
+                isStructureChanged = True
+            else:
+                nodes.add(event.node)
+                if event.field in TimelineIndex.SCENE_FIELDS:
+                    isTimelineChanged = True
+        if isTimelineChanged:
+            for scId in self._ui.prjFile.get_timeline().pop_touched():
+                nodes.add(f'{self.SCENE_PREFIX}{scId}')
+        if isStructureChanged:
+            self.update_prj_structure()
+        elif nodes:
+            self.update_nodes(nodes)
+
     def on_quit(self):
         """Write column width to the applicaton's keyword arguments."""
         self._ui.kwargs['title_width'] = self.tree.column('#0', 'width')
-        for i, column in enumerate(self.columns):
-            self._ui.kwargs[column[2]] = self.tree.column(i, 'width')
+        for column in self.columns:
+            self._ui.kwargs[column[2]] = self.tree.column(column[1], 'width')
 
     def open_children(self, parent):
         """Recursively show children nodes.
@@ -1028,6 +1087,48 @@ class TreeViewer(ttk.Frame):
         prevNode, __ = search_tree(root, None, None)
         return prevNode
 
+    def rebuild_tree(self):
+        """Rebuild the tree, keeping open branches, selection, and scroll position."""
+
+        def get_open_states(node):
+            for childNode in self.tree.get_children(node):
+                openStates[childNode] = self.tree.item(childNode, 'open')
+                get_open_states(childNode)
+
+        openStates = {}
+        get_open_states('')
+        selection = self.tree.selection()
+        yview = self.tree.yview()
+        self.build_tree()
+        for node in openStates:
+            if self.tree.exists(node) and self.tree.item(node, 'open') != openStates[node]:
+                self.tree.item(node, open=openStates[node])
+                if node.startswith(self.CHAPTER_PREFIX):
+                    self._configure_chapter_columns(node, collect=not openStates[node])
+        selection = [node for node in selection if self.tree.exists(node)]
+        if selection:
+            self.tree.selection_set(selection)
+            self.tree.focus(selection[0])
+        self.tree.yview_moveto(yview[0])
+
+    def recolor_scenes(self):
+        """Update the scene row colors for the current coloring mode, without rebuilding the tree.
+        
+        The coloring tags are removed from all rows, and set for the scenes grouped by status or mode,
+        with one call per tag.
+        """
+        self._coloringTable = None
+        attribute, rowTags = self._get_coloring_table()
+        for tag in self._COLORING_TAGS:
+            self.tree.tk.call(self.tree, 'tag', 'remove', tag)
+        if attribute is None or self._ui.prjFile is None:
+            return
+
+        for value, scIds in self._ui.prjFile.get_scene_columns().get_scene_groups(attribute).items():
+            tag = rowTags.get(value, None)
+            if tag is not None:
+                self.tree.tk.call(self.tree, 'tag', 'add', tag, [f'{self.SCENE_PREFIX}{scId}' for scId in scIds])
+
     def refresh_tree(self):
         """Display the tree nodes regarding the way they are read from the file."""
         isModified = False
@@ -1036,6 +1137,7 @@ class TreeViewer(ttk.Frame):
         if self._ui.prjFile.adjust_scene_types():
             isModified = True
         self.build_tree()
+        self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, None, sender=self)
         if isModified:
             self._ui.isModified = True
 
@@ -1072,6 +1174,57 @@ class TreeViewer(ttk.Frame):
             for child in self.tree.get_children(parent):
                 self.show_chapters(child)
 
+    def update_nodes(self, nodes):
+        """Redisplay nodes without rebuilding the tree.
+        
+        Positional arguments:
+            nodes: iterable of node IDs to update.
+            
+        The tree structure must match the novel structure.
+        Parent chapters/parts of scenes are updated as well.
+        If the total word count has changed, all Book positions are updated.
+        """
+        wordsTotal = self._ui.prjFile.get_counts()[0]
+        nodes = set(nodes)
+        self._coloringTable = None
+        scenePositions, chapterPositions = self._ui.prjFile.get_scene_columns().get_positions()
+        if wordsTotal != self._wordsTotal:
+            self._wordsTotal = wordsTotal
+            for chId in self._ui.novel.srtChapters:
+                for scId in self._ui.novel.chapters[chId].srtScenes:
+                    nodes.add(f'{self.SCENE_PREFIX}{scId}')
+        for node in list(nodes):
+            if node.startswith(self.SCENE_PREFIX) and self.tree.exists(node):
+                chapterNode = self.tree.parent(node)
+                nodes.add(chapterNode)
+                if chapterNode.startswith(self.CHAPTER_PREFIX):
+                    nodes.add(self.tree.parent(chapterNode))
+        sceneIds = []
+        for node in nodes:
+            if not self.tree.exists(node):
+                continue
+
+            elemId = node[2:]
+            if node.startswith(self.SCENE_PREFIX):
+                sceneIds.append(elemId)
+                title, columns, nodeTags = self._set_scene_display(elemId, position=scenePositions.get(elemId, None))
+            elif node.startswith(self.CHAPTER_PREFIX) or node.startswith(self.PART_PREFIX):
+                doCollect = not self.tree.item(node, 'open')
+                title, columns, nodeTags = self._set_chapter_display(elemId, position=chapterPositions.get(elemId, None), collect=doCollect)
+            elif node.startswith(self.CHARACTER_PREFIX):
+                title, columns, nodeTags = self._set_character_display(elemId)
+            elif node.startswith(self.LOCATION_PREFIX):
+                title, columns, nodeTags = self._set_location_display(elemId)
+            elif node.startswith(self.ITEM_PREFIX):
+                title, columns, nodeTags = self._set_item_display(elemId)
+            elif node.startswith(self.PRJ_NOTE_PREFIX):
+                title, columns, nodeTags = self._set_prjNote_display(elemId)
+            else:
+                continue
+
+            self.tree.item(node, text=title, values=columns, tags=nodeTags)
+        self._set_timeline_display(sceneIds)
+
     def update_prj_structure(self):
         """Iterate the tree and rebuild the sorted lists."""
 
@@ -1122,7 +1275,9 @@ class TreeViewer(ttk.Frame):
                 self.tree.item(childNode, text=title, values=columns, tags=nodeTags)
             return scnPos
 
+        self._ui.prjFile.invalidate_columns()
         self._wordsTotal = self._ui.prjFile.get_counts()[0]
+        self._coloringTable = None
         self._ui.novel.srtChapters = []
         self._ui.novel.srtCharacters = []
         self._ui.novel.srtLocations = []
@@ -1135,6 +1290,8 @@ class TreeViewer(ttk.Frame):
         serialize_tree(self.LC_ROOT, '')
         serialize_tree(self.IT_ROOT, '')
         serialize_tree(self.PN_ROOT, '')
+        self._ui.prjFile.invalidate_columns()
+        self._ui.prjFile.invalidate_timeline()
 
         # Make sure that scenes inherit the parent's type, if not normal.
         if self._ui.prjFile.adjust_scene_types():
@@ -1148,6 +1305,8 @@ class TreeViewer(ttk.Frame):
         # Check the arc related associations.
         self._ui.prjFile.check_arcs()
 
+        self._set_timeline_display(self._ui.prjFile.get_timeline().get_chronology())
+        self._ui.modelEvents.publish_fallback(sender=self)
         self._ui.isModified = True
         self._ui.show_status()
 
@@ -1189,6 +1348,7 @@ class TreeViewer(ttk.Frame):
             del self._ui.novel.chapters[elemId]
             self._ui.novel.srtChapters.remove(elemId)
             self.tree.delete(f'{self.CHAPTER_PREFIX}{elemId}')
+            self._ui.modelEvents.publish(ModelEventBus.ELEMENT_REMOVED, selection, sender=self)
             self.update_prj_structure()
 
     def _configure_chapter_columns(self, nodeId, collect=False):
@@ -1306,9 +1466,7 @@ class TreeViewer(ttk.Frame):
                 if self._trashNode is None:
                     # Create a "trash bin"; use the first free chapter ID.
                     trashId = create_id(self._ui.novel.chapters)
-                    self._ui.novel.chapters[trashId] = Chapter()
-                    for fieldName in self._ui.prjFile.CHP_KWVAR:
-                        self._ui.novel.chapters[trashId].kwVar[fieldName] = None
+                    self._ui.novel.chapters[trashId] = CompactChapter()
                     self._ui.novel.chapters[trashId].title = _('Trash')
                     self._ui.novel.chapters[trashId].isTrash = True
                     self._trashNode = f'{self.CHAPTER_PREFIX}{trashId}'
@@ -1327,6 +1485,7 @@ class TreeViewer(ttk.Frame):
                     self.tree.delete(selection)
                 # Make sure the whole "trash bin" is unused.
                 self._set_type([self._trashNode], 3)
+            self._ui.modelEvents.publish(ModelEventBus.ELEMENT_REMOVED, selection, sender=self)
             self.update_prj_structure()
 
     def _demote_part(self, event=None):
@@ -1340,9 +1499,47 @@ class TreeViewer(ttk.Frame):
         elemId = selection[2:]
         if self._ui.ask_yes_no(_('Demote part "{}" to chapter?').format(self._ui.novel.chapters[elemId].title)):
             self._ui.novel.chapters[elemId].chLevel = 0
+            self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, f'{self.CHAPTER_PREFIX}{elemId}', 'chLevel', sender=self)
             self.update_prj_structure()
             self.refresh_tree()
 
+    def _get_coloring_table(self):
+        """Return the row tags for the current coloring mode.
+        
+        Return a tuple:
+            attribute: str -- Scene attribute the row color depends on; None, if not coloring.
+            rowTags: dict -- key: attribute value, value: row tag.
+        
+        The table is calculated once per display update.
+        """
+        if self._coloringTable is None:
+            attribute = None
+            rowTags = {}
+            if self._ui.coloringMode == 1:
+                attribute = 'status'
+                for status in range(1, len(Scene.STATUS)):
+                    rowTags[status] = Scene.STATUS[status]
+            elif self._ui.coloringMode == 2:
+                try:
+                    workPhase = int(self._ui.novel.kwVar['Field_WorkPhase'])
+                except:
+                    pass
+                else:
+                    attribute = 'status'
+                    for status in range(len(Scene.STATUS)):
+                        if status == workPhase:
+                            rowTags[status] = 'On_schedule'
+                        elif status < workPhase:
+                            rowTags[status] = 'Behind_schedule'
+                        else:
+                            rowTags[status] = 'Before_schedule'
+            elif self._ui.coloringMode == 3:
+                attribute = 'scnMode'
+                for sceneMode in (1, 2, 3, 4, 5):
+                    rowTags[sceneMode] = f'mod{sceneMode}'
+            self._coloringTable = (attribute, rowTags)
+        return self._coloringTable
+
     def _on_close_branch(self, event=None):
         """Event handler for manually collapsing a branch."""
         try:
@@ -1396,6 +1593,7 @@ class TreeViewer(ttk.Frame):
             self.tree.move(node, targetNode, 0)
         elif node.startswith(self.CHAPTER_PREFIX) and targetNode.startswith(self.PART_PREFIX) and not self.tree.get_children(targetNode):
             self.tree.move(node, targetNode, self.tree.index(targetNode))
+        self._ui.modelEvents.publish(ModelEventBus.ELEMENT_MOVED, node, sender=self)
         self.update_prj_structure()
 
     def _on_open_context_menu(self, event):
@@ -1543,6 +1741,7 @@ class TreeViewer(ttk.Frame):
 
         if self._ui.ask_yes_no(_('Promote chapter "{}" to part?').format(self._ui.novel.chapters[elemId].title)):
             self._ui.novel.chapters[elemId].chLevel = 1
+            self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, f'{self.PART_PREFIX}{elemId}', 'chLevel', sender=self)
             self.update_prj_structure()
             self.refresh_tree()
 
@@ -1699,13 +1898,8 @@ class TreeViewer(ttk.Frame):
         if self._ui.novel.characters[crId].notes:
             columns[self._colPos['nt']] = _('N')
 
-        # Count the scenes that use this character as viewpoint.
-        wordCount = 0
-        for scId in self._ui.novel.scenes:
-            if self._ui.novel.scenes[scId].scType == 0:
-                if self._ui.novel.scenes[scId].characters:
-                    if self._ui.novel.scenes[scId].characters[0] == crId and not self._ui.novel.scenes[scId].doNotExport:
-                        wordCount += self._ui.novel.scenes[scId].wordCount
+        # Count the words of the scenes that use this character as viewpoint.
+        wordCount = self._ui.prjFile.get_scene_columns().get_viewpoint_words().get(crId, 0)
         if wordCount > 0:
             columns[self._colPos['wc']] = wordCount
 
@@ -1740,6 +1934,7 @@ class TreeViewer(ttk.Frame):
             if node.startswith(self.CHARACTER_PREFIX):
                 if self._ui.novel.characters[node[2:]].isMajor != chrStatus:
                     self._ui.novel.characters[node[2:]].isMajor = chrStatus
+                    self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, node, 'isMajor', sender=self)
                     has_changed = True
             elif node == self.CR_ROOT:
 
@@ -1864,24 +2059,11 @@ class TreeViewer(ttk.Frame):
                 nodeTags.append('unused')
             else:
                 # Set the row color according to the color mode.
-                if self._ui.coloringMode == 1:
-                    nodeTags.append(Scene.STATUS[self._ui.novel.scenes[scId].status])
-                elif self._ui.coloringMode == 2:
-                    try:
-                        workPhase = int(self._ui.novel.kwVar['Field_WorkPhase'])
-                    except:
-                        pass
-                    else:
-                        if self._ui.novel.scenes[scId].status == workPhase:
-                            nodeTags.append('On_schedule')
-                        elif self._ui.novel.scenes[scId].status < workPhase:
-                            nodeTags.append('Behind_schedule')
-                        else:
-                            nodeTags.append('Before_schedule')
-                elif self._ui.coloringMode == 3:
-                    sceneMode = self._ui.novel.scenes[scId].scnMode
-                    if sceneMode in (1, 2, 3, 4, 5):
-                        nodeTags.append(f'mod{sceneMode}')
+                attribute, rowTags = self._get_coloring_table()
+                if attribute is not None:
+                    tag = rowTags.get(getattr(self._ui.novel.scenes[scId], attribute), None)
+                    if tag is not None:
+                        nodeTags.append(tag)
                 try:
                     positionStr = f'{round(100 * position / self._wordsTotal, 1)}%'
                 except:
@@ -1944,6 +2126,7 @@ class TreeViewer(ttk.Frame):
             if node.startswith(self.SCENE_PREFIX):
                 if  self._ui.novel.scenes[node[2:]].status != scnStatus:
                     self._ui.novel.scenes[node[2:]].status = scnStatus
+                    self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, node, 'status', sender=self)
                     has_changed = True
             elif node.startswith(self.CHAPTER_PREFIX) or node.startswith(self.PART_PREFIX) or node.startswith(self.NV_ROOT):
                 self.tree.item(node, open=True)
@@ -1964,6 +2147,7 @@ class TreeViewer(ttk.Frame):
             if node.startswith(self.SCENE_PREFIX):
                 if  self._ui.novel.scenes[node[2:]].scnMode != scnMode:
                     self._ui.novel.scenes[node[2:]].scnMode = scnMode
+                    self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, node, 'scnMode', sender=self)
                     has_changed = True
             elif node.startswith(self.CHAPTER_PREFIX) or node.startswith(self.PART_PREFIX) or node.startswith(self.NV_ROOT):
                 self.tree.item(node, open=True)
@@ -1973,6 +2157,25 @@ class TreeViewer(ttk.Frame):
         if has_changed:
             self.update_prj_structure()
 
+    def _set_timeline_display(self, scIds):
+        """Display the timeline flags of the scenes.
+        
+        Positional arguments:
+            scIds: iterable of IDs of scenes just displayed, i.e. with an empty timeline column.
+        
+        F -- The scene starts before the previous "Normal" scene in reading order.
+        O -- The scene overlaps another scene.
+        """
+        timeline = self._ui.prjFile.get_timeline()
+        for scId in scIds:
+            flags = []
+            if timeline.is_out_of_order(scId):
+                flags.append(_('F'))
+            if timeline.is_overlapping(scId):
+                flags.append(_('O'))
+            if flags:
+                self.tree.set(f'{self.SCENE_PREFIX}{scId}', self._colPos['tl'], ' '.join(flags))
+
     def _set_type(self, nodes, newType):
         """Recursively set scene or chapter type (Normal/Notes/Todo/Unused).
         
@@ -1987,6 +2190,7 @@ class TreeViewer(ttk.Frame):
                 scene = self._ui.novel.scenes[node[2:]]
                 if scene.scType != newType:
                     scene.scType = newType
+                    self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, node, 'scType', sender=self)
                     has_changed = True
             elif node.startswith(self.CHAPTER_PREFIX) or node.startswith(self.PART_PREFIX):
                 self.tree.item(node, open=True)
@@ -1995,6 +2199,7 @@ class TreeViewer(ttk.Frame):
                     newType = 3
                 if chapter.chType != newType:
                     chapter.chType = newType
+                    self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, node, 'chType', sender=self)
                     has_changed = True
 
                 # Go one level down.
@@ -0,0 +1,195 @@
+"""Provide a service class for reporting the memory used by the loaded project.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import sys
+import tracemalloc
+import tkinter as tk
+import xml.etree.ElementTree as ET
+from collections import deque
+from datetime import datetime
+from types import FunctionType, MethodType, ModuleType
+from pywriter.pywriter_globals import *
+
+
+class MemoryReport:
+    """Account for the memory of the loaded project by category.
+
+    The sizes are the sum of sys.getsizeof() over all objects reachable from a category's roots.
+    The categories are measured in order; an object shared by several categories
+    is counted for the first one only.
+    Classes, functions, modules, and tkinter widgets are not followed.
+    Memory held by Tk itself, e.g. the text of the contents viewer, is estimated
+    by the size of its Python copy.
+
+    If tracemalloc is tracing, the report lists the largest allocations by source line.
+    Otherwise, tracing is started by the report, so the next report can show
+    the allocations in between. Then the next report stops tracing after taking its snapshot,
+    because tracing slows down the program and needs memory of its own.
+    Tracing that was active before, e.g. started with the "--trace-memory" option, is kept.
+    Each report is compared with the previous one.
+
+    Public methods:
+        create() -- Measure the categories, write the report, and return its path.
+        get_size(*roots, seen=None) -- Return the total size of the objects reachable from the roots.
+
+    Public class constants:
+        TOP_ENTRIES: int -- Number of source lines listed.
+    """
+    TOP_ENTRIES = 15
+    _REPORT_FILE = 'memory_report.txt'
+    _ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None), range)
+    _SKIPPED_TYPES = (type, ModuleType, FunctionType, MethodType, tk.Misc, tk.Variable)
+
+    def __init__(self, ui):
+        """Initialize instance variables.
+
+        Positional arguments:
+            ui: NovelystTk -- The application.
+        """
+        self._ui = ui
+        self._previousDate = None
+        self._previousSizes = {}
+        # key: category, value: size in bytes
+        self._previousSnapshot = None
+        # tracemalloc.Snapshot instance
+        self._startedTracing = False
+        # True, if tracing was started by a report and is still active
+
+    def create(self):
+        """Measure the categories, write the report, and return its path.
+
+        Raise OSError if the report cannot be written.
+        """
+        date = datetime.now().replace(microsecond=0)
+        sizes = self._measure()
+        lines = [
+            'novelyst memory report',
+            date.isoformat(sep=' '),
+            ]
+        if self._ui.prjFile is not None:
+            lines.append(norm_path(self._ui.prjFile.filePath))
+        if self._previousDate is None:
+            lines.append(f'\n{"Category":<30} {"KiB":>10}')
+        else:
+            lines.append(f'\n{"Category":<30} {"KiB":>10} {"Change":>10}  (since {self._previousDate.isoformat(sep=" ")})')
+        for category, size in sizes.items():
+            line = f'{category:<30} {size / 1024:10.1f}'
+            if self._previousDate is not None:
+                line = f'{line} {(size - self._previousSizes.get(category, 0)) / 1024:+10.1f}'
+            lines.append(line)
+        total = sum(sizes.values())
+        lines.append(f'{"Total":<30} {total / 1024:10.1f}')
+
+        #--- Allocations traced by tracemalloc.
+        snapshot = None
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+                ))
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append(f'\nTraced allocations: {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB)')
+            lines.append(f'\nLargest allocations by source line:')
+            for statistic in snapshot.statistics('lineno')[:self.TOP_ENTRIES]:
+                lines.append(f'{statistic.size / 1024:10.1f} KiB {statistic.count:9} blocks  {statistic.traceback}')
+            if self._previousSnapshot is not None:
+                lines.append(f'\nLargest changes by source line since the previous report:')
+                for statistic in snapshot.compare_to(self._previousSnapshot, 'lineno')[:self.TOP_ENTRIES]:
+                    lines.append(f'{statistic.size_diff / 1024:+10.1f} KiB {statistic.count_diff:+9} blocks  {statistic.traceback}')
+            if self._startedTracing:
+                tracemalloc.stop()
+                self._startedTracing = False
+                snapshot = None
+                lines.append('\nAllocation tracing stopped; the next report starts it again.')
+        else:
+            tracemalloc.start()
+            self._startedTracing = True
+            lines.append('\nAllocation tracing started; the next report lists the allocations since this one, and stops tracing.')
+            lines.append('To trace the allocations from the program start, start novelyst with the "--trace-memory" option.')
+
+        self._previousDate = date
+        self._previousSizes = sizes
+        self._previousSnapshot = snapshot
+        reportPath = os.path.join(self._ui.tempDir, self._REPORT_FILE)
+        with open(reportPath, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+        return reportPath
+
+    def get_size(self, *roots, seen=None):
+        """Return the total size of the objects reachable from the roots.
+
+        Positional arguments:
+            roots -- Objects to measure.
+
+        Optional arguments:
+            seen: set -- IDs of the objects already counted; updated with the objects counted now.
+        """
+        if seen is None:
+            seen = set()
+        size = 0
+        pending = deque(roots)
+        while pending:
+            obj = pending.pop()
+            if id(obj) in seen or isinstance(obj, self._SKIPPED_TYPES):
+                continue
+
+            seen.add(id(obj))
+            size += sys.getsizeof(obj)
+            if isinstance(obj, self._ATOMIC_TYPES):
+                continue
+
+            if isinstance(obj, dict):
+                pending.extend(obj.keys())
+                pending.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+                pending.extend(obj)
+            elif isinstance(obj, ET.ElementTree):
+                pending.append(obj.getroot())
+            elif isinstance(obj, ET.Element):
+                pending.extend((obj.tag, obj.text, obj.tail))
+                if obj.keys():
+                    pending.append(obj.attrib)
+                    # Otherwise, accessing the attributes would create an empty dict.
+                pending.extend(obj)
+            else:
+                if not getattr(type(obj), 'STATE_IN_SLOTS', False) and hasattr(obj, '__dict__'):
+                    pending.append(vars(obj))
+                    # Otherwise, accessing the instance dictionary of a compact element would create an empty one.
+                for cls in type(obj).__mro__:
+                    slots = cls.__dict__.get('__slots__', ())
+                    if isinstance(slots, str):
+                        slots = (slots,)
+                    for slot in slots:
+                        if slot not in ('__dict__', '__weakref__'):
+                            pending.append(getattr(obj, slot, None))
+        return size
+
+    def _measure(self):
+        """Return a dict with the sizes of the categories; key: category, value: size in bytes."""
+        seen = set()
+        sizes = {}
+        novel = self._ui.novel
+        prjFile = self._ui.prjFile
+        if novel is not None:
+            sizes['Scene contents'] = self.get_size(*[scene.sceneContent for scene in novel.scenes.values()], seen=seen)
+            kwVars = [novel.kwVar]
+            for collection in (novel.chapters, novel.scenes, novel.characters, novel.locations, novel.items, novel.projectNotes):
+                kwVars.extend(element.kwVar for element in collection.values())
+            sizes['Custom fields (kwVar)'] = self.get_size(*kwVars, seen=seen)
+            sizes['Other model data'] = self.get_size(novel, seen=seen)
+        if prjFile is not None:
+            sizes['XML tree'] = self.get_size(prjFile.loadedTree, seen=seen)
+            sizes['Word count log'] = self.get_size(prjFile.wcLog, prjFile.wcLogUpdate, seen=seen)
+            sizes['Merge hashes'] = self.get_size(prjFile.elementHashes, seen=seen)
+        sizes['Contents viewer text'] = self.get_size(self._ui.contentsViewer.get('1.0', 'end'), seen=seen)
+        sizes['Search index'] = self.get_size(self._ui.searchIndexer.index, seen=seen)
+        manuscriptModule = sys.modules.get('novelystlib.export.odt_manuscript_nv', None)
+        if manuscriptModule is not None:
+            sizes['Manuscript export cache'] = self.get_size(manuscriptModule.OdtManuscriptNv._sceneCache, seen=seen)
+        sizes['Plugin error logs'] = self.get_size(self._ui.plugins.errorLog, seen=seen)
+        return sizes
@@ -8,6 +8,7 @@ import re
 import tkinter as tk
 from tkinter import ttk
 from pywriter.pywriter_globals import *
+from novelystlib.model.model_event_bus import ModelEventBus
 from novelystlib.view_controller.widgets.rich_text_yw import RichTextYw
 
 
@@ -15,6 +16,7 @@ class ContentsViewer(RichTextYw):
     """A tkinter text box class for novelyst file viewing.
     
     Public methods:
+        on_model_events(events) -- Reload the text, if the book's contents are concerned.
         reset_view() -- Clear the text box.
         see(idStr) -- Scroll the text to the position of the idStr node.
         update() -- Reload the text to view.
@@ -25,6 +27,9 @@ class ContentsViewer(RichTextYw):
 
     Show the novel contents in a text box.
     """
+    _CONTENTS_NODE_PREFIXES = ('pt', 'ch', 'sc')
+    _CONTENTS_FIELDS = ('title', 'sceneContent', 'chType', 'chLevel', 'scType', 'doNotExport')
+    # Element attributes displayed in the text box.
 
     def __init__(self, ui, parent, **kwargs):
         """Put a text box to the specified window.
@@ -47,6 +52,27 @@ class ContentsViewer(RichTextYw):
         self._textMarks = {}
         self._index = '1.0'
 
+    def on_model_events(self, events):
+        """Reload the text, if the book's contents are concerned.
+        
+        Positional arguments:
+            events: list of ModelEvent instances.
+        """
+        for event in events:
+            if event.node is None:
+                break
+
+            if not event.node.startswith(self._CONTENTS_NODE_PREFIXES):
+                continue
+
+            if event.kind != ModelEventBus.FIELD_CHANGED or event.field is None or event.field in self._CONTENTS_FIELDS:
+                break
+
+        else:
+            return
+
+        self.update()
+
     def reset_view(self):
         """Clear the text box."""
         self.config(state='normal')
@@ -12,7 +12,13 @@ from pywriter.pywriter_globals import *
 from pywriter.model.novel import Novel
 from pywriter.ui.main_tk import MainTk
 from pywriter.ui.set_icon_tk import *
+from pywriter.file.doc_open import open_document
 from novelystlib.model.work_file import WorkFile
+from novelystlib.model.snapshot_cache import SnapshotCache
+from novelystlib.model.backup_store import BackupStore
+from novelystlib.model.export_cache import ExportCache
+from novelystlib.model.model_event_bus import ModelEventBus
+from novelystlib.model.timeline_index import TimelineIndex
 from novelystlib.plugin.plugin_collection import PluginCollection
 from novelystlib.view_controller.left_frame.tree_viewer import TreeViewer
 from novelystlib.view_controller.middle_frame.contents_viewer import ContentsViewer
@@ -26,14 +32,23 @@ from novelystlib.view_controller.right_frame.notes_scene_view import NotesSceneV
 from novelystlib.view_controller.right_frame.todo_scene_view import TodoSceneView
 from novelystlib.view_controller.right_frame.character_view import CharacterView
 from novelystlib.view_controller.right_frame.projectnote_view import ProjectnoteView
+from novelystlib.widgets.detachable_frame import DetachableFrame
 from novelystlib.view_controller.pop_up.settings_window import SettingsWindow
 from novelystlib.view_controller.pop_up.plugin_manager import PluginManager
+from novelystlib.view_controller.pop_up.backup_browser import BackupBrowser
+from novelystlib.view_controller.pop_up.search_window import SearchWindow
+from novelystlib.view_controller.pop_up.find_replace_window import FindReplaceWindow
+from novelystlib.export.nv_exporter import NvExporter
 from novelystlib.export.nv_doc_exporter import NvDocExporter
 from novelystlib.export.nv_reporter import NvReporter
 from novelystlib.data_reader.character_data_reader import CharacterDataReader
 from novelystlib.data_reader.location_data_reader import LocationDataReader
 from novelystlib.data_reader.item_data_reader import ItemDataReader
 from novelystlib.view_controller.pop_up.data_importer import DataImporter
+from novelystlib.view_controller.file_watcher import FileWatcher
+from novelystlib.view_controller.search_indexer import SearchIndexer
+from novelystlib.view_controller.event_profiler import EventProfiler
+from novelystlib.view_controller.memory_report import MemoryReport
 
 PLUGIN_PATH = f'{sys.path[0]}/plugin'
 
@@ -42,6 +57,7 @@ class NovelystTk(MainTk):
     """Controller of the tkinter GUI framework for novelyst.
     
     Public methods:
+        browse_backups(event) -- Open a toplevel window to restore a version from the backup history.
         check_lock() -- Show a message and return True, if the project is locked.
         close_project(event) -- Close the current project.
         detach_properties_frame(event) -- View the properties in its own window.
@@ -51,11 +67,14 @@ class NovelystTk(MainTk):
         edit_settings(event) -- Open a toplevel window to edit the program settings.
         enable_menu() -- Enable menu entries when a project is open.
         export_document(suffix) -- Export a document.
+        find_and_replace(event) -- Open a window for a project-wide find and replace.
+        find_replacements(replacer) -- Apply changes and return a list of the replacements found in the project.
         import_characters() -- Import characters from an XML data file.
         import_locations() -- Import locations from an XML data file.
         import_items() -- Import items from an XML data file.
         lock(event) -- Lock the project.
         manage_plugins(event) -- Open a toplevel window to manage the plugins.
+        merge_changes(event) -- Merge external changes of the project file into the model.
         new_project(event) -- Create a novelyst project instance.
         on_quit(event) -- Save keyword arguments before exiting the program.
         open_installation_folder(event) -- Open the installation folder with the OS file manager.
@@ -63,13 +82,19 @@ class NovelystTk(MainTk):
         open_project_folder(event) -- Open the project folder with the OS file manager.
         refresh_tree(event) -- Apply changes and refresh the tree.
         reload_project(event) -- Discard changes and reload the project.
+        replace_in_project(replacer, changes) -- Apply replacements to the project; return their number.
         restore_backup(event) -- Discard changes and restore the latest backup file.
+        restore_from_history(backupStore, backupId) -- Discard changes and restore a version from the backup history.
         save_as(event) -- Rename the project file and save it to disk.
         save_project(event) -- Save the novelyst project to disk and set "unchanged" status.
+        search(query) -- Apply changes and return a list of matching document keys, or None while indexing.
+        search_project(event) -- Open a window for a full-text search of the project.
         show_chapter_level(event) -- Open all Book/Part nodes and close all chapter nodes in the tree viewer.
         show_properties() -- Show the properties of the selected element.
         show_status(message=None) -- Display project statistics at the status bar.
+        show_memory_report(event) -- Write a report of the memory used by the project, and open it.
         toggle_lock(event) -- Toggle the 'locked' status.
+        toggle_profiling(event) -- Start/stop measuring the event handlers.
         toggle_viewer(event) -- Show/hide the contents viewer text box.
         toggle_properties(event) -- Show/hide the element properties frame.
         toggle_properties_window(event) -- Detach/dock the element properties frame.
@@ -86,16 +111,23 @@ class NovelystTk(MainTk):
     Public instance variables:
         guiStyle -- ttk.Style object.
         plugins: PluginCollection -- Dict-like Container for registered plugin objects.
+        modelEvents: ModelEventBus -- Publish/subscribe hub for model changes; views and plugins subscribe to it.
         tempDir: str -- Directory path for temporary files to be deleted on exit.
+        profiler: EventProfiler -- Service measuring the event handlers in profiling mode.
+        memoryReport: MemoryReport -- Service reporting the memory used by the project.
+        cacheDir: str -- Directory path for persistent cache files; None if caching is disabled.
         kwargs: dict -- keyword arguments, used as global configuration data.
         exporter: NvExporter -- Converter strategy for document export. 
         reporter: NvExporter -- Converter strategy for report generation. 
+        fileWatcher: FileWatcher -- Service reporting changes of the project file on disk.
+        searchIndexer: SearchIndexer -- Service providing a full-text search index of the project.
         wordCount: int -- Total words of "normal" type scenes.
         reloading: bool -- If True, suppress popup message when reopening a project that has changed on disk.
         prjFile: WorkFile
         novel: Novel
         coloringMode: int -- Scene row coloring mode indicating a COLORING_MODES item.
         cleanUpYw: bool -- If True, delete yWriter-only data on saving the project.
+        backupHistory: bool -- If True, add the project file to the backup history on saving.
         appWindow: ttk.frame -- Application window with three frames.
         leftFrame: ttk.frame -- Frame for the project tree.
         tv: TreeViewer -- Project tree view instance.
@@ -123,6 +155,19 @@ class NovelystTk(MainTk):
         COLORING_MODES: List[str] -- Scene row coloring modes.
     """
     COLORING_MODES = [_('None'), _('Status'), _('Work phase'), _('Mode')]
+    _PROPERTY_VIEWS = dict(
+        basic=BasicView,
+        project=ProjectView,
+        chapter=ChapterView,
+        todoChapter=TodoChapterView,
+        todoScene=TodoSceneView,
+        notesScene=NotesSceneView,
+        scene=NormalSceneView,
+        character=CharacterView,
+        projectNote=ProjectnoteView,
+        worldElement=WorldElementView,
+        )
+    # Registry of the element properties views; key: view name, value: view class.
     _HELP_URL = 'https://peter88213.github.io/novelyst/help/help'
     _KEY_NEW_PROJECT = ('<Control-n>', 'Ctrl-N')
     _KEY_LOCK_PROJECT = ('<Control-l>', 'Ctrl-L')
@@ -147,12 +192,20 @@ class NovelystTk(MainTk):
     _KEY_SHOW_PLANNING = ('<F11>', 'F11')
     _KEY_SHOW_PROJECTNOTES = ('<F12>', 'F12')
     _KEY_SHOW_HELP = ('<F1>', 'F1')
+    _KEY_SEARCH = ('<Control-f>', 'Ctrl-F')
 
     _YW_CLASS = WorkFile
 
-    def __init__(self, colTitle, tempDir, **kwargs):
+    def __init__(self, colTitle, tempDir, cacheDir=None, **kwargs):
         """Load plugins and set up the application's user interface.
         
+        Positional arguments:
+            colTitle: str -- Application title.
+            tempDir: str -- Directory path for temporary files to be deleted on exit.
+            
+        Optional arguments:
+            cacheDir: str -- Directory path for persistent cache files; if None, caching is disabled.
+        
         Required keyword arguments:
             root_geometry: str -- geometry of the root window.
             middle_frame_width: int -- width of the chapter frame.
@@ -164,6 +217,9 @@ class NovelystTk(MainTk):
             color_text_bg: str -- tk color name for text box background.
             color_text_fg: str -- tk color name for text box foreground.
             coloring_mode: int -- Scene row coloring mode.
+            snapshot_cache_mb: int -- Size limit of the project snapshot cache in MB.
+            slow_hook_ms: int -- Duration of a plugin hook call in ms, above which the hook is reported as slow.
+            warm_views: str -- Semicolon-separated names of the properties views to be created in advance.
     
         Extends the superclass constructor.
         """
@@ -178,15 +234,31 @@ class NovelystTk(MainTk):
         self.plugins = PluginCollection(self)
         # dict-like Container for registered plugin objects
 
+        self.modelEvents = ModelEventBus(self.root.after_idle)
+        # changes are announced here; the subscribers are notified when the application is idle
+
         self.launchers = {}
         # launchers for opening linked non-standard filetypes.
 
         self.tempDir = tempDir
+        self.profiler = EventProfiler(os.path.join(tempDir, 'profile'))
+        # the report is placed in a subdirectory, so it is kept when the temporary files are deleted on exit
+        self.memoryReport = MemoryReport(self)
+        self.cacheDir = cacheDir
         self.kwargs = kwargs
+        self.plugins.slowHookThreshold = int(self.kwargs['slow_hook_ms']) / 1000
+        if self.cacheDir is not None:
+            WorkFile.snapshotCache = SnapshotCache(
+                f'{self.cacheDir}/snapshots',
+                int(self.kwargs['snapshot_cache_mb']) * 1000000
+                )
+            NvExporter.exportCache = ExportCache(f'{self.cacheDir}/exports.json')
         self._internalModificationFlag = False
         self._internalLockFlag = False
         self.exporter = NvDocExporter(self)
         self.reporter = NvReporter(self)
+        self.fileWatcher = FileWatcher(self.root, self._report_file_change)
+        self.searchIndexer = SearchIndexer(self.modelEvents)
         self.wordCount = 0
         self.reloading = False
         self.prjFile = None
@@ -203,6 +275,9 @@ class NovelystTk(MainTk):
         # "Delete yWriter-only data on save" state.
         self.cleanUpYw = self.kwargs['clean_up_yw']
 
+        # "Keep a backup history" state.
+        self.backupHistory = self.kwargs['backup_history']
+
         #--- Build the GUI frames.
 
         # Create an application window with three frames.
@@ -226,6 +301,12 @@ class NovelystTk(MainTk):
         if self.kwargs['show_contents']:
             self.middleFrame.pack(side='left', expand=False, fill='both')
 
+        # Let the views follow the model changes.
+        self.modelEvents.subscribe(self.tv.on_model_events)
+        self.modelEvents.subscribe(self.contentsViewer.on_model_events)
+        self.modelEvents.subscribe(self._on_model_events)
+        self.modelEvents.subscribe(self._on_model_change, immediate=True)
+
         #--- Build the main menu
         # Requires windows and frames initialized
 
@@ -235,7 +316,9 @@ class NovelystTk(MainTk):
         self.fileMenu.add_command(label=_('New'), accelerator=self._KEY_NEW_PROJECT[1], command=self.new_project)
         self.fileMenu.add_command(label=_('Open...'), accelerator=self._KEY_OPEN_PROJECT[1], command=self.open_project)
         self.fileMenu.add_command(label=_('Reload'), accelerator=self._KEY_RELOAD_PROJECT[1], command=self.reload_project)
+        self.fileMenu.add_command(label=_('Merge external changes'), command=self.merge_changes)
         self.fileMenu.add_command(label=_('Restore backup'), accelerator=self._KEY_RESTORE_BACKUP[1], command=self.restore_backup)
+        self.fileMenu.add_command(label=_('Restore from backup history...'), command=self.browse_backups)
         self.fileMenu.add_separator()
         self.fileMenu.add_command(label=_('Refresh Tree'), accelerator=self._KEY_REFRESH_TREE[1], command=self.refresh_tree)
         self.fileMenu.add_command(label=_('Lock'), accelerator=self._KEY_LOCK_PROJECT[1], command=self.lock)
@@ -268,6 +351,9 @@ class NovelystTk(MainTk):
         self.viewMenu.add_command(label=_('Toggle Text viewer'), accelerator=self._KEY_TOGGLE_VIEWER[1], command=self.toggle_viewer)
         self.viewMenu.add_command(label=_('Toggle Properties'), accelerator=self._KEY_TOGGLE_PROPERTIES[1], command=self.toggle_properties)
         self.viewMenu.add_command(label=_('Detach/Dock Properties'), accelerator=self._KEY_DETACH_PROPERTIES[1], command=self.toggle_properties_window)
+        self.viewMenu.add_separator()
+        self.viewMenu.add_command(label=_('Search...'), accelerator=self._KEY_SEARCH[1], command=self.search_project)
+        self.viewMenu.add_command(label=_('Find and replace...'), command=self.find_and_replace)
 
         # Part
         self.partMenu = tk.Menu(self.mainMenu, tearoff=0)
@@ -295,6 +381,7 @@ class NovelystTk(MainTk):
         self.sceneMenu.add_separator()
         self.sceneMenu.add_command(label=_('Export scene descriptions for editing'), command=lambda: self.export_document('_scenes'))
         self.sceneMenu.add_command(label=_('Export scene list (spreadsheet)'), command=lambda: self.export_document('_scenelist'))
+        self.sceneMenu.add_command(label=_('Show Timeline'), command=lambda: self._show_report('_timeline'))
 
         # Character
         self.characterMenu = tk.Menu(self.mainMenu, tearoff=0)
@@ -364,6 +451,8 @@ class NovelystTk(MainTk):
         self.toolsMenu.add_command(label=_('Program settings'), command=self.edit_settings)
         self.toolsMenu.add_command(label=_('Plugin Manager'), command=self.manage_plugins)
         self.toolsMenu.add_command(label=_('Open installation folder'), command=self.open_installationFolder)
+        self.toolsMenu.add_command(label=_('Start profiling'), command=self.toggle_profiling)
+        self.toolsMenu.add_command(label=_('Memory report'), command=self.show_memory_report)
         self.toolsMenu.add_separator()
 
         # Help
@@ -379,7 +468,9 @@ class NovelystTk(MainTk):
         self.rightFrame.pack_propagate(0)
         if self.kwargs['show_properties']:
             self.rightFrame.pack(expand=True, fill='both')
-        self._initialize_properties_frame(self.rightFrame)
+        self._propertiesFrame = DetachableFrame(self.rightFrame)
+        self._propertiesFrame.pack(expand=True, fill='both')
+        self._initialize_properties_frame(self._propertiesFrame)
         self._propWinDetached = False
         if self.kwargs['detach_prop_win']:
             self.detach_properties_frame()
@@ -398,6 +489,7 @@ class NovelystTk(MainTk):
         self.root.bind(self._KEY_TOGGLE_VIEWER[0], self.toggle_viewer)
         self.root.bind(self._KEY_TOGGLE_PROPERTIES[0], self.toggle_properties)
         self.root.bind(self._KEY_DETACH_PROPERTIES[0], self.toggle_properties_window)
+        self.root.bind(self._KEY_SEARCH[0], self.search_project)
         self.root.bind(self._KEY_GO_BACK[0], self.tv.go_back)
         self.root.bind(self._KEY_GO_FORWARD[0], self.tv.go_forward)
         if sys.platform == 'win32':
@@ -419,8 +511,10 @@ class NovelystTk(MainTk):
     @isModified.setter
     def isModified(self, setFlag):
         if setFlag:
-            self.contentsViewer.update()
             self._internalModificationFlag = True
+            if self.prjFile is not None:
+                self.prjFile.invalidate_columns()
+            self.modelEvents.publish_fallback()
             self.pathBar.config(bg=self.kwargs['color_modified_bg'])
             self.pathBar.config(fg=self.kwargs['color_modified_fg'])
         else:
@@ -456,6 +550,18 @@ class NovelystTk(MainTk):
             self.fileMenu.entryconfig(_('Lock'), state='normal')
             self.fileMenu.entryconfig(_('Unlock'), state='disabled')
 
+    def browse_backups(self, event=None):
+        """Open a toplevel window to restore a version from the backup history."""
+        backupStore = self._get_backup_store()
+        if not backupStore.get_backups():
+            self.set_info_how(f'!{_("No backup available")}')
+            return
+
+        offset = 300
+        __, x, y = self.root.geometry().split('+')
+        windowGeometry = f'+{int(x)+offset}+{int(y)+offset}'
+        BackupBrowser(self, backupStore, windowGeometry)
+
     def check_lock(self):
         """Show a message and return True, if the project is locked."""
         if self.isLocked:
@@ -479,6 +585,7 @@ class NovelystTk(MainTk):
         Extends the superclass method.
         """
         self._elementView.apply_changes()
+        self.fileWatcher.stop()
         self.contentsViewer.reset_view()
         self.plugins.on_close()
 
@@ -486,10 +593,15 @@ class NovelystTk(MainTk):
         if self.isModified and not self.reloading:
             if self.ask_yes_no(_('Save changes?')):
                 self.save_project()
+        if self.prjFile is not None and not self.isModified:
+            # Keep the snapshot and the index only if they match the project file.
+            self.prjFile.write_snapshot()
+        self.searchIndexer.stop(persist=not self.isModified)
         self.isModified = False
         self.view_nothing()
         self.tv.reset_tree()
         # this removes all children from the tree
+        self.modelEvents.discard()
         self.reloading = False
         self.isLocked = False
         self.novel = None
@@ -503,14 +615,11 @@ class NovelystTk(MainTk):
 
         if self.rightFrame.winfo_manager():
             self.rightFrame.pack_forget()
-        self._propertiesWindow = tk.Toplevel()
-        self._propertiesWindow.geometry(self.kwargs['prop_win_geometry'])
-        set_icon(self._propertiesWindow, icon='pLogo32', default=False)
-        self._elementView.pack_forget()
-        self._initialize_properties_frame(self._propertiesWindow)
-        self._elementView.pack()
+        self._propertiesFrame.detach()
+        self._propertiesFrame.geometry(self.kwargs['prop_win_geometry'])
+        set_icon(self._propertiesFrame, icon='pLogo32', default=False)
         self.show_properties()
-        self._propertiesWindow.protocol("WM_DELETE_WINDOW", self.dock_properties_frame)
+        self._propertiesFrame.protocol("WM_DELETE_WINDOW", self.dock_properties_frame)
         self.kwargs['detach_prop_win'] = True
         self._propWinDetached = True
 
@@ -530,7 +639,9 @@ class NovelystTk(MainTk):
         self.mainMenu.entryconfig(_('Export'), state='disabled')
         self.mainMenu.entryconfig(_('Project notes'), state='disabled')
         self.fileMenu.entryconfig(_('Reload'), state='disabled')
+        self.fileMenu.entryconfig(_('Merge external changes'), state='disabled')
         self.fileMenu.entryconfig(_('Restore backup'), state='disabled')
+        self.fileMenu.entryconfig(_('Restore from backup history...'), state='disabled')
         self.fileMenu.entryconfig(_('Refresh Tree'), state='disabled')
         self.fileMenu.entryconfig(_('Lock'), state='disabled')
         self.fileMenu.entryconfig(_('Unlock'), state='disabled')
@@ -562,13 +673,12 @@ class NovelystTk(MainTk):
         if not self._propWinDetached:
             return
 
-        self._initialize_properties_frame(self.rightFrame)
+        self.kwargs['prop_win_geometry'] = self._propertiesFrame.winfo_geometry()
+        self._propertiesFrame.dock()
+        self._propertiesFrame.pack(expand=True, fill='both')
         if not self.rightFrame.winfo_manager():
             self.rightFrame.pack(side='left', expand=False, fill='both')
-        self._elementView.pack()
         self.show_properties()
-        self.kwargs['prop_win_geometry'] = self._propertiesWindow.winfo_geometry()
-        self._propertiesWindow.destroy()
         self.kwargs['show_properties'] = True
         self.kwargs['detach_prop_win'] = False
         self._propWinDetached = False
@@ -597,7 +707,9 @@ class NovelystTk(MainTk):
         self.mainMenu.entryconfig(_('Export'), state='normal')
         self.mainMenu.entryconfig(_('Project notes'), state='normal')
         self.fileMenu.entryconfig(_('Reload'), state='normal')
+        self.fileMenu.entryconfig(_('Merge external changes'), state='normal')
         self.fileMenu.entryconfig(_('Restore backup'), state='normal')
+        self.fileMenu.entryconfig(_('Restore from backup history...'), state='normal')
         self.fileMenu.entryconfig(_('Refresh Tree'), state='normal')
         self.fileMenu.entryconfig(_('Lock'), state='normal')
         self.fileMenu.entryconfig(_('Open Project folder'), state='normal')
@@ -617,6 +729,27 @@ class NovelystTk(MainTk):
         self._elementView.apply_changes()
         self.exporter.run(self.prjFile, suffix, **kwargs)
 
+    def find_and_replace(self, event=None):
+        """Open a window for a project-wide find and replace."""
+        if self.prjFile is None:
+            return
+
+        offset = 300
+        __, x, y = self.root.geometry().split('+')
+        windowGeometry = f'+{int(x)+offset}+{int(y)+offset}'
+        FindReplaceWindow(self, windowGeometry)
+
+    def find_replacements(self, replacer):
+        """Apply changes and return a list of the replacements found in the project.
+
+        Positional arguments:
+            replacer: TextReplacer -- The replacer to use.
+
+        The novel is not modified; see TextReplacer.find() for the list entries.
+        """
+        self._elementView.apply_changes()
+        return replacer.find(self.novel)
+
     def import_characters(self):
         """Import characters from an XML data file."""
         self.restore_status()
@@ -705,6 +838,92 @@ class NovelystTk(MainTk):
         windowGeometry = f'+{int(x)+offset}+{int(y)+offset}'
         PluginManager(self, windowGeometry)
 
+    def merge_changes(self, event=None):
+        """Merge external changes of the project file into the model.
+        
+        Keep the tree state and unsaved changes; report conflicts.
+        """
+        if self.prjFile.is_locked():
+            self.set_info_how(f'!{_("yWriter seems to be open. Please close first")}.')
+            return
+
+        if not self.prjFile.has_changed_on_disk():
+            self.set_info_how(_('The project file has not changed on disk.'))
+            return
+
+        self._elementView.apply_changes()
+        wasModified = self.isModified
+        try:
+            merger = self.prjFile.merge()
+        except Error as ex:
+            self.set_info_how(f'!{str(ex)}')
+            return
+
+        #--- Update the tree.
+        prefixes = dict(
+            scenes=self.tv.SCENE_PREFIX,
+            characters=self.tv.CHARACTER_PREFIX,
+            locations=self.tv.LOCATION_PREFIX,
+            items=self.tv.ITEM_PREFIX,
+            projectNotes=self.tv.PRJ_NOTE_PREFIX,
+            )
+        nodes = []
+        isStructureChanged = False
+        for collection in merger.changed:
+            if collection == merger.NOVEL_KEY:
+                continue
+
+            if not collection in prefixes:
+                # Chapters or sort order: the tree structure may have changed.
+                isStructureChanged = True
+                break
+
+            for elemId in merger.changed[collection]:
+                node = f'{prefixes[collection]}{elemId}'
+                if elemId in getattr(self.novel, collection) and self.tv.tree.exists(node):
+                    nodes.append(node)
+                else:
+                    isStructureChanged = True
+        if isStructureChanged:
+            self.tv.rebuild_tree()
+        else:
+            self.tv.update_nodes(nodes)
+
+        #--- Update the other views, whether the project is regarded as modified or not.
+        # The contents viewer, the search index, and the plugins are notified by the model event.
+        if merger.changed:
+            self.modelEvents.publish(ModelEventBus.FIELD_CHANGED, None, sender=self.tv)
+        self.show_path(_('{0} (last saved on {1})').format(norm_path(self.prjFile.filePath), self.prjFile.fileDate))
+        self.show_status()
+        self.show_properties()
+        if merger.conflicts or wasModified:
+            self.isModified = True
+        else:
+            self.isModified = False
+
+        #--- Report the result.
+        changeCount = 0
+        for collection in merger.changed:
+            changeCount += len(merger.changed[collection])
+        if merger.conflicts:
+            conflicts = []
+            for collection, elemId in merger.conflicts:
+                try:
+                    title = getattr(self.novel, collection)[elemId].title
+                except:
+                    if collection == merger.NOVEL_KEY:
+                        title = _('Book')
+                    elif elemId is None:
+                        title = _('Sort order')
+                    else:
+                        title = elemId
+                conflicts.append(f'- {title}')
+            self.show_info(
+                '\n'.join(conflicts),
+                title=_('{0} external changes merged; not applied due to unsaved changes').format(changeCount)
+                )
+        self.set_info_how(f'{_("External changes merged")}: {changeCount}')
+
     def new_project(self, event=None):
         """Create a novelyst project instance."""
         if self.prjFile is not None:
@@ -725,12 +944,15 @@ class NovelystTk(MainTk):
             self.enable_menu()
             self.tv.build_tree()
             self.show_status()
+            self.contentsViewer.view_text()
             self.isModified = True
+            self.searchIndexer.start(self.prjFile)
 
             #--- Initialize custom keyword variables.
             for fieldName in self.prjFile.PRJ_KWVAR:
                 self.novel.kwVar[fieldName] = None
             self.novel.kwVar['Field_WorkPhase'] = 1
+            self.fileWatcher.start(self.prjFile)
 
     def on_quit(self, event=None):
         """Save changes and keyword arguments before exiting the program."""
@@ -748,13 +970,18 @@ class NovelystTk(MainTk):
             # Save "Delete yWriter-only data on save" state.
             self.kwargs['clean_up_yw'] = self.cleanUpYw
 
+            # Save "Keep a backup history" state.
+            self.kwargs['backup_history'] = self.backupHistory
+
             # Save scene coloring mode.
             self.kwargs['coloring_mode'] = self.coloringMode
 
             # Save windows size and position.
             if self._propWinDetached:
-                self.kwargs['prop_win_geometry'] = self._propertiesWindow.winfo_geometry()
+                self.kwargs['prop_win_geometry'] = self._propertiesFrame.winfo_geometry()
             self.tv.on_quit()
+            if self.profiler.isEnabled:
+                self.toggle_profiling()
             super().on_quit()
         except Exception as ex:
             self.show_error(str(ex), title='ERROR: Unhandled exception on exit')
@@ -787,6 +1014,8 @@ class NovelystTk(MainTk):
         if not super().open_project(fileName):
             return False
 
+        self.prjFile.keepColumns = True
+        # All model changes are announced, so the scene columns can be kept until then.
         self.show_path(_('{0} (last saved on {1})').format(norm_path(self.prjFile.filePath), self.prjFile.fileDate))
         self.tv.build_tree()
         self.show_status()
@@ -797,6 +1026,8 @@ class NovelystTk(MainTk):
             self.isModified = False
         if self.prjFile.has_lockfile():
             self.isLocked = True
+        self.fileWatcher.start(self.prjFile)
+        self.searchIndexer.start(self.prjFile)
         return True
 
     def open_projectFolder(self, event=None):
@@ -838,6 +1069,58 @@ class NovelystTk(MainTk):
         self.open_project(self.prjFile.filePath)
         # Includes closing
 
+    def replace_in_project(self, replacer, changes, undo=False):
+        """Apply replacements to the project; return their number.
+
+        Positional arguments:
+            replacer: TextReplacer -- The replacer that has found the changes.
+            changes: list -- Changes as returned by find_replacements().
+
+        Optional arguments:
+            undo: bool -- If True, revert the changes applied before.
+
+        The changes are applied all at once; then the views are updated only for the elements changed.
+        Return None, if nothing has been changed.
+        """
+        if self.check_lock():
+            return None
+
+        self._elementView.apply_changes()
+        try:
+            if undo:
+                replacer.undo(self.novel, changes)
+            else:
+                replacer.apply(self.novel, changes)
+        except Error as ex:
+            self.set_info_how(f'!{str(ex)}')
+            return None
+
+        prefixes = dict(
+            scenes=self.tv.SCENE_PREFIX,
+            characters=self.tv.CHARACTER_PREFIX,
+            locations=self.tv.LOCATION_PREFIX,
+            items=self.tv.ITEM_PREFIX,
+            projectNotes=self.tv.PRJ_NOTE_PREFIX,
+            )
+        self.modelEvents.begin_batch()
+        for (collection, elemId, field), __, __, __ in changes:
+            if collection in prefixes:
+                node = f'{prefixes[collection]}{elemId}'
+            elif self.novel.chapters[elemId].chLevel == 1:
+                node = f'{self.tv.PART_PREFIX}{elemId}'
+            else:
+                node = f'{self.tv.CHAPTER_PREFIX}{elemId}'
+            self.modelEvents.publish(ModelEventBus.FIELD_CHANGED, node, field, sender=self)
+        self.modelEvents.end_batch()
+        self.isModified = True
+        self.show_properties()
+        count = sum(change[3] for change in changes)
+        if undo:
+            self.set_info_how(f'{_("Replacements undone")}: {count}')
+        else:
+            self.set_info_how(f'{_("Replacements")}: {count}')
+        return count
+
     def restore_backup(self, event=None):
         """Discard changes and restore the latest backup file."""
         latestBackup = f'{self.prjFile.filePath}.bak'
@@ -863,6 +1146,28 @@ class NovelystTk(MainTk):
         self.open_project(self.prjFile.filePath)
         # Includes closing
 
+    def restore_from_history(self, backupStore, backupId):
+        """Discard changes and restore a version from the backup history.
+
+        Positional arguments:
+            backupStore: BackupStore -- The project's backup history.
+            backupId: str -- ID of the version to restore.
+
+        The current project file is added to the backup history before,
+        so restoring can be undone.
+        """
+        try:
+            backupStore.add(self.prjFile.filePath)
+            backupStore.restore(backupId, self.prjFile.filePath)
+        except Error as ex:
+            self.set_info_how(f'!{str(ex)}')
+            return
+
+        self.reloading = True
+        # This is to avoid another question when closing the project
+        self.open_project(self.prjFile.filePath)
+        # Includes closing
+
     def save_as(self, event=None):
         """Rename the project file and save it to disk.
         
@@ -881,6 +1186,7 @@ class NovelystTk(MainTk):
                     self.show_path(f'{norm_path(self.prjFile.filePath)} ({_("last saved on")} {self.prjFile.fileDate})')
                     self.isModified = False
                     self.restore_status()
+                    self._add_to_backup_history()
                     self.kwargs['yw_last_open'] = self.prjFile.filePath
                     return True
 
@@ -914,13 +1220,46 @@ class NovelystTk(MainTk):
         self.show_path(f'{norm_path(self.prjFile.filePath)} ({_("last saved on")} {self.prjFile.fileDate})')
         self.isModified = False
         self.restore_status()
+        self._add_to_backup_history()
         self.kwargs['yw_last_open'] = self.prjFile.filePath
         return True
 
+    def search(self, query):
+        """Apply changes and return a list of matching document keys, or None while indexing.
+
+        Positional arguments:
+            query: str -- Search terms; see SearchIndex for the syntax.
+
+        A document key is a (collection name, element ID, field name) tuple.
+        """
+        self._elementView.apply_changes()
+        return self.searchIndexer.search(query)
+
+    def search_project(self, event=None):
+        """Open a window for a full-text search of the project."""
+        if self.prjFile is None:
+            return
+
+        offset = 300
+        __, x, y = self.root.geometry().split('+')
+        windowGeometry = f'+{int(x)+offset}+{int(y)+offset}'
+        SearchWindow(self, windowGeometry)
+
     def show_chapter_level(self, event=None):
         """Open all Book/part nodes and close all chapter nodes in the tree viewer."""
         self.tv.show_chapters(self.tv.NV_ROOT)
 
+    def show_memory_report(self, event=None):
+        """Write a report of the memory used by the project, and open it."""
+        self._elementView.apply_changes()
+        try:
+            reportPath = self.memoryReport.create()
+        except OSError as ex:
+            self.set_info_how(f'!{_("Cannot write the memory report")}: {str(ex)}')
+        else:
+            self.set_info_how(_('Memory report written to "{}".').format(norm_path(reportPath)))
+            open_document(reportPath)
+
     def show_properties(self):
         """Show the properties of the selected element."""
         try:
@@ -964,6 +1303,24 @@ class NovelystTk(MainTk):
         else:
             self.lock()
 
+    def toggle_profiling(self, event=None):
+        """Start/stop measuring the event handlers.
+        
+        On stopping, write the report and open it.
+        """
+        if self.profiler.isEnabled:
+            reportPath = self.profiler.stop()
+            self.toolsMenu.entryconfig(_('Stop profiling'), label=_('Start profiling'))
+            if reportPath is None:
+                self.set_info_how(f'!{_("Cannot write the profiling report")}.')
+            else:
+                self.set_info_how(_('Profiling report written to "{}".').format(norm_path(reportPath)))
+                open_document(reportPath)
+        else:
+            self.profiler.start()
+            self.toolsMenu.entryconfig(_('Start profiling'), label=_('Stop profiling'))
+            self.set_info_how(_('Profiling started.'))
+
     def toggle_viewer(self, event=None):
         """Show/hide the contents viewer text box."""
         if self.middleFrame.winfo_manager():
@@ -1007,15 +1364,9 @@ class NovelystTk(MainTk):
         """
         self._elementView.apply_changes()
         if self.novel.chapters[chId].chLevel == 0 and self.novel.chapters[chId].chType == 2:
-            if not self._elementView is self._todoChapterView:
-                self._elementView.hide()
-                self._elementView = self._todoChapterView
-                self._elementView.show()
+            self._show_view('todoChapter')
         else:
-            if not self._elementView is self._chapterView:
-                self._elementView.hide()
-                self._elementView = self._chapterView
-                self._elementView.show()
+            self._show_view('chapter')
         self._elementView.set_data(self.novel.chapters[chId])
         self.contentsViewer.see(f'ch{chId}')
 
@@ -1026,10 +1377,7 @@ class NovelystTk(MainTk):
             crId: str -- character ID
         """
         self._elementView.apply_changes()
-        if not self._elementView is self._characterView:
-            self._elementView.hide()
-            self._elementView = self._characterView
-            self._elementView.show()
+        self._show_view('character')
         self._elementView.set_data(self.novel.characters[crId])
 
     def view_item(self, itId):
@@ -1039,10 +1387,7 @@ class NovelystTk(MainTk):
             itId: str -- item ID
         """
         self._elementView.apply_changes()
-        if not self._elementView is self._worldElementView:
-            self._elementView.hide()
-            self._elementView = self._worldElementView
-            self._elementView.show()
+        self._show_view('worldElement')
         self._elementView.set_data(self.novel.items[itId])
 
     def view_location(self, lcId):
@@ -1052,28 +1397,20 @@ class NovelystTk(MainTk):
             lcId: str -- location ID
         """
         self._elementView.apply_changes()
-        if not self._elementView is self._worldElementView:
-            self._elementView.hide()
-            self._elementView = self._worldElementView
-            self._elementView.show()
+        self._show_view('worldElement')
         self._elementView.set_data(self.novel.locations[lcId])
 
     def view_narrative(self):
         """Show the project's properties."""
         self._elementView.apply_changes()
-        if not self._elementView is self._projectView:
-            self._elementView.hide()
-            self._elementView = self._projectView
-            self._elementView.show()
+        self._show_view('project')
         self._elementView.set_data(self.novel)
 
     def view_nothing(self):
         """Reset properties if nothing valid is selected."""
-        if not self._elementView is self._basicView:
+        if not self._elementView is self._propertyViews['basic']:
             self._elementView.apply_changes()
-            self._elementView.hide()
-            self._elementView = self._basicView
-            self._elementView.show()
+            self._show_view('basic')
 
     def view_projectNote(self, pnId):
         """Show the selected project note.
@@ -1082,10 +1419,7 @@ class NovelystTk(MainTk):
             pnId: str -- Project note ID
         """
         self._elementView.apply_changes()
-        if not self._elementView is self._projectnoteView:
-            self._elementView.hide()
-            self._elementView = self._projectnoteView
-            self._elementView.show()
+        self._show_view('projectNote')
         self._elementView.set_data(self.novel.projectNotes[pnId])
 
     def view_scene(self, scId):
@@ -1096,45 +1430,111 @@ class NovelystTk(MainTk):
         """
         self._elementView.apply_changes()
         if self.novel.scenes[scId].scType == 2:
-            if not self._elementView is self._todoSceneView:
-                self._elementView.hide()
-                self._elementView = self._todoSceneView
-                self._elementView.show()
+            self._show_view('todoScene')
         elif self.novel.scenes[scId].scType == 1:
-            if not self._elementView is self._notesSceneView:
-                self._elementView.hide()
-                self._elementView = self._notesSceneView
-                self._elementView.show()
+            self._show_view('notesScene')
         else:
-            if not self._elementView is self._sceneView:
-                self._elementView.hide()
-                self._elementView = self._sceneView
-                self._elementView.show()
+            self._show_view('scene')
         self._elementView.set_data(self.novel.scenes[scId])
         self.contentsViewer.see(f'sc{scId}')
 
+    def _add_to_backup_history(self):
+        """Add the saved project file to the backup history, if enabled."""
+        if not self.backupHistory:
+            return
+
+        try:
+            self._get_backup_store().add(self.prjFile.filePath)
+        except Error as ex:
+            self.set_info_how(f'!{str(ex)}')
+
     def _build_main_menu(self):
         """Overrides the superclass template method."""
         pass
 
+    def _get_backup_store(self):
+        """Return the backup history of the current project file.
+
+        The history is stored in a directory next to the project file.
+        """
+        fileName, __ = os.path.splitext(self.prjFile.filePath)
+        return BackupStore(
+            f'{fileName}_backup',
+            keepLast=int(self.kwargs['backup_keep_last']),
+            keepHourly=int(self.kwargs['backup_keep_hourly']),
+            keepDaily=int(self.kwargs['backup_keep_daily']),
+            keepWeekly=int(self.kwargs['backup_keep_weekly']),
+            )
+
     def _initialize_properties_frame(self, parent):
-        """Initialize element properties views.
+        """Initialize the registry of element properties views.
         
-        This method is called e.g. when detaching or docking the properties.
+        Positional arguments:
+            parent -- Frame where the views are placed.
+            
+        The views are created on first use, except those listed in the "warm_views" setting,
+        which are created as soon as the application is idle.
         """
-        self._basicView = BasicView(self, parent)
-        self._projectView = ProjectView(self, parent)
-        self._chapterView = ChapterView(self, parent)
-        self._todoChapterView = TodoChapterView(self, parent)
-        self._todoSceneView = TodoSceneView(self, parent)
-        self._notesSceneView = NotesSceneView(self, parent)
-        self._sceneView = NormalSceneView(self, parent)
-        self._characterView = CharacterView(self, parent)
-        self._projectnoteView = ProjectnoteView(self, parent)
-        self._worldElementView = WorldElementView(self, parent)
-
-        self._elementView = self._basicView
+        self._propertyViewParent = parent
+        self._propertyViews = {}
+        self._elementView = self._get_view('basic')
         self._elementView.set_data(None)
+        for viewName in string_to_list(self.kwargs['warm_views']):
+            if viewName in self._PROPERTY_VIEWS:
+                self.root.after_idle(self._get_view, viewName)
+
+    def _get_view(self, viewName):
+        """Return the element properties view; create it on first use.
+        
+        Positional arguments:
+            viewName: str -- Key of the view in the _PROPERTY_VIEWS registry.
+        """
+        try:
+            return self._propertyViews[viewName]
+
+        except KeyError:
+            view = self._PROPERTY_VIEWS[viewName](self, self._propertyViewParent)
+            self._propertyViews[viewName] = view
+            return view
+
+    def _on_model_change(self, events):
+        """Discard the scene columns as soon as the model changes, and keep the timeline index up to date."""
+        if self.prjFile is None:
+            return
+
+        self.prjFile.invalidate_columns()
+        for event in events:
+            if event.kind == ModelEventBus.FIELD_CHANGED and event.node and event.field is not None:
+                if event.field in TimelineIndex.SCENE_FIELDS:
+                    if event.node.startswith(self.tv.SCENE_PREFIX):
+                        self.prjFile.update_timeline(event.node[2:])
+                    continue
+
+                if not event.field in TimelineIndex.TYPE_FIELDS:
+                    continue
+
+            self.prjFile.invalidate_timeline()
+
+    def _on_model_events(self, events):
+        """Update the status bar after model changes."""
+        if self.novel is not None:
+            self.show_status()
+
+    def _report_file_change(self):
+        """Tell the user that the project file has been changed by another application."""
+        self.set_info_how(f'!{_("The project file has changed on disk. Use File > Merge external changes")}.')
+
+    def _show_view(self, viewName):
+        """Replace the displayed element properties view, if needed.
+        
+        Positional arguments:
+            viewName: str -- Key of the view in the _PROPERTY_VIEWS registry.
+        """
+        view = self._get_view(viewName)
+        if not self._elementView is view:
+            self._elementView.hide()
+            self._elementView = view
+            self._elementView.show()
 
     def _show_report(self, suffix):
         """Create HTML report for the web browser."""
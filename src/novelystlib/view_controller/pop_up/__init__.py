@@ -1,8 +1,11 @@
 """Modules for novelyst pop-up view-controller classes.
 
 Modules:
+backup_browser -- Provide a class for a backup history browser.
 data_importer -- Provide a class for a data import pick list.
+find_replace_window -- Provide a class for a project-wide find and replace window.
 plugin_manager -- Provide a class for a plugin manager.
+search_window -- Provide a class for a full-text search window.
 settings_window -- Provide a class for program settings.
 
 Copyright (c) 2023 Peter Triesberger
@@ -0,0 +1,68 @@
+"""Provide a class for a backup history browser.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import tkinter as tk
+from tkinter import ttk
+from pywriter.pywriter_globals import *
+
+
+class BackupBrowser(tk.Toplevel):
+
+    def __init__(self, ui, backupStore, size, **kw):
+        self._ui = ui
+        self._backupStore = backupStore
+        super().__init__(**kw)
+        self.title(f'{_("Backup history")} - {self._ui.novel.title}')
+        self.geometry(size)
+        self.grab_set()
+        self.focus()
+        window = ttk.Frame(self)
+        window.pack(fill='both', expand=True)
+
+        columns = 'Date', 'Size'
+        self._backupCollection = ttk.Treeview(window, columns=columns, show='headings', selectmode='browse')
+        scrollY = ttk.Scrollbar(self._backupCollection, orient='vertical', command=self._backupCollection.yview)
+        self._backupCollection.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self._backupCollection.pack(fill='both', expand=True)
+        self._backupCollection.bind('<<TreeviewSelect>>', self._on_select_backup)
+        self._backupCollection.bind('<Double-1>', self._restore)
+
+        self._backupCollection.column('Date', width=200, minwidth=150, stretch=False)
+        self._backupCollection.heading('Date', text=_('Date'), anchor='w')
+        self._backupCollection.column('Size', width=100, minwidth=100, stretch=True)
+        self._backupCollection.heading('Size', text=_('Size'), anchor='w')
+
+        for backupId, timestamp, size in self._backupStore.get_backups():
+            self._backupCollection.insert('', 'end', backupId, values=[timestamp, f'{size // 1000} kB'])
+
+        # "Restore" button.
+        self._restoreButton = ttk.Button(window, text=_('Restore'), command=self._restore, state='disabled')
+        self._restoreButton.pack(padx=5, pady=5, side='left')
+
+        # "Exit" button.
+        ttk.Button(window, text=_('Exit'), command=self.destroy).pack(padx=5, pady=5, side='left')
+
+    def _on_select_backup(self, event):
+        if self._backupCollection.selection():
+            self._restoreButton.configure(state='normal')
+        else:
+            self._restoreButton.configure(state='disabled')
+
+    def _restore(self, event=None):
+        try:
+            backupId = self._backupCollection.selection()[0]
+        except IndexError:
+            return
+
+        timestamp = self._backupCollection.item(backupId)['values'][0]
+        if self._ui.isModified:
+            question = _('Discard changes and restore the backup?')
+        else:
+            question = _('Restore the backup?')
+        if self._ui.ask_yes_no(question, timestamp):
+            self.destroy()
+            self._ui.restore_from_history(self._backupStore, backupId)
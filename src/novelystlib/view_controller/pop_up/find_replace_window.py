@@ -0,0 +1,172 @@
+"""Provide a class for a project-wide find and replace window.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import tkinter as tk
+from tkinter import ttk
+from pywriter.pywriter_globals import *
+from novelystlib.model.text_replacer import TextReplacer
+
+
+class FindReplaceWindow(tk.Toplevel):
+    """Find and replace text in the whole project.
+
+    The changes are listed for preview; only the selected ones are applied.
+    The last replacement can be undone, as long as the texts have not been modified since.
+    """
+    _FIELD_NAMES = dict(
+        desc=_('Description'),
+        sceneContent=_('Content'),
+        notes=_('Notes'),
+        goal=_('Goal'),
+        conflict=_('Conflict'),
+        outcome=_('Outcome'),
+        bio=_('Bio'),
+        goals=_('Goals'),
+        )
+
+    def __init__(self, ui, size, **kw):
+        self._ui = ui
+        super().__init__(**kw)
+        self.title(f'{_("Find and replace")} - {self._ui.novel.title}')
+        self.geometry(size)
+        self.focus()
+        self._replacer = None
+        self._changes = {}
+        # key: tree item ID, value: change as returned by TextReplacer.find()
+        self._appliedChanges = []
+        # changes applied by the last replacement
+        window = ttk.Frame(self)
+        window.pack(fill='both', expand=True)
+
+        # Search options.
+        optionsFrame = ttk.Frame(window)
+        optionsFrame.pack(fill='x')
+        optionsFrame.columnconfigure(1, weight=1)
+        ttk.Label(optionsFrame, text=_('Find')).grid(row=0, column=0, padx=5, pady=2, sticky='w')
+        self._searchStr = tk.StringVar()
+        searchEntry = ttk.Entry(optionsFrame, textvariable=self._searchStr)
+        searchEntry.grid(row=0, column=1, padx=5, pady=2, sticky='ew')
+        searchEntry.bind('<Return>', self._preview)
+        searchEntry.focus_set()
+        ttk.Label(optionsFrame, text=_('Replace with')).grid(row=1, column=0, padx=5, pady=2, sticky='w')
+        self._replaceStr = tk.StringVar()
+        replaceEntry = ttk.Entry(optionsFrame, textvariable=self._replaceStr)
+        replaceEntry.grid(row=1, column=1, padx=5, pady=2, sticky='ew')
+        replaceEntry.bind('<Return>', self._preview)
+        self._isRegex = tk.BooleanVar(value=False)
+        ttk.Checkbutton(optionsFrame, text=_('Regular expression'), variable=self._isRegex).grid(row=0, column=2, padx=5, pady=2, sticky='w')
+        self._matchCase = tk.BooleanVar(value=True)
+        ttk.Checkbutton(optionsFrame, text=_('Match case'), variable=self._matchCase).grid(row=1, column=2, padx=5, pady=2, sticky='w')
+        ttk.Button(optionsFrame, text=_('Preview'), command=self._preview).grid(row=0, column=3, padx=5, pady=2, sticky='ew')
+        ttk.Button(optionsFrame, text=_('Replace'), command=self._replace).grid(row=1, column=3, padx=5, pady=2, sticky='ew')
+        self._undoButton = ttk.Button(optionsFrame, text=_('Undo'), command=self._undo, state='disabled')
+        self._undoButton.grid(row=2, column=3, padx=5, pady=2, sticky='ew')
+
+        # Change list.
+        columns = 'Element', 'Field', 'Count', 'Context'
+        self._changeCollection = ttk.Treeview(window, columns=columns, show='headings', selectmode='extended')
+        scrollY = ttk.Scrollbar(self._changeCollection, orient='vertical', command=self._changeCollection.yview)
+        self._changeCollection.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self._changeCollection.pack(fill='both', expand=True)
+
+        self._changeCollection.column('Element', width=200, minwidth=120, stretch=False)
+        self._changeCollection.heading('Element', text=_('Element'), anchor='w')
+        self._changeCollection.column('Field', width=100, minwidth=100, stretch=False)
+        self._changeCollection.heading('Field', text=_('Field'), anchor='w')
+        self._changeCollection.column('Count', width=60, minwidth=60, stretch=False)
+        self._changeCollection.heading('Count', text=_('Count'), anchor='w')
+        self._changeCollection.column('Context', width=400, stretch=True)
+        self._changeCollection.heading('Context', text=_('Context'), anchor='w')
+
+        # Status display.
+        self._status = tk.StringVar()
+        ttk.Label(window, textvariable=self._status).pack(padx=5, pady=5, side='left')
+
+        # "Exit" button.
+        ttk.Button(window, text=_('Exit'), command=self.destroy).pack(padx=5, pady=5, side='right')
+
+    def _get_field_name(self, field):
+        """Return the displayed name of a document field."""
+        if field in self._FIELD_NAMES:
+            return self._FIELD_NAMES[field]
+
+        if field.startswith('Field_'):
+            return field[len('Field_'):]
+
+        if field.startswith('field'):
+            fieldTitle = getattr(self._ui.novel, f'fieldTitle{field[-1]}', None)
+            if fieldTitle:
+                return fieldTitle
+
+        return field
+
+    def _clear(self):
+        self._changeCollection.delete(*self._changeCollection.get_children())
+        self._changes = {}
+
+    def _preview(self, event=None):
+        """List the changes; select all of them."""
+        self._clear()
+        try:
+            self._replacer = TextReplacer(
+                self._searchStr.get(),
+                self._replaceStr.get(),
+                isRegex=self._isRegex.get(),
+                matchCase=self._matchCase.get(),
+                )
+        except Error as ex:
+            self._replacer = None
+            self._status.set(str(ex))
+            return
+
+        changes = self._ui.find_replacements(self._replacer)
+        for change in changes:
+            collection, elemId, field = change[0]
+            itemId = f'{collection}:{elemId}:{field}'
+            self._changes[itemId] = change
+            self._changeCollection.insert(
+                '',
+                'end',
+                itemId,
+                values=[
+                    getattr(self._ui.novel, collection)[elemId].title or '',
+                    self._get_field_name(field),
+                    change[3],
+                    self._replacer.get_context(change),
+                    ],
+                )
+        if self._changes:
+            self._changeCollection.selection_set(*self._changes)
+        self._status.set(f'{sum(change[3] for change in changes)} {_("matches")}')
+
+    def _replace(self, event=None):
+        """Apply the selected changes."""
+        if self._replacer is None:
+            return
+
+        changes = [self._changes[itemId] for itemId in self._changeCollection.selection()]
+        if not changes:
+            self._status.set(_('Nothing selected'))
+            return
+
+        count = self._ui.replace_in_project(self._replacer, changes)
+        self._clear()
+        if count is not None:
+            self._appliedChanges = changes
+            self._undoButton.configure(state='normal')
+            self._status.set(f'{count} {_("replacements")}')
+
+    def _undo(self, event=None):
+        """Revert the last replacement."""
+        if not self._appliedChanges:
+            return
+
+        count = self._ui.replace_in_project(self._replacer, self._appliedChanges, undo=True)
+        if count is not None:
+            self._appliedChanges = []
+            self._undoButton.configure(state='disabled')
+            self._status.set(f'{count} {_("replacements undone")}')
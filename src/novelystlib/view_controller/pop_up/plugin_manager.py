@@ -8,6 +8,7 @@ import tkinter as tk
 import webbrowser
 from tkinter import ttk
 from pywriter.pywriter_globals import *
+from novelystlib.plugin.lazy_plugin import LazyPlugin
 
 
 class PluginManager(tk.Toplevel):
@@ -22,12 +23,13 @@ class PluginManager(tk.Toplevel):
         window = ttk.Frame(self)
         window.pack(fill='both', expand=True)
 
-        columns = 'Module', 'Version', 'novelyst API', 'Description'
+        columns = 'Module', 'Version', 'novelyst API', 'Load time', 'Slowest hook', 'Description'
         self._moduleCollection = ttk.Treeview(window, columns=columns, show='headings', selectmode='browse')
         self._moduleCollection.pack(fill='both', expand=True)
         self._moduleCollection.bind('<<TreeviewSelect>>', self._on_select_module)
         self._moduleCollection.tag_configure('rejected', foreground='red')
         self._moduleCollection.tag_configure('inactive', foreground='gray')
+        self._moduleCollection.tag_configure('slow', foreground='dark orange')
 
         self._moduleCollection.column('Module', width=150, minwidth=120, stretch=False)
         self._moduleCollection.heading('Module', text=_('Module'), anchor='w')
@@ -35,6 +37,10 @@ class PluginManager(tk.Toplevel):
         self._moduleCollection.heading('Version', text=_('Version'), anchor='w')
         self._moduleCollection.column('novelyst API', width=100, minwidth=100, stretch=False)
         self._moduleCollection.heading('novelyst API', text=_('novelyst API'), anchor='w')
+        self._moduleCollection.column('Load time', width=100, minwidth=100, stretch=False)
+        self._moduleCollection.heading('Load time', text=_('Load time'), anchor='w')
+        self._moduleCollection.column('Slowest hook', width=150, minwidth=100, stretch=False)
+        self._moduleCollection.heading('Slowest hook', text=_('Slowest hook'), anchor='w')
         self._moduleCollection.column('Description', width=400, stretch=True)
         self._moduleCollection.heading('Description', text=_('Description'), anchor='w')
 
@@ -52,13 +58,28 @@ class PluginManager(tk.Toplevel):
                 apiRequired = self._ui.plugins[moduleName].NOVELYST_API
             except:
                 apiRequired = _('unknown')
-            columns = [moduleName, version, apiRequired, description]
+            if moduleName in self._ui.plugins.loadTimes:
+                loadTime = f'{self._ui.plugins.loadTimes[moduleName] * 1000:.0f} ms'
+            elif isinstance(self._ui.plugins[moduleName], LazyPlugin):
+                loadTime = _('Not loaded')
+            else:
+                loadTime = ''
+            hookStatistics = self._ui.plugins.get_hook_statistics(moduleName)
+            if hookStatistics:
+                hook = max(hookStatistics, key=lambda h: hookStatistics[h][1])
+                slowestHook = f'{hook} {hookStatistics[hook][1] * 1000:.0f} ms'
+            else:
+                slowestHook = ''
+            columns = [moduleName, version, apiRequired, loadTime, slowestHook, description]
             if self._ui.plugins[moduleName].isRejected:
                 nodeTags.append('rejected')
                 # Mark rejected modules, represented by a dummy.
             elif not self._ui.plugins[moduleName].isActive:
                 nodeTags.append('inactive')
                 # Mark loaded yet incompatible modules.
+            elif self._ui.plugins.is_slow(moduleName) or moduleName in self._ui.plugins.errorLog:
+                nodeTags.append('slow')
+                # Mark modules with slow or failing hooks.
             self._moduleCollection.insert('', 'end', moduleName, values=columns, tags=tuple(nodeTags))
 
         # "Home page" button.
@@ -69,6 +90,10 @@ class PluginManager(tk.Toplevel):
         self._deleteButton = ttk.Button(window, text=_('Delete'), command=self._delete_module, state='disabled')
         self._deleteButton.pack(padx=5, pady=5, side='left')
 
+        # "Error log" button.
+        self._errorLogButton = ttk.Button(window, text=_('Error log'), command=self._show_error_log, state='disabled')
+        self._errorLogButton.pack(padx=5, pady=5, side='left')
+
         # "Exit" button.
         ttk.Button(window, text=_('Exit'), command=self.destroy).pack(padx=5, pady=5, side='left')
 
@@ -86,6 +111,7 @@ class PluginManager(tk.Toplevel):
         moduleName = self._moduleCollection.selection()[0]
         homeButtonState = 'disabled'
         deleteButtonState = 'disabled'
+        errorLogButtonState = 'disabled'
         if moduleName:
             try:
                 if self._ui.plugins[moduleName].URL:
@@ -97,8 +123,11 @@ class PluginManager(tk.Toplevel):
                     deleteButtonState = 'normal'
             except:
                 pass
+            if moduleName in self._ui.plugins.errorLog:
+                errorLogButtonState = 'normal'
         self._homeButton.configure(state=homeButtonState)
         self._deleteButton.configure(state=deleteButtonState)
+        self._errorLogButton.configure(state=errorLogButtonState)
 
     def _open_home_page(self, event=None):
         moduleName = self._moduleCollection.selection()[0]
@@ -110,3 +139,7 @@ class PluginManager(tk.Toplevel):
             except:
                 pass
 
+    def _show_error_log(self, event=None):
+        moduleName = self._moduleCollection.selection()[0]
+        if moduleName in self._ui.plugins.errorLog:
+            self._ui.show_info('\n'.join(self._ui.plugins.errorLog[moduleName]), title=f'{moduleName} - {_("Error log")}')
@@ -0,0 +1,137 @@
+"""Provide a class for a full-text search window.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import re
+import tkinter as tk
+from tkinter import ttk
+from pywriter.pywriter_globals import *
+
+
+class SearchWindow(tk.Toplevel):
+    """Search the project, and go to the elements found.
+
+    The window is not modal, so the user can work with the search results.
+    """
+    _FIELD_NAMES = dict(
+        title=_('Title'),
+        desc=_('Description'),
+        sceneContent=_('Content'),
+        notes=_('Notes'),
+        goal=_('Goal'),
+        conflict=_('Conflict'),
+        outcome=_('Outcome'),
+        tags=_('Tags'),
+        fullName=_('Full name'),
+        aka=_('AKA'),
+        bio=_('Bio'),
+        goals=_('Goals'),
+        )
+    _CONTEXT_CHARS = 40
+
+    def __init__(self, ui, size, **kw):
+        self._ui = ui
+        super().__init__(**kw)
+        self.title(f'{_("Search")} - {self._ui.novel.title}')
+        self.geometry(size)
+        self.focus()
+        window = ttk.Frame(self)
+        window.pack(fill='both', expand=True)
+
+        # Search entry.
+        searchBar = ttk.Frame(window)
+        searchBar.pack(fill='x')
+        self._query = tk.StringVar()
+        queryEntry = ttk.Entry(searchBar, textvariable=self._query)
+        queryEntry.pack(padx=5, pady=5, side='left', fill='x', expand=True)
+        queryEntry.bind('<Return>', self._search)
+        queryEntry.focus_set()
+        ttk.Button(searchBar, text=_('Search'), command=self._search).pack(padx=5, pady=5, side='left')
+
+        # Result list.
+        columns = 'Element', 'Field', 'Context'
+        self._resultCollection = ttk.Treeview(window, columns=columns, show='headings', selectmode='browse')
+        scrollY = ttk.Scrollbar(self._resultCollection, orient='vertical', command=self._resultCollection.yview)
+        self._resultCollection.configure(yscrollcommand=scrollY.set)
+        scrollY.pack(side='right', fill='y')
+        self._resultCollection.pack(fill='both', expand=True)
+        self._resultCollection.bind('<<TreeviewSelect>>', self._on_select_result)
+
+        self._resultCollection.column('Element', width=200, minwidth=120, stretch=False)
+        self._resultCollection.heading('Element', text=_('Element'), anchor='w')
+        self._resultCollection.column('Field', width=100, minwidth=100, stretch=False)
+        self._resultCollection.heading('Field', text=_('Field'), anchor='w')
+        self._resultCollection.column('Context', width=400, stretch=True)
+        self._resultCollection.heading('Context', text=_('Context'), anchor='w')
+
+        # Status display.
+        self._status = tk.StringVar()
+        ttk.Label(window, textvariable=self._status).pack(padx=5, pady=5, side='left')
+
+        # "Exit" button.
+        ttk.Button(window, text=_('Exit'), command=self.destroy).pack(padx=5, pady=5, side='right')
+
+    def _get_context(self, text, words):
+        """Return a part of text around the first occurrence of a search word."""
+        for word in words:
+            match = re.search(rf'\b{re.escape(word)}', text, flags=re.IGNORECASE)
+            if match is not None:
+                start = max(0, match.start() - self._CONTEXT_CHARS)
+                context = text[start:match.end() + self._CONTEXT_CHARS]
+                if start > 0:
+                    context = f'...{context}'
+                return ' '.join(context.split())
+
+        return ' '.join(text[:2 * self._CONTEXT_CHARS].split())
+
+    def _get_node(self, collection, elemId):
+        """Return the tree node ID of a novel element."""
+        tv = self._ui.tv
+        if collection == 'chapters':
+            if self._ui.novel.chapters[elemId].chLevel == 1:
+                return f'{tv.PART_PREFIX}{elemId}'
+
+            return f'{tv.CHAPTER_PREFIX}{elemId}'
+
+        prefixes = dict(
+            scenes=tv.SCENE_PREFIX,
+            characters=tv.CHARACTER_PREFIX,
+            locations=tv.LOCATION_PREFIX,
+            items=tv.ITEM_PREFIX,
+            projectNotes=tv.PRJ_NOTE_PREFIX,
+            )
+        return f'{prefixes[collection]}{elemId}'
+
+    def _on_select_result(self, event=None):
+        try:
+            collection, elemId = self._resultCollection.selection()[0].split(':', 2)[:2]
+            node = self._get_node(collection, elemId)
+            self._ui.tv.go_to_node(node)
+        except:
+            # The element may have been deleted in the meantime.
+            return
+
+        if collection in ('chapters', 'scenes'):
+            self._ui.contentsViewer.see(node)
+
+    def _search(self, event=None):
+        self._resultCollection.delete(*self._resultCollection.get_children())
+        query = self._query.get()
+        results = self._ui.search(query)
+        if results is None:
+            self._status.set(_('The project is being indexed. Please try again.'))
+            return
+
+        words = [word.rstrip('*') for word in re.findall(r'[\w*]+', query)]
+        for collection, elemId, field in results:
+            element = getattr(self._ui.novel, collection)[elemId]
+            text = self._ui.searchIndexer.index.get_text((collection, elemId, field))
+            self._resultCollection.insert(
+                '',
+                'end',
+                f'{collection}:{elemId}:{field}',
+                values=[element.title or '', self._FIELD_NAMES.get(field, field), self._get_context(text, words)],
+                )
+        self._status.set(f'{len(results)} {_("matches")}')
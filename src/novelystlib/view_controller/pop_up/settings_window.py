@@ -50,6 +50,11 @@ class SettingsWindow(tk.Toplevel):
         ttk.Checkbutton(frame1, text=_('Delete yWriter-only data on save'), variable=self._cleanUpYw).pack(anchor='w')
         self._cleanUpYw.trace('w', self._update_cleanup)
 
+        # Checkbox for keeping a backup history.
+        self._backupHistory = tk.BooleanVar(frame1, value=self._ui.backupHistory)
+        ttk.Checkbutton(frame1, text=_('Keep a backup history'), variable=self._backupHistory).pack(anchor='w')
+        self._backupHistory.trace('w', self._update_backup_history)
+
         # Listbox for column reordering.
         ttk.Label(frame2,
                   text=_('Columns')
@@ -78,7 +83,7 @@ class SettingsWindow(tk.Toplevel):
     def _change_colors(self, *args, **kwargs):
         cmStr = self._coloringModeStr.get()
         self._ui.coloringMode = self._ui.COLORING_MODES.index(cmStr)
-        self._tv.refresh_tree()
+        self._tv.recolor_scenes()
 
     def _change_column_order(self, *args, **kwargs):
         srtColumns = []
@@ -87,7 +92,9 @@ class SettingsWindow(tk.Toplevel):
             srtColumns.append(self._coIdsByTitle[title])
         self._ui.kwargs['column_order'] = list_to_string(srtColumns)
         self._tv.configure_columns()
-        self._tv.build_tree()
+
+    def _update_backup_history(self, *args, **kwargs):
+        self._ui.backupHistory = self._backupHistory.get()
 
     def _update_cleanup(self, *args, **kwargs):
         self._ui.cleanUpYw = self._cleanUpYw.get()
@@ -4,9 +4,12 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/novelyst
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
+import copy
 import tkinter as tk
 from tkinter import ttk
 from pywriter.pywriter_globals import *
+from novelystlib.model.model_event_bus import ModelEventBus
+from novelystlib.model.element_state import get_element_state
 from novelystlib.widgets.text_box import TextBox
 from novelystlib.widgets.index_card import IndexCard
 
@@ -15,7 +18,7 @@ class BasicView(ttk.Frame):
     """Generic class for viewing tree element properties.
     
     Public methods:
-        apply_changes() -- Apply changes of element title, description, and notes.   
+        apply_changes() -- Apply changes of element title, description, and notes; announce the changes.   
         hide() -- Clear the ui text boxes, and hide the view.
         set_data() -- Update the view with element's data.
         show() -- Make the ui text boxes and the view visible.
@@ -38,6 +41,8 @@ class BasicView(ttk.Frame):
 
         self._ui = ui
         self._element = None
+        self._elementState = {}
+        # shallow copies of the element's attributes, as loaded into the view
         self._tagsStr = ''
         self._parent = parent
 
@@ -48,7 +53,10 @@ class BasicView(ttk.Frame):
         self._create_frames()
 
     def apply_changes(self):
-        """Apply changes of element title, description, and notes."""
+        """Apply changes of element title, description, and notes; announce the changes.
+        
+        Subclasses extend this method, applying their changes before calling it.
+        """
         if self._element is not None:
 
             # Title entry.
@@ -75,8 +83,7 @@ class BasicView(ttk.Frame):
                             self._element.notes = notes
                             self._ui.isModified = True
 
-        if self._ui.isModified:
-            self._ui.tv.update_prj_structure()
+            self._publish_changes()
 
     def hide(self):
         """Hide the view."""
@@ -86,6 +93,7 @@ class BasicView(ttk.Frame):
         """Update the view with element's data."""
         self._tagsStr = ''
         self._element = element
+        self._save_state()
         if self._element is not None:
 
             # Title entry.
@@ -174,6 +182,64 @@ class BasicView(ttk.Frame):
             self._ui.tv.tree.see(prevNode)
             self._ui.tv.tree.selection_set(prevNode)
 
+    def _get_node(self):
+        """Return the tree node ID of the element viewed; '' for the project; None if not found."""
+        novel = self._ui.novel
+        if self._element is novel:
+            return ''
+
+        tv = self._ui.tv
+        for prefix, elements in (
+                (tv.SCENE_PREFIX, novel.scenes),
+                (tv.CHARACTER_PREFIX, novel.characters),
+                (tv.LOCATION_PREFIX, novel.locations),
+                (tv.ITEM_PREFIX, novel.items),
+                (tv.PRJ_NOTE_PREFIX, novel.projectNotes),
+                ):
+            for elemId, element in elements.items():
+                if element is self._element:
+                    return f'{prefix}{elemId}'
+
+        for chId, chapter in novel.chapters.items():
+            if chapter is self._element:
+                if chapter.chLevel == 1:
+                    return f'{tv.PART_PREFIX}{chId}'
+
+                return f'{tv.CHAPTER_PREFIX}{chId}'
+
+        return None
+
+    def _publish_changes(self):
+        """Announce the element's attributes changed since they were loaded into the view.
+        
+        Changes that may affect other elements are delivered immediately,
+        because the views rely on the project structure being updated after applying.
+        """
+        changedFields = []
+        for name, value in get_element_state(self._element).items():
+            if self._elementState.get(name, None) != value:
+                changedFields.append(name)
+        if not changedFields:
+            return
+
+        node = self._get_node()
+        if node is not None:
+            for name in changedFields:
+                self._ui.modelEvents.publish(ModelEventBus.FIELD_CHANGED, node, name, sender=self)
+            for name in changedFields:
+                if name in self._ui.tv.STRUCTURE_FIELDS:
+                    self._ui.modelEvents.flush()
+                    break
+
+        self._save_state()
+
+    def _save_state(self):
+        """Keep copies of the element's attributes for detecting changes."""
+        if self._element is None:
+            self._elementState = {}
+        else:
+            self._elementState = {name: copy.copy(value) for name, value in get_element_state(self._element).items()}
+
     def _update_field_bool(self, tkValue, fieldname):
         """Update a custom field and return True if changed.
         
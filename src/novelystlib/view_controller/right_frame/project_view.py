@@ -5,6 +5,8 @@ For further information see https://github.com/peter88213/novelyst
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 import os
+from datetime import date
+from datetime import timedelta
 import tkinter as tk
 from tkinter import ttk
 from pywriter.pywriter_globals import *
@@ -172,6 +174,16 @@ class ProjectView(BasicView):
 
         ttk.Separator(self._progressFrame, orient='horizontal').pack(fill='x')
 
+        # Words written recently, according to the word count log.
+        self._writtenLastWeek = MyStringVar()
+        LabelDisp(self._progressFrame, text=_('Last 7 days'),
+                  textvariable=self._writtenLastWeek, lblWidth=20).pack(anchor='w')
+        self._writtenLastMonth = MyStringVar()
+        LabelDisp(self._progressFrame, text=_('Last 30 days'),
+                  textvariable=self._writtenLastMonth, lblWidth=20).pack(anchor='w')
+
+        ttk.Separator(self._progressFrame, orient='horizontal').pack(fill='x')
+
         self._totalUsed = MyStringVar()
         LabelDisp(self._progressFrame, text=_('Used'),
                   textvariable=self._totalUsed, lblWidth=20).pack(anchor='w')
@@ -441,6 +453,15 @@ class ProjectView(BasicView):
         self._total2ndEdit.set(statusCounts[4])
         self._totalDone.set(statusCounts[5])
 
+        # Words written recently.
+        today = date.today()
+        for writtenVar, days in ((self._writtenLastWeek, 7), (self._writtenLastMonth, 30)):
+            wordsWritten = self._ui.prjFile.wcLog.get_words_written(today - timedelta(days=days - 1), actualCount=normalWordsTotal)
+            if wordsWritten is None:
+                writtenVar.set('')
+            else:
+                writtenVar.set(wordsWritten)
+
         # 'Work phase' combobox.
         phases = [_('Undefined'), _('Outline'), _('Draft'), _('1st Edit'), _('2nd Edit'), _('Done')]
         self._phaseCombobox.configure(values=phases)
@@ -0,0 +1,143 @@
+"""Provide a service class for the project's full-text search index.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from threading import Thread
+from novelystlib.model.model_event_bus import ModelEventBus
+from novelystlib.model.search_index import SearchIndex
+
+
+class SearchIndexer:
+    """Provide a search index for the open project, built in the background.
+
+    On start, the index is loaded from the snapshot cache, if available.
+    Otherwise, it is built in a worker thread, so opening a large project is not delayed.
+    The elements changed in the meantime are collected from the model change events.
+    Before each search, only their texts are reindexed.
+    Events that do not tell the element, e.g. the fallback event for unannounced changes,
+    and removed chapters lead to a refresh of all elements.
+    On stop, the index can be stored in the snapshot cache, if it matches the project file.
+
+    Public methods:
+        search(query) -- Return a list of matching document keys, or None if the index is not ready.
+        start(prjFile) -- Start indexing a project.
+        stop(persist) -- Discard the index; optionally store it in the snapshot cache before.
+
+    Public instance variables:
+        index: SearchIndex -- The search index; None while indexing.
+
+    Public class constants:
+        CACHE_KIND: str -- Kind of the snapshot cache entries.
+    """
+    CACHE_KIND = 'index'
+
+    def __init__(self, modelEvents):
+        """Subscribe to the model change events.
+
+        Positional arguments:
+            modelEvents: ModelEventBus -- The application's model change events.
+        """
+        self.index = None
+        self._prjFile = None
+        self._touched = set()
+        # (collection name, element ID) tuples of the elements changed since the last refresh
+        self._refreshAll = False
+        modelEvents.subscribe(self._on_model_events, immediate=True)
+
+    def search(self, query):
+        """Return a list of matching document keys, or None if the index is not ready.
+
+        Positional arguments:
+            query: str -- Search terms; see SearchIndex for the syntax.
+        """
+        if self.index is None:
+            return None
+
+        self._refresh()
+        return self.index.search(query)
+
+    def start(self, prjFile):
+        """Start indexing a project.
+
+        Positional arguments:
+            prjFile: WorkFile -- The project file, with the novel already read.
+        """
+        self.stop()
+        self._prjFile = prjFile
+        self._touched = set()
+        self._refreshAll = False
+        Thread(target=self._build, args=(prjFile,), daemon=True).start()
+
+    def stop(self, persist=False):
+        """Discard the index; optionally store it in the snapshot cache before.
+
+        Optional arguments:
+            persist: bool -- If True, the project must be unchanged since it was read or written.
+        """
+        if persist and self.index is not None and self._prjFile.snapshotCache is not None:
+            self._refresh()
+            self._prjFile.snapshotCache.save(
+                self._prjFile.filePath,
+                self._get_file_state(self._prjFile),
+                self.index,
+                kind=self.CACHE_KIND,
+                )
+        self.index = None
+        self._prjFile = None
+
+    def _build(self, prjFile):
+        """Worker thread: Load or build the index of a project."""
+        index = None
+        if prjFile.snapshotCache is not None:
+            index = prjFile.snapshotCache.load(prjFile.filePath, self._get_file_state(prjFile), kind=self.CACHE_KIND)
+        if index is None:
+            index = SearchIndex()
+            try:
+                index.build(prjFile.novel)
+            except RuntimeError:
+                # The novel has been changed while indexing; refreshing on search fixes it.
+                self._refreshAll = True
+        if prjFile is self._prjFile:
+            # The project has not been closed in the meantime.
+            self.index = index
+
+    def _get_file_state(self, prjFile):
+        return (prjFile.fileSize, prjFile.timestamp, prjFile.fileHash)
+
+    def _on_model_events(self, events):
+        """Collect the elements whose texts may have changed."""
+        if self._prjFile is None:
+            return
+
+        for event in events:
+            if event.node is None:
+                self._refreshAll = True
+                continue
+
+            collection = ModelEventBus.NODE_COLLECTIONS.get(event.node[:2], None)
+            if collection is None or event.kind == ModelEventBus.ELEMENT_MOVED:
+                continue
+
+            if event.kind == ModelEventBus.ELEMENT_REMOVED and collection == 'chapters':
+                # The chapter's scenes may be deleted as well.
+                self._refreshAll = True
+                continue
+
+            if event.kind == ModelEventBus.FIELD_CHANGED and event.field is not None:
+                if not event.field in SearchIndex.FIELDS[collection]:
+                    continue
+
+            self._touched.add((collection, event.node[2:]))
+
+    def _refresh(self):
+        """Reindex the texts changed since the last refresh."""
+        if self._refreshAll:
+            self._refreshAll = False
+            self._touched = set()
+            self.index.refresh(self._prjFile.novel)
+        elif self._touched:
+            touched = self._touched
+            self._touched = set()
+            self.index.refresh_elements(self._prjFile.novel, touched)
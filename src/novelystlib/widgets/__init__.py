@@ -1,6 +1,7 @@
 """Widgets for general use.
 
 Modules:
+detachable_frame -- Provide a tkinter frame that can be detached as a window of its own.
 drag_drop_listbox -- Provide a tkinter listbox with drag'n'drop reordering of entries.
 folding_frame -- Provide a tkinter based folding frame with a "show/hide" button.
 label_combo -- Provide a tkinter based combobox with a label.
@@ -0,0 +1,55 @@
+"""Provide a tkinter frame that can be detached as a window of its own.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import tkinter as tk
+
+
+class DetachableFrame(tk.Frame, tk.Wm):
+    """A tkinter frame that can be detached as a window of its own.
+
+    The child widgets are kept when detaching and docking,
+    so they need not be rebuilt.
+    When detached, the window manager methods such as geometry() or protocol() apply.
+
+    Public methods:
+        detach() -- Show the frame as a top-level window.
+        dock() -- Make the frame a child window of its parent again.
+
+    Public instance variables:
+        isDetached: bool -- True, if the frame is shown as a top-level window.
+    """
+
+    def __init__(self, parent, **kw):
+        """Put a frame in the specified parent widget.
+
+        Positional arguments:
+            parent -- parent widget.
+
+        Extends the superclass constructor.
+        """
+        super().__init__(parent, **kw)
+        self.isDetached = False
+
+    def detach(self):
+        """Show the frame as a top-level window."""
+        if self.isDetached:
+            return
+
+        if self.winfo_manager():
+            self.pack_forget()
+        self.wm_manage(self)
+        self.isDetached = True
+
+    def dock(self):
+        """Make the frame a child window of its parent again.
+
+        The frame must be placed by a geometry manager afterwards.
+        """
+        if not self.isDetached:
+            return
+
+        self.wm_forget(self)
+        self.isDetached = False
@@ -0,0 +1,106 @@
+"""Measure the scene aggregates computed from the columnar scene metadata.
+
+usage: bench_aggregates.py [-h] [--sizes N,N,...] [--repeat N]
+
+Run from the src directory, with pywriter on the Python path.
+For each size, a project with this number of scenes is generated by generate_project.py.
+Timed are the aggregates the status bar, the project view, and the tree need after a change:
+get_counts(), count_words(), get_status_counts(), the positions,
+and the viewpoint words of every character.
+They are computed once by loops over the scene objects, as before the scene columns,
+and once from the scene columns, including the time for building them.
+The column operations use NumPy, if installed and the project is large enough.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import argparse
+import tempfile
+from pywriter.model.novel import Novel
+from novelystlib.model.work_file import WorkFile
+from novelystlib.model.scene_columns import SceneColumns
+from generate_project import generate_project
+from bench_core import get_counts
+from bench_core import best_time
+
+SIZES = '1000,10000'
+
+
+def query_objects(novel):
+    """Run the aggregate queries of a tree refresh by iterating the scene objects."""
+    partCount = chapterCount = sceneCount = wordCount = 0
+    for chId in novel.srtChapters:
+        if novel.chapters[chId].chType == 0:
+            for scId in novel.chapters[chId].srtScenes:
+                if novel.scenes[scId].scType == 0 and not novel.scenes[scId].doNotExport:
+                    sceneCount += 1
+                    wordCount += novel.scenes[scId].wordCount
+            if novel.chapters[chId].chLevel == 1:
+                partCount += 1
+            else:
+                chapterCount += 1
+    count = totalCount = 0
+    for chId in novel.srtChapters:
+        if not novel.chapters[chId].isTrash:
+            for scId in novel.chapters[chId].srtScenes:
+                if novel.scenes[scId].scType in (0, 3) and not novel.scenes[scId].doNotExport:
+                    totalCount += novel.scenes[scId].wordCount
+                    if novel.scenes[scId].scType == 0:
+                        count += novel.scenes[scId].wordCount
+    counts = [None, 0, 0, 0, 0, 0]
+    for scId in novel.scenes:
+        if novel.scenes[scId].scType == 0 and not novel.scenes[scId].doNotExport:
+            if novel.scenes[scId].status is not None:
+                counts[novel.scenes[scId].status] += novel.scenes[scId].wordCount
+    positions = {}
+    wordCount = 0
+    for chId in novel.srtChapters:
+        positions[chId] = wordCount
+        for scId in novel.chapters[chId].srtScenes:
+            positions[scId] = wordCount
+            if novel.scenes[scId].scType == 0 and not novel.scenes[scId].doNotExport:
+                wordCount += novel.scenes[scId].wordCount
+    for crId in novel.characters:
+        wordCount = 0
+        for scId in novel.scenes:
+            if novel.scenes[scId].scType == 0:
+                if novel.scenes[scId].characters:
+                    if novel.scenes[scId].characters[0] == crId and not novel.scenes[scId].doNotExport:
+                        wordCount += novel.scenes[scId].wordCount
+
+
+def query_columns(prjFile):
+    """Run the aggregate queries of a tree refresh with the scene columns."""
+    prjFile.get_counts()
+    prjFile.count_words()
+    prjFile.get_status_counts()
+    prjFile.get_scene_columns().get_positions()
+    for crId in prjFile.novel.characters:
+        prjFile.get_scene_columns().get_viewpoint_words().get(crId, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the scene aggregates.')
+    parser.add_argument('--sizes', default=SIZES, metavar='N,N,...', help=f'numbers of scenes; default: {SIZES}')
+    parser.add_argument('--repeat', type=int, default=5, metavar='N', help='runs per operation; default: 5')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes.split(','):
+            filePath = os.path.join(directory, f'bench{size}.yw7')
+            generate_project(filePath, **get_counts(int(size), 10))
+            prjFile = WorkFile(filePath)
+            prjFile.novel = Novel()
+            prjFile.read()
+            objects = best_time(lambda: query_objects(prjFile.novel), args.repeat)
+            build = best_time(lambda: SceneColumns(prjFile.novel), args.repeat)
+            prjFile.keepColumns = True
+            columns = best_time(lambda: query_columns(prjFile), args.repeat, setup=prjFile.invalidate_columns)
+            print(f'{size:>6} scenes, {len(prjFile.novel.characters)} characters: '
+                  f'{objects * 1000:.1f} ms with object loops, {columns * 1000:.1f} ms with columns '
+                  f'(building: {build * 1000:.1f} ms, NumPy: {SceneColumns(prjFile.novel).usesNumpy})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Measure backup throughput and disk footprint of the backup store.
+
+usage: bench_backup_store.py yw7-file [number of saves]
+
+Run from the src directory, with pywriter on the Python path.
+
+Simulate a writing session: Before each save, one scene's content is changed.
+Compare the store size with the size of full copies of each version.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import re
+import sys
+import shutil
+import tempfile
+from time import perf_counter
+from novelystlib.model.backup_store import BackupStore
+
+
+def get_dir_size(path):
+    size = 0
+    for dirPath, __, fileNames in os.walk(path):
+        for fileName in fileNames:
+            size += os.path.getsize(os.path.join(dirPath, fileName))
+    return size
+
+
+def run(sourcePath, saves, **retention):
+    with open(sourcePath, 'rb') as f:
+        content = f.read()
+    # Give empty scenes some text, to get a realistic project size.
+    filler = b' '.join([b'Lorem ipsum dolor sit amet.'] * 200)
+    content = content.replace(b'<SceneContent />', b'<SceneContent><![CDATA[' + filler + b']]></SceneContent>')
+    sceneContent = re.compile(rb'<SceneContent><!\[CDATA\[.*?(?=\]\]>)', re.DOTALL)
+    if not sceneContent.search(content):
+        sys.exit('No scenes found.')
+
+    workDir = tempfile.mkdtemp()
+    try:
+        prjPath = f'{workDir}/project.yw7'
+        store = BackupStore(f'{workDir}/project_backup', **retention)
+        fullCopies = 0
+        addTime = 0.0
+        for i in range(saves):
+            # Append a word to one scene per save.
+            scenes = list(sceneContent.finditer(content))
+            end = scenes[i % len(scenes)].end()
+            content = content[:end] + b' word' + content[end:]
+            with open(prjPath, 'wb') as f:
+                f.write(content)
+            fullCopies += len(content)
+            startTime = perf_counter()
+            store.add(prjPath)
+            addTime += perf_counter() - startTime
+
+        backups = store.get_backups()
+        startTime = perf_counter()
+        store.restore(backups[-1][0], f'{workDir}/restored.yw7')
+        restoreTime = perf_counter() - startTime
+        storeSize = get_dir_size(store.storeDir)
+    finally:
+        shutil.rmtree(workDir)
+
+    print(f'Saves: {saves}, project size: {len(content) // 1000} kB, backups kept: {len(backups)}')
+    print(f'Backup: {addTime * 1000 / saves:.2f} ms per save, {fullCopies / addTime / 1000000:.1f} MB/s')
+    print(f'Restore of the oldest backup kept: {restoreTime * 1000:.2f} ms')
+    print(f'Store size: {storeSize // 1000} kB; full copies: {fullCopies // 1000} kB; ratio: {fullCopies / storeSize:.1f}')
+
+
+if __name__ == '__main__':
+    try:
+        numberOfSaves = int(sys.argv[2])
+    except IndexError:
+        numberOfSaves = 1000
+    print('--- Keep all versions')
+    run(sys.argv[1], numberOfSaves, keepLast=numberOfSaves)
+    print('--- Default retention policy')
+    run(sys.argv[1], numberOfSaves)
@@ -0,0 +1,138 @@
+"""Measure the core operations on synthetic projects of increasing size.
+
+usage: bench_core.py [-h] [--sizes N,N,...] [--words N] [--repeat N] [--output FILE] [--compare FILE]
+
+Run from the src directory, with pywriter on the Python path.
+For each size, a project with this number of scenes is generated by generate_project.py.
+The other element counts grow with the number of scenes.
+Timed are reading and writing the project file, check_arcs(), count_words(),
+and each export target of the document exporter and the reporter.
+The manuscript scene cache is cleared before each export, so the full conversion is timed.
+The best of the repeated runs is recorded.
+
+The results are written as JSON, so runs can be compared with the --compare option.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+from time import perf_counter
+from pywriter.model.novel import Novel
+from novelystlib.model.work_file import WorkFile
+from novelystlib.export.nv_doc_exporter import NvDocExporter
+from novelystlib.export.nv_reporter import NvReporter
+from novelystlib.export.odt_manuscript_nv import OdtManuscriptNv
+from novelystlib.export.lazy_export_target_factory import LazyExportTargetFactory
+from generate_project import generate_project
+
+SIZES = '100,500,1000'
+
+
+def get_counts(scenes, words):
+    """Return the element counts of a generated project with the given number of scenes."""
+    return dict(
+        parts=max(1, scenes // 100),
+        chapters=max(1, scenes // 5),
+        scenes=scenes,
+        words=words,
+        characters=max(5, scenes // 10),
+        arcs=max(2, scenes // 100),
+        points=10,
+        tags=max(5, scenes // 20),
+        )
+
+
+def best_time(function, repeat, setup=None):
+    """Return the shortest duration of the repeated function calls."""
+    durations = []
+    for __ in range(repeat):
+        if setup is not None:
+            setup()
+        startTime = perf_counter()
+        function()
+        durations.append(perf_counter() - startTime)
+    return min(durations)
+
+
+def bench_size(scenes, words, repeat, directory):
+    """Return a dict with the durations of the core operations; key: operation name."""
+    filePath = os.path.join(directory, f'bench{scenes}.yw7')
+    generate_project(filePath, **get_counts(scenes, words))
+    results = {}
+
+    def read():
+        prjFile = WorkFile(filePath)
+        prjFile.novel = Novel()
+        prjFile.read()
+        return prjFile
+
+    results['read'] = best_time(read, repeat)
+    prjFile = read()
+    results['write'] = best_time(prjFile.write, repeat)
+    results['check_arcs'] = best_time(prjFile.check_arcs, repeat)
+    results['count_words'] = best_time(prjFile.count_words, repeat)
+
+    def clear_cache():
+        OdtManuscriptNv._sceneCache = {}
+
+    for name, exporterClass in (('export', NvDocExporter), ('report', NvReporter)):
+        factory = LazyExportTargetFactory(exporterClass.EXPORT_TARGETS)
+        for suffix in exporterClass.EXPORT_TARGETS:
+            __, target = factory.make_file_objects(prjFile.filePath, suffix=suffix)
+            target.novel = prjFile.novel
+            results[f'{name} {type(target).__name__} ({suffix})'] = best_time(target.write, repeat, setup=clear_cache)
+    return results
+
+
+def compare(results, baseline):
+    """Print the durations relative to a previous run."""
+    print(f'\n{"size":>6}  {"operation":<50} {"baseline":>10} {"now":>10} {"ratio":>7}')
+    for size, durations in results['sizes'].items():
+        for operation, duration in durations.items():
+            try:
+                previous = baseline['sizes'][size][operation]
+            except KeyError:
+                continue
+
+            print(f'{size:>6}  {operation:<50} {previous:10.4f} {duration:10.4f} {duration / previous:7.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the core operations on synthetic projects.')
+    parser.add_argument('--sizes', default=SIZES, metavar='N,N,...', help=f'numbers of scenes; default: {SIZES}')
+    parser.add_argument('--words', type=int, default=1000, metavar='N', help='words per scene; default: 1000')
+    parser.add_argument('--repeat', type=int, default=3, metavar='N', help='runs per operation; default: 3')
+    parser.add_argument('--output', metavar='FILE', help='JSON file to write the results to; default: stdout')
+    parser.add_argument('--compare', metavar='FILE', help='JSON file with the results of a previous run')
+    args = parser.parse_args()
+    results = dict(
+        date=datetime.now().replace(microsecond=0).isoformat(sep=' '),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        words=args.words,
+        repeat=args.repeat,
+        sizes={},
+        )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes.split(','):
+            print(f'Measuring {size} scenes ...', file=sys.stderr)
+            results['sizes'][size] = bench_size(int(size), args.words, args.repeat, directory)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""Measure the latency of typical user interactions with the novelyst GUI.
+
+usage: bench_gui.py [-h] [--sizes N,N,...] [--words N] [--repeat N] [--select N] [--withdraw]
+                    [--output FILE] [--compare FILE]
+
+Run from the src directory, with pywriter on the Python path.
+A display is required. On Linux, if DISPLAY is not set, a virtual X server (Xvfb)
+is started for the run, if installed.
+
+For each size, a project with this number of scenes is generated by generate_project.py.
+The application is instantiated, and the interactions are scripted:
+- open and close the project,
+- select the next scenes one by one,
+- drag a chapter to other positions,
+- toggle the markup display of the contents viewer,
+- change the scene coloring mode and the column order,
+- call build_tree(), update_prj_structure(), show_chapters(), and view_text() directly.
+The latency of an interaction includes processing the pending Tk events,
+i.e. the delivery of model change events and the redrawing.
+With --withdraw, the main window is not mapped, so drawing is not included.
+
+The latency percentiles are written as JSON, so runs can be compared with the --compare option.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from types import SimpleNamespace
+from datetime import datetime
+from time import perf_counter
+from time import sleep
+from pywriter.pywriter_globals import list_to_string
+from novelyst_ import SETTINGS
+from novelyst_ import OPTIONS
+from novelystlib.view_controller.novelyst_tk import NovelystTk
+from generate_project import generate_project
+from bench_core import get_counts
+from bench_core import compare
+
+SIZES = '100,500,1000'
+XVFB_DISPLAY = ':99'
+
+
+class Recorder:
+    """Collect latencies of interactions, including the Tk event processing."""
+
+    def __init__(self, root):
+        self._root = root
+        self.samples = {}
+
+    def measure(self, interaction, function, *args):
+        """Call the function, process the pending events, and record the duration."""
+        self._root.update()
+        startTime = perf_counter()
+        function(*args)
+        self._root.update()
+        self.samples.setdefault(interaction, []).append(perf_counter() - startTime)
+
+    def get_statistics(self):
+        """Return a dict with latency percentiles per interaction."""
+        statistics = {}
+        for interaction, samples in self.samples.items():
+            samples = sorted(samples)
+            statistics[interaction] = dict(
+                n=len(samples),
+                p50=percentile(samples, 50),
+                p90=percentile(samples, 90),
+                p99=percentile(samples, 99),
+                max=samples[-1],
+                )
+        return statistics
+
+
+def percentile(sortedSamples, percent):
+    """Return the percentile of a sorted list, using the nearest-rank method."""
+    rank = max(1, -(-len(sortedSamples) * percent // 100))
+    return sortedSamples[int(rank) - 1]
+
+
+def start_display():
+    """Start a virtual X server if no display is set; return the process, or None."""
+    if os.name == 'nt' or sys.platform == 'darwin' or os.environ.get('DISPLAY'):
+        return None
+
+    xvfb = shutil.which('Xvfb')
+    if xvfb is None:
+        sys.exit('No display found, and Xvfb is not installed.')
+
+    process = subprocess.Popen([xvfb, XVFB_DISPLAY, '-screen', '0', '1920x1080x24'])
+    os.environ['DISPLAY'] = XVFB_DISPLAY
+    sleep(1)
+    return process
+
+
+def create_app(tempDir, withdraw):
+    """Return a NovelystTk instance with the default settings."""
+    kwargs = {}
+    kwargs.update(SETTINGS)
+    kwargs.update(OPTIONS)
+    app = NovelystTk('novelyst benchmark', tempDir, **kwargs)
+    app.ask_yes_no = lambda *args, **kwargs: False
+    # Do not save changes on closing.
+    if withdraw:
+        app.root.withdraw()
+    app.root.update()
+    return app
+
+
+def get_nodes(tree, prefix, parent=''):
+    """Return a list of the tree's nodes with the given prefix, in tree order."""
+    nodes = []
+    for node in tree.get_children(parent):
+        if node.startswith(prefix):
+            nodes.append(node)
+        nodes.extend(get_nodes(tree, prefix, node))
+    return nodes
+
+
+def drag(app, node, targetNode):
+    """Simulate dropping a tree node on another one."""
+    tree = app.tv.tree
+    tree.selection_set(node)
+    tree.see(targetNode)
+    app.root.update()
+    x, y, __, height = tree.bbox(targetNode) or (0, 0, 0, 0)
+    app.tv._on_move_node(SimpleNamespace(x=x, y=y + height // 2))
+
+
+def bench_size(app, filePath, args):
+    """Return a dict with latency statistics per interaction."""
+    recorder = Recorder(app.root)
+    for __ in range(args.repeat):
+        recorder.measure('open project', app.open_project, filePath)
+        recorder.measure('close project', app.close_project)
+    app.open_project(filePath)
+    tree = app.tv.tree
+
+    #--- Select the next scenes.
+    for node in get_nodes(tree, app.tv.SCENE_PREFIX, app.tv.NV_ROOT)[:args.select]:
+        recorder.measure('select scene', tree.selection_set, node)
+
+    #--- Drag the first chapter to other positions.
+    chapters = get_nodes(tree, app.tv.CHAPTER_PREFIX, app.tv.NV_ROOT)
+    if len(chapters) > 1:
+        step = max(1, len(chapters) // 20)
+        for targetNode in chapters[1::step]:
+            recorder.measure('drag chapter', drag, app, chapters[0], targetNode)
+
+    #--- Toggle the markup display.
+    for __ in range(args.repeat * 2):
+        showMarkup = app.contentsViewer.showMarkup
+        recorder.measure('toggle markup', showMarkup.set, not showMarkup.get())
+
+    #--- Change the coloring mode and the column order, as the settings window does.
+    for __ in range(args.repeat):
+        for coloringMode in range(len(app.COLORING_MODES)):
+            app.coloringMode = coloringMode
+            recorder.measure('change coloring mode', app.tv.recolor_scenes)
+    columnOrder = app.kwargs['column_order']
+    for __ in range(args.repeat):
+        app.kwargs['column_order'] = list_to_string(reversed([column[0] for column in app.tv.columns]))
+        recorder.measure('change column order', app.tv.configure_columns)
+    app.kwargs['column_order'] = columnOrder
+    app.tv.configure_columns()
+
+    #--- Call the view methods directly.
+    for __ in range(args.repeat):
+        recorder.measure('build_tree', app.tv.build_tree)
+        recorder.measure('update_prj_structure', app.tv.update_prj_structure)
+        recorder.measure('show_chapters', app.tv.show_chapters, app.tv.NV_ROOT)
+        recorder.measure('view_text', app.contentsViewer.update)
+    app.close_project()
+    return recorder.get_statistics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the latency of GUI interactions.')
+    parser.add_argument('--sizes', default=SIZES, metavar='N,N,...', help=f'numbers of scenes; default: {SIZES}')
+    parser.add_argument('--words', type=int, default=1000, metavar='N', help='words per scene; default: 1000')
+    parser.add_argument('--repeat', type=int, default=3, metavar='N', help='runs per interaction; default: 3')
+    parser.add_argument('--select', type=int, default=500, metavar='N', help='scenes to select; default: 500')
+    parser.add_argument('--withdraw', action='store_true', help='do not map the main window')
+    parser.add_argument('--output', metavar='FILE', help='JSON file to write the results to; default: stdout')
+    parser.add_argument('--compare', metavar='FILE', help='JSON file with the results of a previous run')
+    args = parser.parse_args()
+    display = start_display()
+    results = dict(
+        date=datetime.now().replace(microsecond=0).isoformat(sep=' '),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        words=args.words,
+        repeat=args.repeat,
+        withdraw=args.withdraw,
+        sizes={},
+        )
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            app = create_app(directory, args.withdraw)
+            for size in args.sizes.split(','):
+                print(f'Measuring {size} scenes ...', file=sys.stderr)
+                filePath = os.path.join(directory, f'bench{size}.yw7')
+                generate_project(filePath, **get_counts(int(size), args.words))
+                statistics = bench_size(app, filePath, args)
+                results['sizes'][size] = {interaction: values['p50'] for interaction, values in statistics.items()}
+                results.setdefault('percentiles', {})[size] = statistics
+            app.root.destroy()
+    finally:
+        if display is not None:
+            display.terminate()
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
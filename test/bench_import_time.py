@@ -0,0 +1,76 @@
+"""Measure the import time of the novelyst application modules.
+
+usage: bench_import_time.py [limit in ms]
+
+Run from the src directory, with pywriter on the Python path.
+The application module is imported by a fresh interpreter with "python -X importtime".
+The script lists the slowest imports, and checks that no document writer module
+is imported at startup.
+If a limit is given, the total import time must not exceed it.
+Exit status is 1, if a check fails.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import sys
+import subprocess
+
+APPLICATION_MODULE = 'novelystlib.view_controller.novelyst_tk'
+WRITER_PACKAGES = ('pywriter.odt_w.', 'pywriter.ods_w.', 'pywriter.html.')
+WRITER_MODULES = (
+    'pywriter.yw.data_files',
+    'novelystlib.export.odt_',
+    'novelystlib.export.ods_',
+    'novelystlib.export.html_',
+    'novelystlib.export.wrimo_file',
+    )
+TOP_ENTRIES = 15
+
+
+def get_import_times(moduleName):
+    """Return a list of (self us, cumulative us, module name) tuples for a cold import."""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {moduleName}'],
+        capture_output=True,
+        text=True,
+        )
+    if process.returncode != 0:
+        sys.exit(process.stderr)
+
+    importTimes = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+
+        selfTime, cumulativeTime, name = line[len('import time:'):].split('|')
+        importTimes.append((int(selfTime), int(cumulativeTime), name.strip()))
+    return importTimes
+
+
+def main(limit=None):
+    importTimes = get_import_times(APPLICATION_MODULE)
+    total = max(cumulativeTime for __, cumulativeTime, name in importTimes if name == APPLICATION_MODULE)
+    print(f'{len(importTimes)} modules imported in {total / 1000:.1f} ms.')
+    print(f'\nSlowest imports (self time):')
+    for selfTime, __, name in sorted(importTimes, reverse=True)[:TOP_ENTRIES]:
+        print(f'{selfTime / 1000:8.1f} ms  {name}')
+    isOk = True
+    writers = [name for __, __, name in importTimes if name.startswith(WRITER_PACKAGES + WRITER_MODULES)]
+    if writers:
+        isOk = False
+        print(f'\nDocument writers imported at startup:')
+        for name in writers:
+            print(f'    {name}')
+    if limit is not None and total > limit * 1000:
+        isOk = False
+        print(f'\nImport time exceeds the limit of {limit} ms.')
+    if not isOk:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    try:
+        main(float(sys.argv[1]))
+    except IndexError:
+        main()
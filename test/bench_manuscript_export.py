@@ -0,0 +1,84 @@
+"""Measure the repeated manuscript export with cached scene conversion.
+
+usage: bench_manuscript_export.py [number of words]
+
+Run from the src directory, with pywriter on the Python path.
+The novel is generated with random words and some markup; 1,000 words per scene.
+The ODT content is rendered by the pywriter class, and by the caching class
+for a first export, an unchanged re-export, and a re-export after editing two scenes.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import sys
+import random
+import tempfile
+from time import perf_counter
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from pywriter.odt_w.odt_w_manuscript import OdtWManuscript
+from novelystlib.export.odt_manuscript_nv import OdtManuscriptNv
+
+
+def render(exportClass, filePath, novel):
+    """Return the rendering time and the rendered ODT content."""
+    document = exportClass(filePath)
+    document.novel = novel
+    startTime = perf_counter()
+    text = document._get_text()
+    duration = perf_counter() - startTime
+    if exportClass is OdtManuscriptNv:
+        OdtManuscriptNv._sceneCache = document._usedEntries
+        # This is what the write() method does after the export.
+    return duration, text
+
+
+def main(words):
+    random.seed(1)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    vocabulary = [''.join(random.choices(letters, k=random.randint(2, 9))) for __ in range(20000)]
+    vocabulary.extend(['[i]word[/i]', '[b]word[/b]', 'well-known', '/*comment*/', '\n'])
+    novel = Novel()
+    novel.title = 'Bench'
+    novel.authorName = 'Author'
+    for i in range(words // 1000):
+        if i % 10 == 0:
+            chId = str(i // 10 + 1)
+            chapter = Chapter()
+            chapter.title = f'Chapter {chId}'
+            novel.chapters[chId] = chapter
+            novel.srtChapters.append(chId)
+        scene = Scene()
+        scene.title = f'Scene {i}'
+        scene.status = 1
+        scene.sceneContent = ' '.join(random.choices(vocabulary, k=1000))
+        novel.scenes[str(i)] = scene
+        chapter.srtScenes.append(str(i))
+    novel.get_languages()
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = os.path.join(tempDir, f'bench{OdtManuscriptNv.SUFFIX}{OdtManuscriptNv.EXTENSION}')
+        duration, reference = render(OdtWManuscript, filePath, novel)
+        print(f'Render all scenes: {duration:.3f} s')
+        for run in ('First export', 'Unchanged'):
+            duration, text = render(OdtManuscriptNv, filePath, novel)
+            print(f'{run}: {duration:.3f} s')
+            if text != reference:
+                print('Results differ!')
+        novel.scenes['1'].sceneContent += ' [i]revised[/i]'
+        novel.scenes['2'].title = 'Revised'
+        __, reference = render(OdtWManuscript, filePath, novel)
+        duration, text = render(OdtManuscriptNv, filePath, novel)
+        print(f'Two scenes changed: {duration:.3f} s')
+        if text != reference:
+            print('Results differ!')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main(300000)
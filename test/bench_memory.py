@@ -0,0 +1,112 @@
+"""Measure the memory held by the novel elements, with and without the compact element classes.
+
+usage: bench_memory.py [-h] [--sizes N,N,...] [--words N] [--output FILE] [--compare FILE]
+
+Run from the src directory, with pywriter on the Python path.
+For each size, a project with this number of scenes is generated by generate_project.py.
+The project is read twice: by WorkFile, which creates compact scenes and chapters
+with interned IDs, and by a WorkFile subclass that keeps the pywriter elements.
+Measured are
+- the memory allocated for the novel read, as traced by tracemalloc,
+- the size of the scene and chapter objects, including their attributes,
+  as summed up by the memory report.
+The scene contents are kept short by default, because they are the same in both cases.
+
+The results are written as JSON, so runs can be compared with the --compare option.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import gc
+import sys
+import json
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+from pywriter.model.novel import Novel
+from novelystlib.model.work_file import WorkFile
+from novelystlib.view_controller.memory_report import MemoryReport
+from generate_project import generate_project
+from bench_core import get_counts
+from bench_core import compare
+
+SIZES = '1000,10000'
+
+
+class PlainWorkFile(WorkFile):
+    """WorkFile keeping the scenes and chapters created by the pywriter reader."""
+
+    def _compact_elements(self):
+        pass
+
+
+def measure_novel(fileClass, filePath):
+    """Return a tuple: traced bytes allocated for the novel, bytes of the scenes, bytes of the chapters."""
+    gc.collect()
+    tracemalloc.start()
+    prjFile = fileClass(filePath)
+    prjFile.novel = Novel()
+    prjFile.read()
+    novel = prjFile.novel
+    del prjFile
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    memoryReport = MemoryReport(None)
+    sceneSize = memoryReport.get_size(*novel.scenes.values())
+    chapterSize = memoryReport.get_size(*novel.chapters.values())
+    return traced, sceneSize, chapterSize
+
+
+def bench_size(scenes, words, directory):
+    """Return a dict with the memory sizes in bytes; key: measurement name."""
+    filePath = os.path.join(directory, f'bench{scenes}.yw7')
+    generate_project(filePath, **get_counts(scenes, words))
+    results = {}
+    for name, fileClass in (('pywriter', PlainWorkFile), ('compact', WorkFile)):
+        traced, sceneSize, chapterSize = measure_novel(fileClass, filePath)
+        results[f'novel ({name})'] = traced
+        results[f'scenes ({name})'] = sceneSize
+        results[f'chapters ({name})'] = chapterSize
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the memory held by the novel elements.')
+    parser.add_argument('--sizes', default=SIZES, metavar='N,N,...', help=f'numbers of scenes; default: {SIZES}')
+    parser.add_argument('--words', type=int, default=10, metavar='N', help='words per scene; default: 10')
+    parser.add_argument('--output', metavar='FILE', help='JSON file to write the results to; default: stdout')
+    parser.add_argument('--compare', metavar='FILE', help='JSON file with the results of a previous run')
+    args = parser.parse_args()
+    results = dict(
+        date=datetime.now().replace(microsecond=0).isoformat(sep=' '),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        words=args.words,
+        sizes={},
+        )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes.split(','):
+            print(f'Measuring {size} scenes ...', file=sys.stderr)
+            sizes = bench_size(int(size), args.words, directory)
+            results['sizes'][size] = sizes
+            for name in ('novel', 'scenes', 'chapters'):
+                before = sizes[f'{name} (pywriter)']
+                after = sizes[f'{name} (compact)']
+                print(f'{size:>6} scenes  {name:<8} {before / 1024:10.1f} KiB -> {after / 1024:10.1f} KiB ({(after - before) / before:+.0%})', file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Measure indexing and query times of the full-text search index.
+
+usage: bench_search_index.py [number of words]
+
+Run from the src directory, with pywriter on the Python path.
+The novel is generated with random words; 1,000 words per scene.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import sys
+import pickle
+import random
+from time import perf_counter
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from novelystlib.model.search_index import SearchIndex
+
+
+def main(words):
+    random.seed(1)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    vocabulary = [''.join(random.choices(letters, k=random.randint(2, 9))) for __ in range(20000)]
+    novel = Novel()
+    for i in range(words // 1000):
+        scene = Scene()
+        scene.title = f'Scene {i}'
+        scene.sceneContent = ' '.join(random.choices(vocabulary, k=1000))
+        novel.scenes[str(i)] = scene
+
+    index = SearchIndex()
+    startTime = perf_counter()
+    index.build(novel)
+    print(f'Build: {perf_counter() - startTime:.2f} s for {index.wordCount} words')
+
+    startTime = perf_counter()
+    data = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f'Pickle: {perf_counter() - startTime:.2f} s, {len(data) // 1000000} MB')
+    startTime = perf_counter()
+    index = pickle.loads(data)
+    print(f'Unpickle: {perf_counter() - startTime:.2f} s')
+
+    novel.scenes['0'].sceneContent = 'changed'
+    startTime = perf_counter()
+    index.refresh(novel)
+    print(f'Refresh after changing a scene: {(perf_counter() - startTime) * 1000:.1f} ms')
+
+    queries = [
+        vocabulary[5],
+        f'{vocabulary[5]} {vocabulary[7]}',
+        f'"{vocabulary[5]} {vocabulary[7]}"',
+        f'{vocabulary[5][:2]}*',
+        ]
+    for query in queries:
+        startTime = perf_counter()
+        results = index.search(query)
+        print(f'Query {query}: {len(results)} matches in {(perf_counter() - startTime) * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main(1000000)
@@ -0,0 +1,69 @@
+"""Measure the obfuscated text export for word count validation.
+
+usage: bench_wrimo_file.py [number of words]
+
+Run from the src directory, with pywriter on the Python path.
+The novel is generated with random words and some markup; 1,000 words per scene.
+For comparison, the scenes are also obfuscated with the former three substitutions.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import re
+import sys
+import random
+import tempfile
+from time import perf_counter
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene, ADDITIONAL_WORD_LIMITS, NO_WORD_LIMITS
+from novelystlib.export.wrimo_file import WrimoFile, obfuscate
+
+
+def obfuscate_by_substitutions(text):
+    text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
+    text = NO_WORD_LIMITS.sub('', text)
+    return re.sub('\S', 'x', text)
+
+
+def main(words):
+    random.seed(1)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    vocabulary = [''.join(random.choices(letters, k=random.randint(2, 9))) for __ in range(20000)]
+    vocabulary.extend(['[i]word[/i]', 'well-known', 'this—that', '/*comment*/', '\n'])
+    novel = Novel()
+    chapter = Chapter()
+    novel.chapters['1'] = chapter
+    novel.srtChapters.append('1')
+    for i in range(words // 1000):
+        scene = Scene()
+        scene.sceneContent = ' '.join(random.choices(vocabulary, k=1000))
+        scene.status = 1
+        novel.scenes[str(i)] = scene
+        chapter.srtScenes.append(str(i))
+    texts = [scene.sceneContent for scene in novel.scenes.values()]
+
+    startTime = perf_counter()
+    reference = [obfuscate_by_substitutions(text) for text in texts]
+    print(f'Three substitutions: {perf_counter() - startTime:.2f} s')
+    startTime = perf_counter()
+    result = [obfuscate(text) for text in texts]
+    print(f'Single pass: {perf_counter() - startTime:.2f} s')
+    if result != reference:
+        print('Results differ!')
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        wrimoFile = WrimoFile(os.path.join(tempDir, f'bench{WrimoFile.SUFFIX}{WrimoFile.EXTENSION}'))
+        wrimoFile.novel = novel
+        startTime = perf_counter()
+        wrimoFile.write()
+        print(f'Write file: {perf_counter() - startTime:.2f} s')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main(1000000)
@@ -0,0 +1,185 @@
+"""Generate a synthetic novelyst project for benchmarking.
+
+usage: generate_project.py [-h] [--parts N] [--chapters N] [--scenes N] [--words N]
+                           [--characters N] [--arcs N] [--points N] [--tags N] [--seed N]
+                           filePath
+
+Run from the src directory, with pywriter on the Python path.
+The chapters are evenly distributed among the parts, and the scenes among the chapters.
+The scene contents are random words with some markup.
+Each arc is defined by an arc chapter with the given number of points;
+each point is associated with a normal scene assigned to the arc.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import random
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from pywriter.model.character import Character
+from novelystlib.model.work_file import WorkFile
+
+DEFAULTS = dict(
+    parts=3,
+    chapters=30,
+    scenes=150,
+    words=1000,
+    characters=20,
+    arcs=3,
+    points=5,
+    tags=10,
+    )
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+MARKUP = ['[i]word[/i]', '[b]word[/b]', 'well-known', '/*comment*/']
+WORDS_PER_PARAGRAPH = 100
+
+
+def generate_novel(parts, chapters, scenes, words, characters, arcs, points, tags, seed=1):
+    """Return a Novel instance with the specified numbers of elements."""
+    random.seed(seed)
+    vocabulary = [''.join(random.choices(LETTERS, k=random.randint(2, 9))) for __ in range(20000)]
+    vocabulary.extend(MARKUP)
+    tagNames = [f'Tag{i + 1}' for i in range(tags)]
+    arcNames = [f'A{i + 1}' for i in range(arcs)]
+    novel = Novel()
+    novel.title = 'Synthetic novel'
+    novel.authorName = 'Generator'
+    novel.languageCode = 'en'
+    novel.countryCode = 'US'
+    novel.kwVar = {fieldName: None for fieldName in WorkFile.PRJ_KWVAR}
+
+    #--- Characters.
+    for i in range(characters):
+        crId = str(i + 1)
+        character = Character()
+        character.title = f'Character {i + 1}'
+        character.fullName = f'Character {i + 1} {random.choice(vocabulary).capitalize()}'
+        character.desc = ' '.join(random.choices(vocabulary, k=30))
+        character.isMajor = i < characters // 5 + 1
+        character.tags = random.sample(tagNames, min(len(tagNames), 2))
+        novel.characters[crId] = character
+        novel.srtCharacters.append(crId)
+
+    #--- Parts, chapters, and scenes.
+    chId = 0
+    scId = 0
+    normalScenes = []
+    for chapterIndex in range(chapters):
+        if parts and chapterIndex % max(1, chapters // parts) == 0 and chapterIndex // max(1, chapters // parts) < parts:
+            chId += 1
+            part = Chapter()
+            part.title = f'Part {chapterIndex // max(1, chapters // parts) + 1}'
+            part.chLevel = 1
+            part.chType = 0
+            novel.chapters[str(chId)] = part
+            novel.srtChapters.append(str(chId))
+        chId += 1
+        chapter = Chapter()
+        chapter.title = f'Chapter {chapterIndex + 1}'
+        chapter.desc = ' '.join(random.choices(vocabulary, k=20))
+        chapter.chLevel = 0
+        chapter.chType = 0
+        novel.chapters[str(chId)] = chapter
+        novel.srtChapters.append(str(chId))
+        for __ in range(scenes // chapters + (chapterIndex < scenes % chapters)):
+            scId += 1
+            scene = Scene()
+            scene.title = f'Scene {scId}'
+            scene.desc = ' '.join(random.choices(vocabulary, k=30))
+            paragraphs = []
+            for j in range(0, words, WORDS_PER_PARAGRAPH):
+                paragraphs.append(' '.join(random.choices(vocabulary, k=min(WORDS_PER_PARAGRAPH, words - j))))
+            scene.sceneContent = '\n'.join(paragraphs)
+            scene.scType = 0
+            scene.status = random.randint(1, 5)
+            scene.tags = random.sample(tagNames, random.randint(0, min(len(tagNames), 3)))
+            if characters:
+                scene.characters = random.sample(list(novel.characters), random.randint(1, min(characters, 4)))
+            else:
+                scene.characters = []
+            scene.locations = []
+            scene.items = []
+            if arcNames:
+                scene.scnArcs = ';'.join(random.sample(arcNames, random.randint(0, min(len(arcNames), 2))))
+            scene.date = f'2023-01-{scId % 28 + 1:02}'
+            scene.time = f'{scId % 24:02}:00:00'
+            scene.lastsHours = '1'
+            novel.scenes[str(scId)] = scene
+            chapter.srtScenes.append(str(scId))
+            normalScenes.append(str(scId))
+
+    #--- Arcs and points.
+    if arcNames:
+        chId += 1
+        part = Chapter()
+        part.title = 'Arcs'
+        part.chLevel = 1
+        part.chType = 2
+        novel.chapters[str(chId)] = part
+        novel.srtChapters.append(str(chId))
+    for arc in arcNames:
+        chId += 1
+        arcChapter = Chapter()
+        arcChapter.title = f'{arc} - Narrative arc'
+        arcChapter.chLevel = 0
+        arcChapter.chType = 2
+        arcChapter.kwVar = {fieldName: None for fieldName in WorkFile.CHP_KWVAR}
+        arcChapter.kwVar['Field_ArcDefinition'] = arc
+        novel.chapters[str(chId)] = arcChapter
+        novel.srtChapters.append(str(chId))
+        arcScenes = [scId for scId in normalScenes if arc in novel.scenes[scId].scnArcs.split(';')]
+        for i in range(points):
+            scId += 1
+            point = Scene()
+            point.title = f'{arc} point {i + 1}'
+            point.desc = ' '.join(random.choices(vocabulary, k=20))
+            point.scType = 2
+            point.status = 1
+            point.scnArcs = arc
+            point.characters = []
+            point.locations = []
+            point.items = []
+            point.kwVar = {fieldName: None for fieldName in WorkFile.SCN_KWVAR}
+            if i < len(arcScenes):
+                point.kwVar['Field_SceneAssoc'] = arcScenes[i * len(arcScenes) // points]
+            novel.scenes[str(scId)] = point
+            arcChapter.srtScenes.append(str(scId))
+    return novel
+
+
+def generate_project(filePath, seed=1, **counts):
+    """Write a synthetic project file; return the WorkFile instance.
+
+    Positional arguments:
+        filePath: str -- Path of the .yw7 file to create.
+
+    Optional arguments:
+        seed: int -- Random number generator seed.
+        counts -- Numbers of elements, as specified by DEFAULTS.
+    """
+    elementCounts = DEFAULTS.copy()
+    elementCounts.update(counts)
+    prjFile = WorkFile(filePath)
+    prjFile.novel = generate_novel(seed=seed, **elementCounts)
+    prjFile.check_arcs()
+    prjFile.write()
+    return prjFile
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic novelyst project.')
+    parser.add_argument('filePath', help='path of the .yw7 file to create')
+    for name, value in DEFAULTS.items():
+        parser.add_argument(f'--{name}', type=int, default=value, metavar='N', help=f'default: {value}')
+    parser.add_argument('--seed', type=int, default=1, metavar='N', help='default: 1')
+    args = vars(parser.parse_args())
+    filePath = args.pop('filePath')
+    prjFile = generate_project(filePath, **args)
+    print(f'{filePath}: {len(prjFile.novel.chapters)} chapters, {len(prjFile.novel.scenes)} scenes, {prjFile.count_words()[0]} words.')
+
+
+if __name__ == '__main__':
+    main()
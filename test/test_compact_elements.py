@@ -0,0 +1,154 @@
+"""Regression tests for the memory-saving scene and chapter classes.
+
+usage: test_compact_elements.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+The compact elements must hold the same state as the pywriter elements they replace.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import copy
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from novelystlib.model.compact_chapter import CompactChapter
+from novelystlib.model.compact_scene import CompactScene
+from novelystlib.model.element_state import get_element_state
+
+
+def make_scene():
+    scene = Scene()
+    scene.title = 'Scene 1'
+    scene.desc = 'Alice arrives.'
+    scene.sceneContent = 'Alice arrives at the station.'
+    scene.scType = 0
+    scene.status = 2
+    scene.tags = ['arrival', 'station']
+    scene.characters = ['1', '2']
+    scene.locations = ['1']
+    scene.items = []
+    scene.date = '2023-01-01'
+    scene.time = '12:00:00'
+    # Like a scene read from a project file, with all known fields.
+    scene.kwVar = dict.fromkeys(CompactScene.KwVar.FIELDS)
+    scene.kwVar['Field_SceneArcs'] = 'A'
+    scene.kwVar['Field_Custom'] = 'unknown field'
+    return scene
+
+
+def make_chapter():
+    chapter = Chapter()
+    chapter.title = 'Chapter 1'
+    chapter.chLevel = 0
+    chapter.chType = 0
+    chapter.srtScenes = ['1', '2']
+    chapter.kwVar = dict.fromkeys(CompactChapter.KwVar.FIELDS)
+    chapter.kwVar['Field_NoNumber'] = '1'
+    chapter.kwVar['Field_Custom'] = 'unknown field'
+    return chapter
+
+
+def get_state(element):
+    """Return the element state, with the custom keyword variables as a dict."""
+    state = get_element_state(element)
+    state['kwVar'] = dict(state['kwVar'])
+    return state
+
+
+def test_kw_var_record_behaves_like_a_dict():
+    record = CompactScene.KwVar()
+    reference = dict.fromkeys(CompactScene.KwVar.FIELDS)
+    assert record == reference
+    for key, value in (
+            ('Field_SceneArcs', 'A;B'),
+            ('Field_Custom', 'x'),
+            ('Field_SceneMode', 2),
+            ('Field_Other', None),
+            ):
+        record[key] = value
+        reference[key] = value
+    del record['Field_SceneAssoc']
+    del reference['Field_SceneAssoc']
+    del record['Field_Custom']
+    del reference['Field_Custom']
+    assert record == reference
+    assert list(record) == list(reference)
+    assert repr(record) == repr(reference)
+    assert len(record) == len(reference)
+    assert not 'Field_SceneAssoc' in record
+    assert record.get('Field_SceneAssoc', 'default') == 'default'
+    assert record.get('Field_Missing') is None
+    for missingKey in ('Field_SceneAssoc', 'Field_Missing'):
+        try:
+            record[missingKey]
+        except KeyError:
+            pass
+        else:
+            assert False, missingKey
+        try:
+            del record[missingKey]
+        except KeyError:
+            pass
+        else:
+            assert False, missingKey
+
+
+def test_kw_var_record_copy_is_independent():
+    record = CompactScene.KwVar({'Field_SceneArcs': 'A', 'Field_Custom': 'x'})
+    for recordCopy in (record.copy(), copy.copy(record), copy.deepcopy(record)):
+        assert recordCopy == record
+        recordCopy['Field_SceneArcs'] = 'B'
+        recordCopy['Field_Custom'] = 'y'
+        assert record['Field_SceneArcs'] == 'A'
+        assert record['Field_Custom'] == 'x'
+
+
+def test_new_compact_scene_state():
+    reference = get_state(Scene())
+    reference['kwVar'] = dict.fromkeys(CompactScene.KwVar.FIELDS)
+    assert get_state(CompactScene()) == reference
+
+
+def test_compact_scene_has_the_scene_state():
+    scene = make_scene()
+    compactScene = CompactScene.from_scene(scene)
+    assert get_state(compactScene) == get_state(scene)
+    assert compactScene.sceneContent == scene.sceneContent
+    assert compactScene.wordCount == scene.wordCount
+    compactScene.kwVar['Field_SceneArcs'] = 'B'
+    assert scene.kwVar['Field_SceneArcs'] == 'A'
+
+
+def test_compact_scene_completes_the_known_fields():
+    scene = make_scene()
+    scene.kwVar = {'Field_SceneArcs': 'A'}
+    compactScene = CompactScene.from_scene(scene)
+    reference = dict.fromkeys(CompactScene.KwVar.FIELDS)
+    reference['Field_SceneArcs'] = 'A'
+    assert compactScene.kwVar == reference
+
+
+def test_compact_scene_copy_has_the_scene_state():
+    compactScene = CompactScene.from_scene(make_scene())
+    assert get_state(copy.deepcopy(compactScene)) == get_state(compactScene)
+
+
+def test_compact_scene_has_no_instance_dictionary():
+    compactScene = CompactScene.from_scene(make_scene())
+    get_element_state(compactScene)
+    assert not hasattr(compactScene, '__dict__') or not vars(compactScene)
+
+
+def test_compact_chapter_has_the_chapter_state():
+    chapter = make_chapter()
+    compactChapter = CompactChapter.from_chapter(chapter)
+    assert get_state(compactChapter) == get_state(chapter)
+    assert get_state(copy.deepcopy(compactChapter)) == get_state(chapter)
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
@@ -0,0 +1,165 @@
+"""Regression tests for the record of exported documents' model fingerprints.
+
+usage: test_export_cache.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import tempfile
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from pywriter.model.character import Character
+from novelystlib.model.compact_scene import CompactScene
+from novelystlib.model.export_cache import ExportCache
+from novelystlib.export.html_characters import HtmlCharacters
+from novelystlib.export.odt_manuscript_nv import OdtManuscriptNv
+
+
+class WholeNovelExport:
+    """Export target without FINGERPRINT_SOURCES."""
+
+
+class TagFilter:
+    """Scene filter as set by a plugin."""
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def accept(self, source, eId):
+        return self.tag in (source.novel.scenes[eId].tags or [])
+
+
+def make_novel():
+    novel = Novel()
+    novel.title = 'Export cache test'
+    character = Character()
+    character.title = 'Alice'
+    character.desc = 'The heroine.'
+    novel.characters['1'] = character
+    novel.srtCharacters.append('1')
+    scene = Scene()
+    scene.title = 'Scene 1'
+    scene.sceneContent = 'Alice arrives.'
+    novel.scenes['1'] = scene
+    return novel
+
+
+def write_document(filePath, text):
+    with open(filePath, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_fingerprint_covers_the_sources_only():
+    novel = make_novel()
+    exportCache = ExportCache(None)
+    target = HtmlCharacters('')
+    fingerprint = exportCache.get_fingerprint(target, novel)
+    novel.scenes['1'].sceneContent = 'Alice leaves.'
+    assert exportCache.get_fingerprint(target, novel) == fingerprint
+    novel.characters['1'].desc = 'The villain.'
+    assert exportCache.get_fingerprint(target, novel) != fingerprint
+
+
+def test_fingerprint_covers_the_whole_novel_by_default():
+    novel = make_novel()
+    exportCache = ExportCache(None)
+    target = WholeNovelExport()
+    fingerprint = exportCache.get_fingerprint(target, novel)
+    novel.scenes['1'].sceneContent = 'Alice leaves.'
+    assert exportCache.get_fingerprint(target, novel) != fingerprint
+
+
+def test_fingerprint_depends_on_the_export_class():
+    novel = make_novel()
+    exportCache = ExportCache(None)
+    assert exportCache.get_fingerprint(HtmlCharacters(''), novel) != exportCache.get_fingerprint(WholeNovelExport(), novel)
+
+
+def test_fingerprint_covers_the_keyword_arguments():
+    novel = make_novel()
+    exportCache = ExportCache(None)
+    target = HtmlCharacters('')
+    fingerprint = exportCache.get_fingerprint(target, novel, suffix='_character_report')
+    assert exportCache.get_fingerprint(target, novel, suffix='_character_report') == fingerprint
+    assert exportCache.get_fingerprint(target, novel, suffix='_other_report') != fingerprint
+    assert exportCache.get_fingerprint(target, novel) != fingerprint
+
+
+def test_fingerprint_covers_the_options():
+    novel = make_novel()
+    exportCache = ExportCache(None)
+    target = OdtManuscriptNv('test.yw7')
+    fingerprint = exportCache.get_fingerprint(target, novel)
+    assert exportCache.get_fingerprint(OdtManuscriptNv('test.yw7'), novel) == fingerprint
+    # Temporary directories and other working data are not options.
+    target.projectName = 'Other project'
+    assert exportCache.get_fingerprint(target, novel) != fingerprint
+    target = OdtManuscriptNv('test.yw7')
+    target._sceneFilter = TagFilter('red')
+    fingerprint = exportCache.get_fingerprint(target, novel)
+    target._sceneFilter = TagFilter('red')
+    assert exportCache.get_fingerprint(target, novel) == fingerprint
+    target._sceneFilter = TagFilter('blue')
+    assert exportCache.get_fingerprint(target, novel) != fingerprint
+
+
+def test_fingerprint_covers_compact_scenes():
+    exportCache = ExportCache(None)
+    target = WholeNovelExport()
+    novel = make_novel()
+    novel.scenes['1'] = CompactScene.from_scene(novel.scenes['1'])
+    fingerprint = exportCache.get_fingerprint(target, novel)
+    otherNovel = make_novel()
+    otherNovel.scenes['1'] = CompactScene.from_scene(otherNovel.scenes['1'])
+    assert exportCache.get_fingerprint(target, otherNovel) == fingerprint
+    novel.scenes['1'].sceneContent = 'Alice leaves.'
+    changedFingerprint = exportCache.get_fingerprint(target, novel)
+    assert changedFingerprint != fingerprint
+    novel.scenes['1'].kwVar['Field_SceneArcs'] = 'A'
+    assert exportCache.get_fingerprint(target, novel) != changedFingerprint
+
+
+def test_document_is_up_to_date_until_changed():
+    with tempfile.TemporaryDirectory() as tempDir:
+        exportCache = ExportCache(os.path.join(tempDir, 'exports.json'))
+        documentPath = os.path.join(tempDir, 'document.html')
+        write_document(documentPath, 'Exported.')
+        exportCache.update(documentPath, 'fingerprint')
+        assert exportCache.is_up_to_date(documentPath, 'fingerprint')
+        assert not exportCache.is_up_to_date(documentPath, 'other fingerprint')
+        write_document(documentPath, 'Edited by the user.')
+        assert not exportCache.is_up_to_date(documentPath, 'fingerprint')
+
+
+def test_deleted_document_is_not_up_to_date():
+    with tempfile.TemporaryDirectory() as tempDir:
+        exportCache = ExportCache(os.path.join(tempDir, 'exports.json'))
+        documentPath = os.path.join(tempDir, 'document.html')
+        write_document(documentPath, 'Exported.')
+        exportCache.update(documentPath, 'fingerprint')
+        os.remove(documentPath)
+        assert not exportCache.is_up_to_date(documentPath, 'fingerprint')
+
+
+def test_entries_of_missing_documents_are_removed():
+    with tempfile.TemporaryDirectory() as tempDir:
+        exportCache = ExportCache(os.path.join(tempDir, 'exports.json'))
+        firstPath = os.path.join(tempDir, 'first.html')
+        secondPath = os.path.join(tempDir, 'second.html')
+        write_document(firstPath, 'Exported.')
+        exportCache.update(firstPath, 'fingerprint')
+        os.remove(firstPath)
+        write_document(secondPath, 'Exported.')
+        exportCache.update(secondPath, 'fingerprint')
+        assert list(exportCache._read()) == [os.path.abspath(secondPath)]
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
@@ -0,0 +1,78 @@
+"""Regression tests for the substitute of plugins registered by their manifests.
+
+usage: test_lazy_plugin.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from novelystlib.plugin.lazy_plugin import LazyPlugin
+
+MANIFEST = dict(
+    novelyst_api='4.0',
+    hooks=['enable_menu', 'disable_menu', 'on_close', 'on_quit', 'open_node'],
+    )
+
+
+class Plugin:
+    """Loaded plugin recording its hook calls."""
+
+    def __init__(self):
+        self.isActive = True
+        self.calls = []
+
+    def __getattr__(self, hook):
+        return lambda: self.calls.append(hook)
+
+
+class Plugins:
+    """Stand-in for the plugin collection, counting the module imports."""
+
+    def __init__(self, isProjectOpen):
+        self.isProjectOpen = isProjectOpen
+        self.loaded = []
+
+    def load_module(self, filePath):
+        self.loaded.append(Plugin())
+        return self.loaded[-1]
+
+
+def test_application_hooks_do_not_load():
+    plugins = Plugins(True)
+    lazyPlugin = LazyPlugin(plugins, 'novelyst_example.py', MANIFEST)
+    lazyPlugin.enable_menu()
+    lazyPlugin.disable_menu()
+    lazyPlugin.on_close()
+    lazyPlugin.on_quit()
+    assert plugins.loaded == []
+
+
+def test_open_node_loads_and_enables_menu():
+    plugins = Plugins(True)
+    lazyPlugin = LazyPlugin(plugins, 'novelyst_example.py', MANIFEST)
+    lazyPlugin.open_node()
+    assert len(plugins.loaded) == 1
+    assert plugins.loaded[0].calls == ['enable_menu', 'open_node']
+
+
+def test_load_without_project_keeps_menu_disabled():
+    plugins = Plugins(False)
+    lazyPlugin = LazyPlugin(plugins, 'novelyst_example.py', MANIFEST)
+    pluginObject = lazyPlugin.load()
+    assert pluginObject.calls == []
+
+
+def test_unlisted_open_node_is_ignored():
+    plugins = Plugins(True)
+    lazyPlugin = LazyPlugin(plugins, 'novelyst_example.py', dict(novelyst_api='4.0', hooks=['on_close']))
+    lazyPlugin.open_node()
+    assert plugins.loaded == []
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
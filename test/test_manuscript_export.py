@@ -0,0 +1,121 @@
+"""Regression tests for the manuscript export re-rendering only changed scenes.
+
+usage: test_manuscript_export.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import tempfile
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from pywriter.odt_w.odt_w_manuscript import OdtWManuscript
+from novelystlib.export.odt_manuscript_nv import OdtManuscriptNv
+
+
+class CountingManuscript(OdtManuscriptNv):
+    """Manuscript export recording the scene contents it converts."""
+    converted = []
+
+    def _convert_from_yw(self, text, quick=False):
+        if not quick:
+            self.converted.append(text)
+        return super()._convert_from_yw(text, quick)
+
+
+def make_novel():
+    novel = Novel()
+    novel.title = 'Manuscript test'
+    chapter = Chapter()
+    chapter.title = 'Chapter 1'
+    chapter.chLevel = 0
+    chapter.chType = 0
+    chapter.srtScenes = []
+    novel.chapters['1'] = chapter
+    novel.srtChapters.append('1')
+    for scId in ('1', '2', '3'):
+        scene = Scene()
+        scene.title = f'Scene {scId}'
+        scene.sceneContent = f'Content of scene {scId}.'
+        scene.scType = 0
+        scene.status = 1
+        novel.scenes[scId] = scene
+        chapter.srtScenes.append(scId)
+    novel.get_languages()
+    return novel
+
+
+def export(tempDir, novel):
+    """Write the manuscript; return the contents converted."""
+    document = CountingManuscript(os.path.join(tempDir, 'test_manuscript.odt'))
+    document.novel = novel
+    CountingManuscript.converted = []
+    document.write()
+    contents = {scene.sceneContent for scene in novel.scenes.values()}
+    return [text for text in CountingManuscript.converted if text in contents]
+
+
+def get_text(tempDir, novel, exportClass):
+    """Return the rendered manuscript content without writing it."""
+    document = exportClass(os.path.join(tempDir, 'test_manuscript.odt'))
+    document.novel = novel
+    return document._get_text()
+
+
+def test_only_changed_scenes_are_rendered_again():
+    with tempfile.TemporaryDirectory() as tempDir:
+        novel = make_novel()
+        CountingManuscript._sceneCache = {}
+        assert len(export(tempDir, novel)) == 3
+        novel.scenes['2'].sceneContent = 'Revised content.'
+        assert export(tempDir, novel) == ['Revised content.']
+        assert export(tempDir, novel) == []
+
+
+def test_cached_output_equals_full_rendering():
+    with tempfile.TemporaryDirectory() as tempDir:
+        novel = make_novel()
+        CountingManuscript._sceneCache = {}
+        export(tempDir, novel)
+        novel.scenes['1'].sceneContent = 'New first scene, with more words than before.'
+        novel.scenes['2'].title = 'Retitled'
+        text = get_text(tempDir, novel, CountingManuscript)
+        assert 'New first scene' in text
+        assert text == get_text(tempDir, novel, OdtWManuscript)
+
+
+def test_cached_mappings_are_not_changed():
+    with tempfile.TemporaryDirectory() as tempDir:
+        novel = make_novel()
+        CountingManuscript._sceneCache = {}
+        export(tempDir, novel)
+        cachedMappings = {key: dict(mapping) for key, mapping in CountingManuscript._sceneCache.items()}
+        novel.scenes['1'].sceneContent = 'New first scene, with more words than before.'
+        get_text(tempDir, novel, CountingManuscript)
+        for key, mapping in cachedMappings.items():
+            assert CountingManuscript._sceneCache[key] == mapping
+
+
+def test_cache_is_limited():
+    with tempfile.TemporaryDirectory() as tempDir:
+        novel = make_novel()
+        CountingManuscript._sceneCache = {}
+        savedLimit = CountingManuscript.CACHE_LIMIT
+        CountingManuscript.CACHE_LIMIT = len(novel.scenes['1'].sceneContent)
+        try:
+            export(tempDir, novel)
+            assert len(CountingManuscript._sceneCache) == 1
+            assert export(tempDir, novel) == ['Content of scene 2.', 'Content of scene 3.']
+        finally:
+            CountingManuscript.CACHE_LIMIT = savedLimit
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
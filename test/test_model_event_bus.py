@@ -0,0 +1,118 @@
+"""Regression tests for the model change event bus.
+
+usage: test_model_event_bus.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from novelystlib.model.model_event_bus import ModelEventBus
+from novelystlib.model.model_event_bus import ModelEvent
+
+
+class Recorder:
+    """Subscriber collecting the delivered event lists."""
+
+    def __init__(self):
+        self.deliveries = []
+
+    def __call__(self, events):
+        self.deliveries.append(events)
+
+
+def make_bus():
+    """Return a bus with a manual scheduler, and the list of scheduled functions."""
+    scheduled = []
+    return ModelEventBus(scheduled.append), scheduled
+
+
+def test_events_are_delivered_once_per_burst():
+    bus, scheduled = make_bus()
+    recorder = Recorder()
+    bus.subscribe(recorder)
+    bus.publish(ModelEventBus.FIELD_CHANGED, 'sc1', 'title')
+    bus.publish(ModelEventBus.FIELD_CHANGED, 'sc1', 'title')
+    bus.publish(ModelEventBus.FIELD_CHANGED, 'sc2', 'desc')
+    assert len(scheduled) == 1
+    scheduled.pop()()
+    assert recorder.deliveries == [[
+        ModelEvent(ModelEventBus.FIELD_CHANGED, 'sc1', 'title', None),
+        ModelEvent(ModelEventBus.FIELD_CHANGED, 'sc2', 'desc', None),
+        ]]
+
+
+def test_fallback_is_delivered_without_other_events():
+    bus, scheduled = make_bus()
+    recorder = Recorder()
+    bus.subscribe(recorder)
+    bus.publish_fallback()
+    scheduled.pop()()
+    assert recorder.deliveries == [[ModelEvent(ModelEventBus.FIELD_CHANGED, None, None, None)]]
+
+
+def test_fallback_is_dropped_with_announced_changes():
+    bus, scheduled = make_bus()
+    recorder = Recorder()
+    bus.subscribe(recorder)
+    bus.publish_fallback()
+    bus.publish(ModelEventBus.FIELD_CHANGED, 'sc1', 'title')
+    scheduled.pop()()
+    assert recorder.deliveries == [[ModelEvent(ModelEventBus.FIELD_CHANGED, 'sc1', 'title', None)]]
+
+
+def test_fallback_keeps_the_first_sender():
+    bus, scheduled = make_bus()
+    recorder = Recorder()
+    bus.subscribe(recorder)
+    bus.publish_fallback(sender='tree')
+    bus.publish_fallback()
+    scheduled.pop()()
+    assert recorder.deliveries == [[ModelEvent(ModelEventBus.FIELD_CHANGED, None, None, 'tree')]]
+
+
+def test_fallback_during_delivery_is_ignored():
+    bus, scheduled = make_bus()
+
+    def subscriber(events):
+        bus.publish_fallback()
+
+    bus.subscribe(subscriber)
+    bus.publish(ModelEventBus.ELEMENT_ADDED, 'sc1')
+    scheduled.pop()()
+    assert scheduled == []
+
+
+def test_immediate_subscribers_get_the_fallback():
+    bus, scheduled = make_bus()
+    recorder = Recorder()
+    bus.subscribe(recorder, immediate=True)
+    bus.publish_fallback()
+    assert recorder.deliveries == []
+    scheduled.pop()()
+    assert recorder.deliveries == [[ModelEvent(ModelEventBus.FIELD_CHANGED, None, None, None)]]
+
+
+def test_subscriber_exceptions_are_logged():
+    bus, scheduled = make_bus()
+    recorder = Recorder()
+
+    def failing_subscriber(events):
+        raise ValueError('subscriber failed')
+
+    bus.subscribe(failing_subscriber)
+    bus.subscribe(recorder)
+    bus.publish(ModelEventBus.ELEMENT_REMOVED, 'sc1')
+    scheduled.pop()()
+    assert len(recorder.deliveries) == 1
+    assert len(bus.errorLog) == 1
+    assert 'subscriber failed' in bus.errorLog[0]
+    assert 'Traceback' in bus.errorLog[0]
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
@@ -0,0 +1,200 @@
+"""Regression tests for merging external project file changes.
+
+usage: test_novel_merger.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import copy
+import os
+import tempfile
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from pywriter.model.character import Character
+from novelystlib.model.novel_merger import NovelMerger
+from novelystlib.model.work_file import WorkFile
+
+
+def make_novel():
+    """Return a novel with two chapters of two scenes each, and a character."""
+    novel = Novel()
+    novel.title = 'Merge test'
+    for chapterIndex in range(2):
+        chId = str(chapterIndex + 1)
+        chapter = Chapter()
+        chapter.title = f'Chapter {chId}'
+        chapter.chLevel = 0
+        chapter.chType = 0
+        chapter.srtScenes = []
+        novel.chapters[chId] = chapter
+        novel.srtChapters.append(chId)
+        for sceneIndex in range(2):
+            scId = str(chapterIndex * 2 + sceneIndex + 1)
+            scene = Scene()
+            scene.title = f'Scene {scId}'
+            scene.sceneContent = f'Content of scene {scId}.'
+            scene.scType = 0
+            scene.status = 1
+            novel.scenes[scId] = scene
+            chapter.srtScenes.append(scId)
+    character = Character()
+    character.title = 'Alice'
+    novel.characters['1'] = character
+    novel.srtCharacters.append('1')
+    return novel
+
+
+def add_scene(novel, scId, chId):
+    scene = Scene()
+    scene.title = f'Scene {scId}'
+    scene.sceneContent = 'Added remotely.'
+    scene.scType = 0
+    scene.status = 1
+    novel.scenes[scId] = scene
+    novel.chapters[chId].srtScenes.append(scId)
+
+
+def merge(local, remote, base):
+    merger = NovelMerger()
+    merger.merge(local, remote, NovelMerger.get_hashes(base))
+    return merger
+
+
+def test_remote_change_is_taken():
+    base = make_novel()
+    local = copy.deepcopy(base)
+    remote = copy.deepcopy(base)
+    remote.scenes['2'].sceneContent = 'Changed remotely.'
+    merger = merge(local, remote, base)
+    assert local.scenes['2'].sceneContent == 'Changed remotely.'
+    assert merger.changed == {'scenes': {'2'}}
+    assert merger.conflicts == []
+
+
+def test_conflicting_change_is_kept():
+    base = make_novel()
+    local = copy.deepcopy(base)
+    remote = copy.deepcopy(base)
+    local.scenes['2'].sceneContent = 'Changed locally.'
+    remote.scenes['2'].sceneContent = 'Changed remotely.'
+    merger = merge(local, remote, base)
+    assert local.scenes['2'].sceneContent == 'Changed locally.'
+    assert merger.conflicts == [('scenes', '2')]
+
+
+def test_scene_added_to_conflicting_chapter_is_attached():
+    base = make_novel()
+    local = copy.deepcopy(base)
+    remote = copy.deepcopy(base)
+    local.chapters['1'].title = 'Edited locally'
+    add_scene(remote, '5', '1')
+    merger = merge(local, remote, base)
+    assert local.chapters['1'].title == 'Edited locally'
+    assert local.chapters['1'].srtScenes == ['1', '2', '5']
+    assert local.scenes['5'].sceneContent == 'Added remotely.'
+    assert merger.conflicts == [('chapters', '1')]
+
+
+def test_scene_added_to_locally_deleted_chapter_is_reported():
+    base = make_novel()
+    local = copy.deepcopy(base)
+    remote = copy.deepcopy(base)
+    for scId in local.chapters['2'].srtScenes:
+        del local.scenes[scId]
+    del local.chapters['2']
+    local.srtChapters.remove('2')
+    add_scene(remote, '5', '2')
+    merger = merge(local, remote, base)
+    assert not '5' in local.scenes
+    assert ('scenes', '5') in merger.conflicts
+    assert not '5' in merger.changed.get('scenes', set())
+
+
+def test_chapter_added_to_conflicting_order_is_attached():
+    base = make_novel()
+    local = copy.deepcopy(base)
+    remote = copy.deepcopy(base)
+    local.srtChapters.reverse()
+    chapter = Chapter()
+    chapter.title = 'Chapter 3'
+    chapter.chLevel = 0
+    chapter.chType = 0
+    chapter.srtScenes = []
+    remote.chapters['3'] = chapter
+    remote.srtChapters.append('3')
+    add_scene(remote, '5', '3')
+    merger = merge(local, remote, base)
+    assert local.srtChapters == ['2', '1', '3']
+    assert local.chapters['3'].srtScenes == ['5']
+    assert merger.conflicts == [('srtChapters', None)]
+
+
+def test_deleted_references_are_removed():
+    base = make_novel()
+    base.scenes['1'].characters = ['1']
+    local = copy.deepcopy(base)
+    remote = copy.deepcopy(base)
+    local.scenes['1'].sceneContent = 'Changed locally.'
+    del remote.characters['1']
+    remote.srtCharacters.remove('1')
+    remote.scenes['1'].characters = []
+    merge(local, remote, base)
+    assert not '1' in local.characters
+    assert local.srtCharacters == []
+    assert local.scenes['1'].characters == []
+
+
+def test_work_file_merge():
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = os.path.join(tempDir, 'test.yw7')
+        prjFile = WorkFile(filePath)
+        prjFile.snapshotCache = None
+        prjFile.novel = make_novel()
+        prjFile.write()
+
+        # Change the file externally.
+        remoteFile = WorkFile(filePath)
+        remoteFile.snapshotCache = None
+        remoteFile.novel = Novel()
+        remoteFile.read()
+        remoteFile.novel.chapters['1'].srtScenes.remove('1')
+        remoteFile.novel.chapters['2'].srtScenes.append('1')
+        remoteFile.novel.scenes['3'].title = 'Changed remotely'
+        remoteFile.write()
+
+        # Change the model locally.
+        prjFile.novel.scenes['4'].title = 'Changed locally'
+        assert prjFile.has_changed_on_disk()
+        merger = prjFile.merge()
+        assert merger.conflicts == []
+        assert prjFile.novel.chapters['1'].srtScenes == ['2']
+        assert prjFile.novel.chapters['2'].srtScenes == ['3', '4', '1']
+        assert prjFile.novel.scenes['3'].title == 'Changed remotely'
+        assert prjFile.novel.scenes['4'].title == 'Changed locally'
+        assert not prjFile.has_changed_on_disk()
+
+
+def test_work_file_keeps_element_hashes():
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = os.path.join(tempDir, 'test.yw7')
+        prjFile = WorkFile(filePath)
+        prjFile.snapshotCache = None
+        prjFile.novel = make_novel()
+        prjFile.write()
+        assert prjFile.elementHashes == NovelMerger.get_hashes(prjFile.novel)
+        readFile = WorkFile(filePath)
+        readFile.snapshotCache = None
+        readFile.novel = Novel()
+        readFile.read()
+        assert readFile.elementHashes == NovelMerger.get_hashes(readFile.novel)
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
@@ -0,0 +1,150 @@
+"""Regression tests for the aggregates computed from the columnar scene metadata.
+
+usage: test_scene_columns.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+The aggregates are compared with the loops over the scene objects they replace,
+with the array module, and with NumPy, if installed.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from novelystlib.model import scene_columns
+from novelystlib.model.scene_columns import SceneColumns
+from generate_project import generate_novel
+
+
+def make_novel():
+    """Return a generated novel with some unused, excluded, trashed, and unassigned scenes."""
+    novel = generate_novel(parts=2, chapters=6, scenes=40, words=20, characters=5, arcs=2, points=3, tags=3)
+    scIds = list(novel.scenes)
+    novel.scenes[scIds[1]].scType = 3
+    novel.scenes[scIds[2]].scType = 1
+    novel.scenes[scIds[3]].doNotExport = True
+    novel.scenes[scIds[4]].characters = []
+    novel.scenes[scIds[5]].status = None
+    trash = Chapter()
+    trash.title = 'Trash'
+    trash.chLevel = 0
+    trash.chType = 0
+    trash.isTrash = True
+    trash.srtScenes = [scIds[6]]
+    novel.chapters['99'] = trash
+    novel.srtChapters.append('99')
+    novel.chapters[novel.srtChapters[1]].srtScenes.remove(scIds[6])
+    unassigned = Scene()
+    unassigned.title = 'Unassigned'
+    unassigned.scType = 0
+    unassigned.status = 2
+    unassigned.sceneContent = 'Not in a chapter.'
+    unassigned.characters = []
+    novel.scenes['999'] = unassigned
+    return novel
+
+
+def count_words(novel):
+    count = totalCount = 0
+    for chId in novel.srtChapters:
+        if not novel.chapters[chId].isTrash:
+            for scId in novel.chapters[chId].srtScenes:
+                if novel.scenes[scId].scType in (0, 3) and not novel.scenes[scId].doNotExport:
+                    totalCount += novel.scenes[scId].wordCount
+                    if novel.scenes[scId].scType == 0:
+                        count += novel.scenes[scId].wordCount
+    return count, totalCount
+
+
+def get_counts(novel):
+    partCount = chapterCount = sceneCount = wordCount = 0
+    for chId in novel.srtChapters:
+        if novel.chapters[chId].chType == 0:
+            for scId in novel.chapters[chId].srtScenes:
+                if novel.scenes[scId].scType == 0 and not novel.scenes[scId].doNotExport:
+                    sceneCount += 1
+                    wordCount += novel.scenes[scId].wordCount
+            if novel.chapters[chId].chLevel == 1:
+                partCount += 1
+            else:
+                chapterCount += 1
+    return wordCount, sceneCount, chapterCount, partCount
+
+
+def get_status_counts(novel):
+    counts = [None, 0, 0, 0, 0, 0]
+    for scId in novel.scenes:
+        if novel.scenes[scId].scType == 0 and not novel.scenes[scId].doNotExport:
+            if novel.scenes[scId].status is not None:
+                counts[novel.scenes[scId].status] += novel.scenes[scId].wordCount
+    return counts
+
+
+def get_positions(novel):
+    scenePositions = {}
+    chapterPositions = {}
+    wordCount = 0
+    for chId in novel.srtChapters:
+        chapterPositions[chId] = wordCount
+        for scId in novel.chapters[chId].srtScenes:
+            scenePositions[scId] = wordCount
+            if novel.scenes[scId].scType == 0 and not novel.scenes[scId].doNotExport:
+                wordCount += novel.scenes[scId].wordCount
+    return scenePositions, chapterPositions
+
+
+def get_viewpoint_words(novel):
+    result = {}
+    for crId in novel.characters:
+        wordCount = 0
+        for scId in novel.scenes:
+            if novel.scenes[scId].scType == 0:
+                if novel.scenes[scId].characters:
+                    if novel.scenes[scId].characters[0] == crId and not novel.scenes[scId].doNotExport:
+                        wordCount += novel.scenes[scId].wordCount
+        if wordCount > 0:
+            result[crId] = wordCount
+    return result
+
+
+def get_scene_groups(novel):
+    result = {}
+    for chId in novel.srtChapters:
+        for scId in novel.chapters[chId].srtScenes:
+            if novel.scenes[scId].scType == 0 and not novel.scenes[scId].doNotExport:
+                result.setdefault(novel.scenes[scId].status or 0, []).append(scId)
+    return result
+
+
+def check_aggregates(threshold):
+    novel = make_novel()
+    savedThreshold = SceneColumns.NUMPY_THRESHOLD
+    SceneColumns.NUMPY_THRESHOLD = threshold
+    try:
+        columns = SceneColumns(novel)
+    finally:
+        SceneColumns.NUMPY_THRESHOLD = savedThreshold
+    assert columns.count_words() == count_words(novel)
+    assert columns.get_counts() == get_counts(novel)
+    assert columns.get_status_counts() == get_status_counts(novel)
+    assert columns.get_positions() == get_positions(novel)
+    assert columns.get_viewpoint_words() == get_viewpoint_words(novel)
+    assert columns.get_scene_groups('status') == get_scene_groups(novel)
+    return columns
+
+
+def test_aggregates_with_array_module():
+    assert not check_aggregates(10 ** 9).usesNumpy
+
+
+def test_aggregates_with_numpy():
+    columns = check_aggregates(0)
+    assert columns.usesNumpy == (scene_columns._get_numpy() is not None)
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
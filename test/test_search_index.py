@@ -0,0 +1,140 @@
+"""Regression tests for the full-text search index and its event-driven refresh.
+
+usage: test_search_index.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import time
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from novelystlib.model.model_event_bus import ModelEventBus
+from novelystlib.model.search_index import SearchIndex
+from novelystlib.view_controller.search_indexer import SearchIndexer
+
+
+class ProjectFile:
+    """Stand-in for the work file, as far as the indexer needs it."""
+
+    def __init__(self, novel):
+        self.novel = novel
+        self.snapshotCache = None
+        self.filePath = None
+
+
+def make_novel():
+    novel = Novel()
+    chapter = Chapter()
+    chapter.title = 'Chapter one'
+    chapter.srtScenes = []
+    novel.chapters['1'] = chapter
+    novel.srtChapters.append('1')
+    for scId, text in (('1', 'The quick brown fox.'), ('2', 'A lazy dog sleeps.')):
+        scene = Scene()
+        scene.title = f'Scene {scId}'
+        scene.sceneContent = text
+        novel.scenes[scId] = scene
+        chapter.srtScenes.append(scId)
+    return novel
+
+
+def start_indexer(novel):
+    modelEvents = ModelEventBus()
+    indexer = SearchIndexer(modelEvents)
+    indexer.start(ProjectFile(novel))
+    for __ in range(500):
+        if indexer.index is not None:
+            break
+
+        time.sleep(0.01)
+    assert indexer.index is not None
+    return indexer, modelEvents
+
+
+def test_refresh_elements_equals_rebuild():
+    novel = make_novel()
+    index = SearchIndex()
+    index.build(novel)
+    novel.scenes['1'].sceneContent = 'The quick red fox jumps.'
+    novel.scenes['2'].sceneContent = ''
+    index.refresh_elements(novel, [('scenes', '1'), ('scenes', '2')])
+    rebuilt = SearchIndex()
+    rebuilt.build(novel)
+    for query in ('red', 'brown', 'lazy', 'fox', '"red fox"', 'qu*'):
+        assert index.search(query) == rebuilt.search(query), query
+    assert index.wordCount == rebuilt.wordCount
+
+
+def test_refresh_elements_removes_deleted_elements():
+    novel = make_novel()
+    index = SearchIndex()
+    index.build(novel)
+    del novel.scenes['2']
+    index.refresh_elements(novel, [('scenes', '2')])
+    assert index.search('lazy') == []
+    assert index.get_text(('scenes', '2', 'sceneContent')) == ''
+
+
+def test_indexer_finds_announced_changes():
+    novel = make_novel()
+    indexer, modelEvents = start_indexer(novel)
+    assert indexer.search('fox') == [('scenes', '1', 'sceneContent')]
+    novel.scenes['1'].sceneContent = 'A slow turtle.'
+    modelEvents.publish(ModelEventBus.FIELD_CHANGED, 'sc1', 'sceneContent')
+    assert indexer.search('turtle') == [('scenes', '1', 'sceneContent')]
+    assert indexer.search('fox') == []
+    assert indexer.search('lazy') == [('scenes', '2', 'sceneContent')]
+
+
+def test_indexer_finds_announced_new_elements():
+    novel = make_novel()
+    indexer, modelEvents = start_indexer(novel)
+    scene = Scene()
+    scene.title = 'Scene 3'
+    scene.sceneContent = 'A new beginning.'
+    novel.scenes['3'] = scene
+    novel.chapters['1'].srtScenes.append('3')
+    modelEvents.publish(ModelEventBus.ELEMENT_ADDED, 'sc3')
+    assert indexer.search('beginning') == [('scenes', '3', 'sceneContent')]
+
+
+def test_indexer_keeps_results_after_other_events():
+    novel = make_novel()
+    indexer, modelEvents = start_indexer(novel)
+    novel.scenes['1'].status = 2
+    modelEvents.publish(ModelEventBus.FIELD_CHANGED, 'sc1', 'status')
+    novel.chapters['1'].srtScenes.reverse()
+    modelEvents.publish(ModelEventBus.ELEMENT_MOVED, 'sc2')
+    assert indexer.search('fox') == [('scenes', '1', 'sceneContent')]
+    assert indexer.search('lazy') == [('scenes', '2', 'sceneContent')]
+
+
+def test_indexer_refreshes_all_after_fallback_event():
+    novel = make_novel()
+    indexer, modelEvents = start_indexer(novel)
+    novel.scenes['2'].sceneContent = 'An unannounced change.'
+    modelEvents.publish_fallback()
+    assert indexer.search('unannounced') == [('scenes', '2', 'sceneContent')]
+
+
+def test_indexer_refreshes_all_after_removing_a_chapter():
+    novel = make_novel()
+    indexer, modelEvents = start_indexer(novel)
+    for scId in novel.chapters['1'].srtScenes:
+        del novel.scenes[scId]
+    del novel.chapters['1']
+    novel.srtChapters.remove('1')
+    modelEvents.publish(ModelEventBus.ELEMENT_REMOVED, 'ch1')
+    assert indexer.search('fox') == []
+    assert indexer.search('chapter') == []
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
@@ -0,0 +1,95 @@
+"""Regression tests for reopening unchanged projects from the snapshot cache.
+
+usage: test_snapshot_cache.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import tempfile
+from pywriter.model.novel import Novel
+from novelystlib.model.snapshot_cache import SnapshotCache
+from novelystlib.model.work_file import WorkFile
+from generate_project import generate_project
+from bench_core import get_counts
+
+
+def open_project(filePath, snapshotCache):
+    prjFile = WorkFile(filePath)
+    prjFile.snapshotCache = snapshotCache
+    prjFile.novel = Novel()
+    prjFile.read()
+    prjFile.keepColumns = True
+    return prjFile
+
+
+def get_aggregates(prjFile):
+    return prjFile.count_words(), prjFile.get_counts(), prjFile.get_status_counts()
+
+
+def test_snapshot_is_written_on_request_only():
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = os.path.join(tempDir, 'test.yw7')
+        generate_project(filePath, **get_counts(50, 20))
+        snapshotCache = SnapshotCache(os.path.join(tempDir, 'cache'), 10000000)
+        prjFile = open_project(filePath, snapshotCache)
+        assert os.listdir(snapshotCache.cacheDir) == []
+        prjFile.write()
+        assert os.listdir(snapshotCache.cacheDir) == []
+        prjFile.write_snapshot()
+        assert len(os.listdir(snapshotCache.cacheDir)) == 1
+
+
+def test_reopened_project_equals_read_project():
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = os.path.join(tempDir, 'test.yw7')
+        generate_project(filePath, **get_counts(50, 20))
+        snapshotCache = SnapshotCache(os.path.join(tempDir, 'cache'), 10000000)
+        prjFile = open_project(filePath, snapshotCache)
+        aggregates = get_aggregates(prjFile)
+        prjFile.write_snapshot()
+        reopenedFile = open_project(filePath, snapshotCache)
+        assert reopenedFile.loadedTree is None
+        # The model has been restored from the snapshot.
+        assert reopenedFile.elementHashes == prjFile.elementHashes
+        assert get_aggregates(reopenedFile) == aggregates
+
+
+def test_restored_aggregates_are_discarded_on_change():
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = os.path.join(tempDir, 'test.yw7')
+        generate_project(filePath, **get_counts(50, 20))
+        snapshotCache = SnapshotCache(os.path.join(tempDir, 'cache'), 10000000)
+        open_project(filePath, snapshotCache).write_snapshot()
+        prjFile = open_project(filePath, snapshotCache)
+        count, totalCount = prjFile.count_words()
+        scene = prjFile.novel.scenes[prjFile.novel.chapters[prjFile.novel.srtChapters[-1]].srtScenes[0]]
+        scene.scType = 0
+        scene.doNotExport = False
+        scene.sceneContent = f'{scene.sceneContent} one more word'
+        prjFile.invalidate_columns()
+        assert prjFile.count_words()[1] > totalCount
+
+
+def test_changed_file_is_read_again():
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = os.path.join(tempDir, 'test.yw7')
+        generate_project(filePath, **get_counts(50, 20))
+        snapshotCache = SnapshotCache(os.path.join(tempDir, 'cache'), 10000000)
+        prjFile = open_project(filePath, snapshotCache)
+        prjFile.write_snapshot()
+        prjFile.novel.title = 'Changed title'
+        prjFile.write()
+        reopenedFile = open_project(filePath, snapshotCache)
+        assert reopenedFile.loadedTree is not None
+        assert reopenedFile.novel.title == 'Changed title'
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
@@ -0,0 +1,174 @@
+"""Regression tests for the project-wide find and replace.
+
+usage: test_text_replacer.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import re
+from pywriter.pywriter_globals import Error
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.character import Character
+from pywriter.model.scene import Scene
+from novelystlib.model.compact_scene import CompactScene
+from novelystlib.model.text_replacer import TextReplacer
+from novelystlib.model.text_replacer import replace_text
+
+
+def make_novel():
+    novel = Novel()
+    chapter = Chapter()
+    chapter.title = 'Chapter one'
+    chapter.desc = 'Where Anna meets Bob.'
+    chapter.srtScenes = ['1', '2']
+    novel.chapters['1'] = chapter
+    novel.srtChapters.append('1')
+    scene = Scene()
+    scene.title = 'Scene 1'
+    scene.sceneContent = 'Anna sees [i]Anna[/i] in the mirror.'
+    scene.field1 = 'Anna is tired.'
+    novel.scenes['1'] = scene
+    scene = CompactScene()
+    scene.title = 'Scene 2'
+    scene.sceneContent = 'Bob waits.'
+    scene.kwVar['Field_SceneArcs'] = 'Anna'
+    scene.kwVar['Field_CustomAR'] = 'Anna'
+    novel.scenes['2'] = scene
+    character = Character()
+    character.title = 'Anna'
+    character.bio = 'anna was born in Anna town.'
+    character.kwVar = {'Field_Link': 'Anna.png', 'Field_Nickname': 'Little Anna'}
+    novel.characters['1'] = character
+    novel.srtCharacters.append('1')
+    return novel
+
+
+def test_replace_text_keeps_markup():
+    pattern = re.compile('i')
+    assert replace_text(pattern, 'I', 'a [i]fine[/i] line') == ('a [i]fIne[/i] lIne', 2)
+    pattern = re.compile(r'e \[')
+    assert replace_text(pattern, '', 'the [b]end[/b]') == ('the [b]end[/b]', 0)
+
+
+def test_replace_text_keeps_quotation_marks():
+    pattern = re.compile('>')
+    assert replace_text(pattern, '<', '> quoted\nnot > quoted') == ('> quoted\nnot < quoted', 1)
+
+
+def test_find_does_not_modify_the_novel():
+    novel = make_novel()
+    changes = TextReplacer('Anna', 'Eve').find(novel)
+    assert novel.scenes['1'].sceneContent == 'Anna sees [i]Anna[/i] in the mirror.'
+    assert len(changes) == 5
+
+
+def test_find_covers_the_custom_fields():
+    novel = make_novel()
+    changes = TextReplacer('Anna', 'Eve').find(novel)
+    docKeys = set(change[0] for change in changes)
+    assert ('chapters', '1', 'desc') in docKeys
+    assert ('scenes', '1', 'field1') in docKeys
+    assert ('characters', '1', 'Field_Nickname') in docKeys
+    assert not ('characters', '1', 'Field_Link') in docKeys
+    assert not ('scenes', '2', 'Field_SceneArcs') in docKeys
+    assert not ('scenes', '2', 'Field_CustomAR') in docKeys
+
+
+def test_match_case():
+    novel = make_novel()
+    changes = TextReplacer('anna', 'Eve').find(novel)
+    assert [change[0] for change in changes] == [('characters', '1', 'bio')]
+    assert changes[0][3] == 1
+    changes = TextReplacer('anna', 'Eve', matchCase=False).find(novel)
+    bio = [change for change in changes if change[0] == ('characters', '1', 'bio')][0]
+    assert bio[2] == 'Eve was born in Eve town.'
+    assert bio[3] == 2
+
+
+def test_regex_groups():
+    novel = make_novel()
+    changes = TextReplacer(r'(\w+) waits', r'\1 is waiting', isRegex=True).find(novel)
+    assert changes == [(('scenes', '2', 'sceneContent'), 'Bob waits.', 'Bob is waiting.', 1)]
+
+
+def test_invalid_regex_raises_error():
+    try:
+        TextReplacer('(', '', isRegex=True)
+    except Error:
+        pass
+    else:
+        assert False
+
+
+def test_apply_replaces_and_counts_words():
+    novel = make_novel()
+    replacer = TextReplacer('waits', 'is waiting')
+    touched = replacer.apply(novel, replacer.find(novel))
+    assert touched == {('scenes', '2')}
+    assert novel.scenes['2'].sceneContent == 'Bob is waiting.'
+    assert novel.scenes['2'].wordCount == 3
+
+
+def test_apply_writes_custom_fields():
+    novel = make_novel()
+    replacer = TextReplacer('Anna', 'Eve')
+    replacer.apply(novel, replacer.find(novel))
+    assert novel.scenes['1'].sceneContent == 'Eve sees [i]Eve[/i] in the mirror.'
+    assert novel.scenes['1'].field1 == 'Eve is tired.'
+    assert novel.characters['1'].kwVar['Field_Nickname'] == 'Little Eve'
+    assert novel.characters['1'].kwVar['Field_Link'] == 'Anna.png'
+    assert novel.scenes['2'].kwVar['Field_SceneArcs'] == 'Anna'
+
+
+def test_apply_refuses_stale_changes():
+    novel = make_novel()
+    replacer = TextReplacer('Anna', 'Eve')
+    changes = replacer.find(novel)
+    novel.characters['1'].bio = 'Changed meanwhile.'
+    try:
+        replacer.apply(novel, changes)
+    except Error:
+        pass
+    else:
+        assert False
+    assert novel.scenes['1'].sceneContent == 'Anna sees [i]Anna[/i] in the mirror.'
+
+
+def test_undo_restores_the_texts():
+    novel = make_novel()
+    replacer = TextReplacer('Anna', 'Eve')
+    changes = replacer.find(novel)
+    replacer.apply(novel, changes)
+    touched = replacer.undo(novel, changes)
+    assert touched == {('chapters', '1'), ('scenes', '1'), ('characters', '1')}
+    assert novel.scenes['1'].sceneContent == 'Anna sees [i]Anna[/i] in the mirror.'
+    assert novel.scenes['1'].wordCount == 6
+    assert novel.scenes['1'].field1 == 'Anna is tired.'
+    assert novel.characters['1'].kwVar['Field_Nickname'] == 'Little Anna'
+    assert TextReplacer('Anna', 'Eve').find(novel) == changes
+
+
+def test_undo_refuses_modified_texts():
+    novel = make_novel()
+    replacer = TextReplacer('Anna', 'Eve')
+    changes = replacer.find(novel)
+    replacer.apply(novel, changes)
+    novel.scenes['1'].field1 = 'Changed meanwhile.'
+    try:
+        replacer.undo(novel, changes)
+    except Error:
+        pass
+    else:
+        assert False
+    assert novel.scenes['1'].sceneContent == 'Eve sees [i]Eve[/i] in the mirror.'
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
@@ -0,0 +1,150 @@
+"""Regression tests for the story timeline index.
+
+usage: test_timeline_index.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+The index updated scene by scene must answer like an index built from scratch.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import random
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from novelystlib.model.timeline_index import TimelineIndex
+
+GAP_LENGTHS = (0, 3600, 86400)
+
+
+def set_random_time(scene, rng):
+    """Give the scene a random date or day, time, and duration; or none of them."""
+    scene.date = None
+    scene.day = None
+    choice = rng.random()
+    if choice < 0.4:
+        scene.date = f'2023-01-{rng.randint(1, 9):02}'
+    elif choice < 0.7:
+        scene.day = str(rng.randint(-3, 9))
+    elif choice < 0.75:
+        scene.date = 'invalid'
+    scene.time = rng.choice([None, '00:00:00', '10:00:00', '12:30:00'])
+    scene.lastsHours = rng.choice([None, '0', '1', '5', '30', 'invalid'])
+    scene.lastsDays = rng.choice([None, None, '1'])
+
+
+def make_novel(rng, sceneCount):
+    """Return a novel with randomly timed scenes of all types, partly in the trash."""
+    novel = Novel()
+    for chapterIndex in range(4):
+        chId = str(chapterIndex + 1)
+        chapter = Chapter()
+        chapter.title = f'Chapter {chId}'
+        chapter.chLevel = 0
+        chapter.chType = 0
+        chapter.isTrash = chapterIndex == 3
+        chapter.srtScenes = []
+        novel.chapters[chId] = chapter
+        novel.srtChapters.append(chId)
+    for sceneIndex in range(sceneCount):
+        scId = str(sceneIndex + 1)
+        scene = Scene()
+        scene.title = f'Scene {scId}'
+        scene.scType = rng.choice([0, 0, 0, 1, 2, 3])
+        set_random_time(scene, rng)
+        novel.scenes[scId] = scene
+        novel.chapters[str(sceneIndex % 4 + 1)].srtScenes.append(scId)
+    return novel
+
+
+def get_answers(timelineIndex, novel):
+    """Return the answers of all queries, for comparison."""
+    answers = dict(
+        chronology=timelineIndex.get_chronology(),
+        outOfOrder=timelineIndex.get_out_of_order(),
+        )
+    for minLength in GAP_LENGTHS:
+        answers[f'gaps {minLength}'] = timelineIndex.get_gaps(minLength)
+    for scId in novel.scenes:
+        answers[f'span {scId}'] = timelineIndex.get_span(scId)
+        answers[f'flags {scId}'] = (timelineIndex.is_overlapping(scId), timelineIndex.is_out_of_order(scId))
+    for scId in answers['chronology']:
+        answers[f'overlapping {scId}'] = timelineIndex.get_overlapping(scId)
+    return answers
+
+
+def test_updates_equal_rebuild():
+    for seed in range(100):
+        rng = random.Random(seed)
+        novel = make_novel(rng, rng.randint(0, 30))
+        timelineIndex = TimelineIndex(novel)
+        for step in range(20):
+            if not novel.scenes:
+                break
+
+            scId = rng.choice(list(novel.scenes))
+            flagsBefore = {s: (timelineIndex.is_overlapping(s), timelineIndex.is_out_of_order(s)) for s in novel.scenes}
+            set_random_time(novel.scenes[scId], rng)
+            touched = timelineIndex.update_scene(scId)
+            rebuilt = TimelineIndex(novel)
+            assert get_answers(timelineIndex, novel) == get_answers(rebuilt, novel), (seed, step)
+
+            # Scenes whose flags change must be reported, so the tree rows are refreshed.
+            for s in novel.scenes:
+                if flagsBefore[s] != (rebuilt.is_overlapping(s), rebuilt.is_out_of_order(s)):
+                    assert s in touched, (seed, step, s)
+
+
+def test_touched_scenes_are_collected_until_popped():
+    rng = random.Random(1)
+    novel = make_novel(rng, 20)
+    timelineIndex = TimelineIndex(novel)
+    allTouched = set()
+    for scId in ('1', '2', '5'):
+        novel.scenes[scId].date = '2023-02-01'
+        novel.scenes[scId].day = None
+        allTouched.update(timelineIndex.update_scene(scId))
+    assert timelineIndex.pop_touched() == allTouched
+    assert timelineIndex.pop_touched() == set()
+
+
+def test_unchanged_scene_is_not_touched():
+    rng = random.Random(2)
+    novel = make_novel(rng, 10)
+    timelineIndex = TimelineIndex(novel)
+    assert timelineIndex.update_scene('1') == set()
+    assert timelineIndex.update_scene('unknown') == set()
+
+
+def test_chronology_queries():
+    novel = Novel()
+    chapter = Chapter()
+    chapter.chType = 0
+    chapter.srtScenes = ['1', '2', '3']
+    novel.chapters['1'] = chapter
+    novel.srtChapters.append('1')
+    for scId, day, time, lastsHours in (
+            ('1', '1', '10:00:00', '2'),
+            ('2', '1', '11:00:00', '1'),
+            ('3', '0', '08:00:00', None),
+            ):
+        scene = Scene()
+        scene.scType = 0
+        scene.day = day
+        scene.time = time
+        scene.lastsHours = lastsHours
+        novel.scenes[scId] = scene
+    timelineIndex = TimelineIndex(novel)
+    assert timelineIndex.get_chronology() == ['3', '1', '2']
+    assert timelineIndex.get_overlapping('1') == ['2']
+    assert not timelineIndex.is_overlapping('3')
+    assert timelineIndex.get_out_of_order() == ['3']
+    assert timelineIndex.get_gaps(3600) == [(93600, '3', '1')]
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
@@ -0,0 +1,95 @@
+"""Regression tests for the dictionary compatibility of the word count log.
+
+usage: test_wc_log.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import xml.etree.ElementTree as ET
+from novelystlib.model.wc_log import WcLog
+
+
+def make_log():
+    return WcLog({
+        '2023-03-02': ['120', '150'],
+        '2023-03-01': ['100', '110'],
+        })
+
+
+def test_read_like_a_dict():
+    wcLog = make_log()
+    assert list(wcLog) == ['2023-03-01', '2023-03-02']
+    assert wcLog['2023-03-01'] == ['100', '110']
+    assert wcLog['2023-03-01'][1] == '110'
+    assert list(wcLog['2023-03-02']) == ['120', '150']
+    assert dict(wcLog) == {'2023-03-01': ['100', '110'], '2023-03-02': ['120', '150']}
+    assert wcLog.get('2023-03-03') is None
+    assert not '2023-03-03' in wcLog
+    count, totalCount = wcLog['2023-03-02']
+    assert (count, totalCount) == ('120', '150')
+
+
+def test_missing_dates_raise_key_error():
+    wcLog = make_log()
+    for wcDate in ('2023-03-03', 'no date'):
+        try:
+            wcLog[wcDate]
+        except KeyError:
+            pass
+        else:
+            assert False, wcDate
+
+
+def test_write_like_a_dict():
+    wcLog = make_log()
+    wcLog['2023-03-03'] = ['130', '160']
+    wcLog['2023-03-01'] = [90, 100]
+    assert wcLog['2023-03-01'] == ['90', '100']
+    del wcLog['2023-03-02']
+    assert list(wcLog) == ['2023-03-01', '2023-03-03']
+    assert wcLog.latest() == ('2023-03-03', 130, 160)
+
+
+def test_item_assignment_writes_through():
+    wcLog = make_log()
+    wcLog['2023-03-01'][0] = '105'
+    assert wcLog['2023-03-01'] == ['105', '110']
+    assert wcLog.get_count('2023-03-01') == (105, 110)
+    entry = wcLog['2023-03-02']
+    wcLog['2023-02-28'] = ['10', '20']
+    # The view is not affected by insertions before its entry.
+    entry[1] = 155
+    assert wcLog['2023-03-02'] == ['120', '155']
+    entry[:] = ['125', '160']
+    assert wcLog.latest() == ('2023-03-02', 125, 160)
+
+
+def test_entry_length_is_fixed():
+    wcLog = make_log()
+    try:
+        wcLog['2023-03-01'][:] = ['1']
+    except ValueError:
+        pass
+    else:
+        assert False
+    assert wcLog['2023-03-01'] == ['100', '110']
+
+
+def test_xml_round_trip():
+    wcLog = make_log()
+    wcLog['2023-03-01'][0] = '105'
+    root = ET.Element('YWRITER7')
+    xmlWcLog = wcLog.write_xml(root)
+    readLog = WcLog()
+    readLog.read_xml(xmlWcLog)
+    assert dict(readLog) == dict(wcLog)
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')
@@ -0,0 +1,94 @@
+"""Regression tests for the obfuscated text export for word count validation.
+
+usage: test_wrimo_file.py
+
+Run from the src directory, with pywriter on the Python path, or with pytest.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/novelyst
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import re
+import tempfile
+from pywriter.file.file_export import FileExport
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene, ADDITIONAL_WORD_LIMITS, NO_WORD_LIMITS
+from novelystlib.export.wrimo_file import WrimoFile, obfuscate
+
+
+class JoinedWrimoFile(WrimoFile):
+    """Obfuscated text file, written by the superclass as one string."""
+    write = FileExport.write
+
+
+def obfuscate_by_substitutions(text):
+    text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
+    text = NO_WORD_LIMITS.sub('', text)
+    return re.sub(r'\S', 'x', text)
+
+
+def make_novel():
+    novel = Novel()
+    chapters = (
+        ('1', 0, 0, ('1', '2', '3')),
+        ('2', 1, 0, ('4',)),
+        ('3', 0, 3, ('5',)),
+        ('4', 0, 0, ('6', '7')),
+        ('5', 0, 0, ('8', '9', '10')),
+        )
+    for chId, chType, chLevel, srtScenes in chapters:
+        chapter = Chapter()
+        chapter.title = f'Chapter {chId}'
+        chapter.chType = chType
+        chapter.chLevel = chLevel
+        chapter.srtScenes = list(srtScenes)
+        novel.chapters[chId] = chapter
+        novel.srtChapters.append(chId)
+    for scId in range(1, 11):
+        scene = Scene()
+        scene.title = f'Scene {scId}'
+        scene.desc = 'Not counted.'
+        scene.scType = 0
+        scene.status = 1
+        scene.sceneContent = f'Scene {scId}: a [i]well-known[/i] word—or two /* comment */.\nNext line.'
+        novel.scenes[str(scId)] = scene
+    novel.chapters['3'].chType = 3
+    novel.scenes['2'].appendToPrev = True
+    novel.scenes['3'].scType = 1
+    novel.scenes['6'].doNotExport = True
+    novel.scenes['7'].doNotExport = True
+    novel.scenes['9'].sceneContent = '<HTML>not counted'
+    novel.scenes['10'].sceneContent = ''
+    return novel
+
+
+def write(fileClass, tempDir, novel):
+    wrimoFile = fileClass(os.path.join(tempDir, f'test{fileClass.__name__}{WrimoFile.SUFFIX}{WrimoFile.EXTENSION}'))
+    wrimoFile.novel = novel
+    wrimoFile.write()
+    with open(wrimoFile.filePath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_obfuscate_equals_substitutions():
+    for text in ('[i]well-known[/i] this—that', '/*a comment*/ word\n> quote', 'x  y\tz', ''):
+        assert obfuscate(text) == obfuscate_by_substitutions(text), text
+
+
+def test_written_file_equals_superclass_output():
+    novel = make_novel()
+    with tempfile.TemporaryDirectory() as tempDir:
+        text = write(WrimoFile, tempDir, novel)
+        assert text == write(JoinedWrimoFile, tempDir, novel)
+    assert text.count('xxxx xxxxx\n\n') == 4
+    # scenes 1, 2, 4, and 8
+    assert not 'N' in text
+
+
+if __name__ == '__main__':
+    for name, function in list(globals().items()):
+        if name.startswith('test_'):
+            function()
+            print(f'{name}: OK')